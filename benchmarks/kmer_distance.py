@@ -0,0 +1,72 @@
+"""Benchmark of the accuracy and speed of the k-mer profile distances against the levenshtein distance.
+
+Generates traditions of increasing size with the stemmabench generator and computes their distance matrix with the
+built-in levenshtein distance and with the cosine and Bray-Curtis distances of the k-mer profiles. For each distance it
+reports the time of the matrix, its Spearman correlation with the levenshtein distances and the fraction of the
+manuscripts whose nearest manuscript is their parent or one of their children in the generated stemma.
+
+Usage (from the root of the repository):
+    python benchmarks/kmer_distance.py --config demo/config.yaml --text demo/test_text.txt --depths 4 5 6
+"""
+import argparse
+import time
+from typing import List, Tuple
+import numpy as np
+from stemmabench.bench.config_parser import StemmaBenchConfig
+from stemmabench.bench.stemma_generator import Stemma
+from stemmabench.algorithms.distance_engine import DistanceEngine
+from stemmabench.algorithms.kmer import KmerProfile
+from traditions import generate
+
+
+def spearman(matrix1: np.ndarray, matrix2: np.ndarray) -> float:
+    """Returns the Spearman correlation of the distances between distinct manuscripts of two matrices."""
+    upper = np.triu_indices(len(matrix1), k=1)
+    ranks1 = np.argsort(np.argsort(matrix1[upper]))
+    ranks2 = np.argsort(np.argsort(matrix2[upper]))
+    return float(np.corrcoef(ranks1, ranks2)[0, 1])
+
+
+def neighbor_accuracy(matrix: np.ndarray, labels: List[str], edges: List[Tuple[int, int]]) -> float:
+    """Returns the fraction of the manuscripts whose nearest manuscript is adjacent to them in the stemma."""
+    adjacent = {(str(parent), str(child)) for parent, child in edges}
+    adjacent |= {(child, parent) for parent, child in adjacent}
+    masked = matrix + np.diag(np.full(len(labels), np.inf))
+    nearest = masked.argmin(axis=1)
+    return float(np.mean([(labels[i], labels[j]) in adjacent for i, j in enumerate(nearest)]))
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--config", default="demo/config.yaml", help="Configuration of the variants.")
+    parser.add_argument("--text", default="demo/test_text.txt", help="Original text of the traditions.")
+    parser.add_argument("--depths", type=int, nargs="+", default=[4, 5, 6], help="Depths of the traditions.")
+    parser.add_argument("--width", type=int, default=3, help="Number of copies of each manuscript.")
+    parser.add_argument("--k", type=int, default=3, help="Number of characters of the k-mers.")
+    parser.add_argument("--n-jobs", type=int, default=1, help="Worker processes for the levenshtein distances.")
+    parser.add_argument("--seed", type=int, default=0, help="Seed of the generator.")
+    args = parser.parse_args()
+    np.random.seed(args.seed)
+    config = StemmaBenchConfig.from_yaml(args.config)
+    text = Stemma.load_text(args.text)
+    distances = {"levenshtein": DistanceEngine("levenshtein", n_jobs=args.n_jobs)}
+    for metric in KmerProfile.METRICS:
+        distances[f"kmer {metric}"] = DistanceEngine(KmerProfile(k=args.k, metric=metric))
+    print(f"{'manuscripts':>12} {'distance':>16} {'time (s)':>9} {'speedup':>8} {'spearman':>9} {'nearest':>8}")
+    for depth in args.depths:
+        stemma = generate(config, text, depth, args.width)
+        labels = sorted(stemma.texts_lookup)
+        texts = [stemma.texts_lookup[label] for label in labels]
+        reference, reference_time = None, None
+        for name, engine in distances.items():
+            start = time.perf_counter()
+            matrix = engine.compute(texts)
+            elapsed = time.perf_counter() - start
+            if reference is None:
+                reference, reference_time = matrix, elapsed
+            print(f"{len(labels):>12} {name:>16} {elapsed:>9.2f} {reference_time / elapsed:>8.1f} "
+                  f"{spearman(reference, matrix):>9.3f} {neighbor_accuracy(matrix, labels, stemma.edges):>8.2f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,48 @@
+"""Benchmark of the exact and rapid searches of the Neighbor-Joining algorithm on generated traditions.
+
+Generates traditions of increasing size with the stemmabench generator, computes their distance matrix with the
+built-in levenshtein distance and times both searches of NeighborJoining on it. Both searches must return the same tree.
+
+Usage (from the root of the repository):
+    python benchmarks/nj_search.py --config demo/config.yaml --text demo/test_text.txt --depths 5 6 7 8
+"""
+import argparse
+import time
+import numpy as np
+from stemmabench.bench.config_parser import StemmaBenchConfig
+from stemmabench.bench.stemma_generator import Stemma
+from stemmabench.algorithms.distance_engine import DistanceEngine
+from stemmabench.algorithms.nj_core import NeighborJoining
+from traditions import generate
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--config", default="demo/config.yaml", help="Configuration of the variants.")
+    parser.add_argument("--text", default="demo/test_text.txt", help="Original text of the traditions.")
+    parser.add_argument("--depths", type=int, nargs="+", default=[5, 6, 7, 8], help="Depths of the traditions.")
+    parser.add_argument("--width", type=int, default=3, help="Number of copies of each manuscript.")
+    parser.add_argument("--n-jobs", type=int, default=1, help="Worker processes for the distance matrix.")
+    parser.add_argument("--seed", type=int, default=0, help="Seed of the generator.")
+    args = parser.parse_args()
+    np.random.seed(args.seed)
+    config = StemmaBenchConfig.from_yaml(args.config)
+    text = Stemma.load_text(args.text)
+    print(f"{'manuscripts':>12} {'distances (s)':>14} {'exact (s)':>10} {'rapid (s)':>10} {'speedup':>8} {'same tree':>10}")
+    for depth in args.depths:
+        texts = generate(config, text, depth, args.width).texts_lookup
+        labels = sorted(texts)
+        start = time.perf_counter()
+        matrix = DistanceEngine("levenshtein", n_jobs=args.n_jobs).compute([texts[label] for label in labels])
+        distances = time.perf_counter() - start
+        timings, results = [], []
+        for search in NeighborJoining.SEARCHES:
+            start = time.perf_counter()
+            results.append(NeighborJoining(matrix, labels, search=search).build())
+            timings.append(time.perf_counter() - start)
+        print(f"{len(labels):>12} {distances:>14.2f} {timings[0]:>10.2f} {timings[1]:>10.2f} "
+              f"{timings[0] / timings[1]:>8.1f} {str(results[0] == results[1]):>10}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,60 @@
+"""Benchmark of the local search of FitchParsimony on generated traditions.
+
+Generates traditions of increasing size with the stemmabench generator, collates them with StemmaParsimony.collate and
+builds the starting tree by Neighbor-Joining on the built-in levenshtein distance. The starting tree is then improved by
+the NNI and SPR searches of FitchParsimony, and for each search the benchmark reports the length of the tree, the number
+of candidate trees evaluated per minute and the fraction of the groups of manuscripts of the generated stemma found in
+the tree.
+
+Usage (from the root of the repository):
+    python benchmarks/parsimony.py --config demo/config.yaml --text demo/test_text.txt --depths 4 5 6
+"""
+import argparse
+import time
+import numpy as np
+from stemmabench.bench.config_parser import StemmaBenchConfig
+from stemmabench.bench.stemma_generator import Stemma
+from stemmabench.algorithms.distance_engine import DistanceEngine
+from stemmabench.algorithms.nj_core import NeighborJoining
+from stemmabench.algorithms.parsimony_core import FitchParsimony
+from stemmabench.algorithms.stemma_Parsimony import StemmaParsimony
+from traditions import generate
+from upgma_nj import recovered
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--config", default="demo/config.yaml", help="Configuration of the variants.")
+    parser.add_argument("--text", default="demo/test_text.txt", help="Original text of the traditions.")
+    parser.add_argument("--depths", type=int, nargs="+", default=[4, 5, 6], help="Depths of the traditions.")
+    parser.add_argument("--width", type=int, default=3, help="Number of copies of each manuscript.")
+    parser.add_argument("--max-rounds", type=int, default=None, help="Maximal number of rounds of the searches.")
+    parser.add_argument("--seed", type=int, default=0, help="Seed of the generator.")
+    args = parser.parse_args()
+    np.random.seed(args.seed)
+    config = StemmaBenchConfig.from_yaml(args.config)
+    text = Stemma.load_text(args.text)
+    print(f"{'manuscripts':>12} {'characters':>11} {'search':>7} {'length':>7} {'time (s)':>9} "
+          f"{'trees/min':>10} {'recovered':>10}")
+    for depth in args.depths:
+        stemma = generate(config, text, depth, args.width)
+        labels = sorted(stemma.texts_lookup)
+        texts = [stemma.texts_lookup[label] for label in labels]
+        reference = [(str(parent), str(child)) for parent, child in stemma.edges]
+        matrix = DistanceEngine("levenshtein").compute(texts)
+        characters = StemmaParsimony.collate(texts, base=int(matrix.sum(axis=1).argmin()))
+        _, start = NeighborJoining(matrix, labels, search="rapid").build()
+        for search in ("none",) + FitchParsimony.SEARCHES:
+            parsimony = FitchParsimony(characters, labels)
+            length = parsimony.set_tree(start)
+            began = time.perf_counter()
+            if search != "none":
+                length = parsimony.search(search, max_rounds=args.max_rounds)
+            elapsed = time.perf_counter() - began
+            rate = parsimony.evaluated / elapsed * 60 if elapsed else 0.0
+            print(f"{len(labels):>12} {parsimony.characters:>11} {search:>7} {length:>7} {elapsed:>9.2f} "
+                  f"{rate:>10.0f} {recovered(labels, reference, parsimony.edges()[1]):>10.2f}")
+
+
+if __name__ == "__main__":
+    main()
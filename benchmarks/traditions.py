@@ -0,0 +1,20 @@
+"""Generation of the traditions used by the benchmarks."""
+from stemmabench.bench.config_parser import StemmaBenchConfig
+from stemmabench.bench.stemma_generator import Stemma
+
+
+def generate(config: StemmaBenchConfig, text: str, depth: int, width: int) -> Stemma:
+    """Generates a tradition in which each manuscript has width copies, over depth generations.
+
+    ### Args:
+        - config (StemmaBenchConfig): The configuration of the variants.
+        - text (str): The original text.
+        - depth (int): The number of generations.
+        - width (int): The number of copies of each manuscript.
+
+    ### Returns:
+        - Stemma: The generated stemma, with the texts of the tradition in texts_lookup and its edges in edges.
+    """
+    config.stemma.depth = depth
+    config.stemma.width.min, config.stemma.width.max = width, width + 1
+    return Stemma(config=config, original_text=text).generate()
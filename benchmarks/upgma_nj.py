@@ -0,0 +1,66 @@
+"""Benchmark of the speed and accuracy of UPGMA and WPGMA against Neighbor-Joining on generated traditions.
+
+Generates traditions of increasing size with the stemmabench generator, computes their distance matrix once with the
+built-in levenshtein distance and times the rapid search of NeighborJoining and both methods of AverageLinkage on it.
+For each tree it reports the fraction of the groups of manuscripts of the generated stemma, the bipartitions of its
+edges, that are also bipartitions of the reconstructed tree.
+
+Usage (from the root of the repository):
+    python benchmarks/upgma_nj.py --config demo/config.yaml --text demo/test_text.txt --depths 5 6 7 8
+"""
+import argparse
+import time
+from typing import List, Tuple
+import numpy as np
+from stemmabench.bench.config_parser import StemmaBenchConfig
+from stemmabench.bench.stemma_generator import Stemma
+from stemmabench.algorithms.consensus import Consensus
+from stemmabench.algorithms.distance_engine import DistanceEngine
+from stemmabench.algorithms.nj_core import NeighborJoining
+from stemmabench.algorithms.upgma_core import AverageLinkage
+from traditions import generate
+
+
+def recovered(labels: List[str], reference: List[Tuple[str, str]], edges: List[List[str]]) -> float:
+    """Returns the fraction of the non trivial bipartitions of the reference tree found in a tree."""
+    consensus = Consensus(labels)
+    consensus.add(edges)
+    bitsets = set(consensus.bitsets(reference).values())
+    bitsets = {bitset for bitset in bitsets if 1 < bin(bitset).count("1") < len(labels) - 1}
+    return float(np.mean([bitset in consensus.counts for bitset in bitsets])) if bitsets else 1.0
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--config", default="demo/config.yaml", help="Configuration of the variants.")
+    parser.add_argument("--text", default="demo/test_text.txt", help="Original text of the traditions.")
+    parser.add_argument("--depths", type=int, nargs="+", default=[5, 6, 7, 8], help="Depths of the traditions.")
+    parser.add_argument("--width", type=int, default=3, help="Number of copies of each manuscript.")
+    parser.add_argument("--n-jobs", type=int, default=1, help="Worker processes for the distance matrix.")
+    parser.add_argument("--seed", type=int, default=0, help="Seed of the generator.")
+    args = parser.parse_args()
+    np.random.seed(args.seed)
+    config = StemmaBenchConfig.from_yaml(args.config)
+    text = Stemma.load_text(args.text)
+    print(f"{'manuscripts':>12} {'algorithm':>10} {'time (s)':>9} {'speedup':>8} {'recovered':>10}")
+    for depth in args.depths:
+        stemma = generate(config, text, depth, args.width)
+        labels = sorted(stemma.texts_lookup)
+        reference = [(str(parent), str(child)) for parent, child in stemma.edges]
+        matrix = DistanceEngine("levenshtein", n_jobs=args.n_jobs).compute([stemma.texts_lookup[label]
+                                                                            for label in labels])
+        builders = {"nj": lambda: NeighborJoining(matrix, labels, search="rapid")}
+        for method in AverageLinkage.METHODS:
+            builders[method] = lambda method=method: AverageLinkage(matrix, labels, method=method)
+        nj_time = None
+        for name, builder in builders.items():
+            start = time.perf_counter()
+            _, edges = builder().build()
+            elapsed = time.perf_counter() - start
+            nj_time = nj_time or elapsed
+            print(f"{len(labels):>12} {name:>10} {elapsed:>9.2f} {nj_time / elapsed:>8.1f} "
+                  f"{recovered(labels, reference, edges):>10.2f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,470 @@
+from typing import Dict, List, Tuple, Union
+import numpy as np
+from stemmabench.algorithms.manuscript_in_tree_base import ManuscriptInTreeBase
+import stemmabench.algorithms.manuscript_in_tree as man
+import stemmabench.algorithms.manuscript_in_tree_empty as empty
+
+
+class CompactTree:
+    """Array backed representation of a rooted stemma tree.
+    The node labels are interned to integer ids and the structure of the tree is stored in flat numpy arrays.
+
+    ### Attributes:
+        - labels (list): The node labels. The position of a label in the list is the id of the node.
+        - index (dict): Dictionary with node labels as keys and node ids as values.
+        - parent (numpy.ndarray): int32 array containing the id of the parent of each node. Set to -1 for the root.
+        - child_offsets (numpy.ndarray): CSR offsets of the children. The children of node i are child_ids[child_offsets[i]:child_offsets[i+1]].
+        - child_ids (numpy.ndarray): int32 array of the node ids grouped by parent.
+        - branch_lengths (numpy.ndarray): float64 array containing the length of the edge between each node and its parent. Set to 0 for the root.
+        - root (int): The id of the root node.
+        - depth (numpy.ndarray): The number of edges between each node and the root.
+        - root_distance (numpy.ndarray): The sum of the branch lengths between each node and the root.
+    """
+
+    def __init__(self,
+                 labels: List[str],
+                 parent: Union[np.ndarray, List[int]],
+                 branch_lengths: Union[np.ndarray, List[float], None] = None,
+                 child_order: Union[np.ndarray, List[int], None] = None) -> None:
+        """Constructor for the CompactTree class.
+
+        ### Args:
+            - labels (list): The node labels indexed by node id.
+            - parent (numpy.ndarray, list): The id of the parent of each node. Must be -1 for the root and only for the root.
+            - branch_lengths (numpy.ndarray, list, Optional): The length of the edge between each node and its parent.
+            If not specified the length of each edge will be assumed to be 1.
+            - child_order (numpy.ndarray, list, Optional): The node ids in the order in which siblings should be listed.
+            If not specified the siblings are ordered by node id.
+
+        ### Raises:
+            - ValueError: If the labels are not unique or if the arrays do not have the same length as labels.
+            - ValueError: If the tree does not have exactly one root or contains a cycle.
+        """
+        self._labels: List[str] = [str(label) for label in labels]
+        self._index: Dict[str, int] = {label: i for i, label in enumerate(self._labels)}
+        if len(self._index) != len(self._labels):
+            raise ValueError("The node labels must be unique.")
+        size = len(self._labels)
+        self._parent: np.ndarray = np.asarray(parent, dtype=np.int32).reshape(-1)
+        if self._parent.shape[0] != size:
+            raise ValueError("Parameter parent must contain one entry per label.")
+        if branch_lengths is None:
+            self._branch_lengths: np.ndarray = np.ones(size, dtype=np.float64)
+        else:
+            self._branch_lengths = np.array(branch_lengths, dtype=np.float64).reshape(-1)
+            if self._branch_lengths.shape[0] != size:
+                raise ValueError("Parameter branch_lengths must contain one entry per label.")
+        roots = np.flatnonzero(self._parent < 0)
+        if roots.shape[0] != 1:
+            raise ValueError(f"The tree must have exactly one root, found {roots.shape[0]}.")
+        self._root: int = int(roots[0])
+        self._branch_lengths[self._root] = 0.0
+        if child_order is None:
+            child_order = np.arange(size, dtype=np.int32)
+        child_order = np.asarray(child_order, dtype=np.int32)
+        child_order = child_order[child_order != self._root]
+        self._child_ids: np.ndarray = child_order[np.argsort(
+            self._parent[child_order], kind="stable")]
+        self._child_offsets: np.ndarray = np.zeros(size + 1, dtype=np.int64)
+        np.cumsum(np.bincount(self._parent[self._child_ids], minlength=size),
+                  out=self._child_offsets[1:])
+        self._depth, self._root_distance = self._ancestor_sums()
+
+    @property
+    def labels(self):
+        return self._labels
+
+    @property
+    def index(self):
+        return self._index
+
+    @property
+    def parent(self):
+        return self._parent
+
+    @property
+    def child_offsets(self):
+        return self._child_offsets
+
+    @property
+    def child_ids(self):
+        return self._child_ids
+
+    @property
+    def branch_lengths(self):
+        return self._branch_lengths
+
+    @property
+    def root(self):
+        return self._root
+
+    @property
+    def depth(self):
+        return self._depth
+
+    @property
+    def root_distance(self):
+        return self._root_distance
+
+    def __len__(self) -> int:
+        """Returns the number of nodes in the tree."""
+        return len(self._labels)
+
+    def __repr__(self) -> str:
+        """String representation of the tree."""
+        return f"CompactTree(root={self._labels[self._root]}, size={len(self)})"
+
+    def _ancestor_sums(self) -> Tuple[np.ndarray, np.ndarray]:
+        """Computes the depth and the distance to the root of every node using pointer jumping.
+        Runs in O(log(depth)) vectorized passes over the parent array.
+
+        ### Returns:
+            - numpy.ndarray: The depth of each node.
+            - numpy.ndarray: The distance between each node and the root.
+
+        ### Raises:
+            - ValueError: If the parent array contains a cycle.
+        """
+        size = len(self)
+        ancestor = self._parent.astype(np.int64)
+        depth = (ancestor >= 0).astype(np.int64)
+        distance = self._branch_lengths.copy()
+        for _ in range(max(size, 1).bit_length() + 1):
+            has_ancestor = ancestor >= 0
+            if not has_ancestor.any():
+                return depth, distance
+            jump = np.where(has_ancestor, ancestor, 0)
+            depth = depth + np.where(has_ancestor, depth[jump], 0)
+            distance = distance + np.where(has_ancestor, distance[jump], 0.0)
+            ancestor = np.where(has_ancestor, ancestor[jump], -1)
+        raise ValueError("The parent array contains a cycle.")
+
+    @staticmethod
+    def intern(edge_list: Union[List[List[str]], np.ndarray]) -> Tuple[List[str], Dict[str, int], np.ndarray]:
+        """Interns the labels of an edge list to integer ids in order of first appearance.
+
+        ### Args:
+            - edge_list (list, numpy.ndarray): A list of edges.
+
+        ### Returns:
+            - list: The labels indexed by id.
+            - dict: Dictionary with labels as keys and ids as values.
+            - numpy.ndarray: int32 array of shape (n,2) containing the edges as ids.
+
+        ### Raises:
+            - ValueError: If the edge list is not of shape (n,2).
+        """
+        edges = np.asarray(edge_list)
+        if edges.size == 0:
+            edges = edges.reshape(0, 2)
+        if len(edges.shape) != 2 or edges.shape[1] != 2:
+            raise ValueError(f"The edge list has shape {edges.shape}. It must be of shape (n,2).")
+        flat = edges.ravel().tolist()
+        index: Dict[str, int] = {}
+        ids = np.fromiter((index.setdefault(label, len(index)) for label in flat),
+                          dtype=np.int32, count=len(flat)).reshape(-1, 2)
+        return list(index), index, ids
+
+    @staticmethod
+    def csr(sources: np.ndarray, targets: np.ndarray, size: int) -> Tuple[np.ndarray, np.ndarray]:
+        """Groups targets by source in compressed sparse row format.
+        The relative order of the targets of each source is preserved.
+
+        ### Args:
+            - sources (numpy.ndarray): The source id of each entry.
+            - targets (numpy.ndarray): The target id of each entry.
+            - size (int): The number of distinct ids.
+
+        ### Returns:
+            - numpy.ndarray: The offsets, the targets of i are in targets[offsets[i]:offsets[i+1]].
+            - numpy.ndarray: The grouped targets.
+        """
+        order = np.argsort(sources, kind="stable")
+        offsets = np.zeros(size + 1, dtype=np.int64)
+        np.cumsum(np.bincount(sources, minlength=size), out=offsets[1:])
+        return offsets, targets[order]
+
+    @classmethod
+    def from_edges(cls,
+                   edge_list: Union[List[List[str]], np.ndarray],
+                   dist_dict: Union[Dict[str, Union[float, int]], None] = None,
+                   root: Union[str, None] = None) -> "CompactTree":
+        """Builds a compact tree from an edge list.
+
+        ### Args:
+            - edge_list (list, numpy.ndarray): A list of edges in format [parent, child].
+            - dist_dict (dict, Optional): Dictionary with the edges as keys in format "parent,child" or "child,parent"
+            and the length of the edges as value. If not specified the length of each edge will be assumed to be 1.
+            Edges missing from the dictionary are given a length of nan.
+            - root (str, Optional): If specified the edges are considered as undirected and the tree is oriented from this node.
+
+        ### Returns:
+            - CompactTree: The tree represented by the edge list.
+
+        ### Raises:
+            - ValueError: If the edge list is not of shape (n,2) or does not represent a tree.
+            - ValueError: If root is specified and is not present in the edge list.
+        """
+        labels, index, ids = cls.intern(edge_list)
+        size = len(labels)
+        if dist_dict is None:
+            edge_lengths = np.ones(ids.shape[0], dtype=np.float64)
+        else:
+            edge_lengths = np.array([cls.edge_length(dist_dict, labels[p], labels[c])
+                                     for p, c in ids.tolist()], dtype=np.float64)
+        if size == 0:
+            raise ValueError("The edge list must contain at least one edge.")
+        if ids.shape[0] != size - 1:
+            raise ValueError("The edge list does not represent a tree.")
+        parent = np.full(size, -1, dtype=np.int32)
+        branch_lengths = np.zeros(size, dtype=np.float64)
+        if root is None:
+            if np.bincount(ids[:, 1], minlength=size).max() > 1:
+                raise ValueError("A node of the edge list has more than one parent.")
+            parent[ids[:, 1]] = ids[:, 0]
+            branch_lengths[ids[:, 1]] = edge_lengths
+            return cls(labels, parent, branch_lengths, child_order=ids[:, 1])
+        if root not in index:
+            raise ValueError(f"Parameter root: {root} is not present in edge_list.")
+        offsets, adjacent, adjacent_lengths = cls.adjacency(ids, size, edge_lengths)
+        parent, branch_lengths, _, order = cls.bfs(offsets, adjacent, adjacent_lengths, index[root])
+        if order.shape[0] != size - 1:
+            raise ValueError("The edge list does not represent a connected tree.")
+        return cls(labels, parent, branch_lengths, child_order=order)
+
+    @classmethod
+    def adjacency(cls,
+                  ids: np.ndarray,
+                  size: int,
+                  edge_lengths: Union[np.ndarray, None] = None) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+        """Builds the undirected adjacency index of an interned edge list in compressed sparse row format.
+        The neighbours of each node are listed in edge list order.
+
+        ### Args:
+            - ids (numpy.ndarray): Array of shape (n,2) containing the edges as ids (see intern).
+            - size (int): The number of nodes.
+            - edge_lengths (numpy.ndarray, Optional): The length of each edge. If not specified the lengths are set to 1.
+
+        ### Returns:
+            - numpy.ndarray: The offsets, the neighbours of i are in adjacent[offsets[i]:offsets[i+1]].
+            - numpy.ndarray: The neighbours grouped by node.
+            - numpy.ndarray: The length of the edge to each neighbour.
+        """
+        if edge_lengths is None:
+            edge_lengths = np.ones(ids.shape[0], dtype=np.float64)
+        offsets, adjacent = cls.csr(ids.ravel(), ids[:, ::-1].ravel(), size)
+        _, adjacent_lengths = cls.csr(ids.ravel(), np.repeat(np.asarray(edge_lengths, dtype=np.float64), 2), size)
+        return offsets, adjacent, adjacent_lengths
+
+    @staticmethod
+    def bfs(offsets: np.ndarray,
+            adjacent: np.ndarray,
+            adjacent_lengths: np.ndarray,
+            source: int) -> Tuple[np.ndarray, np.ndarray, np.ndarray, np.ndarray]:
+        """Breadth first search over an adjacency index (see adjacency) in O(n).
+        The search visits one node at a time over plain lists: a level by level vectorized search would take one numpy
+        step per level, which is slow on the deep chain-like trees produced by Neighbor-Joining.
+
+        ### Args:
+            - offsets (numpy.ndarray): The offsets of the adjacency index.
+            - adjacent (numpy.ndarray): The neighbours grouped by node.
+            - adjacent_lengths (numpy.ndarray): The length of the edge to each neighbour.
+            - source (int): The id of the node the search starts from.
+
+        ### Returns:
+            - numpy.ndarray: The parent of each node in the search tree. -1 for the source and the unreached nodes.
+            - numpy.ndarray: The length of the edge between each node and its parent.
+            - numpy.ndarray: The distance between the source and each node. nan for the unreached nodes.
+            - numpy.ndarray: The reached nodes other than the source in order of discovery.
+        """
+        size = offsets.shape[0] - 1
+        offsets_list = offsets.tolist()
+        adjacent_list = adjacent.tolist()
+        lengths_list = adjacent_lengths.tolist()
+        parent = [-1] * size
+        branch_lengths = [0.0] * size
+        distance = [np.nan] * size
+        distance[source] = 0.0
+        visited = [False] * size
+        visited[source] = True
+        order = [source]
+        for node in order:
+            for position in range(offsets_list[node], offsets_list[node + 1]):
+                target = adjacent_list[position]
+                if not visited[target]:
+                    visited[target] = True
+                    parent[target] = node
+                    branch_lengths[target] = lengths_list[position]
+                    distance[target] = distance[node] + lengths_list[position]
+                    order.append(target)
+        return (np.array(parent, dtype=np.int32), np.array(branch_lengths, dtype=np.float64),
+                np.array(distance, dtype=np.float64), np.array(order[1:], dtype=np.int64))
+
+    @staticmethod
+    def edge_length(dist_dict: Dict[str, Union[float, int]], node1: str, node2: str) -> float:
+        """Looks up the length of an edge in a dictionary of edge lengths.
+
+        ### Args:
+            - dist_dict (dict): Dictionary with the edges as keys in format "parent,child" and the length of the edges as value.
+            - node1 (str): The label of the first node of the edge.
+            - node2 (str): The label of the second node of the edge.
+
+        ### Returns:
+            - float: The length of the edge. nan if neither "node1,node2" nor "node2,node1" is a key of dist_dict.
+        """
+        length = dist_dict.get(f"{node1},{node2}")
+        if length is None:
+            length = dist_dict.get(f"{node2},{node1}")
+        return np.nan if length is None else length
+
+    @classmethod
+    def from_manuscript(cls, root: ManuscriptInTreeBase) -> "CompactTree":
+        """Builds a compact tree from the root of a tree of manuscripts.
+
+        ### Args:
+            - root (ManuscriptInTreeBase): The root of the tree.
+
+        ### Returns:
+            - CompactTree: The array representation of the tree. Edges without a length are given a length of 1.
+        """
+        labels = [root.label]
+        parent = [-1]
+        branch_lengths = [0.0]
+        stack = [(root, 0)]
+        while stack:
+            node, node_id = stack.pop()
+            edges = node.edges if len(node.edges) == len(node.children) else [1.0] * len(node.children)
+            for child, edge in zip(node.children, edges):
+                stack.append((child, len(labels)))
+                labels.append(child.label)
+                parent.append(node_id)
+                branch_lengths.append(edge)
+        return cls(labels, parent, branch_lengths)
+
+    def to_manuscript(self, text_list: List[str]) -> ManuscriptInTreeBase:
+        """Builds the tree of manuscripts represented by the compact tree.
+
+        ### Args:
+            - text_list (list): The list of texts present in the tree. Nodes whose label is in text_list are instantiated
+            as ManuscriptInTree, the others as ManuscriptInTreeEmpty.
+
+        ### Returns:
+            - ManuscriptInTreeBase: The root of the tree with the edges set from the branch lengths.
+        """
+        texts = set(text_list)
+        nodes: List[Union[ManuscriptInTreeBase, None]] = [None] * len(self)
+        for node_id in np.argsort(self._depth, kind="stable").tolist():
+            parent_id = int(self._parent[node_id])
+            parent = nodes[parent_id] if parent_id >= 0 else None
+            node_class = man.ManuscriptInTree if self._labels[node_id] in texts else empty.ManuscriptInTreeEmpty
+            nodes[node_id] = node_class(parent=parent, label=self._labels[node_id], children=[], edges=[])
+        for node_id, node in enumerate(nodes):
+            children = self.children(node_id).tolist()
+            node._children = [nodes[child] for child in children]
+            node._edges = self._branch_lengths[children].tolist()
+        return nodes[self._root]
+
+    def reroot(self, new_root: str) -> "CompactTree":
+        """Returns the tree rerooted to the given node.
+        Only the parent pointers on the path between the new root and the old root are reversed.
+
+        ### Args:
+            - new_root (str): The label of the node the tree is to be rerooted to.
+
+        ### Returns:
+            - CompactTree: The rerooted tree. The branch lengths follow their edges.
+
+        ### Raises:
+            - ValueError: If new_root is not in the tree.
+        """
+        if new_root not in self._index:
+            raise ValueError(f"Parameter new_root: {new_root} is not present in the tree.")
+        path = [self._index[new_root]]
+        while self._parent[path[-1]] >= 0:
+            path.append(int(self._parent[path[-1]]))
+        parent = self._parent.copy()
+        branch_lengths = self._branch_lengths.copy()
+        parent[path[1:]] = path[:-1]
+        branch_lengths[path[1:]] = self._branch_lengths[path[:-1]]
+        parent[path[0]] = -1
+        return CompactTree(self._labels, parent, branch_lengths,
+                           child_order=np.append(self._child_ids, self._root))
+
+    def children(self, node: int) -> np.ndarray:
+        """Returns the children of a node.
+
+        ### Args:
+            - node (int): The id of the node.
+
+        ### Returns:
+            - numpy.ndarray: The ids of the children of the node.
+        """
+        return self._child_ids[self._child_offsets[node]:self._child_offsets[node + 1]]
+
+    def find_root(self) -> str:
+        """Returns the label of the root of the tree."""
+        return self._labels[self._root]
+
+    def degree(self) -> np.ndarray:
+        """Returns the number of edges connected to each node."""
+        return np.diff(self._child_offsets) + (self._parent >= 0)
+
+    def leaves(self) -> List[str]:
+        """Returns the labels of all the nodes without children."""
+        return [self._labels[i] for i in np.flatnonzero(np.diff(self._child_offsets) == 0).tolist()]
+
+    def to_edge_list(self) -> List[List[str]]:
+        """Returns the edge list of the tree in format [parent, child]."""
+        labels = np.array(self._labels, dtype=object)
+        return np.stack((labels[self._parent[self._child_ids]], labels[self._child_ids]), axis=1).tolist()
+
+    def edge_dict(self) -> Dict[str, float]:
+        """Returns a dictionary with the edges as keys in format "parent,child" and the branch lengths as values."""
+        return {f"{self._labels[p]},{self._labels[c]}": length
+                for p, c, length in zip(self._parent[self._child_ids].tolist(),
+                                        self._child_ids.tolist(),
+                                        self._branch_lengths[self._child_ids].tolist())}
+
+    def path(self, start: str, target: str) -> List[str]:
+        """Returns the list of the nodes on the path between two nodes.
+
+        ### Args:
+            - start (str): The label of the node the path starts from.
+            - target (str): The label of the node the path ends at.
+
+        ### Returns:
+            - list: The labels of the nodes between start and target, both included.
+            Empty if either start or target is not in the tree.
+        """
+        if start not in self._index or target not in self._index:
+            return []
+        up, down = [self._index[start]], [self._index[target]]
+        while self._depth[up[-1]] > self._depth[down[-1]]:
+            up.append(int(self._parent[up[-1]]))
+        while self._depth[down[-1]] > self._depth[up[-1]]:
+            down.append(int(self._parent[down[-1]]))
+        while up[-1] != down[-1]:
+            up.append(int(self._parent[up[-1]]))
+            down.append(int(self._parent[down[-1]]))
+        return [self._labels[i] for i in up + down[-2::-1]]
+
+    def path_length(self, start: str, target: str, weighted: bool = True) -> float:
+        """Returns the length of the path between two nodes.
+
+        ### Args:
+            - start (str): The label of the node the path starts from.
+            - target (str): The label of the node the path ends at.
+            - weighted (bool, Optional): If false each edge is counted as having a length of 1.
+
+        ### Returns:
+            - float: The sum of the branch lengths between both nodes.
+
+        ### Raises:
+            - ValueError: If start or target are not in the tree.
+        """
+        if start not in self._index or target not in self._index:
+            raise ValueError(f"Nodes {start} and {target} must both be in the tree.")
+        path = [self._index[label] for label in self.path(start, target)]
+        top = path[int(np.argmin(self._depth[path]))]
+        distances = self._root_distance if weighted else self._depth
+        return float(distances[path[0]] + distances[path[-1]] - 2 * distances[top])
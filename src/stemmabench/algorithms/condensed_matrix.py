@@ -0,0 +1,273 @@
+import os
+from typing import Tuple, Union
+import numpy as np
+
+
+class CondensedMatrix:
+    """Symmetric matrix with a null diagonal stored as its condensed upper triangle.
+    The pairs (i, j) with i < j are stored row after row in a vector of size·(size - 1)/2 values, in the same order as
+    scipy.spatial.distance.squareform, which halves the memory of the full matrix. The rows and blocks of the full
+    matrix are read through views computed on demand.
+    The vector can be a numpy.memmap of a .npy file, created or reopened with the open method, so that matrices larger
+    than the memory are written by several processes and reused across runs.
+
+    ### Attributes:
+        - size (int): The number of rows of the full matrix.
+        - dtype (numpy.dtype): The type of the stored values.
+        - data (numpy.ndarray): The condensed upper triangle.
+        - shape (tuple): The shape of the full matrix.
+        - path (str): The path of the memory-mapped file, None if the matrix is in memory.
+    """
+
+    # Number of values of the blocks read at once from the condensed vector.
+    _BLOCK_VALUES: int = 1 << 21
+
+    def __init__(self,
+                 size: int,
+                 dtype: Union[type, np.dtype] = np.float64,
+                 data: Union[np.ndarray, None] = None) -> None:
+        """Constructor for the CondensedMatrix class.
+
+        ### Args:
+            - size (int): The number of rows of the full matrix.
+            - dtype (type, numpy.dtype, Optional): The type of the stored values. Defaults to float64.
+            - data (numpy.ndarray, Optional): The condensed upper triangle. Defaults to zeros.
+
+        ### Raises:
+            - ValueError: If size is negative or if data does not have size·(size - 1)/2 values.
+        """
+        if size < 0:
+            raise ValueError("Parameter size must be a positive integer.")
+        length = size * (size - 1) // 2
+        if data is None:
+            data = np.zeros(length, dtype=dtype)
+        elif data.ndim != 1 or len(data) != length:
+            raise ValueError(f"A condensed matrix of size {size} must have {length} values.")
+        self._size: int = size
+        self._data: np.ndarray = np.asanyarray(data, dtype=dtype)
+
+    @property
+    def size(self):
+        return self._size
+
+    @property
+    def dtype(self):
+        return self._data.dtype
+
+    @property
+    def data(self):
+        return self._data
+
+    @property
+    def shape(self) -> Tuple[int, int]:
+        return self._size, self._size
+
+    @property
+    def path(self):
+        return getattr(self._data, "filename", None)
+
+    def __len__(self) -> int:
+        """Returns the number of rows of the full matrix."""
+        return self._size
+
+    @staticmethod
+    def index(size: int, rows: Union[int, np.ndarray], cols: Union[int, np.ndarray]) -> Union[int, np.ndarray]:
+        """Returns the positions in the condensed vector of pairs of distinct rows and columns.
+
+        ### Args:
+            - size (int): The number of rows of the full matrix.
+            - rows (int, numpy.ndarray): The rows of the pairs.
+            - cols (int, numpy.ndarray): The columns of the pairs, different from the rows.
+
+        ### Returns:
+            - int, numpy.ndarray: The positions of the pairs.
+        """
+        first = np.minimum(rows, cols).astype(np.int64)
+        second = np.maximum(rows, cols).astype(np.int64)
+        return size * first - first * (first + 1) // 2 + second - first - 1
+
+    @staticmethod
+    def row_col(size: int, index: Union[int, np.ndarray]) -> Tuple[np.ndarray, np.ndarray]:
+        """Returns the pairs (row, col) with row < col stored at positions of the condensed vector.
+
+        ### Args:
+            - size (int): The number of rows of the full matrix.
+            - index (int, numpy.ndarray): The positions in the condensed vector.
+
+        ### Returns:
+            - numpy.ndarray: The rows of the pairs.
+            - numpy.ndarray: The columns of the pairs.
+        """
+        index = np.asarray(index, dtype=np.int64)
+        # Position of the first pair of each row, the row of a position is found with a binary search.
+        starts = CondensedMatrix.index(size, np.arange(size - 1), np.arange(1, size))
+        rows = np.searchsorted(starts, index, side="right") - 1
+        return rows, index - starts[rows] + rows + 1
+
+    def row_slice(self, row: int) -> slice:
+        """Returns the slice of the condensed vector containing the pairs (row, col) with row < col.
+
+        ### Args:
+            - row (int): The row.
+
+        ### Returns:
+            - slice: The slice of the pairs of the row.
+        """
+        start = row * self._size - row * (row + 1) // 2
+        return slice(start, start + self._size - row - 1)
+
+    def row(self, row: int, dtype: Union[type, np.dtype, None] = None) -> np.ndarray:
+        """Returns a row of the full matrix.
+
+        ### Args:
+            - row (int): The row.
+            - dtype (type, numpy.dtype, Optional): The type of the returned row. Defaults to the type of the values.
+
+        ### Returns:
+            - numpy.ndarray: The values of the row.
+        """
+        out = np.zeros(self._size, dtype=dtype or self.dtype)
+        out[:row] = self._data[self.index(self._size, np.arange(row), row)]
+        out[row + 1:] = self._data[self.row_slice(row)]
+        return out
+
+    def block(self, rows: np.ndarray, cols: np.ndarray) -> np.ndarray:
+        """Returns a block of the full matrix.
+
+        ### Args:
+            - rows (numpy.ndarray): The rows of the block.
+            - cols (numpy.ndarray): The columns of the block.
+
+        ### Returns:
+            - numpy.ndarray: The values of the block.
+        """
+        rows, cols = np.asarray(rows)[:, None], np.asarray(cols)[None, :]
+        if not len(self._data):
+            return np.zeros((rows.shape[0], cols.shape[1]), dtype=self.dtype)
+        # The index of a pair (i, i) is a valid position, whose value is replaced by 0.
+        out = self._data[self.index(self._size, rows, cols)]
+        out[rows == cols] = 0
+        return out
+
+    def set_block(self, rows: np.ndarray, cols: np.ndarray, values: np.ndarray) -> None:
+        """Writes a block of the full matrix. The values on the diagonal are ignored.
+
+        ### Args:
+            - rows (numpy.ndarray): The rows of the block.
+            - cols (numpy.ndarray): The columns of the block.
+            - values (numpy.ndarray): The values of the block.
+        """
+        rows, cols = np.asarray(rows)[:, None], np.asarray(cols)[None, :]
+        distinct = rows != cols
+        self._data[self.index(self._size, rows, cols)[distinct]] = np.asarray(values)[distinct]
+
+    def to_dense(self,
+                 dtype: Union[type, np.dtype, None] = None,
+                 out: Union[np.ndarray, None] = None) -> np.ndarray:
+        """Returns the full matrix. It is filled by blocks of rows whose upper part is copied row by row and whose lower
+        part is read column by column, each column being a contiguous range of the condensed vector, so that
+        memory-mapped matrices are read sequentially.
+
+        ### Args:
+            - dtype (type, numpy.dtype, Optional): The type of the full matrix. Defaults to the type of the values.
+            - out (numpy.ndarray, Optional): The square array in which the full matrix is written, for example a
+            numpy.memmap. Defaults to a new array.
+
+        ### Returns:
+            - numpy.ndarray: The full symmetric matrix.
+        """
+        if out is None:
+            out = np.zeros(self.shape, dtype=dtype or self.dtype)
+        if not len(self._data):
+            out[:] = 0
+            return out
+        # The value of a pair (col, row) with col < row is at offset[col] + row.
+        cols = np.arange(self._size, dtype=np.int64)
+        offset = self._size * cols - cols * (cols + 1) // 2 - cols - 1
+        step = max(1, self._BLOCK_VALUES // max(1, self._size))
+        for start in range(0, self._size, step):
+            rows = np.arange(start, min(start + step, self._size))
+            out[start:rows[-1] + 1, :rows[-1] + 1] = self._data[offset[:rows[-1] + 1, None] + rows[None, :]].T
+            for row in rows:
+                out[row, row] = 0
+                out[row, row + 1:] = self._data[self.row_slice(row)]
+        return out
+
+    @classmethod
+    def from_dense(cls, matrix: np.ndarray, dtype: Union[type, np.dtype, None] = None) -> "CondensedMatrix":
+        """Returns the condensed upper triangle of a square matrix.
+
+        ### Args:
+            - matrix (numpy.ndarray): The square matrix.
+            - dtype (type, numpy.dtype, Optional): The type of the stored values. Defaults to the type of the matrix.
+
+        ### Returns:
+            - CondensedMatrix: The condensed matrix.
+
+        ### Raises:
+            - ValueError: If the matrix is not square.
+        """
+        matrix = np.asarray(matrix)
+        if matrix.ndim != 2 or matrix.shape[0] != matrix.shape[1]:
+            raise ValueError("The matrix must be square.")
+        out = cls(matrix.shape[0], dtype=dtype or matrix.dtype)
+        for row in range(out.size - 1):
+            out.data[out.row_slice(row)] = matrix[row, row + 1:]
+        return out
+
+    @classmethod
+    def open(cls,
+             path: str,
+             size: Union[int, None] = None,
+             dtype: Union[type, np.dtype] = np.float64,
+             mode: str = "r+") -> "CondensedMatrix":
+        """Opens a condensed matrix memory-mapped to a .npy file. A missing file is created and filled with nan, which
+        marks the values not computed yet.
+
+        ### Args:
+            - path (str): The path of the .npy file.
+            - size (int, Optional): The number of rows of the full matrix. Required to create the file.
+            - dtype (type, numpy.dtype, Optional): The type of the values of a created file. Defaults to float64.
+            - mode (str, Optional): The mode of numpy.memmap, r to only read the values. Defaults to r+.
+
+        ### Returns:
+            - CondensedMatrix: The memory-mapped condensed matrix.
+
+        ### Raises:
+            - ValueError: If the file does not exist and cannot be created, or if it does not match size.
+        """
+        if not os.path.isfile(path):
+            if mode == "r" or size is None:
+                raise ValueError(f"The file {path} does not exist and cannot be created without its size.")
+            data = np.lib.format.open_memmap(path, mode="w+", dtype=dtype, shape=(size * (size - 1) // 2,))
+            data[:] = np.nan
+            data.flush()
+        data = np.lib.format.open_memmap(path, mode=mode)
+        # The number of rows is the positive root of size·(size - 1)/2 = len(data).
+        found = int(round((1 + np.sqrt(1 + 8 * len(data))) / 2)) if len(data) else (size or 0)
+        if data.ndim != 1 or found * (found - 1) // 2 != len(data) or (size is not None and size != found):
+            raise ValueError(f"The file {path} does not contain a condensed matrix of size {size}.")
+        return cls(found, dtype=data.dtype, data=data)
+
+    def flush(self) -> None:
+        """Writes the changes of a memory-mapped matrix to its file."""
+        if isinstance(self._data, np.memmap):
+            self._data.flush()
+
+    def __getitem__(self, key: Union[int, Tuple[int, int]]) -> Union[np.ndarray, float]:
+        """Returns a row of the full matrix, or the value of a pair.
+
+        ### Args:
+            - key (int, tuple): A row or a pair (row, col).
+
+        ### Returns:
+            - numpy.ndarray, float: The values of the row or the value of the pair.
+        """
+        if isinstance(key, tuple):
+            row, col = key
+            return self.dtype.type(0) if row == col else self._data[self.index(self._size, row, col)]
+        return self.row(key)
+
+    def __array__(self, dtype=None, copy=None) -> np.ndarray:
+        """Returns the full matrix, so that numpy functions accept condensed matrices."""
+        return self.to_dense(dtype)
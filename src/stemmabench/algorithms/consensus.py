@@ -0,0 +1,193 @@
+from typing import Dict, List, Tuple, Union
+import numpy as np
+from stemmabench.algorithms.compact_tree import CompactTree
+
+
+class Consensus:
+    """Counts the bipartitions of the leaves of many trees on the same leaves, and builds their consensus tree.
+    Each bipartition is a bitset of the leaves stored as a Python integer: bit i is set if leaf i is on the side of the
+    bipartition that does not contain leaf 0, so that a bipartition has the same bitset whatever the root of the tree.
+    The bitsets of a tree are computed in a single pass from its deepest nodes to its root, and counted in a dictionary.
+    The bipartitions separating at most one leaf from the others are in every tree and are not counted.
+
+    ### Attributes:
+        - leaves (list): The labels of the leaves of the trees.
+        - trees (int): The number of trees added.
+        - counts (dict): The number of trees containing each bipartition, with the bitsets as keys.
+    """
+
+    METHODS = ("majority", "strict")
+
+    def __init__(self, leaves: List[str]) -> None:
+        """Constructor for the Consensus class.
+
+        ### Args:
+            - leaves (list): The labels of the leaves of the trees.
+
+        ### Raises:
+            - ValueError: If the labels of the leaves are not unique.
+        """
+        if len(set(leaves)) != len(leaves):
+            raise ValueError("The labels of the leaves must be unique.")
+        self._leaves: List[str] = list(leaves)
+        self._index: Dict[str, int] = {leaf: i for i, leaf in enumerate(self._leaves)}
+        self._trees: int = 0
+        self._counts: Dict[int, int] = {}
+
+    @property
+    def leaves(self):
+        return self._leaves
+
+    @property
+    def trees(self):
+        return self._trees
+
+    @property
+    def counts(self):
+        return self._counts
+
+    def bitsets(self, edge_list: Union[List[List[str]], np.ndarray]) -> Dict[str, int]:
+        """Returns the bitset of the bipartition of the leaves of each edge of a tree.
+
+        ### Args:
+            - edge_list (list, numpy.ndarray): The edges of the tree, which must contain all the leaves.
+
+        ### Returns:
+            - dict: The bitset of each edge, with the edges as keys in the format "node_label1,node_label2".
+
+        ### Raises:
+            - ValueError: If the tree does not contain all the leaves.
+        """
+        return {edge: bitset for edge, bitset, _ in self._bitsets(edge_list)}
+
+    def _bitsets(self, edge_list: Union[List[List[str]], np.ndarray]) -> List[Tuple[str, int, int]]:
+        """Returns the bitset of the bipartition of each edge of a tree with its number of leaves.
+
+        ### Args:
+            - edge_list (list, numpy.ndarray): The edges of the tree, which must contain all the leaves.
+
+        ### Returns:
+            - list: The edge in the format "node_label1,node_label2", the bitset and its number of leaves for each edge.
+
+        ### Raises:
+            - ValueError: If the tree does not contain all the leaves.
+        """
+        labels, _, ids = CompactTree.intern(edge_list)
+        if sum(label in self._index for label in labels) != len(self._leaves):
+            raise ValueError("The tree does not contain all the leaves.")
+        if not len(ids):
+            return []
+        offsets, connected = CompactTree.csr(ids.ravel(), ids[:, ::-1].ravel(), len(labels))
+        offsets, connected = offsets.tolist(), connected.tolist()
+        parents = [-1] * len(labels)
+        parents[0] = 0
+        order = [0]
+        for node in order:
+            for neighbor in connected[offsets[node]:offsets[node + 1]]:
+                if parents[neighbor] < 0:
+                    parents[neighbor] = node
+                    order.append(neighbor)
+        below = [1 << self._index[label] if label in self._index else 0 for label in labels]
+        sizes = [int(label in self._index) for label in labels]
+        for node in reversed(order[1:]):
+            below[parents[node]] |= below[node]
+            sizes[parents[node]] += sizes[node]
+        full = (1 << len(self._leaves)) - 1
+        out = []
+        for parent, child in ids.tolist():
+            # The side of the edge below it in the breadth first order.
+            node = child if parents[child] == parent else parent
+            bitset, size = below[node], sizes[node]
+            if bitset & 1:
+                bitset, size = full ^ bitset, len(self._leaves) - size
+            out.append((f"{labels[parent]},{labels[child]}", bitset, size))
+        return out
+
+    def add(self, edge_list: Union[List[List[str]], np.ndarray]) -> None:
+        """Counts the bipartitions of a tree.
+
+        ### Args:
+            - edge_list (list, numpy.ndarray): The edges of the tree, which must contain all the leaves.
+        """
+        for bitset in {bitset for _, bitset, size in self._bitsets(edge_list) if 1 < size < len(self._leaves) - 1}:
+            self._counts[bitset] = self._counts.get(bitset, 0) + 1
+        self._trees += 1
+
+    def members(self, bitset: int) -> List[int]:
+        """Returns the leaves of a bipartition.
+
+        ### Args:
+            - bitset (int): The bitset of the bipartition.
+
+        ### Returns:
+            - list: The indices of the leaves whose bit is set.
+        """
+        data = np.frombuffer(bitset.to_bytes((len(self._leaves) + 7) // 8, "little"), dtype=np.uint8)
+        return np.flatnonzero(np.unpackbits(data, bitorder="little")).tolist()
+
+    def support(self, bitset: int) -> float:
+        """Returns the frequency of a bipartition in the trees. The bipartitions separating at most one leaf from the
+        others have a frequency of 1.
+
+        ### Args:
+            - bitset (int): The bitset of the bipartition.
+
+        ### Returns:
+            - float: The fraction of the trees containing the bipartition.
+        """
+        if not 1 < bin(bitset).count("1") < len(self._leaves) - 1:
+            return 1.0
+        return self._counts.get(bitset, 0) / self._trees if self._trees else 0.0
+
+    def supports(self, edge_list: Union[List[List[str]], np.ndarray]) -> Dict[str, float]:
+        """Returns the frequency in the counted trees of the bipartition of each edge of a tree.
+
+        ### Args:
+            - edge_list (list, numpy.ndarray): The edges of the tree, which must contain all the leaves.
+
+        ### Returns:
+            - dict: The support of each edge, with the edges as keys in the format "node_label1,node_label2".
+        """
+        return {edge: self.support(bitset) if 1 < size < len(self._leaves) - 1 else 1.0
+                for edge, bitset, size in self._bitsets(edge_list)}
+
+    def build(self, method: str = "majority") -> Tuple[Dict[str, float], List[List[str]]]:
+        """Builds the consensus tree of the counted trees. The majority-rule consensus keeps the bipartitions of more
+        than half of the trees, and the strict consensus the bipartitions of all the trees. The kept bipartitions are
+        compatible with each other: each one is a cluster of leaves not containing leaf 0, and its parent is the
+        smallest larger cluster containing one of its leaves. The tree is rooted at a new node N_0 joined to leaf 0.
+
+        ### Args:
+            - method (str, Optional): The consensus method: {majority, strict}. Defaults to majority.
+
+        ### Returns:
+            - dict: The support of each edge, with the edges as keys in the format "parent,child".
+            - list: The edges of the consensus tree, the new nodes being labeled N_1, N_2, ...
+
+        ### Raises:
+            - ValueError: If method is not supported or if no tree was added.
+        """
+        if method not in self.METHODS:
+            raise ValueError(f"Unknown method {method}. Supported methods are: {list(self.METHODS)}.")
+        if not self._trees:
+            raise ValueError("At least one tree must be added to build a consensus.")
+        kept = [bitset for bitset, count in self._counts.items()
+                if (count == self._trees if method == "strict" else 2 * count > self._trees)]
+        kept.sort(key=lambda bitset: -bin(bitset).count("1"))
+        labels = [f"N_{i + 1}" for i in range(len(kept))]
+        # The smallest cluster containing each leaf, -1 for the root.
+        current = [-1] * len(self._leaves)
+        supports: Dict[str, float] = {}
+        edges: List[List[str]] = []
+        for cluster, bitset in enumerate(kept):
+            members = self.members(bitset)
+            parent = labels[current[members[0]]] if current[members[0]] >= 0 else "N_0"
+            edges.append([parent, labels[cluster]])
+            supports[f"{parent},{labels[cluster]}"] = self._counts[bitset] / self._trees
+            for leaf in members:
+                current[leaf] = cluster
+        for leaf, label in enumerate(self._leaves):
+            parent = labels[current[leaf]] if current[leaf] >= 0 else "N_0"
+            edges.append([parent, label])
+            supports[f"{parent},{label}"] = 1.0
+        return supports, edges
@@ -0,0 +1,215 @@
+import functools
+import importlib
+import sys
+import types
+from numbers import Number
+from typing import Any, Callable, Dict, List, Union
+import numpy as np
+
+
+class Distance:
+    """Base class for the distances between manuscripts.
+    A distance can be called on 2 texts like a function and computes blocks of the distance matrix with the pairwise
+    method. Subclasses must override at least one of __call__ and pairwise: vectorized backends override pairwise to
+    fill a whole block with a few NumPy calls, scalar backends only override __call__.
+
+    Built-in distances are registered with the Distance.register decorator and can be selected by name.
+
+    ### Attributes:
+        - version (str): Version of the implementation, to be increased when a change modifies the returned distances.
+        - identity (str): String identifying the distance, its parameters and its version. Used as key by DistanceCache.
+        None if the distance cannot be identified across runs.
+    """
+
+    _registry: Dict[str, Callable[[], "Distance"]] = {}
+    # Modules registering the built-in distances, imported the first time a distance is selected by name.
+    _builtin_modules: List[str] = ["stemmabench.algorithms.levenshtein", "stemmabench.algorithms.minhash",
+                                   "stemmabench.algorithms.kmer", "stemmabench.algorithms.ncd",
+                                   "stemmabench.algorithms.word_levenshtein"]
+    version: str = "1"
+
+    def __call__(self, text1: str, text2: str) -> float:
+        """Returns the distance between two texts.
+
+        ### Args:
+            - text1 (str): The first text.
+            - text2 (str): The second text.
+
+        ### Returns:
+            - float: The distance between both texts.
+        """
+        return float(self.pairwise([text1], [text2])[0, 0])
+
+    def pairwise(self, texts1: List[str], texts2: Union[List[str], None] = None) -> np.ndarray:
+        """Returns the matrix of the distances between two lists of texts.
+
+        ### Args:
+            - texts1 (list): The texts of the rows of the matrix.
+            - texts2 (list, Optional): The texts of the columns of the matrix. If not specified the distances between
+            the texts of texts1 are computed and the matrix is symmetric with a null diagonal.
+
+        ### Returns:
+            - numpy.ndarray: Matrix with the distance between texts1[i] and texts2[j] at position [i, j].
+        """
+        if texts2 is None:
+            out = np.zeros((len(texts1), len(texts1)), dtype=float)
+            for row in range(len(texts1)):
+                for col in range(row + 1, len(texts1)):
+                    out[row, col] = self(texts1[row], texts1[col])
+            return out + out.T
+        out = np.zeros((len(texts1), len(texts2)), dtype=float)
+        for row, text1 in enumerate(texts1):
+            for col, text2 in enumerate(texts2):
+                out[row, col] = self(text1, text2)
+        return out
+
+    def prepare(self, texts: List[str]) -> None:
+        """Called once with all the texts before their distances are computed, in the calling process. Distances
+        precomputing a representation of each text override it, the default does nothing.
+
+        ### Args:
+            - texts (list): The texts whose distances will be computed.
+        """
+
+    @property
+    def identity(self) -> Union[str, None]:
+        description = self.describe(self)
+        return None if description is None else f"{description}:{self.version}"
+
+    @staticmethod
+    def describe(obj: Any) -> Union[str, None]:
+        """Returns a description of an object that is stable across runs: its qualified name followed by its attributes
+        of simple types. Functions are described by their qualified name, and bound methods by their name and the
+        description of the object they are bound to, so that the methods of two objects of different types or
+        parameters are different.
+
+        ### Args:
+            - obj (Any): The object to be described.
+
+        ### Returns:
+            - str: The description of the object, None for the lambdas, local functions and classes and
+            functools.partial objects, which cannot be told apart by their name.
+        """
+        if isinstance(obj, functools.partial):
+            return None
+        owner = getattr(obj, "__self__", None)
+        if owner is not None and not isinstance(owner, types.ModuleType) and hasattr(obj, "__name__"):
+            description = Distance.describe(owner)
+            return None if description is None else f"{description}.{obj.__name__}"
+        if hasattr(obj, "__qualname__"):
+            if "<lambda>" in obj.__qualname__ or "<locals>" in obj.__qualname__:
+                return None
+            return f"{getattr(obj, '__module__', '')}.{obj.__qualname__}"
+        if "<locals>" in type(obj).__qualname__:
+            return None
+        attributes = sorted((key, value) for key, value in getattr(obj, "__dict__", {}).items()
+                            if value is None or isinstance(value, (bool, int, float, str)))
+        return f"{type(obj).__module__}.{type(obj).__qualname__}{attributes}"
+
+    def is_similarity(self) -> bool:
+        """Checks on a small batch of texts that d(x,x) = 0 and d(x,y) = d(y,x).
+
+        ### Returns:
+            - bool: True if the distance respects both conditions.
+        """
+        texts = ["test", "test1", "test2"]
+        matrix = self.pairwise(texts, texts)
+        return bool((np.diag(matrix) == 0).all() and (matrix == matrix.T).all())
+
+    @classmethod
+    def register(cls, name: str) -> Callable:
+        """Class decorator registering a distance under a name. The class must be constructible without arguments.
+
+        ### Args:
+            - name (str): The name used to select the distance.
+
+        ### Returns:
+            - Callable: The decorator.
+        """
+        def decorator(distance_class):
+            cls._registry[name] = distance_class
+            return distance_class
+        return decorator
+
+    @classmethod
+    def names(cls) -> List[str]:
+        """Returns the names of the registered distances.
+
+        ### Returns:
+            - list: The names of the registered distances.
+        """
+        for module in cls._builtin_modules:
+            importlib.import_module(module)
+        return list(cls._registry)
+
+    @classmethod
+    def resolve(cls, distance: Union["Distance", Callable, str]) -> "Distance":
+        """Returns the Distance corresponding to the given parameter.
+
+        ### Args:
+            - distance (Distance, Callable, str): A Distance, a function that takes 2 strings as parameters and returns
+            the distance between them, or the name of a registered distance.
+
+        ### Returns:
+            - Distance: The distance itself, the registered distance or the function wrapped in a ScalarDistance.
+
+        ### Raises:
+            - ValueError: If distance is a name that is not registered.
+            - ValueError: If distance is not callable.
+        """
+        if isinstance(distance, Distance):
+            return distance
+        if isinstance(distance, str):
+            if distance not in cls.names():
+                raise ValueError(f"Unknown distance {distance}. Supported distances are: {cls.names()}.")
+            return cls._registry[distance]()
+        if not callable(distance):
+            raise ValueError("The distance parameter is not callable.")
+        return ScalarDistance(distance)
+
+
+class ScalarDistance(Distance):
+    """Distance wrapping a function that takes 2 strings as parameters and returns the distance between them.
+
+    ### Attributes:
+        - function (Callable): The wrapped distance function.
+    """
+
+    def __init__(self, function: Callable[[str, str], Number], identity: Union[str, None] = None) -> None:
+        """Constructor for the ScalarDistance class.
+
+        ### Args:
+            - function (Callable): A function that takes 2 strings as parameters and returns the distance between them.
+            - identity (str, Optional): The identity of the distance, required to cache the distances of a lambda, a
+            local function or a functools.partial. Defaults to the description of the function.
+        """
+        self._function: Callable[[str, str], Number] = function
+        self._identity: Union[str, None] = identity
+
+    @property
+    def function(self):
+        return self._function
+
+    @property
+    def identity(self) -> Union[str, None]:
+        if self._identity is not None:
+            return self._identity
+        description = self.describe(self._function)
+        if description is None:
+            return None
+        # The version of the package defining the function replaces the version of the wrapper.
+        package = sys.modules.get(str(getattr(self._function, "__module__", None) or
+                                      type(self._function).__module__).split(".")[0])
+        return f"{description}:{getattr(package, '__version__', '')}"
+
+    def __call__(self, text1: str, text2: str) -> float:
+        """Returns the distance between two texts computed by the wrapped function.
+
+        ### Args:
+            - text1 (str): The first text.
+            - text2 (str): The second text.
+
+        ### Returns:
+            - float: The distance between both texts.
+        """
+        return self._function(text1, text2)
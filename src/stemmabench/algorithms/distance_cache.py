@@ -0,0 +1,145 @@
+import hashlib
+import os
+from pathlib import Path
+from typing import Dict, List
+import numpy as np
+
+
+class DistanceCache:
+    """Persistent, content-addressed cache of the distances between texts.
+    The texts are identified by the first 8 bytes of the sha256 of their content, so that the cache stays valid when
+    manuscripts are renamed, added or removed. Each distance identity has its own append-only file of fixed size records
+    (fingerprint of text 1, fingerprint of text 2, distance) with fingerprint 1 <= fingerprint 2. The file is its own
+    index: it is loaded once as a sorted array in which the pairs are looked up with a binary search.
+
+    ### Attributes:
+        - folder (str): The folder containing the cache files.
+    """
+
+    RECORD: np.dtype = np.dtype([("text1", "<u8"), ("text2", "<u8"), ("value", "<f8")])
+
+    def __init__(self, folder: str) -> None:
+        """Constructor for the DistanceCache class.
+
+        ### Args:
+            - folder (str): The folder containing the cache files. Created if it does not exist.
+
+        ### Raises:
+            - RuntimeError: If was unable to create the folder.
+        """
+        if not os.path.isdir(folder):
+            try:
+                Path(folder).mkdir(parents=True, exist_ok=True)
+            except OSError:
+                raise RuntimeError(f"Was unable to create the directory {folder}.")
+        self._folder: str = folder
+        self._tables: Dict[str, np.ndarray] = {}
+
+    @property
+    def folder(self):
+        return self._folder
+
+    @staticmethod
+    def fingerprint(texts: List[str]) -> np.ndarray:
+        """Returns the content fingerprints of texts.
+
+        ### Args:
+            - texts (list): The texts.
+
+        ### Returns:
+            - numpy.ndarray: The first 8 bytes of the sha256 of each text as unsigned integers.
+        """
+        return np.array([int.from_bytes(hashlib.sha256(text.encode("utf-8")).digest()[:8], "little")
+                         for text in texts], dtype=np.uint64)
+
+    def path(self, identity: str) -> str:
+        """Returns the path of the cache file of a distance.
+
+        ### Args:
+            - identity (str): The identity of the distance.
+
+        ### Returns:
+            - str: The path of the cache file.
+        """
+        return os.path.join(self.folder, hashlib.sha256(identity.encode("utf-8")).hexdigest()[:32] + ".bin")
+
+    def _table(self, identity: str) -> np.ndarray:
+        """Returns the sorted records of a distance, loading them from disk the first time.
+        An incomplete trailing record, left by an interrupted write, is ignored.
+
+        ### Args:
+            - identity (str): The identity of the distance.
+
+        ### Returns:
+            - numpy.ndarray: The records sorted by pair of fingerprints.
+        """
+        if identity not in self._tables:
+            path = self.path(identity)
+            records = np.zeros(0, dtype=self.RECORD)
+            if os.path.isfile(path):
+                records = np.fromfile(path, dtype=self.RECORD, count=os.path.getsize(path) // self.RECORD.itemsize)
+            self._tables[identity] = np.sort(records, order=["text1", "text2"])
+        return self._tables[identity]
+
+    @classmethod
+    def _pairs(cls, keys1: np.ndarray, keys2: np.ndarray) -> np.ndarray:
+        """Returns the ordered pairs of fingerprints as records.
+
+        ### Args:
+            - keys1 (numpy.ndarray): The fingerprints of the first texts.
+            - keys2 (numpy.ndarray): The fingerprints of the second texts.
+
+        ### Returns:
+            - numpy.ndarray: Records with the smallest fingerprint of each pair in text1.
+        """
+        pairs = np.zeros(len(keys1), dtype=cls.RECORD)
+        pairs["text1"] = np.minimum(keys1, keys2)
+        pairs["text2"] = np.maximum(keys1, keys2)
+        return pairs
+
+    def __len__(self) -> int:
+        """Returns the number of distances in the files of the cache."""
+        return sum(os.path.getsize(os.path.join(self.folder, name)) // self.RECORD.itemsize
+                   for name in os.listdir(self.folder) if name.endswith(".bin"))
+
+    def lookup(self, identity: str, keys1: np.ndarray, keys2: np.ndarray) -> np.ndarray:
+        """Looks up the distances of pairs of texts.
+
+        ### Args:
+            - identity (str): The identity of the distance.
+            - keys1 (numpy.ndarray): The fingerprints of the first texts.
+            - keys2 (numpy.ndarray): The fingerprints of the second texts.
+
+        ### Returns:
+            - numpy.ndarray: The cached distances, nan for the pairs that are not in the cache.
+        """
+        out = np.full(len(keys1), np.nan)
+        table = self._table(identity)
+        if not len(table) or not len(keys1):
+            return out
+        pairs = self._pairs(keys1, keys2)[["text1", "text2"]]
+        keys = table[["text1", "text2"]]
+        position = np.minimum(np.searchsorted(keys, pairs), len(table) - 1)
+        found = (table["text1"][position] == pairs["text1"]) & (table["text2"][position] == pairs["text2"])
+        out[found] = table["value"][position[found]]
+        return out
+
+    def add(self, identity: str, keys1: np.ndarray, keys2: np.ndarray, values: np.ndarray) -> None:
+        """Appends distances to the cache file of a distance. The pairs must not be in the cache yet.
+
+        ### Args:
+            - identity (str): The identity of the distance.
+            - keys1 (numpy.ndarray): The fingerprints of the first texts.
+            - keys2 (numpy.ndarray): The fingerprints of the second texts.
+            - values (numpy.ndarray): The distances between the texts.
+        """
+        if not len(keys1):
+            return
+        table = self._table(identity)
+        records = self._pairs(keys1, keys2)
+        records["value"] = values
+        with open(self.path(identity), "ab") as file:
+            # Drops the incomplete record of an interrupted write so that the records stay aligned.
+            file.truncate(file.tell() - file.tell() % self.RECORD.itemsize)
+            records.tofile(file)
+        self._tables[identity] = np.sort(np.concatenate((table, records)), order=["text1", "text2"])
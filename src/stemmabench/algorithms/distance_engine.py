@@ -0,0 +1,424 @@
+import os
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from typing import Callable, List, Tuple, Union
+import numpy as np
+from stemmabench.algorithms.condensed_matrix import CondensedMatrix
+from stemmabench.algorithms.distance import Distance
+from stemmabench.algorithms.distance_cache import DistanceCache
+from stemmabench.algorithms.shared_corpus import SharedCorpus
+
+
+# Set in each worker process by _init_worker, the texts being read from the shared corpus of the main process.
+_WORKER_DISTANCE: Union[Distance, None] = None
+_WORKER_TEXTS: Union[SharedCorpus, List[str]] = []
+_WORKER_ORDER: Union[np.ndarray, None] = None
+_WORKER_OUT: Union[CondensedMatrix, None] = None
+
+
+def _init_worker(distance: Distance,
+                 corpus: str,
+                 order: Union[np.ndarray, None] = None,
+                 path: Union[str, None] = None) -> None:
+    """Initializer of the worker processes of the distance engine.
+
+    ### Args:
+        - distance (Distance): The distance.
+        - corpus (str): The name of the shared corpus of the texts of the manuscripts.
+        - order (numpy.ndarray, Optional): The row of the matrix of each text.
+        - path (str, Optional): The path of the memory-mapped matrix in which the tiles are written.
+    """
+    global _WORKER_DISTANCE, _WORKER_TEXTS, _WORKER_ORDER, _WORKER_OUT
+    _WORKER_DISTANCE = distance
+    _WORKER_TEXTS = SharedCorpus.attach(corpus)
+    _WORKER_ORDER = order
+    _WORKER_OUT = CondensedMatrix.open(path) if path else None
+
+
+def _compute_worker_tile(tile: Tuple[int, int, int, int]) -> Tuple[Tuple[int, int, int, int], Union[np.ndarray, None]]:
+    """Computes a tile of the distance matrix in a worker process. With a memory-mapped matrix the tile is written
+    directly into the matrix instead of being sent back to the main process.
+
+    ### Args:
+        - tile (tuple): The tile bounds (row_start, row_stop, col_start, col_stop).
+
+    ### Returns:
+        - tuple: The tile bounds.
+        - numpy.ndarray: The distances of the tile, None if they were written into the memory-mapped matrix.
+    """
+    block = DistanceEngine.compute_tile(_WORKER_DISTANCE, _WORKER_TEXTS, tile)
+    if _WORKER_OUT is None:
+        return tile, block
+    _WORKER_OUT.set_block(_WORKER_ORDER[tile[0]:tile[1]], _WORKER_ORDER[tile[2]:tile[3]], block)
+    return tile, None
+
+
+class DistanceEngine:
+    """Computes the distance matrix of a list of manuscripts.
+    The upper triangle of the matrix is split into square tiles that are computed serially or by a bounded pool of
+    worker processes, and written into a preallocated condensed matrix. The worker processes read the texts from a
+    SharedCorpus instead of receiving a copy each. Each tile is computed with a single call to the pairwise
+    method of the distance.
+    With a cache, only the pairs missing from the cache are computed: the texts are reordered so that a small set of
+    texts covering all the missing pairs comes first, and only the rows of these texts are computed.
+    The matrix can be memory-mapped to a file, in which the worker processes write their tiles directly. The file is
+    reused by the next runs on the same texts, which only compute the distances missing from it.
+
+    ### Attributes:
+        - distance (Distance): The distance used to compute the matrix.
+        - n_jobs (int): The number of worker processes. 1 computes the matrix in the calling process.
+        - tile_size (int): The number of rows and columns of each tile.
+        - progress (Callable): Function called after each tile with the number of pairs computed and the total number of pairs.
+        - cache (DistanceCache): The persistent cache of the computed distances.
+    """
+
+    def __init__(self,
+                 distance: Union[Distance, Callable, str],
+                 n_jobs: int = 1,
+                 tile_size: int = 64,
+                 progress: Union[Callable[[int, int], None], None] = None,
+                 cache: Union[DistanceCache, str, None] = None) -> None:
+        """Constructor for the DistanceEngine class.
+
+        ### Args:
+            - distance (Distance, Callable, str): A Distance, a function that takes 2 strings as parameters and returns
+            the distance between them or the name of a registered distance. Must be picklable if n_jobs is different than 1.
+            - n_jobs (int, Optional): The number of worker processes. -1 uses one process per CPU. Defaults to 1,
+            which computes the matrix in the calling process.
+            - tile_size (int, Optional): The number of rows and columns of each tile.
+            - progress (Callable, Optional): Function called after each tile with the number of pairs computed
+            and the total number of pairs.
+            - cache (DistanceCache, str, Optional): A DistanceCache or the path of its folder. If not specified all the
+            distances are computed.
+
+        ### Raises:
+            - ValueError: If n_jobs is 0 or lower than -1 or if tile_size is lower than 1.
+            - ValueError: If a cache is given for a distance without identity, such as a lambda.
+        """
+        if n_jobs == 0 or n_jobs < -1:
+            raise ValueError("Parameter n_jobs must be -1 or a positive integer.")
+        if tile_size < 1:
+            raise ValueError("Parameter tile_size must be a positive integer.")
+        self._distance: Distance = Distance.resolve(distance)
+        self._n_jobs: int = (os.cpu_count() or 1) if n_jobs == -1 else n_jobs
+        self._tile_size: int = tile_size
+        self._progress: Union[Callable[[int, int], None], None] = progress
+        if cache is not None and self._distance.identity is None:
+            raise ValueError("The distances of a lambda, a local function or a functools.partial cannot be cached. "
+                             "Wrap it in a ScalarDistance with an explicit identity.")
+        self._cache: Union[DistanceCache, None] = DistanceCache(cache) if isinstance(cache, str) else cache
+
+    @property
+    def distance(self):
+        return self._distance
+
+    @property
+    def n_jobs(self):
+        return self._n_jobs
+
+    @property
+    def tile_size(self):
+        return self._tile_size
+
+    @property
+    def progress(self):
+        return self._progress
+
+    @property
+    def cache(self):
+        return self._cache
+
+    def tiles(self, size: int, rows: Union[int, None] = None) -> List[Tuple[int, int, int, int]]:
+        """Splits the upper triangle of a size*size matrix into tiles.
+        The tiles are ordered from the largest to the smallest number of pairs so that the pool finishes evenly.
+
+        ### Args:
+            - size (int): The number of rows of the matrix.
+            - rows (int, Optional): Only the first rows of the upper triangle are split into tiles. Defaults to all rows.
+
+        ### Returns:
+            - list: The tiles bounds as tuples (row_start, row_stop, col_start, col_stop).
+        """
+        rows = size if rows is None else min(rows, size)
+        bounds = sorted(set(range(0, size, self.tile_size)) | {rows, size})
+        tiles = [(bounds[i], bounds[i + 1], bounds[j], bounds[j + 1])
+                 for i in range(len(bounds) - 1) if bounds[i] < rows for j in range(i, len(bounds) - 1)]
+        return sorted(tiles, key=lambda tile: -self.tile_pairs(tile))
+
+    @staticmethod
+    def tile_pairs(tile: Tuple[int, int, int, int]) -> int:
+        """Returns the number of pairs of the upper triangle covered by a tile.
+
+        ### Args:
+            - tile (tuple): The tile bounds (row_start, row_stop, col_start, col_stop).
+
+        ### Returns:
+            - int: The number of pairs (row, col) of the tile with row < col.
+        """
+        rows, cols = tile[1] - tile[0], tile[3] - tile[2]
+        if tile[0] == tile[2]:
+            return rows * (rows - 1) // 2
+        return rows * cols
+
+    @staticmethod
+    def compute_tile(distance: Distance,
+                     texts: Union[SharedCorpus, List[str]],
+                     tile: Tuple[int, int, int, int]) -> np.ndarray:
+        """Computes the distances of a tile. The tiles on the diagonal are computed as symmetric blocks.
+
+        ### Args:
+            - distance (Distance): The distance.
+            - texts (SharedCorpus, list): The texts of the manuscripts.
+            - tile (tuple): The tile bounds (row_start, row_stop, col_start, col_stop).
+
+        ### Returns:
+            - numpy.ndarray: The distances of the tile.
+        """
+        if tile[0] == tile[2]:
+            return distance.pairwise(texts[tile[0]:tile[1]])
+        return distance.pairwise(texts[tile[0]:tile[1]], texts[tile[2]:tile[3]])
+
+    def compute(self, texts: List[str]) -> np.ndarray:
+        """Computes the symmetric distance matrix of the given texts. The diagonal is set to 0.
+
+        ### Args:
+            - texts (list): The texts of the manuscripts, in the order of the rows of the matrix.
+
+        ### Returns:
+            - numpy.ndarray: The distance matrix.
+        """
+        return self.compute_condensed(texts).to_dense()
+
+    def compute_condensed(self,
+                          texts: List[str],
+                          dtype: Union[type, np.dtype] = np.float64,
+                          path: Union[str, None] = None) -> CondensedMatrix:
+        """Computes the distances between the given texts as the condensed upper triangle of the distance matrix, without
+        creating the full matrix.
+
+        ### Args:
+            - texts (list): The texts of the manuscripts, in the order of the rows of the matrix.
+            - dtype (type, numpy.dtype, Optional): The type of the stored distances. Defaults to float64.
+            - path (str, Optional): The path of a .npy file to which the matrix is memory-mapped. The worker processes
+            write their tiles directly into the file. If the file was created for the same texts and distance by a
+            previous or an interrupted run, only the distances missing from it are computed.
+
+        ### Returns:
+            - CondensedMatrix: The condensed distance matrix.
+        """
+        keys = DistanceCache.fingerprint(texts) if self.cache is not None or path else None
+        if path:
+            out = self.open_matrix(path, keys, dtype)
+        else:
+            out = CondensedMatrix(len(texts), dtype=dtype)
+            if self.cache is not None:
+                out.data[:] = np.nan
+        order = np.arange(len(texts))
+        rows = len(texts)
+        if self.cache is not None or path:
+            if self.cache is not None:
+                # The missing distances are looked up row by row in the cache and left as nan if not found.
+                for row in range(len(texts) - 1):
+                    values = out.data[out.row_slice(row)]
+                    missing = np.flatnonzero(np.isnan(values))
+                    if len(missing):
+                        values[missing] = self.cache.lookup(self.distance.identity, np.full(len(missing), keys[row]),
+                                                            keys[row + 1 + missing])
+                computed_rows, computed_cols, computed_values = [], [], []
+            missing = np.isnan(out.data)
+            if not missing.all():
+                cover = self.missing_cover(CondensedMatrix(len(texts), bool, missing))
+                order = np.concatenate((cover, np.setdiff1d(order, cover))).astype(np.int64)
+                rows = len(cover)
+            del missing
+        texts = [texts[i] for i in order]
+        tiles = self.tiles(len(texts), rows)
+        if tiles:
+            self.distance.prepare(texts)
+        total = sum(self.tile_pairs(tile) for tile in tiles)
+        done = 0
+        for tile, block in self._compute_tiles(texts, tiles, order, out.path):
+            row_ids, col_ids = order[tile[0]:tile[1]], order[tile[2]:tile[3]]
+            if block is not None:
+                out.set_block(row_ids, col_ids, block)
+            if self.cache is not None:
+                if block is None:
+                    block = out.block(row_ids, col_ids)
+                block_rows, block_cols = np.triu_indices(len(row_ids), k=1, m=len(col_ids)) if tile[0] == tile[2] \
+                    else np.indices(block.shape).reshape(2, -1)
+                computed_rows.append(row_ids[block_rows])
+                computed_cols.append(col_ids[block_cols])
+                computed_values.append(block[block_rows, block_cols])
+            done += self.tile_pairs(tile)
+            if self.progress:
+                self.progress(done, total)
+        out.flush()
+        if self.cache is not None and computed_values:
+            computed_rows, computed_cols = np.concatenate(computed_rows), np.concatenate(computed_cols)
+            self.cache.add(self.distance.identity, keys[computed_rows], keys[computed_cols],
+                           np.concatenate(computed_values))
+        return out
+
+    def compute_segments(self,
+                         segments: List[List[str]],
+                         dtype: Union[type, np.dtype] = np.float64) -> List[CondensedMatrix]:
+        """Computes one distance matrix per segment of aligned texts. The segments are stored one after the other in a
+        single corpus, and the tiles of all the matrices are computed by the same pool of worker processes, so that
+        short segments are computed in parallel with each other.
+        With a cache, only the pairs of each segment missing from the cache are computed: as in compute_condensed, the
+        texts of the segment are reordered so that a small set of texts covering its missing pairs comes first, and only
+        the rows of these texts are computed. The matrices whose distances are all found in the cache are not computed.
+
+        ### Args:
+            - segments (list): The texts of each segment, segments[s][i] being segment s of manuscript i.
+            - dtype (type, numpy.dtype, Optional): The type of the stored distances. Defaults to float64.
+
+        ### Returns:
+            - list: The condensed distance matrix of each segment.
+
+        ### Raises:
+            - ValueError: If the segments do not all have the same number of texts.
+        """
+        size = len(segments[0]) if segments else 0
+        if any(len(texts) != size for texts in segments):
+            raise ValueError("All the segments must have one text per manuscript.")
+        out = [CondensedMatrix(size, dtype=dtype) for _ in segments]
+        rows, cols = CondensedMatrix.row_col(size, np.arange(size * (size - 1) // 2))
+        computed, missing, orders, covered = [], [], [], []
+        for segment, texts in enumerate(segments):
+            order, rows_count = np.arange(size), size
+            if self.cache is not None:
+                keys = DistanceCache.fingerprint(texts)
+                # Segments are often identical in several manuscripts, their distance is 0 without a lookup.
+                values = np.zeros(len(rows))
+                different = np.flatnonzero(keys[rows] != keys[cols])
+                values[different] = self.cache.lookup(self.distance.identity, keys[rows[different]],
+                                                      keys[cols[different]])
+                out[segment].data[:] = values
+                if not np.isnan(values).any():
+                    continue
+                missing.append(np.isnan(values))
+                cover = self.missing_cover(CondensedMatrix(size, bool, missing[-1]))
+                order = np.concatenate((cover, np.setdiff1d(order, cover))).astype(np.int64)
+                rows_count = len(cover)
+            computed.append(segment)
+            orders.append(order)
+            covered.append(rows_count)
+        # The tiles of segment s address the texts of the corpus from s·size to (s + 1)·size, in the order of the
+        # segment.
+        texts = [segments[segment][i] for segment, order in zip(computed, orders) for i in order.tolist()]
+        tiles = sorted([(start + position * size, stop + position * size, col_start + position * size,
+                         col_stop + position * size)
+                        for position in range(len(computed))
+                        for start, stop, col_start, col_stop in self.tiles(size, covered[position])],
+                       key=lambda tile: -self.tile_pairs(tile))
+        if tiles:
+            self.distance.prepare(texts)
+        total = sum(self.tile_pairs(tile) for tile in tiles)
+        done = 0
+        for tile, block in self._compute_tiles(texts, tiles):
+            position = tile[0] // size
+            start = position * size
+            order = orders[position]
+            out[computed[position]].set_block(order[tile[0] - start:tile[1] - start],
+                                              order[tile[2] - start:tile[3] - start], block)
+            done += self.tile_pairs(tile)
+            if self.progress:
+                self.progress(done, total)
+        if self.cache is not None:
+            for segment, pairs in zip(computed, missing):
+                keys = DistanceCache.fingerprint(segments[segment])
+                # Each missing pair of texts is added once, even if it appears in several pairs of manuscripts.
+                _, first = np.unique(np.stack((np.minimum(keys[rows[pairs]], keys[cols[pairs]]),
+                                               np.maximum(keys[rows[pairs]], keys[cols[pairs]]))), axis=1,
+                                     return_index=True)
+                self.cache.add(self.distance.identity, keys[rows[pairs][first]], keys[cols[pairs][first]],
+                               out[segment].data[pairs][first])
+        return out
+
+    def open_matrix(self, path: str, keys: np.ndarray, dtype: Union[type, np.dtype] = np.float64) -> CondensedMatrix:
+        """Opens the memory-mapped distance matrix of texts. The fingerprints of the texts and the identity of the
+        distance are saved next to the matrix, in a .texts.npz file. The matrix is reopened if they match, otherwise
+        it is created again with all its distances missing.
+
+        ### Args:
+            - path (str): The path of the .npy file of the matrix.
+            - keys (numpy.ndarray): The fingerprints of the texts, in the order of the rows of the matrix.
+            - dtype (type, numpy.dtype, Optional): The type of the stored distances. Defaults to float64.
+
+        ### Returns:
+            - CondensedMatrix: The memory-mapped matrix, with nan for the distances not computed yet.
+        """
+        description = os.path.splitext(path)[0] + ".texts.npz"
+        if os.path.isfile(path) and os.path.isfile(description):
+            with np.load(description) as saved:
+                # A distance without identity never reuses a matrix, which could have been computed by another one.
+                same = self.distance.identity is not None and str(saved["identity"]) == self.distance.identity and \
+                    np.array_equal(saved["keys"], keys)
+            if same:
+                out = CondensedMatrix.open(path)
+                if out.dtype == np.dtype(dtype):
+                    return out
+                del out
+        for file in (description, path):
+            if os.path.isfile(file):
+                os.remove(file)
+        out = CondensedMatrix.open(path, len(keys), dtype)
+        np.savez(description, keys=keys, identity=np.array(self.distance.identity or ""))
+        return out
+
+    @staticmethod
+    def missing_cover(missing: Union[np.ndarray, CondensedMatrix]) -> np.ndarray:
+        """Greedily selects texts until every missing pair contains at least one selected text, always selecting the
+        text with the most remaining missing pairs. When texts are added to a cached tradition, the new texts are selected.
+
+        ### Args:
+            - missing (numpy.ndarray, CondensedMatrix): Symmetric boolean matrix indicating the missing pairs.
+
+        ### Returns:
+            - numpy.ndarray: The indices of the selected texts, in order of selection.
+        """
+        if not isinstance(missing, CondensedMatrix):
+            missing = CondensedMatrix.from_dense(np.asarray(missing, dtype=bool))
+        remaining = np.zeros(missing.size, dtype=np.int64)
+        for row in range(missing.size - 1):
+            values = missing.data[missing.row_slice(row)]
+            remaining[row] += values.sum()
+            remaining[row + 1:] += values
+        selected = np.zeros(missing.size, dtype=bool)
+        cover = []
+        while remaining.size and remaining.max() > 0:
+            text = int(remaining.argmax())
+            cover.append(text)
+            selected[text] = True
+            remaining -= missing.row(text) & ~selected
+            remaining[text] = 0
+        return np.array(cover, dtype=np.int64)
+
+    def _compute_tiles(self,
+                       texts: List[str],
+                       tiles: List[Tuple[int, int, int, int]],
+                       order: Union[np.ndarray, None] = None,
+                       path: Union[str, None] = None):
+        """Yields the computed tiles, in order of completion when a pool of worker processes is used.
+
+        ### Args:
+            - texts (list): The texts of the manuscripts.
+            - tiles (list): The tiles bounds.
+            - order (numpy.ndarray, Optional): The row of the matrix of each text, required with a path.
+            - path (str, Optional): The path of the memory-mapped distance matrix, in which the worker processes write
+            their tiles directly.
+
+        ### Yields:
+            - tuple: The tile bounds and the distances of the tile, None if they were written into the matrix.
+        """
+        if self.n_jobs == 1 or len(tiles) < 2:
+            for tile in tiles:
+                yield tile, self.compute_tile(self.distance, texts, tile)
+            return
+        with SharedCorpus(texts) as corpus, \
+                ProcessPoolExecutor(max_workers=min(self.n_jobs, len(tiles)),
+                                    initializer=_init_worker,
+                                    initargs=(self.distance, corpus.name, order, path)) as executor:
+            futures = [executor.submit(_compute_worker_tile, tile) for tile in tiles]
+            for future in as_completed(futures):
+                yield future.result()
@@ -0,0 +1,202 @@
+from typing import Dict, List, Tuple, Union
+import numpy as np
+from stemmabench.algorithms.distance import Distance
+from stemmabench.algorithms.distance_cache import DistanceCache
+from stemmabench.algorithms.minhash import MinHash
+
+
+@Distance.register("kmer")
+class KmerProfile(Distance):
+    """Alignment-free distance between the k-mer profiles of two texts.
+    The k-mers (sequences of k consecutive characters or words) of each text are hashed into width buckets, and the
+    profile of the text is the vector of the counts of its buckets. The distances between two blocks of n1 and n2
+    texts whose profiles use d buckets are computed as:
+    - cosine: 1 - u·v / (|u| |v|), with a single matrix product of the profiles of the blocks.
+    - braycurtis: 1 - 2 Σ min(u, v) / Σ (u + v). There is no matrix product for the sums of the minimums, which are
+      accumulated with np.minimum over chunks of max(1, 2^22 // (n1·n2)) columns. A block reads O(n1·n2·d) values,
+      but at most 2^22 of them are in memory at a time, whatever the counts of the profiles.
+    Only the buckets used by the texts of a block are kept as columns, so that the width only sets the rate of hash
+    collisions. The blocks contain at most block_size texts on each side.
+
+    ### Attributes:
+        - k (int): The number of characters or words of each k-mer.
+        - unit (str): The unit of the k-mers: {char, word}
+        - metric (str): The distance between the profiles: {cosine, braycurtis}
+        - width (int): The number of buckets of the profiles.
+        - block_size (int): The maximal number of texts on each side of a block.
+    """
+
+    UNITS = ("char", "word")
+    METRICS = ("cosine", "braycurtis")
+
+    def __init__(self,
+                 k: int = 3,
+                 unit: str = "char",
+                 metric: str = "cosine",
+                 width: int = 1 << 20,
+                 block_size: int = 256) -> None:
+        """Constructor for the KmerProfile class.
+
+        ### Args:
+            - k (int, Optional): The number of characters or words of each k-mer. Defaults to 3.
+            - unit (str, Optional): The unit of the k-mers: {char, word}. Defaults to char.
+            - metric (str, Optional): The distance between the profiles: {cosine, braycurtis}. Defaults to cosine.
+            - width (int, Optional): The number of buckets of the profiles. Defaults to 2^20.
+            - block_size (int, Optional): The maximal number of texts on each side of a block. Defaults to 256.
+
+        ### Raises:
+            - ValueError: If k, width or block_size is lower than 1, or if unit or metric is not supported.
+        """
+        if k < 1 or width < 1 or block_size < 1:
+            raise ValueError("Parameters k, width and block_size must be positive integers.")
+        if unit not in self.UNITS:
+            raise ValueError(f"Unknown unit {unit}. Supported units are: {list(self.UNITS)}.")
+        if metric not in self.METRICS:
+            raise ValueError(f"Unknown metric {metric}. Supported metrics are: {list(self.METRICS)}.")
+        self._k: int = k
+        self._unit: str = unit
+        self._metric: str = metric
+        self._width: int = width
+        self._block_size: int = block_size
+        self._profiles: Dict[int, Tuple[np.ndarray, np.ndarray]] = {}
+
+    @property
+    def k(self):
+        return self._k
+
+    @property
+    def unit(self):
+        return self._unit
+
+    @property
+    def metric(self):
+        return self._metric
+
+    @property
+    def width(self):
+        return self._width
+
+    @property
+    def block_size(self):
+        return self._block_size
+
+    @property
+    def identity(self) -> str:
+        # The block size does not change the distances and is not part of the identity.
+        attributes = [("k", self.k), ("metric", self.metric), ("unit", self.unit), ("width", self.width)]
+        return f"{type(self).__module__}.{type(self).__qualname__}{attributes}:{self.version}"
+
+    def profile(self, text: str) -> Tuple[np.ndarray, np.ndarray]:
+        """Returns the sparse k-mer profile of a text.
+
+        ### Args:
+            - text (str): The text.
+
+        ### Returns:
+            - numpy.ndarray: The sorted buckets used by the k-mers of the text.
+            - numpy.ndarray: The number of k-mers in each bucket.
+        """
+        buckets = MinHash.hash_shingles(text, self.k, self.unit) % np.uint64(self.width)
+        return np.unique(buckets.astype(np.int64), return_counts=True)
+
+    def profiles(self, texts: List[str]) -> List[Tuple[np.ndarray, np.ndarray]]:
+        """Returns the sparse profiles of texts, computing only the profiles that are not cached.
+
+        ### Args:
+            - texts (list): The texts.
+
+        ### Returns:
+            - list: The sorted buckets and the counts of each text.
+        """
+        keys = DistanceCache.fingerprint(texts)
+        for i, key in enumerate(keys):
+            if int(key) not in self._profiles:
+                self._profiles[int(key)] = self.profile(texts[i])
+        return [self._profiles[int(key)] for key in keys]
+
+    def prepare(self, texts: List[str]) -> None:
+        """Computes the profiles of the texts in the main process, so that the worker processes receive them.
+
+        ### Args:
+            - texts (list): The texts.
+        """
+        self.profiles(texts)
+
+    @staticmethod
+    def dense(profiles: List[Tuple[np.ndarray, np.ndarray]], columns: np.ndarray) -> np.ndarray:
+        """Returns the dense profiles of texts restricted to a set of buckets, with np.bincount.
+
+        ### Args:
+            - profiles (list): The sparse profiles of the texts.
+            - columns (numpy.ndarray): The sorted buckets kept as columns, containing all the buckets of the profiles.
+
+        ### Returns:
+            - numpy.ndarray: The counts of each text in each column.
+        """
+        out = np.zeros((len(profiles), len(columns)), dtype=np.float64)
+        for row, (buckets, counts) in enumerate(profiles):
+            out[row] = np.bincount(np.searchsorted(columns, buckets), weights=counts, minlength=len(columns))
+        return out
+
+    def _block(self,
+               profiles1: List[Tuple[np.ndarray, np.ndarray]],
+               profiles2: List[Tuple[np.ndarray, np.ndarray]]) -> np.ndarray:
+        """Returns the distances between two blocks of profiles.
+        The cosine distances cost one matrix product. The Bray-Curtis distances cost O(n1·n2·d) operations for n1 rows,
+        n2 columns and d buckets, over chunks of columns holding at most 2^22 minimums.
+
+        ### Args:
+            - profiles1 (list): The sparse profiles of the rows.
+            - profiles2 (list): The sparse profiles of the columns.
+
+        ### Returns:
+            - numpy.ndarray: The distances between the profiles.
+        """
+        columns = np.unique(np.concatenate([buckets for buckets, _ in profiles1 + profiles2] + [np.zeros(0, np.int64)]))
+        dense1, dense2 = self.dense(profiles1, columns), self.dense(profiles2, columns)
+        if self.metric == "cosine":
+            norms1, norms2 = np.linalg.norm(dense1, axis=1), np.linalg.norm(dense2, axis=1)
+            products = dense1 @ dense2.T
+            with np.errstate(divide="ignore", invalid="ignore"):
+                out = 1 - products / (norms1[:, None] * norms2[None, :])
+            # The rounding removes the errors of the floating point products on identical profiles.
+            out = np.clip(out, 0, 1).round(12)
+            empty = (norms1[:, None] == 0) | (norms2[None, :] == 0)
+            out[empty] = ((norms1[:, None] == 0) != (norms2[None, :] == 0))[empty]
+            return out
+        # The minimums of all the pairs of the block are computed on a chunk of columns at a time, with at most
+        # 2^22 values (32 MiB of float64) in memory.
+        chunk = max(1, (1 << 22) // max(1, len(profiles1) * len(profiles2)))
+        minimums = np.zeros((len(profiles1), len(profiles2)), dtype=np.float64)
+        for start in range(0, len(columns), chunk):
+            minimums += np.minimum(dense1[:, None, start:start + chunk], dense2[None, :, start:start + chunk]).sum(axis=2)
+        totals = dense1.sum(axis=1)[:, None] + dense2.sum(axis=1)[None, :]
+        with np.errstate(divide="ignore", invalid="ignore"):
+            out = 1 - 2 * minimums / totals
+        out[totals == 0] = 0
+        return out
+
+    def pairwise(self, texts1: List[str], texts2: Union[List[str], None] = None) -> np.ndarray:
+        """Returns the matrix of the distances between the profiles of two lists of texts, computed by blocks.
+
+        ### Args:
+            - texts1 (list): The texts of the rows of the matrix.
+            - texts2 (list, Optional): The texts of the columns of the matrix. If not specified the distances between
+            the texts of texts1 are computed.
+
+        ### Returns:
+            - numpy.ndarray: Matrix with the distance between texts1[i] and texts2[j] at position [i, j].
+        """
+        symmetric = texts2 is None
+        profiles1 = self.profiles(texts1)
+        profiles2 = profiles1 if symmetric else self.profiles(texts2)
+        out = np.zeros((len(profiles1), len(profiles2)), dtype=np.float64)
+        for row in range(0, len(profiles1), self.block_size):
+            for col in range(row if symmetric else 0, len(profiles2), self.block_size):
+                out[row:row + self.block_size, col:col + self.block_size] = \
+                    self._block(profiles1[row:row + self.block_size], profiles2[col:col + self.block_size])
+        if symmetric:
+            # Only the upper triangle is computed, and mirrored so that the matrix is exactly symmetric.
+            out = np.triu(out, k=1)
+            out += out.T
+        return out
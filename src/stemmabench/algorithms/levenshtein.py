@@ -0,0 +1,189 @@
+from typing import Dict, Union
+import numpy as np
+from stemmabench.algorithms.distance import Distance
+
+
+@Distance.register("levenshtein")
+class Levenshtein(Distance):
+    """Fast implementations of the Levenshtein (edit) distance between two texts.
+    The distance is the minimal number of character insertions, deletions and substitutions needed to transform one
+    text into the other. All the methods return the same values as textdistance.levenshtein.
+
+    - bit_parallel: Myers/Hyyrö bit-parallel algorithm in O(⌈m/w⌉·n). The bit vectors of the columns of the dynamic
+      programming matrix are stored as Python integers, whose arithmetic runs over arrays of machine words in C.
+    - banded: Dynamic programming restricted to the diagonals |i - j| <= max_distance, each row being computed with
+      NumPy in O(max_distance).
+
+    Both methods accept a max_distance after which they stop and return max_distance + 1.
+
+    ### Attributes:
+        - max_distance (int): The distance after which the computation stops, None to always compute the exact distance.
+    """
+
+    # Large value used for the cells outside of the band.
+    _INFINITY: int = 1 << 40
+
+    def __init__(self, max_distance: Union[int, None] = None) -> None:
+        """Constructor for the Levenshtein class.
+
+        ### Args:
+            - max_distance (int, Optional): If specified, the distances greater than max_distance are returned as
+            max_distance + 1.
+        """
+        self._max_distance: Union[int, None] = max_distance
+
+    @property
+    def max_distance(self):
+        return self._max_distance
+
+    def __call__(self, text1: str, text2: str) -> int:
+        """Returns the Levenshtein distance between two texts.
+
+        ### Args:
+            - text1 (str): The first text.
+            - text2 (str): The second text.
+
+        ### Returns:
+            - int: The distance between both texts, or max_distance + 1 if it is greater than max_distance.
+        """
+        return self.distance(text1, text2, self.max_distance)
+
+    @staticmethod
+    def distance(text1: str, text2: str, max_distance: Union[int, None] = None) -> int:
+        """Returns the Levenshtein distance between two texts. The common prefix and suffix of the texts are removed
+        before running the bit-parallel algorithm with the longest text as pattern.
+
+        ### Args:
+            - text1 (str): The first text.
+            - text2 (str): The second text.
+            - max_distance (int, Optional): If specified, the computation stops as soon as the distance is known to be
+            greater than max_distance.
+
+        ### Returns:
+            - int: The distance between both texts, or max_distance + 1 if it is greater than max_distance.
+        """
+        prefix = Levenshtein.common_prefix_length(text1, text2)
+        text1, text2 = text1[prefix:], text2[prefix:]
+        suffix = Levenshtein.common_prefix_length(text1[::-1], text2[::-1])
+        text1, text2 = text1[:len(text1) - suffix], text2[:len(text2) - suffix]
+        if len(text1) < len(text2):
+            text1, text2 = text2, text1
+        if max_distance is not None and len(text1) - len(text2) > max_distance:
+            return max_distance + 1
+        return Levenshtein.bit_parallel(text1, text2, max_distance)
+
+    @staticmethod
+    def common_prefix_length(text1: str, text2: str) -> int:
+        """Returns the length of the common prefix of two texts with a binary search on slice comparisons.
+
+        ### Args:
+            - text1 (str): The first text.
+            - text2 (str): The second text.
+
+        ### Returns:
+            - int: The length of the longest common prefix.
+        """
+        low, high = 0, min(len(text1), len(text2))
+        while low < high:
+            middle = (low + high + 1) // 2
+            if text1[low:middle] == text2[low:middle]:
+                low = middle
+            else:
+                high = middle - 1
+        return low
+
+    @staticmethod
+    def bit_parallel(pattern: str, text: str, max_distance: Union[int, None] = None) -> int:
+        """Myers/Hyyrö bit-parallel Levenshtein distance.
+        Bit i of the vertical delta vectors pv and mv indicates if D[i+1][j] - D[i][j] is +1 or -1, and the last row of
+        the matrix is tracked in score. Each character of text updates all the cells of the column at once.
+
+        ### Args:
+            - pattern (str): The first text, stored in the bit vectors. Best as the longest of both texts.
+            - text (str): The second text, read one character at a time.
+            - max_distance (int, Optional): If specified, returns max_distance + 1 as soon as the distance is known to be
+            greater than max_distance.
+
+        ### Returns:
+            - int: The distance between both texts, or max_distance + 1 if it is greater than max_distance.
+        """
+        length = len(pattern)
+        if max_distance is not None and abs(length - len(text)) > max_distance:
+            return max_distance + 1
+        if not length:
+            return len(text)
+        peq: Dict[str, int] = {}
+        for position, character in enumerate(pattern):
+            peq[character] = peq.get(character, 0) | (1 << position)
+        mask = (1 << length) - 1
+        last = 1 << (length - 1)
+        pv, mv = mask, 0
+        score = length
+        remaining = len(text)
+        for character in text:
+            eq = peq.get(character, 0)
+            xv = eq | mv
+            xh = (((eq & pv) + pv) ^ pv) | eq
+            ph = mv | ~(xh | pv)
+            mh = pv & xh
+            if ph & last:
+                score += 1
+            elif mh & last:
+                score -= 1
+            ph = (ph << 1) | 1
+            mh <<= 1
+            pv = (mh | ~(xv | ph)) & mask
+            mv = ph & xv & mask
+            remaining -= 1
+            # Each remaining character can lower the score by at most 1.
+            if max_distance is not None and score - remaining > max_distance:
+                return max_distance + 1
+        return score
+
+    @staticmethod
+    def banded(text1: str, text2: str, max_distance: int) -> int:
+        """Levenshtein distance computed on the band of diagonals |i - j| <= max_distance of the dynamic programming
+        matrix. Row i of the band is stored as the cells D[i][i - max_distance:i + max_distance + 1]. The insertions
+        within a row are resolved with the running minimum min_l(T[l] + j - l) = min.accumulate(T - j) + j.
+
+        ### Args:
+            - text1 (str): The first text.
+            - text2 (str): The second text.
+            - max_distance (int): The width of the band on each side of the diagonal.
+
+        ### Returns:
+            - int: The distance between both texts, or max_distance + 1 if it is greater than max_distance.
+
+        ### Raises:
+            - ValueError: If max_distance is negative.
+        """
+        if max_distance < 0:
+            raise ValueError("Parameter max_distance must be positive.")
+        rows, columns = len(text1), len(text2)
+        if abs(rows - columns) > max_distance:
+            return max_distance + 1
+        if not rows or not columns:
+            return max(rows, columns)
+        width = 2 * max_distance + 1
+        offsets = np.arange(width, dtype=np.int64)
+        codes1 = np.frombuffer(text1.encode("utf-32-le"), dtype=np.uint32).astype(np.int64)
+        # Padding with -1 so that the band can be sliced without bound checks.
+        codes2 = np.concatenate((np.full(max_distance + 1, -1, dtype=np.int64),
+                                 np.frombuffer(text2.encode("utf-32-le"), dtype=np.uint32).astype(np.int64),
+                                 np.full(width, -1, dtype=np.int64)))
+        previous = offsets - max_distance
+        previous[(previous < 0) | (previous > columns)] = Levenshtein._INFINITY
+        for row in range(1, rows + 1):
+            # Column of each cell of the band: j = row - max_distance + offset.
+            column = offsets + (row - max_distance)
+            substitution = previous + (codes2[row:row + width] != codes1[row - 1])
+            deletion = np.append(previous[1:], Levenshtein._INFINITY) + 1
+            current = np.minimum(substitution, deletion)
+            current[(column < 0) | (column > columns)] = Levenshtein._INFINITY
+            if row <= max_distance:
+                current[max_distance - row] = row
+            current = np.minimum.accumulate(current - offsets) + offsets
+            if current.min() > max_distance:
+                return max_distance + 1
+            previous = current
+        return int(min(previous[columns - rows + max_distance], max_distance + 1))
@@ -9,6 +9,8 @@ class ManuscriptInTreeBase:
         - parent (ManuscriptBase): The parent of the manuscript. If it is none it is the root of the stemma tree.
         - children (list): The list of the manuscripts children. If it is empty the manuscript is a leaf node of the tree.
         - edges (list): The list of all the edges conected to the tree. Is in the same order as the children list.
+        - supports (list): The bootstrap support of the edges to the children, in the same order as the children list.
+        Empty if the stemma was not bootstrapped.
     """
 
     def __init__(self,
@@ -36,6 +38,7 @@ class ManuscriptInTreeBase:
             raise ValueError("Parameter label must be a string.")
         self._label: str = label
         self._edges: List[float] = edges
+        self._supports: List[float] = []
         if not parent or isinstance(parent, ManuscriptInTreeBase):
             self._parent: Union[ManuscriptInTreeBase, None] = parent
         else:
@@ -62,6 +65,10 @@ class ManuscriptInTreeBase:
     def edges(self):
         return self._edges
 
+    @property
+    def supports(self):
+        return self._supports
+
     def __repr__(self) -> str:
         """String representation of the Manuscript.
 
@@ -79,21 +86,19 @@ class ManuscriptInTreeBase:
         ### Resturns:
             - dict: Dictionary representation of Manuscript and all of its children.
         """
-        if include_edges:
-            if len(self.children) == 0:
-                return {self.label: {}}
-            else:
-                return {"label": self.label,
-                        "edges": {child.label: edge for edge, child in zip(self.edges, self.children)},
-                        "children": {child.label: child.dict() for child in self.children}}
-        else:
-            if not self.children or len(self.children) == 0:
-                return {self.label: {}}
-            else:
-                out = {}
-                for child in self.children:
-                    out.update(child.dict())
-                return {self.label: out}
+        if include_edges and len(self.children) > 0:
+            return {"label": self.label,
+                    "edges": {child.label: edge for edge, child in zip(self.edges, self.children)},
+                    "children": {child.label: child.dict() for child in self.children}}
+        out: Dict[str, Any] = {self.label: {}}
+        stack = [(self, out[self.label])]
+        while stack:
+            node, node_dict = stack.pop()
+            for child in node.children:
+                node_dict[child.label] = {}
+                if child.children:
+                    stack.append((child, node_dict[child.label]))
+        return out
 
     def build_text_lookup(self) -> Dict[str, "ManuscriptInTreeBase"]:
         """Used to instantiate the stemmas lookup attribute.
@@ -101,10 +106,13 @@ class ManuscriptInTreeBase:
         ### Returns:
             dict: Dictionary of its self and all its decendents. With its label as key and its self as value.
         """
-        out = {self.label: self}
-        if self.children:
-            for c in self.children:
-                out.update(c.build_text_lookup())
+        out = {}
+        stack = [self]
+        while stack:
+            node = stack.pop()
+            out[node.label] = node
+            if node.children:
+                stack.extend(reversed(node.children))
         return out
 
     def set_edges(self, edge_dict: Dict[str, Union[float, int]]) -> None:
@@ -114,11 +122,84 @@ class ManuscriptInTreeBase:
             - edge_dict (dict): The dictionary used to set the edges with the edges as keys and the edge distances as values.
             The format of the keys is: "node_label1,node_label2".
         """
-        if len(self.edges) > 0:
-            self._edges = []
+        stack = [self]
+        while stack:
+            node = stack.pop()
+            node._edges = node._edge_values(edge_dict)
+            stack.extend(reversed(node.children))
+
+    def set_supports(self, support_dict: Dict[str, float]) -> None:
+        """Sets the bootstrap supports of the edges of the current manuscript and of all its descendants.
+
+        ### Args:
+            - support_dict (dict): The dictionary with the edges as keys and the frequencies of their bipartitions in the
+            bootstrap trees as values. The format of the keys is: "node_label1,node_label2".
+        """
+        stack = [self]
+        while stack:
+            node = stack.pop()
+            node._supports = node._edge_values(support_dict)
+            stack.extend(reversed(node.children))
+
+    def _edge_values(self, edge_dict: Dict[str, Union[float, int]]) -> List[Union[float, int]]:
+        """Returns the values of the edges to the children of the current manuscript.
+
+        ### Args:
+            - edge_dict (dict): The dictionary with the edges as keys in the format "node_label1,node_label2", in either
+            direction.
+
+        ### Returns:
+            - list: The values of the edges, in the same order as the children list.
+        """
+        values = []
         for child in self.children:
             if edge_dict.get(f"{self.label},{child.label}") != None:
-                self._edges.append(edge_dict[f"{self.label},{child.label}"])
+                values.append(edge_dict[f"{self.label},{child.label}"])
             else:
-                self._edges.append(edge_dict[f"{child.label},{self.label}"])
-            child.set_edges(edge_dict=edge_dict)
+                values.append(edge_dict[f"{child.label},{self.label}"])
+        return values
+
+    def reroot(self, label: str) -> "ManuscriptInTreeBase":
+        """Reroots in place the tree whose root is the calling manuscript.
+        The parent and child relations are reversed on the path between the calling manuscript and the new root,
+        the edge lengths follow their edges.
+
+        ### Args:
+            - label (str): The label of the manuscript the tree is to be rerooted to.
+
+        ### Returns:
+            - ManuscriptInTreeBase: The new root of the tree.
+
+        ### Raises:
+            - ValueError: If label is not the label of the calling manuscript or of one of its descendants.
+        """
+        came_from: Dict[int, "ManuscriptInTreeBase"] = {}
+        new_root = None
+        stack = [self]
+        while stack:
+            node = stack.pop()
+            if node.label == label:
+                new_root = node
+                break
+            for child in node.children:
+                came_from[id(child)] = node
+                stack.append(child)
+        if new_root is None:
+            raise ValueError(f"Parameter label: {label} is not present in the tree.")
+        path = [new_root]
+        while path[-1] is not self:
+            path.append(came_from[id(path[-1])])
+        for child, parent in zip(reversed(path[:-1]), reversed(path[1:])):
+            position = next(i for i, node in enumerate(parent.children) if node is child)
+            has_edges = len(parent.edges) == len(parent.children) and len(child.edges) == len(child.children)
+            if has_edges:
+                child._edges = child.edges + [parent.edges[position]]
+                parent._edges = parent.edges[:position] + parent.edges[position + 1:]
+            if len(parent.supports) == len(parent.children) and len(child.supports) == len(child.children):
+                child._supports = child.supports + [parent.supports[position]]
+                parent._supports = parent.supports[:position] + parent.supports[position + 1:]
+            parent._children = parent.children[:position] + parent.children[position + 1:]
+            child._children = child.children + [parent]
+            parent._parent = child
+        new_root._parent = None
+        return new_root
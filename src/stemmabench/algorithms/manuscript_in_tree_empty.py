@@ -42,6 +42,7 @@ class ManuscriptInTreeEmpty(ManuscriptInTreeBase):
             self._parent: Union[ManuscriptInTreeBase, None] = parent
             self._children: List[ManuscriptInTreeBase] = []
             self._edges: List[float] = edges
+            self._supports: List[float] = []
             self._label: Union[str, None] = list(recursive.keys())[0]
             self.recursive_init(recursive, text_list)
         elif label:
@@ -53,8 +54,8 @@ class ManuscriptInTreeEmpty(ManuscriptInTreeBase):
     def recursive_init(self,
                        recursive: Dict[str, dict],
                        text_list: List[str]) -> None:
-        """When building tree from a dictionary will add all the children for the current manuscript and propagate
-        instantiation to the children.
+        """When building tree from a dictionary will add all the descendants of the current manuscript.
+        The descendants are instantiated with an explicit stack so that deep trees do not hit the recursion limit.
 
         ### Args:
             - recursive (dict): Dictionary representation of the current Manuscript and all its decendents. If different than None will build all the children of the manuscript
@@ -64,13 +65,18 @@ class ManuscriptInTreeEmpty(ManuscriptInTreeBase):
         """
         if not recursive.get(self.label):
             return None
-        for lab in recursive[self.label].keys():
-            if lab in text_list:
-                self._children.append(man.ManuscriptInTree(parent=self, recursive={
-                                      lab: recursive[self._label][lab]}, text_list=text_list))
-            else:
-                self._children.append(ManuscriptInTreeEmpty(parent=self, recursive={
-                                      lab: recursive[self._label][lab]}, text_list=text_list))
+        texts = set(text_list)
+        stack = [(self, recursive[self.label])]
+        while stack:
+            node, descendants = stack.pop()
+            for lab in descendants.keys():
+                if lab in texts:
+                    child = man.ManuscriptInTree(parent=node, label=lab, children=[], edges=[])
+                else:
+                    child = ManuscriptInTreeEmpty(parent=node, label=lab, children=[], edges=[])
+                node._children.append(child)
+                if descendants[lab]:
+                    stack.append((child, descendants[lab]))
 
     def __eq__(self, value: object) -> bool:
         """Returns True if both texts have the same content and the same label.
@@ -0,0 +1,306 @@
+import hashlib
+import os
+from pathlib import Path
+from typing import Dict, List, Union
+import numpy as np
+from stemmabench.algorithms.distance import Distance
+from stemmabench.algorithms.distance_cache import DistanceCache
+
+
+@Distance.register("minhash")
+class MinHash(Distance):
+    """Approximate Jaccard distance between the sets of shingles of two texts, estimated with MinHash signatures.
+    The shingles are the sequences of shingle_size consecutive characters or words of a text, hashed to 64 bits with a
+    rolling polynomial hash. The signature of a text is the minimum of num_perm random hash functions over its
+    shingles, and the Jaccard similarity of two texts is estimated by the fraction of equal values of their signatures.
+    The distance is 1 minus this estimate, with a standard error of at most 0.5/sqrt(num_perm).
+
+    The signatures are cached per text, so that each text is sketched once. With a store folder, the signatures
+    computed by prepare are also kept on disk for the next runs, so that a new text only costs one sketch.
+    Locality sensitive hashing (candidates) finds the pairs of texts likely to be similar without comparing all the
+    signatures.
+
+    ### Attributes:
+        - num_perm (int): The number of hash functions of the signatures.
+        - shingle_size (int): The number of characters or words of each shingle.
+        - unit (str): The unit of the shingles: {char, word}
+        - seed (int): The seed of the random hash functions.
+        - store (str): The folder in which the signatures are stored, None to keep them in memory only.
+    """
+
+    UNITS = ("char", "word")
+
+    # Number of values of the blocks of (shingle, hash function) pairs computed at once.
+    _BLOCK_VALUES: int = 1 << 20
+
+    def __init__(self,
+                 num_perm: int = 128,
+                 shingle_size: Union[int, None] = None,
+                 unit: str = "char",
+                 seed: int = 1,
+                 store: Union[str, None] = None) -> None:
+        """Constructor for the MinHash class.
+
+        ### Args:
+            - num_perm (int, Optional): The number of hash functions of the signatures. Defaults to 128.
+            - shingle_size (int, Optional): The number of characters or words of each shingle. Defaults to 5 characters
+            or 2 words.
+            - unit (str, Optional): The unit of the shingles: {char, word}. Defaults to char.
+            - seed (int, Optional): The seed of the random hash functions. Defaults to 1.
+            - store (str, Optional): A folder in which the signatures are stored and reused across runs.
+
+        ### Raises:
+            - ValueError: If num_perm or shingle_size is lower than 1 or if unit is not supported.
+            - RuntimeError: If was unable to create the store folder.
+        """
+        if num_perm < 1:
+            raise ValueError("Parameter num_perm must be a positive integer.")
+        if unit not in self.UNITS:
+            raise ValueError(f"Unknown unit {unit}. Supported units are: {list(self.UNITS)}.")
+        if shingle_size is not None and shingle_size < 1:
+            raise ValueError("Parameter shingle_size must be a positive integer.")
+        if store is not None and not os.path.isdir(store):
+            try:
+                Path(store).mkdir(parents=True, exist_ok=True)
+            except OSError:
+                raise RuntimeError(f"Was unable to create the directory {store}.")
+        self._num_perm: int = num_perm
+        self._shingle_size: int = shingle_size or (5 if unit == "char" else 2)
+        self._unit: str = unit
+        self._seed: int = seed
+        self._store: Union[str, None] = store
+        generator = np.random.default_rng(seed)
+        self._multipliers: np.ndarray = generator.integers(0, 2 ** 63, num_perm, dtype=np.uint64) * np.uint64(2) + \
+            np.uint64(1)
+        self._increments: np.ndarray = generator.integers(0, 2 ** 63, num_perm, dtype=np.uint64)
+        self._signatures: Dict[int, np.ndarray] = {}
+
+    @property
+    def num_perm(self):
+        return self._num_perm
+
+    @property
+    def shingle_size(self):
+        return self._shingle_size
+
+    @property
+    def unit(self):
+        return self._unit
+
+    @property
+    def seed(self):
+        return self._seed
+
+    @property
+    def store(self):
+        return self._store
+
+    @property
+    def identity(self) -> str:
+        # The store folder does not change the distances and is not part of the identity.
+        attributes = [("num_perm", self.num_perm), ("seed", self.seed), ("shingle_size", self.shingle_size),
+                      ("unit", self.unit)]
+        return f"{type(self).__module__}.{type(self).__qualname__}{attributes}:{self.version}"
+
+    @staticmethod
+    def mix(values: np.ndarray) -> np.ndarray:
+        """Mixes the bits of 64 bits values with the finalizer of splitmix64.
+
+        ### Args:
+            - values (numpy.ndarray): The values, as unsigned 64 bits integers.
+
+        ### Returns:
+            - numpy.ndarray: The mixed values.
+        """
+        values = values ^ (values >> np.uint64(30))
+        values = values * np.uint64(0xBF58476D1CE4E5B9)
+        values = values ^ (values >> np.uint64(27))
+        values = values * np.uint64(0x94D049BB133111EB)
+        return values ^ (values >> np.uint64(31))
+
+    @staticmethod
+    def hash_shingles(text: str, shingle_size: int, unit: str = "char") -> np.ndarray:
+        """Returns the hashes of all the shingles of a text, in order. A text shorter than a shingle is a single shingle.
+
+        ### Args:
+            - text (str): The text.
+            - shingle_size (int): The number of characters or words of each shingle.
+            - unit (str, Optional): The unit of the shingles: {char, word}. Defaults to char.
+
+        ### Returns:
+            - numpy.ndarray: The hashes of the shingles, as unsigned 64 bits integers.
+        """
+        if unit == "char":
+            units = np.frombuffer(text.encode("utf-32-le"), dtype=np.uint32).astype(np.uint64)
+        else:
+            words = text.split()
+            hashes = {word: int.from_bytes(hashlib.blake2b(word.encode("utf-8"), digest_size=8).digest(), "little")
+                      for word in set(words)}
+            units = np.array([hashes[word] for word in words], dtype=np.uint64)
+        if not len(units):
+            return units
+        size = min(shingle_size, len(units))
+        windows = np.lib.stride_tricks.sliding_window_view(units, size)
+        # Polynomial hash of each window, computed modulo 2^64.
+        powers = np.cumprod(np.full(size, 0x100000001B3, dtype=np.uint64))[::-1]
+        return MinHash.mix((windows * powers).sum(axis=1, dtype=np.uint64))
+
+    def shingles(self, text: str) -> np.ndarray:
+        """Returns the hashes of the distinct shingles of a text.
+
+        ### Args:
+            - text (str): The text.
+
+        ### Returns:
+            - numpy.ndarray: The sorted distinct hashes of the shingles, as unsigned 64 bits integers.
+        """
+        return np.unique(self.hash_shingles(text, self.shingle_size, self.unit))
+
+    def signature(self, text: str) -> np.ndarray:
+        """Returns the MinHash signature of a text, computed by blocks of shingles.
+        The empty text has a signature of maximal values, which matches no non empty text: its distance is 1 to the
+        other texts and 0 to another empty text, as the Jaccard distance of two empty sets.
+
+        ### Args:
+            - text (str): The text.
+
+        ### Returns:
+            - numpy.ndarray: The num_perm minimal hashes of the shingles of the text.
+        """
+        out = np.full(self.num_perm, np.iinfo(np.uint64).max, dtype=np.uint64)
+        shingles = self.shingles(text)
+        step = max(1, self._BLOCK_VALUES // self.num_perm)
+        for start in range(0, len(shingles), step):
+            block = shingles[start:start + step, None] * self._multipliers[None, :] + self._increments[None, :]
+            np.minimum(out, block.min(axis=0), out=out)
+        return out
+
+    def signatures(self, texts: List[str]) -> np.ndarray:
+        """Returns the signatures of texts, sketching only the texts whose signature is not cached.
+
+        ### Args:
+            - texts (list): The texts.
+
+        ### Returns:
+            - numpy.ndarray: The signatures of the texts, one row per text.
+        """
+        keys = DistanceCache.fingerprint(texts)
+        for i, key in enumerate(keys):
+            if int(key) not in self._signatures:
+                self._signatures[int(key)] = self.signature(texts[i])
+        out = np.empty((len(texts), self.num_perm), dtype=np.uint64)
+        for i, key in enumerate(keys):
+            out[i] = self._signatures[int(key)]
+        return out
+
+    def prepare(self, texts: List[str]) -> None:
+        """Sketches the texts whose signature is neither cached nor in the store, and appends their signatures to the
+        store. Called by DistanceEngine in the main process, so that the worker processes receive all the signatures.
+
+        ### Args:
+            - texts (list): The texts.
+        """
+        if self._store is not None and not self._signatures:
+            self._load()
+        keys = DistanceCache.fingerprint(texts)
+        missing = np.unique(np.array([key for key in keys if int(key) not in self._signatures], dtype=np.uint64))
+        self.signatures(texts)
+        if self._store is not None and len(missing):
+            self._save(missing)
+
+    def jaccard(self, texts1: List[str], texts2: Union[List[str], None] = None) -> np.ndarray:
+        """Returns the estimated Jaccard similarities between two lists of texts, by comparing all their signatures
+        at once.
+
+        ### Args:
+            - texts1 (list): The texts of the rows of the matrix.
+            - texts2 (list, Optional): The texts of the columns of the matrix. Defaults to texts1.
+
+        ### Returns:
+            - numpy.ndarray: Matrix with the similarity between texts1[i] and texts2[j] at position [i, j].
+        """
+        signatures1 = self.signatures(texts1)
+        signatures2 = signatures1 if texts2 is None else self.signatures(texts2)
+        out = np.empty((len(signatures1), len(signatures2)), dtype=np.float64)
+        step = max(1, self._BLOCK_VALUES // max(1, len(signatures2) * self.num_perm))
+        for start in range(0, len(signatures1), step):
+            equal = signatures1[start:start + step, None, :] == signatures2[None, :, :]
+            out[start:start + step] = equal.sum(axis=2) / self.num_perm
+        return out
+
+    def pairwise(self, texts1: List[str], texts2: Union[List[str], None] = None) -> np.ndarray:
+        """Returns the matrix of the estimated Jaccard distances between two lists of texts.
+
+        ### Args:
+            - texts1 (list): The texts of the rows of the matrix.
+            - texts2 (list, Optional): The texts of the columns of the matrix. If not specified the distances between
+            the texts of texts1 are computed.
+
+        ### Returns:
+            - numpy.ndarray: Matrix with the distance between texts1[i] and texts2[j] at position [i, j].
+        """
+        return 1 - self.jaccard(texts1, texts2)
+
+    def candidates(self, texts: List[str], bands: int = 32) -> np.ndarray:
+        """Finds the pairs of texts likely to be similar with locality sensitive hashing.
+        The signatures are split into bands of num_perm/bands values, and two texts are candidates if all the values of
+        one of their bands are equal. A pair with Jaccard similarity s is found with probability 1 - (1 - s^r)^bands,
+        r being the number of values of each band.
+
+        ### Args:
+            - texts (list): The texts.
+            - bands (int, Optional): The number of bands, a divisor of num_perm. Defaults to 32.
+
+        ### Returns:
+            - numpy.ndarray: The candidate pairs (i, j) with i < j, one per row, sorted.
+
+        ### Raises:
+            - ValueError: If bands is not a divisor of num_perm.
+        """
+        if bands < 1 or self.num_perm % bands:
+            raise ValueError(f"Parameter bands must be a divisor of num_perm ({self.num_perm}).")
+        signatures = self.signatures(texts).reshape(len(texts), bands, self.num_perm // bands)
+        pairs = []
+        for band in range(bands):
+            # Each band is hashed into a bucket, the texts of a bucket are candidates.
+            buckets = np.zeros(len(texts), dtype=np.uint64)
+            for column in range(signatures.shape[2]):
+                buckets = self.mix(buckets ^ signatures[:, band, column])
+            order = np.argsort(buckets, kind="stable")
+            starts = np.flatnonzero(np.diff(buckets[order])) + 1
+            for group in np.split(order, starts):
+                if len(group) > 1:
+                    rows, cols = np.triu_indices(len(group), k=1)
+                    pairs.append(np.sort(np.stack((group[rows], group[cols]), axis=1), axis=1))
+        if not pairs:
+            return np.zeros((0, 2), dtype=np.int64)
+        return np.unique(np.concatenate(pairs), axis=0).astype(np.int64)
+
+    def _path(self) -> str:
+        """Returns the path of the file of the signatures in the store folder."""
+        return os.path.join(self._store, hashlib.sha256(self.identity.encode("utf-8")).hexdigest()[:32] + ".bin")
+
+    def _record(self) -> np.dtype:
+        """Returns the type of the records of the signatures file: the fingerprint of a text and its signature."""
+        return np.dtype([("text", "<u8"), ("signature", "<u8", (self.num_perm,))])
+
+    def _load(self) -> None:
+        """Loads the signatures of the store. An incomplete trailing record, left by an interrupted write, is ignored."""
+        path = self._path()
+        if os.path.isfile(path):
+            records = np.fromfile(path, dtype=self._record(), count=os.path.getsize(path) // self._record().itemsize)
+            self._signatures.update(zip(records["text"].tolist(), records["signature"]))
+
+    def _save(self, keys: np.ndarray) -> None:
+        """Appends signatures to the store.
+
+        ### Args:
+            - keys (numpy.ndarray): The fingerprints of the texts whose signatures are appended.
+        """
+        records = np.zeros(len(keys), dtype=self._record())
+        records["text"] = keys
+        records["signature"] = [self._signatures[int(key)] for key in keys]
+        with open(self._path(), "ab") as file:
+            # Drops the incomplete record of an interrupted write so that the records stay aligned.
+            file.truncate(file.tell() - file.tell() % records.itemsize)
+            records.tofile(file)
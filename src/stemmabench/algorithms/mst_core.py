@@ -0,0 +1,182 @@
+from typing import Dict, List, Tuple, Union
+import numpy as np
+from stemmabench.algorithms.condensed_matrix import CondensedMatrix
+
+
+class MinimumSpanningTree:
+    """Prim's algorithm on a condensed distance matrix, in which every manuscript is a node of the tree.
+    The nodes outside of the tree are kept in row order in an array with their distance to the tree and their closest
+    node in it. At each step the closest node, found by argmin, is added to the tree, and the distances of the remaining
+    nodes are updated with the distances to the added node, read from the condensed vector in a single vectorized
+    gather. The algorithm runs
+    in O(n²) time and O(n) additional memory, so the matrix can be a memory-mapped CondensedMatrix too large for a full
+    matrix. Ties are broken by taking the node of lowest row.
+
+    The tree is then rooted with one of the heuristics:
+    - eccentricity: The manuscript minimizing the largest path length to the other manuscripts in the tree, found on the
+      longest path of the tree.
+    - medoid: The manuscript minimizing the sum of its distances to the other manuscripts in the distance matrix.
+    - A label: The given manuscript.
+
+    ### Attributes:
+        - labels (list): The labels of the manuscripts, in the order of the rows of the distance matrix.
+        - root (str): The rooting heuristic, or the label of the root.
+    """
+
+    ROOTINGS: Tuple[str, ...] = ("eccentricity", "medoid")
+
+    def __init__(self,
+                 dist_matrix: Union[np.ndarray, CondensedMatrix],
+                 labels: List[str],
+                 root: str = "eccentricity") -> None:
+        """Constructor for the MinimumSpanningTree class.
+
+        ### Args:
+            - dist_matrix (numpy.ndarray, CondensedMatrix): The symmetric distance matrix between the manuscripts. A
+            full matrix is condensed first.
+            - labels (list): The labels of the manuscripts, in the order of the rows of the distance matrix.
+            - root (str, Optional): The rooting heuristic: {eccentricity, medoid}, or the label of the root. Defaults
+            to eccentricity.
+
+        ### Raises:
+            - ValueError: If the distance matrix is not square or does not match the labels.
+            - ValueError: If root is neither a rooting heuristic nor one of the labels.
+        """
+        if len(dist_matrix.shape) != 2 or dist_matrix.shape[0] != dist_matrix.shape[1] or \
+                dist_matrix.shape[0] != len(labels):
+            raise ValueError("The distance matrix must be square with one row per label.")
+        if root not in self.ROOTINGS and root not in labels:
+            raise ValueError(f"Unknown root {root}. The root must be one of the labels or one of the heuristics: "
+                             f"{list(self.ROOTINGS)}.")
+        self._labels: List[str] = list(labels)
+        self._root: str = root
+        self._matrix: CondensedMatrix = dist_matrix if isinstance(dist_matrix, CondensedMatrix) \
+            else CondensedMatrix.from_dense(np.asarray(dist_matrix))
+
+    @property
+    def labels(self):
+        return self._labels
+
+    @property
+    def root(self):
+        return self._root
+
+    def build(self) -> Tuple[Dict[str, float], List[List[str]]]:
+        """Builds the minimum spanning tree and orients its edges from the root.
+
+        ### Returns:
+            - dict: The dictionary with edges as keys in format "parent,child" and distances as values.
+            - list: List of edges, in breadth first order from the root.
+        """
+        size = len(self._labels)
+        if size < 2:
+            return {}, []
+        links, lengths = self.spanning_tree()
+        neighbors: List[List[Tuple[int, float]]] = [[] for _ in range(size)]
+        for node in range(1, size):
+            neighbors[node].append((links[node], lengths[node]))
+            neighbors[links[node]].append((node, lengths[node]))
+        if self.root == "eccentricity":
+            root = self.center(neighbors)
+        elif self.root == "medoid":
+            root = int(self.row_sums().argmin())
+        else:
+            root = self._labels.index(self.root)
+        edges_labels, edges_distance = [], []
+        visited = [False] * size
+        visited[root] = True
+        order = [root]
+        for node in order:
+            for neighbor, length in neighbors[node]:
+                if not visited[neighbor]:
+                    visited[neighbor] = True
+                    order.append(neighbor)
+                    edges_labels.append([self._labels[node], self._labels[neighbor]])
+                    edges_distance.append(length)
+        return {f"{edge[0]},{edge[1]}": edges_distance[i] for i, edge in enumerate(edges_labels)}, edges_labels
+
+    def spanning_tree(self) -> Tuple[List[int], List[float]]:
+        """Runs Prim's algorithm from the first manuscript.
+
+        ### Returns:
+            - list: The row of the node each node is joined to when it is added to the tree, -1 for the first one.
+            - list: The length of the edge of each node to the node it is joined to.
+        """
+        size = self._matrix.size
+        data = self._matrix.data
+        links, lengths = [-1] * size, [0.0] * size
+        remaining = np.arange(1, size, dtype=np.int64)
+        distances = self._matrix.row(0, dtype=np.float64)[1:]
+        closest = np.zeros(size - 1, dtype=np.int64)
+        while len(remaining):
+            position = int(distances.argmin())
+            node = int(remaining[position])
+            links[node], lengths[node] = int(closest[position]), float(distances[position])
+            remaining = np.delete(remaining, position)
+            distances = np.delete(distances, position)
+            closest = np.delete(closest, position)
+            new = data[CondensedMatrix.index(size, remaining, node)].astype(np.float64)
+            shorter = new < distances
+            distances[shorter] = new[shorter]
+            closest[shorter] = node
+        return links, lengths
+
+    def center(self, neighbors: List[List[Tuple[int, float]]]) -> int:
+        """Returns the node of minimal eccentricity of a tree, the node of its longest path minimizing the larger of its
+        path lengths to both ends.
+
+        ### Args:
+            - neighbors (list): The neighbors of each node with the lengths of their edges.
+
+        ### Returns:
+            - int: The row of the center.
+        """
+        first, _, _ = self._farthest(neighbors, 0)
+        last, depths, parents = self._farthest(neighbors, first)
+        best, best_eccentricity = last, depths[last]
+        node = last
+        while node != first:
+            node = parents[node]
+            eccentricity = max(depths[node], depths[last] - depths[node])
+            if eccentricity < best_eccentricity:
+                best, best_eccentricity = node, eccentricity
+        return best
+
+    @staticmethod
+    def _farthest(neighbors: List[List[Tuple[int, float]]], start: int) -> Tuple[int, List[float], List[int]]:
+        """Returns the farthest node of a tree from a node, with the path lengths and parents from that node.
+
+        ### Args:
+            - neighbors (list): The neighbors of each node with the lengths of their edges.
+            - start (int): The node the paths start from.
+
+        ### Returns:
+            - int: The farthest node, of lowest row in case of tie.
+            - list: The path length of each node from start.
+            - list: The previous node of each node on its path from start, -1 for start.
+        """
+        depths, parents = [-1.0] * len(neighbors), [-1] * len(neighbors)
+        depths[start] = 0.0
+        stack = [start]
+        while stack:
+            node = stack.pop()
+            for neighbor, length in neighbors[node]:
+                if depths[neighbor] < 0:
+                    depths[neighbor], parents[neighbor] = depths[node] + length, node
+                    stack.append(neighbor)
+        farthest = max(range(len(neighbors)), key=lambda node: (depths[node], -node))
+        return farthest, depths, parents
+
+    def row_sums(self) -> np.ndarray:
+        """Returns the sum of each row of the distance matrix, reading the condensed vector once row after row.
+
+        ### Returns:
+            - numpy.ndarray: The sums of the rows.
+        """
+        size = self._matrix.size
+        sums = np.zeros(size, dtype=np.float64)
+        for row in range(size - 1):
+            values = self._matrix.data[self._matrix.row_slice(row)].astype(np.float64)
+            sums[row] += values.sum()
+            sums[row + 1:] += values
+        return sums
@@ -0,0 +1,184 @@
+import bz2
+import lzma
+import zlib
+from collections import defaultdict
+from typing import Dict, List, Tuple, Union
+import numpy as np
+from stemmabench.algorithms.distance import Distance
+from stemmabench.algorithms.distance_cache import DistanceCache
+
+
+@Distance.register("ncd")
+class CompressionDistance(Distance):
+    """Normalized compression distance between two texts:
+    NCD(x, y) = (C(xy) - min(C(x), C(y))) / max(C(x), C(y)), where C is the size of the compressed text.
+    The concatenation xy puts the longest of both texts first, and the first in byte order if they have the same length,
+    so that the distance is symmetric, and identical texts are at distance 0. C(x) is computed once per text. With
+    zlib, the state of the compressor after x is copied with compressobj.copy for each text y compared to x, so that
+    C(xy) only compresses the shorter text y. bz2 and lzma compressors cannot be
+    copied and compress the whole concatenation.
+    With a segment_size, the texts are split into segments of segment_size words, as in the RHM algorithm, and the
+    distance is the mean of the distances between the segments at the same position.
+
+    ### Attributes:
+        - compressor (str): The compression library: {zlib, bz2, lzma}
+        - level (int): The compression level, None for the default level of the library.
+        - segment_size (int): The number of words of the segments, None to compare the whole texts.
+    """
+
+    COMPRESSORS = ("zlib", "bz2", "lzma")
+    # The order of the concatenations changed in version 2, from byte order to the longest text first.
+    version: str = "2"
+
+    def __init__(self,
+                 compressor: str = "zlib",
+                 level: Union[int, None] = None,
+                 segment_size: Union[int, None] = None) -> None:
+        """Constructor for the CompressionDistance class.
+
+        ### Args:
+            - compressor (str, Optional): The compression library: {zlib, bz2, lzma}. Defaults to zlib.
+            - level (int, Optional): The compression level. Defaults to the default level of the library.
+            - segment_size (int, Optional): The number of words of the segments. Defaults to the whole texts.
+
+        ### Raises:
+            - ValueError: If compressor is not supported or if segment_size is lower than 1.
+        """
+        if compressor not in self.COMPRESSORS:
+            raise ValueError(f"Unknown compressor {compressor}. Supported compressors are: {list(self.COMPRESSORS)}.")
+        if segment_size is not None and segment_size < 1:
+            raise ValueError("Parameter segment_size must be a positive integer.")
+        self._compressor: str = compressor
+        self._level: Union[int, None] = level
+        self._segment_size: Union[int, None] = segment_size
+        self._sizes: Dict[int, List[int]] = {}
+
+    @property
+    def compressor(self):
+        return self._compressor
+
+    @property
+    def level(self):
+        return self._level
+
+    @property
+    def segment_size(self):
+        return self._segment_size
+
+    def compressobj(self):
+        """Returns a new compressor of the library at the compression level."""
+        if self.compressor == "zlib":
+            return zlib.compressobj(zlib.Z_DEFAULT_COMPRESSION if self.level is None else self.level)
+        if self.compressor == "bz2":
+            return bz2.BZ2Compressor(9 if self.level is None else self.level)
+        return lzma.LZMACompressor(preset=self.level)
+
+    def compressed_size(self, data: bytes) -> int:
+        """Returns the size of compressed data.
+
+        ### Args:
+            - data (bytes): The data.
+
+        ### Returns:
+            - int: The number of bytes of the compressed data.
+        """
+        compressor = self.compressobj()
+        return len(compressor.compress(data)) + len(compressor.flush())
+
+    def segments(self, text: str) -> List[bytes]:
+        """Returns the UTF-8 encoded segments of a text.
+
+        ### Args:
+            - text (str): The text.
+
+        ### Returns:
+            - list: The segments of segment_size words, or the whole text if segment_size is None.
+        """
+        if self.segment_size is None:
+            return [text.encode("utf-8")]
+        words = text.split()
+        return [" ".join(words[start:start + self.segment_size]).encode("utf-8")
+                for start in range(0, len(words), self.segment_size)]
+
+    def sizes(self, texts: List[str]) -> List[List[int]]:
+        """Returns the compressed sizes of the segments of texts, computing only the sizes that are not cached.
+
+        ### Args:
+            - texts (list): The texts.
+
+        ### Returns:
+            - list: The compressed size of each segment of each text.
+        """
+        keys = DistanceCache.fingerprint(texts)
+        for i, key in enumerate(keys):
+            if int(key) not in self._sizes:
+                self._sizes[int(key)] = [self.compressed_size(segment) for segment in self.segments(texts[i])]
+        return [self._sizes[int(key)] for key in keys]
+
+    def prepare(self, texts: List[str]) -> None:
+        """Compresses the texts in the main process, so that the worker processes receive their sizes.
+
+        ### Args:
+            - texts (list): The texts.
+        """
+        self.sizes(texts)
+
+    def concatenated_sizes(self, first: bytes, seconds: List[bytes]) -> List[int]:
+        """Returns the compressed sizes of the concatenations of a text with other texts. With zlib, the first text is
+        compressed once and the state of the compressor is copied for each other text.
+
+        ### Args:
+            - first (bytes): The text at the start of the concatenations.
+            - seconds (list): The texts appended to the first text.
+
+        ### Returns:
+            - list: The compressed size of each concatenation.
+        """
+        if self.compressor != "zlib":
+            return [self.compressed_size(first + second) for second in seconds]
+        snapshot = self.compressobj()
+        prefix = len(snapshot.compress(first))
+        out = []
+        for second in seconds:
+            compressor = snapshot.copy()
+            out.append(prefix + len(compressor.compress(second)) + len(compressor.flush()))
+        return out
+
+    def pairwise(self, texts1: List[str], texts2: Union[List[str], None] = None) -> np.ndarray:
+        """Returns the matrix of the normalized compression distances between two lists of texts.
+
+        ### Args:
+            - texts1 (list): The texts of the rows of the matrix.
+            - texts2 (list, Optional): The texts of the columns of the matrix. If not specified the distances between
+            the texts of texts1 are computed.
+
+        ### Returns:
+            - numpy.ndarray: Matrix with the distance between texts1[i] and texts2[j] at position [i, j].
+        """
+        symmetric = texts2 is None
+        texts2 = texts1 if symmetric else texts2
+        segments1, segments2 = [self.segments(text) for text in texts1], [self.segments(text) for text in texts2]
+        sizes1, sizes2 = self.sizes(texts1), self.sizes(texts2)
+        empty = self.compressed_size(b"")
+        totals = np.zeros((len(texts1), len(texts2)), dtype=np.float64)
+        counts = np.zeros((len(texts1), len(texts2)), dtype=np.int64)
+        # Pairs of segments grouped by the segment at the start of their concatenation, compressed once per group.
+        groups: Dict[bytes, List[Tuple[int, int, bytes, int, int]]] = defaultdict(list)
+        for row in range(len(texts1)):
+            for col in range(row + 1 if symmetric else 0, len(texts2)):
+                for position in range(max(len(segments1[row]), len(segments2[col]))):
+                    pair = [(segments[position], sizes[position]) if position < len(segments) else (b"", empty)
+                            for segments, sizes in [(segments1[row], sizes1[row]), (segments2[col], sizes2[col])]]
+                    counts[row, col] += 1
+                    if pair[0][0] != pair[1][0]:
+                        # The longest segment is compressed once for its group, and the shorter one for each pair.
+                        (first, size1), (second, size2) = sorted(pair, key=lambda item: (-len(item[0]), item[0]))
+                        groups[first].append((row, col, second, size1, size2))
+        for first, pairs in groups.items():
+            concatenated = self.concatenated_sizes(first, [second for _, _, second, _, _ in pairs])
+            for (row, col, _, size1, size2), size in zip(pairs, concatenated):
+                totals[row, col] += (size - min(size1, size2)) / max(size1, size2)
+        out = np.divide(totals, counts, out=np.zeros_like(totals), where=counts > 0)
+        if symmetric:
+            out += out.T
+        return out
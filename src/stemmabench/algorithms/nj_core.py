@@ -0,0 +1,354 @@
+from typing import Dict, List, Tuple, Union
+import numpy as np
+from stemmabench.algorithms.condensed_matrix import CondensedMatrix
+
+
+class NeighborJoining:
+    """In-place Neighbor-Joining on a preallocated distance matrix.
+    The active nodes occupy the first rows of the matrix: the node created by a join is written in the row of one of the
+    joined nodes and the last active row is moved into the row of the other one, so that the active matrix is always a
+    contiguous view. The row sums are updated incrementally and the Q matrix is computed by blocks of rows, so that the
+    additional memory is bounded by chunk_size rows.
+
+    The results are the same as the original implementation of StemmaNJ: distances and Q values are rounded to 7
+    decimals and ties are broken by taking the first pair in the order of the original matrix, in which the remaining
+    nodes keep their relative order and each new node is appended at the end.
+
+    Two strategies are available to search the pair of nodes to be joined:
+    - exact: Computes the whole Q matrix at each step, O(n³) overall.
+    - rapid: Keeps the distances of each row sorted, as in RapidNJ. As Q(i, j) >= (r - 2)·d(i, j) - S(i) - max(S), a row
+      is only scanned up to the first distance for which this bound exceeds the best Q found so far, and the rows whose
+      smallest distance already exceeds it are skipped. Returns the same tree as exact for an additional n² sorted
+      distances and node ids in memory.
+
+    ### Attributes:
+        - labels (list): The labels of the leaves, in the order of the rows of the distance matrix.
+        - dtype (numpy.dtype): The type of the working matrix, float64 or float32.
+        - chunk_size (int): The number of rows of the Q matrix computed at once.
+        - search (str): The strategy used to search the pair of nodes to be joined: {exact, rapid}
+        - path (str): The path of the file to which the working matrix is memory-mapped, None if it is in memory.
+    """
+
+    SEARCHES: Tuple[str, ...] = ("exact", "rapid")
+
+    # Default memory allowed for a block of the Q matrix, in bytes.
+    _CHUNK_BYTES: int = 1 << 26
+
+    def __init__(self,
+                 dist_matrix: Union[np.ndarray, CondensedMatrix],
+                 labels: List[str],
+                 dtype: Union[type, np.dtype] = np.float64,
+                 chunk_size: Union[int, None] = None,
+                 search: str = "exact",
+                 path: Union[str, None] = None) -> None:
+        """Constructor for the NeighborJoining class.
+
+        ### Args:
+            - dist_matrix (numpy.ndarray, CondensedMatrix): The symmetric distance matrix between the leaves. A
+            CondensedMatrix is expanded directly into the working matrix, without an intermediate full matrix.
+            - labels (list): The labels of the leaves, in the order of the rows of the distance matrix.
+            - dtype (type, numpy.dtype, Optional): The type of the working matrix, float64 or float32. Defaults to float64.
+            - chunk_size (int, Optional): The number of rows of the Q matrix computed at once. Defaults to the number of
+            rows fitting in 64 MiB.
+            - search (str, Optional): The strategy used to search the pair of nodes to be joined: {exact, rapid}.
+            Defaults to exact.
+            - path (str, Optional): The path of a .npy file to which the working matrix is memory-mapped, for matrices
+            larger than the memory. The file is overwritten. The exact search then reads the matrix by blocks of
+            chunk_size rows, the rapid search still keeps its sorted rows in memory.
+
+        ### Raises:
+            - ValueError: If the distance matrix is not square or does not match the labels.
+            - ValueError: If dtype is not float64 or float32.
+            - ValueError: If search is not a supported strategy.
+        """
+        if len(dist_matrix.shape) != 2 or dist_matrix.shape[0] != dist_matrix.shape[1] or \
+                dist_matrix.shape[0] != len(labels):
+            raise ValueError("The distance matrix must be square with one row per label.")
+        if np.dtype(dtype) not in (np.dtype(np.float64), np.dtype(np.float32)):
+            raise ValueError("Parameter dtype must be float64 or float32.")
+        if chunk_size is not None and chunk_size < 1:
+            raise ValueError("Parameter chunk_size must be a positive integer.")
+        if search not in self.SEARCHES:
+            raise ValueError(f"Unknown search {search}. Supported searches are: {list(self.SEARCHES)}.")
+        self._labels: List[str] = list(labels)
+        self._dtype: np.dtype = np.dtype(dtype)
+        self._chunk_size: int = chunk_size or max(1, self._CHUNK_BYTES // (8 * max(1, len(labels))))
+        self._search: str = search
+        self._path: Union[str, None] = path
+        if path is None:
+            self._matrix: np.ndarray = dist_matrix.to_dense(self._dtype) if isinstance(dist_matrix, CondensedMatrix) \
+                else np.array(dist_matrix, dtype=self._dtype)
+        else:
+            self._matrix = np.lib.format.open_memmap(path, mode="w+", dtype=self._dtype, shape=dist_matrix.shape)
+            if isinstance(dist_matrix, CondensedMatrix):
+                dist_matrix.to_dense(out=self._matrix)
+            else:
+                for start in range(0, len(labels), self._chunk_size):
+                    self._matrix[start:start + self._chunk_size] = dist_matrix[start:start + self._chunk_size]
+
+    @property
+    def labels(self):
+        return self._labels
+
+    @property
+    def dtype(self):
+        return self._dtype
+
+    @property
+    def chunk_size(self):
+        return self._chunk_size
+
+    @property
+    def search(self):
+        return self._search
+
+    @property
+    def path(self):
+        return self._path
+
+    def build(self) -> Tuple[Dict[str, float], List[List[str]]]:
+        """Joins the nodes until 2 are left.
+
+        ### Returns:
+            - dict: The dictionary with edges as keys in format "parent,child" and distances as values.
+            - list: List of edges.
+        """
+        matrix = self._matrix
+        size = matrix.shape[0]
+        names = list(self._labels)
+        # Position of each row in the order of the original implementation.
+        rank = np.arange(size, dtype=np.int64)
+        sums = matrix.sum(axis=1, dtype=np.float64)
+        edges_labels, edges_distance = [], []
+        active = size
+        rapid = False
+        while active > 2:
+            if rapid:
+                first, second = self._rapid_closest_pair(active, sums[:active], rank[:active])
+            else:
+                first, second = self._closest_pair(matrix[:active, :active], sums[:active], rank[:active])
+            dist_fg = matrix[first, second]
+            # The branch lengths are rounded to 7 decimals, so the sums of both rows are computed in the order of the
+            # original implementation to get the same rounding.
+            order = np.argsort(rank[:active])
+            sum_f = matrix[first, order].sum(dtype=np.float64)
+            sum_g = matrix[second, order].sum(dtype=np.float64)
+            df = round(0.5 * np.float64(dist_fg) + (sum_f - sum_g) / (2 * (active - 2)), 7)
+            dg = round(np.float64(dist_fg) - df, 7)
+            new_row = (0.5 * (matrix[first, :active].astype(np.float64) + matrix[second, :active] - dist_fg)).round(7)
+            new_row[[first, second]] = 0
+            sums[:active] += new_row - matrix[:active, first] - matrix[:active, second]
+            sums[first] = new_row.sum()
+            matrix[first, :active] = new_row
+            matrix[:active, first] = new_row
+            new_label = "N_" + str(size - active + 1)
+            edges_labels += [[new_label, names[first]], [new_label, names[second]]]
+            edges_distance += [df, dg]
+            names[first] = new_label
+            rank[first] = size + len(edges_labels)
+            active -= 1
+            if second != active:
+                self._move(active, second, active)
+                sums[second], rank[second], names[second] = sums[active], rank[active], names[active]
+            if rapid:
+                self._rapid_join(first, second, active, size - active)
+            if active == size - 1:
+                # The original implementation rounds the whole matrix after the first join.
+                for start in range(0, active, self.chunk_size):
+                    block = matrix[start:min(start + self.chunk_size, active), :active]
+                    np.round(block, 7, out=block)
+                sums[:active] = matrix[:active, :active].sum(axis=1, dtype=np.float64)
+                if self.search == "rapid" and active > 2:
+                    # The rows are sorted once the distances are rounded.
+                    self._rapid_init(active)
+                    rapid = True
+        last = sorted(range(active), key=lambda i: rank[i])
+        edges_labels.append([names[last[0]], names[last[1]]])
+        edges_distance.append(np.float64(matrix[last[0], last[1]]))
+        return {f"{edge[0]},{edge[1]}": edges_distance[i] for i, edge in enumerate(edges_labels)}, edges_labels
+
+    def _move(self, source: int, target: int, active: int) -> None:
+        """Moves a node of the matrix from a row to an other one.
+
+        ### Args:
+            - source (int): The row of the node to be moved.
+            - target (int): The row the node is moved to.
+            - active (int): The number of active rows, after the move.
+        """
+        self._matrix[target, :active] = self._matrix[source, :active]
+        self._matrix[:active, target] = self._matrix[:active, source]
+        self._matrix[target, target] = 0
+
+    def _closest_pair(self, matrix: np.ndarray, sums: np.ndarray, rank: np.ndarray) -> Tuple[int, int]:
+        """Finds the pair of nodes minimizing Q(i, j) = (r - 2)·d(i, j) - S(i) - S(j), rounded to 7 decimals.
+        The minimum of each row is computed by blocks of rows in a reused buffer. The rows whose minimum is close to the
+        overall minimum are then computed again to find all the pairs tied with it once rounded.
+
+        ### Args:
+            - matrix (numpy.ndarray): The active distance matrix.
+            - sums (numpy.ndarray): The row sums of the active distance matrix.
+            - rank (numpy.ndarray): The position of each row in the order used to break ties.
+
+        ### Returns:
+            - int: The row of the first node of the pair, which comes first in the tie breaking order.
+            - int: The row of the second node of the pair.
+        """
+        active = matrix.shape[0]
+        buffer = self._buffer(active)
+        row_minimum = np.empty(active, dtype=np.float64)
+        for start in range(0, active, self.chunk_size):
+            stop = min(start + self.chunk_size, active)
+            q = buffer[:stop - start, :active]
+            np.multiply(matrix[start:stop], active - 2, out=q, dtype=np.float64)
+            q -= sums[None, :]
+            q[np.arange(stop - start), np.arange(start, stop)] = np.inf
+            q.min(axis=1, out=row_minimum[start:stop])
+        row_minimum -= sums
+        minimum = row_minimum.min()
+        return self._select_pair(matrix, sums, rank, np.flatnonzero(row_minimum <= minimum + self._margin(minimum)))
+
+    @staticmethod
+    def _margin(minimum: float) -> float:
+        """Returns the margin above the minimum of Q within which pairs can be tied with it once rounded to 7 decimals.
+        Rounding is monotonic, so only values close to the minimum can be tied with it. The margin also covers the
+        rounding errors of the different ways of computing Q.
+
+        ### Args:
+            - minimum (float): The minimum of Q.
+
+        ### Returns:
+            - float: The margin.
+        """
+        return 2e-7 + 1e-12 * abs(minimum)
+
+    @staticmethod
+    def _select_pair(matrix: np.ndarray, sums: np.ndarray, rank: np.ndarray, rows: np.ndarray) -> Tuple[int, int]:
+        """Computes the rounded Q values of the given rows and returns the first pair minimizing it in the tie breaking
+        order. The rows must contain both nodes of all the pairs that are tied with the minimum of Q once rounded.
+
+        ### Args:
+            - matrix (numpy.ndarray): The active distance matrix.
+            - sums (numpy.ndarray): The row sums of the active distance matrix.
+            - rank (numpy.ndarray): The position of each row in the order used to break ties.
+            - rows (numpy.ndarray): The rows containing the pairs that can minimize Q.
+
+        ### Returns:
+            - int: The row of the first node of the pair, which comes first in the tie breaking order.
+            - int: The row of the second node of the pair.
+        """
+        q = (matrix.shape[0] - 2) * matrix[rows].astype(np.float64) - (sums[rows, None] + sums[None, :])
+        q[np.arange(len(rows)), rows] = np.inf
+        q = q.round(7)
+        candidate_rows, candidate_cols = np.nonzero(q == q.min())
+        pairs = zip(rows[candidate_rows].tolist(), candidate_cols.tolist())
+        return min(pairs, key=lambda pair: (rank[pair[0]], rank[pair[1]]))
+
+    def _rapid_init(self, active: int) -> None:
+        """Sorts the distances of each row for the rapid search. The sorted rows contain node ids, which stay valid when
+        nodes move between rows, and the entries of joined nodes are skipped lazily.
+
+        ### Args:
+            - active (int): The number of active nodes.
+        """
+        size = self._matrix.shape[0]
+        distances = self._matrix[:active, :active].copy()
+        # The node itself is sorted last, its infinite distance ends the scan of the row.
+        np.fill_diagonal(distances, np.inf)
+        self._sorted_ids = np.argsort(distances, axis=1, kind="stable").astype(np.int32)
+        self._sorted_distances = np.take_along_axis(distances, self._sorted_ids, axis=1)
+        self._head = np.zeros(active, dtype=np.int64)
+        # Row of each node id, -1 for the joined nodes and the padding id 2 * size.
+        self._row_of_node = np.full(2 * size + 1, -1, dtype=np.int64)
+        self._row_of_node[:active] = np.arange(active)
+        self._node_of_row = np.arange(active, dtype=np.int64)
+
+    def _rapid_join(self, first: int, second: int, active: int, step: int) -> None:
+        """Updates the sorted rows after a join of the nodes of rows first and second. The new node has been written in
+        row first and the node of the last row has been moved to row second.
+
+        ### Args:
+            - first (int): The row of the first joined node.
+            - second (int): The row of the second joined node.
+            - active (int): The number of active nodes after the join, which is the former last row.
+            - step (int): The number of joins done so far.
+        """
+        size = self._matrix.shape[0]
+        joined = self._node_of_row[[first, second]]
+        if second != active:
+            self._node_of_row[second] = self._node_of_row[active]
+            self._row_of_node[self._node_of_row[second]] = second
+            self._sorted_ids[second] = self._sorted_ids[active]
+            self._sorted_distances[second] = self._sorted_distances[active]
+            self._head[second] = self._head[active]
+        self._row_of_node[joined] = -1
+        # The new node has been moved with the last row if it was written there.
+        row = second if first == active else first
+        node = size + step - 1
+        self._node_of_row[row] = node
+        self._row_of_node[node] = row
+        distances = self._matrix[row, :active].copy()
+        distances[row] = np.inf
+        order = np.argsort(distances, kind="stable")
+        self._sorted_ids[row, :active] = self._node_of_row[order]
+        self._sorted_ids[row, active:] = 2 * size
+        self._sorted_distances[row, :active] = distances[order]
+        self._sorted_distances[row, active:] = np.inf
+        self._head[row] = 0
+
+    def _rapid_closest_pair(self, active: int, sums: np.ndarray, rank: np.ndarray) -> Tuple[int, int]:
+        """Finds the pair of nodes minimizing the rounded Q values by scanning the sorted rows.
+
+        ### Args:
+            - active (int): The number of active nodes.
+            - sums (numpy.ndarray): The row sums of the active distance matrix.
+            - rank (numpy.ndarray): The position of each row in the order used to break ties.
+
+        ### Returns:
+            - int: The row of the first node of the pair, which comes first in the tie breaking order.
+            - int: The row of the second node of the pair.
+        """
+        rows = np.arange(active)
+        head = self._head[:active]
+        # Moves the heads of the rows past the joined nodes.
+        for row in np.flatnonzero(self._row_of_node[self._sorted_ids[rows, head]] < 0).tolist():
+            alive = self._row_of_node[self._sorted_ids[row, head[row]:]] >= 0
+            head[row] += int(alive.argmax())
+        nearest = self._sorted_distances[rows, head].astype(np.float64)
+        best = ((active - 2) * nearest - sums - sums[self._row_of_node[self._sorted_ids[rows, head]]]).min()
+        max_sum = sums.max()
+        bound = (active - 2) * nearest - sums - max_sum
+        # The rows are scanned together by blocks of columns of doubling width, until the bound of the last distance
+        # of the block of a row exceeds the best Q found so far.
+        rows = np.flatnonzero(bound <= best + self._margin(best))
+        start = head[rows]
+        width = 8
+        selected = []
+        while rows.size:
+            columns = np.minimum(start[:, None] + np.arange(width), self._sorted_ids.shape[1] - 1)
+            others = self._row_of_node[self._sorted_ids[rows[:, None], columns]]
+            distances = self._sorted_distances[rows[:, None], columns].astype(np.float64)
+            q = (active - 2) * distances - sums[rows, None] - sums[others]
+            q[others < 0] = np.inf
+            best = min(best, q.min())
+            close = q <= best + self._margin(best)
+            selected += [rows[close.any(axis=1)], others[close]]
+            more = ((active - 2) * distances[:, -1] - sums[rows] - max_sum <= best + self._margin(best)) & \
+                (start + width < self._sorted_ids.shape[1])
+            rows, start = rows[more], start[more] + width
+            width *= 2
+        # The rows selected before the best Q was lowered may no longer be close to it, _select_pair discards them.
+        selected = np.unique(np.concatenate(selected))
+        return self._select_pair(self._matrix[:active, :active], sums, rank, selected)
+
+    def _buffer(self, active: int) -> np.ndarray:
+        """Returns the buffer used to compute the blocks of the Q matrix, allocated at the first call.
+
+        ### Args:
+            - active (int): The number of active nodes.
+
+        ### Returns:
+            - numpy.ndarray: A buffer of at least chunk_size rows and active columns.
+        """
+        if getattr(self, "_q_buffer", None) is None or self._q_buffer.shape[1] < active:
+            self._q_buffer = np.empty((min(self.chunk_size, active), active), dtype=np.float64)
+        return self._q_buffer
@@ -0,0 +1,480 @@
+from typing import Dict, List, Tuple, Union
+import numpy as np
+
+
+class FitchParsimony:
+    """Fitch parsimony on bit-packed state sets, with a local search of the tree by subtree pruning and regrafting.
+    The characters are the variant locations of the tradition and their states are the readings of the manuscripts. The
+    set of states of a node for a character is a bitset in an unsigned integer lane, so the state sets of a node for all
+    the characters are a row of lanes, and the Fitch step of a node is computed for all the characters at once with
+    vectorized bitwise operations: the set of the node is the intersection of the sets of its children, or their union
+    with a cost of 1 when the intersection is empty. The lanes are uint64 when a character has more than 32 states, and
+    the characters with more than 64 states use several lanes.
+
+    Before packing, the characters whose length is the same on every tree, in which at most one state is shared by
+    several manuscripts, are removed and their length is kept as a constant, and identical characters are merged into
+    one weighted character.
+
+    The tree is binary and rooted, the leaves being the manuscripts. After a subtree is pruned, the length of the tree
+    obtained by regrafting it on each edge of the remaining tree is computed for all the edges at once: rooting the
+    remaining tree on an edge gives the set of the edge from the sets of its two sides, and the regrafting only adds the
+    characters whose set is disjoint from the set of the subtree. After a move, the sets are only computed again on the
+    paths from the modified nodes to the root, until they are unchanged.
+
+    ### Attributes:
+        - labels (list): The labels of the manuscripts, in the order of the rows of the character matrix.
+        - characters (int): The number of informative characters after merging the identical ones.
+        - constant (int): The length of the characters removed, added to the length of every tree.
+        - length (int): The Fitch length of the current tree.
+        - evaluated (int): The number of candidate trees whose length was computed by the local search.
+    """
+
+    SEARCHES: Tuple[str, ...] = ("spr", "nni")
+
+    def __init__(self, characters: np.ndarray, labels: List[str]) -> None:
+        """Constructor for the FitchParsimony class.
+
+        ### Args:
+            - characters (numpy.ndarray): The matrix of the states of the manuscripts, with one row per manuscript and
+            one column per character. The states are non negative integers, a negative state is a missing reading
+            compatible with all the states.
+            - labels (list): The labels of the manuscripts, in the order of the rows of the matrix.
+
+        ### Raises:
+            - ValueError: If the matrix does not have one row per label.
+        """
+        characters = np.asarray(characters, dtype=np.int64)
+        if characters.ndim != 2 or characters.shape[0] != len(labels):
+            raise ValueError("The character matrix must have one row per label.")
+        self._labels: List[str] = list(labels)
+        patterns, weights, self._constant = self.compress(characters)
+        # The weights are floats so that the weighted sums are matrix products computed by BLAS.
+        self._weights: np.ndarray = weights.astype(np.float64)
+        self._leaf_sets, self._lane_character, self._starts = self.pack(patterns)
+        self._multiple_lanes: bool = len(self._starts) != self._leaf_sets.shape[1]
+        self._evaluated: int = 0
+        self._root: int = -1
+        self._parent: List[int] = []
+        self._children: List[List[int]] = []
+
+    @property
+    def labels(self):
+        return self._labels
+
+    @property
+    def characters(self):
+        return len(self._weights)
+
+    @property
+    def constant(self):
+        return self._constant
+
+    @property
+    def length(self):
+        return int(self._cost[self._root]) + self._constant
+
+    @property
+    def evaluated(self):
+        return self._evaluated
+
+    @staticmethod
+    def compress(characters: np.ndarray) -> Tuple[np.ndarray, np.ndarray, int]:
+        """Removes the characters whose length is the same on every tree and merges the identical characters.
+
+        ### Args:
+            - characters (numpy.ndarray): The matrix of the states, with one row per manuscript.
+
+        ### Returns:
+            - numpy.ndarray: The distinct informative characters, with one row per character and their states
+            numbered in order of first appearance.
+            - numpy.ndarray: The number of occurrences of each distinct character.
+            - int: The length of the removed characters.
+        """
+        columns, constant = [], 0
+        for column in characters.T:
+            present = column >= 0
+            values, first, inverse, counts = np.unique(column[present], return_index=True, return_inverse=True,
+                                                       return_counts=True)
+            if (counts >= 2).sum() < 2:
+                # Every state but the shared one appears once: each one costs a change whatever the tree.
+                constant += max(len(values) - 1, 0)
+                continue
+            # The states are renumbered in order of first appearance, so that identical partitions are merged.
+            rank = np.empty(len(values), dtype=np.int64)
+            rank[np.argsort(first, kind="stable")] = np.arange(len(values))
+            renumbered = np.full(len(column), -1, dtype=np.int64)
+            renumbered[present] = rank[inverse]
+            columns.append(renumbered)
+        if not columns:
+            return np.zeros((0, characters.shape[0]), dtype=np.int64), np.zeros(0, dtype=np.int64), constant
+        patterns, weights = np.unique(np.array(columns), axis=0, return_counts=True)
+        return patterns, weights.astype(np.int64), constant
+
+    @staticmethod
+    def pack(patterns: np.ndarray) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+        """Packs the states of the manuscripts into bitsets. The lanes are the narrowest unsigned integers holding all
+        the states of every character, usually uint8 since most variant locations have a few readings, and the
+        characters with more than 64 states use several uint64 lanes.
+
+        ### Args:
+            - patterns (numpy.ndarray): The characters, with one row per character.
+
+        ### Returns:
+            - numpy.ndarray: The lanes of the state sets of each manuscript, with one row per manuscript.
+            - numpy.ndarray: The character of each lane.
+            - numpy.ndarray: The first lane of each character.
+        """
+        states = patterns.max(axis=1, initial=0) + 1 if len(patterns) else np.ones(0, dtype=np.int64)
+        dtype = next(np.dtype(f"uint{bits}") for bits in (8, 16, 32, 64) if bits >= states.max(initial=0) or bits == 64)
+        bits = dtype.itemsize * 8
+        lanes = (states - 1) // bits + 1
+        starts = np.concatenate([[0], np.cumsum(lanes)[:-1]]).astype(np.int64) if len(lanes) else lanes
+        lane_character = np.repeat(np.arange(len(patterns)), lanes)
+        sets = np.zeros((patterns.shape[1], int(lanes.sum())), dtype=dtype)
+        taxa, character = np.nonzero(patterns.T >= 0)
+        values = patterns.T[taxa, character]
+        np.bitwise_or.at(sets, (taxa, starts[character] + values // bits),
+                         np.left_shift(dtype.type(1), (values % bits).astype(dtype)))
+        taxa, character = np.nonzero(patterns.T < 0)
+        for taxon, lane_start, count in zip(taxa.tolist(), starts[character].tolist(), lanes[character].tolist()):
+            sets[taxon, lane_start:lane_start + count] = np.iinfo(dtype).max
+        return sets, lane_character, starts
+
+    def _empty(self, intersection: np.ndarray) -> np.ndarray:
+        """Returns for each character if the state sets of an intersection are empty.
+
+        ### Args:
+            - intersection (numpy.ndarray): The lanes of the intersections, in the last dimension.
+
+        ### Returns:
+            - numpy.ndarray: True for the characters whose set is empty.
+        """
+        if not self._multiple_lanes:
+            return intersection == 0
+        return ~np.logical_or.reduceat(intersection != 0, self._starts, axis=-1)
+
+    def _combine(self, first: np.ndarray, second: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+        """Returns the Fitch set of a node from the sets of its two children, with the characters that change at the node.
+        The union is added to the empty intersections through a mask of all ones on their lanes, which is much faster
+        than a selection with numpy.where.
+
+        ### Args:
+            - first (numpy.ndarray): The lanes of the first child.
+            - second (numpy.ndarray): The lanes of the second child.
+
+        ### Returns:
+            - numpy.ndarray: The lanes of the node.
+            - numpy.ndarray: True for the characters whose sets are disjoint.
+        """
+        sets = first & second
+        empty = self._empty(sets)
+        mask = (empty[..., self._lane_character] if self._multiple_lanes else empty).astype(sets.dtype)
+        np.negative(mask, out=mask)
+        mask &= first | second
+        sets |= mask
+        return sets, empty
+
+    def _cost_of(self, empty: np.ndarray) -> Union[float, np.ndarray]:
+        """Returns the weighted number of characters that change.
+
+        ### Args:
+            - empty (numpy.ndarray): True for the characters that change, in the last dimension.
+
+        ### Returns:
+            - float, numpy.ndarray: The weighted number of changes, an integer.
+        """
+        return empty.astype(np.float64) @ self._weights
+
+    def set_tree(self, edge_list: List[List[str]]) -> int:
+        """Sets the current tree from the edges of a stemma, and computes its length.
+        The manuscripts at internal nodes become leaves joined to their node, the nodes with more than two children are
+        resolved into binary nodes and the hypothetical nodes without manuscripts below them are removed.
+
+        ### Args:
+            - edge_list (list): The edges of the stemma, which must contain all the manuscripts.
+
+        ### Returns:
+            - int: The length of the tree.
+
+        ### Raises:
+            - ValueError: If the stemma does not contain all the manuscripts.
+        """
+        size = len(self._labels)
+        index = {label: i for i, label in enumerate(self._labels)}
+        neighbors: Dict[str, List[str]] = {}
+        for parent, child in edge_list:
+            neighbors.setdefault(parent, []).append(child)
+            neighbors.setdefault(child, []).append(parent)
+        if len(set(neighbors) & set(index)) != size and not (size == 1 and not edge_list):
+            raise ValueError("The stemma does not contain all the manuscripts.")
+        self._parent = [-1] * (2 * size - 1)
+        self._children = [[-1, -1] for _ in range(2 * size - 1)]
+        start = edge_list[0][0] if edge_list else self._labels[0]
+        order, previous = [start], {start: None}
+        for node in order:
+            for neighbor in neighbors.get(node, []):
+                if neighbor not in previous:
+                    previous[neighbor] = node
+                    order.append(neighbor)
+        subtree: Dict[str, int] = {}
+        next_id = size
+        for node in reversed(order):
+            parts = [subtree[child] for child in neighbors.get(node, [])
+                     if child != previous[node] and subtree[child] >= 0]
+            if node in index:
+                parts.append(index[node])
+            while len(parts) > 1:
+                self._children[next_id] = [parts[0], parts[1]]
+                self._parent[parts[0]] = self._parent[parts[1]] = next_id
+                parts = [next_id] + parts[2:]
+                next_id += 1
+            subtree[node] = parts[0] if parts else -1
+        self._root = subtree[start]
+        self._sets = np.zeros((2 * size - 1, self._leaf_sets.shape[1]), dtype=self._leaf_sets.dtype)
+        self._sets[:size] = self._leaf_sets
+        self._up = np.zeros_like(self._sets)
+        self._cost = np.zeros(2 * size - 1, dtype=np.int64)
+        for node in self._postorder(self._root):
+            if node >= size:
+                first, second = self._children[node]
+                self._sets[node], empty = self._combine(self._sets[first], self._sets[second])
+                self._cost[node] = self._cost[first] + self._cost[second] + self._cost_of(empty)
+        return self.length
+
+    def _postorder(self, root: int) -> List[int]:
+        """Returns the nodes of a subtree, each node after its descendants.
+
+        ### Args:
+            - root (int): The root of the subtree.
+
+        ### Returns:
+            - list: The nodes of the subtree.
+        """
+        order, stack = [], [root]
+        while stack:
+            node = stack.pop()
+            order.append(node)
+            if node >= len(self._labels):
+                stack += self._children[node]
+        return order[::-1]
+
+    def _update(self, node: int) -> None:
+        """Computes again the sets and costs of a node and of its ancestors, until they are unchanged. The values stored
+        for the node itself may be outdated, so the update always goes on to its parent.
+
+        ### Args:
+            - node (int): The node whose children changed.
+        """
+        changed = True
+        while node >= 0:
+            first, second = self._children[node]
+            sets, empty = self._combine(self._sets[first], self._sets[second])
+            cost = self._cost[first] + self._cost[second] + self._cost_of(empty)
+            if not changed and cost == self._cost[node] and np.array_equal(sets, self._sets[node]):
+                return
+            self._sets[node], self._cost[node] = sets, cost
+            node, changed = self._parent[node], False
+
+    def _replace_child(self, node: int, old: int, new: int) -> None:
+        """Replaces a child of a node, or the root if node is -1.
+
+        ### Args:
+            - node (int): The parent, -1 for the root.
+            - old (int): The former child.
+            - new (int): The new child.
+        """
+        self._parent[new] = node
+        if node < 0:
+            self._root = new
+        else:
+            self._children[node][self._children[node].index(old)] = new
+
+    def _prune(self, subtree: int) -> Tuple[int, int]:
+        """Detaches a subtree with its parent node, whose other child takes its place.
+
+        ### Args:
+            - subtree (int): The root of the subtree.
+
+        ### Returns:
+            - int: The former parent of the subtree, still parent of the subtree.
+            - int: The former sibling of the subtree.
+        """
+        parent = self._parent[subtree]
+        sibling = self._children[parent][1 - self._children[parent].index(subtree)]
+        grandparent = self._parent[parent]
+        self._replace_child(grandparent, parent, sibling)
+        if grandparent >= 0:
+            self._update(grandparent)
+        return parent, sibling
+
+    def _regraft(self, subtree: int, parent: int, target: int) -> None:
+        """Attaches a pruned subtree with its parent node on the edge above a node.
+
+        ### Args:
+            - subtree (int): The root of the subtree.
+            - parent (int): The parent node pruned with the subtree.
+            - target (int): The node of the remaining tree above which the subtree is attached.
+        """
+        self._replace_child(self._parent[target], target, parent)
+        self._children[parent] = [target, subtree]
+        self._parent[target] = parent
+        self._update(parent)
+
+    def _edges_of_remaining(self) -> Tuple[List[int], Dict[int, int]]:
+        """Computes the sets of the remaining tree rooted above each node, and returns its edges.
+        The sets are computed level by level from the root, with one vectorized step for all the nodes of a level.
+        An edge is identified by its lower node. The two children of the root are the same edge of the unrooted tree,
+        identified by the first child.
+
+        ### Returns:
+            - list: The lower node of each edge.
+            - dict: The edge of each node of the remaining tree, from the node to its neighbor towards the root.
+        """
+        size = len(self._labels)
+        first, second = self._children[self._root]
+        self._up[first], self._up[second] = self._sets[second], self._sets[first]
+        edges, edge_of = [first], {first: first, second: first}
+        level = [node for node in (first, second) if node >= size]
+        while level:
+            left = [self._children[node][0] for node in level]
+            right = [self._children[node][1] for node in level]
+            self._up[left] = self._combine(self._up[level], self._sets[right])[0]
+            self._up[right] = self._combine(self._up[level], self._sets[left])[0]
+            edges += left + right
+            edge_of.update((node, node) for node in left + right)
+            level = [node for node in left + right if node >= size]
+        return edges, edge_of
+
+    def _nni_edges(self, junction: int, edge_of: Dict[int, int]) -> List[int]:
+        """Returns the edges of the remaining tree sharing a node with an edge.
+
+        ### Args:
+            - junction (int): The lower node of the edge.
+            - edge_of (dict): The edge of each node of the remaining tree.
+
+        ### Returns:
+            - list: The lower nodes of the adjacent edges.
+        """
+        first, second = self._children[self._root]
+        upper = self._parent[junction]
+        if upper == self._root:
+            upper = second if junction == first else first
+        out = set()
+        for node in (junction, upper):
+            if node >= len(self._labels):
+                out.update(edge_of[child] for child in self._children[node])
+            out.add(edge_of[node])
+        out.discard(edge_of[junction])
+        return sorted(out)
+
+    def _move(self, subtree: int, search: str) -> bool:
+        """Prunes a subtree and regrafts it on the edge giving the shortest tree, if it is shorter than the current one.
+
+        ### Args:
+            - subtree (int): The root of the subtree.
+            - search (str): The edges on which the subtree can be regrafted: all of them for spr, or the edges adjacent
+            to the pruned one for nni.
+
+        ### Returns:
+            - bool: True if the tree was changed.
+        """
+        length = self._cost[self._root]
+        parent, sibling = self._prune(subtree)
+        if self._root < len(self._labels):
+            self._regraft(subtree, parent, sibling)
+            return False
+        edges, edge_of = self._edges_of_remaining()
+        if self._parent[sibling] < 0:
+            junction = self._children[sibling][0]
+        else:
+            junction = edge_of[sibling]
+        if search == "nni":
+            edges = self._nni_edges(junction, edge_of)
+        else:
+            edges.remove(junction)
+        if not edges:
+            self._regraft(subtree, parent, sibling)
+            return False
+        sets, _ = self._combine(self._sets[edges], self._up[edges])
+        sets &= self._sets[subtree]
+        lengths = self._cost[self._root] + self._cost[subtree] + self._cost_of(self._empty(sets))
+        self._evaluated += len(edges)
+        best = int(lengths.argmin())
+        if lengths[best] < length:
+            self._regraft(subtree, parent, edges[best])
+            return True
+        self._regraft(subtree, parent, sibling)
+        return False
+
+    def search(self, search: str = "spr", max_rounds: Union[int, None] = None) -> int:
+        """Improves the current tree by local moves until no move shortens it. Each round prunes every subtree in turn
+        and regrafts it where the tree is the shortest.
+
+        ### Args:
+            - search (str, Optional): The moves: {spr, nni}. spr regrafts the subtrees on any edge, nni only on the
+            edges adjacent to the one they were pruned from. Defaults to spr.
+            - max_rounds (int, Optional): The maximal number of rounds. Defaults to no limit.
+
+        ### Returns:
+            - int: The length of the tree.
+
+        ### Raises:
+            - ValueError: If search is not supported.
+            - RuntimeError: If the tree was not set.
+        """
+        if search not in self.SEARCHES:
+            raise ValueError(f"Unknown search {search}. Supported searches are: {list(self.SEARCHES)}.")
+        if self._root < 0:
+            raise RuntimeError("The tree must be set before the search.")
+        rounds, improved = 0, len(self._labels) > 3
+        while improved and (max_rounds is None or rounds < max_rounds):
+            improved, rounds = False, rounds + 1
+            for subtree in range(2 * len(self._labels) - 1):
+                if self._parent[subtree] >= 0 and self._move(subtree, search):
+                    improved = True
+        return self.length
+
+    def edges(self) -> Tuple[Dict[str, float], List[List[str]]]:
+        """Returns the edges of the current tree with the weighted number of changes of the informative characters on
+        each edge. The states are assigned from the root: a node keeps the state of its parent when it is in its set,
+        and takes the first state of its set otherwise, so that the changes add up to the length of the tree.
+
+        ### Returns:
+            - dict: The dictionary with edges as keys in format "parent,child" and numbers of changes as values.
+            - list: List of edges, the internal nodes being labeled N_1, N_2, ...
+        """
+        size = len(self._labels)
+        names = self._labels + [f"N_{i + 1}" for i in range(size - 1)]
+        states = np.zeros_like(self._sets)
+        states[self._root] = self._first_state(self._sets[self._root])
+        edges_labels, edges_distance = [], []
+        stack = [self._root] if self._root >= size else []
+        while stack:
+            node = stack.pop()
+            for child in self._children[node]:
+                inherited = ~self._empty(states[node] & self._sets[child])
+                lanes = inherited[self._lane_character] if self._multiple_lanes else inherited
+                states[child] = np.where(lanes, states[node], self._first_state(self._sets[child]))
+                edges_labels.append([names[node], names[child]])
+                edges_distance.append(float((~inherited) @ self._weights))
+                if child >= size:
+                    stack.append(child)
+        return {f"{edge[0]},{edge[1]}": edges_distance[i] for i, edge in enumerate(edges_labels)}, edges_labels
+
+    def _first_state(self, sets: np.ndarray) -> np.ndarray:
+        """Returns the lowest state of each set.
+
+        ### Args:
+            - sets (numpy.ndarray): The lanes of the sets.
+
+        ### Returns:
+            - numpy.ndarray: The lanes of the singletons of the lowest states.
+        """
+        lowest = sets & (~sets + sets.dtype.type(1))
+        if not self._multiple_lanes:
+            return lowest
+        nonzero = (sets != 0).astype(np.int64)
+        before = np.cumsum(nonzero) - nonzero
+        # The lanes of a character after its first non empty lane are cleared.
+        first = (nonzero > 0) & (before == np.repeat(before[self._starts], np.diff(np.append(self._starts, len(sets)))))
+        return np.where(first, lowest, sets.dtype.type(0))
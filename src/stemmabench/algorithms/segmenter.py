@@ -0,0 +1,113 @@
+import re
+from typing import List, Union
+import numpy as np
+
+
+class Segmenter:
+    """Splits texts into segments aligned by position, so that the distances between manuscripts are computed segment
+    by segment. As in the RHM algorithm, segment s of every manuscript is compared with segment s of the others, and the
+    manuscripts with fewer segments have empty segments at the end.
+
+    ### Attributes:
+        - unit (str): The unit of the segments: {line, sentence, words}
+        - size (int): The number of lines, sentences or words of each segment.
+    """
+
+    UNITS = ("line", "sentence", "words")
+    WEIGHTINGS = ("sum", "length")
+
+    def __init__(self, unit: str = "words", size: int = 1) -> None:
+        """Constructor for the Segmenter class.
+
+        ### Args:
+            - unit (str, Optional): The unit of the segments: {line, sentence, words}. Defaults to words.
+            - size (int, Optional): The number of lines, sentences or words of each segment. Defaults to 1.
+
+        ### Raises:
+            - ValueError: If unit is not supported or if size is lower than 1.
+        """
+        if unit not in self.UNITS:
+            raise ValueError(f"Unknown unit {unit}. Supported units are: {list(self.UNITS)}.")
+        if size < 1:
+            raise ValueError("Parameter size must be a positive integer.")
+        self._unit: str = unit
+        self._size: int = size
+
+    @classmethod
+    def resolve(cls, segmentation: Union["Segmenter", str, int]) -> "Segmenter":
+        """Returns the Segmenter corresponding to the given parameter.
+
+        ### Args:
+            - segmentation (Segmenter, str, int): A Segmenter, a unit of segments of size 1, or a number of words.
+
+        ### Returns:
+            - Segmenter: The segmenter.
+        """
+        if isinstance(segmentation, Segmenter):
+            return segmentation
+        if isinstance(segmentation, str):
+            return cls(segmentation)
+        return cls("words", segmentation)
+
+    @property
+    def unit(self):
+        return self._unit
+
+    @property
+    def size(self):
+        return self._size
+
+    def split(self, text: str) -> List[str]:
+        """Returns the segments of a text.
+
+        ### Args:
+            - text (str): The text.
+
+        ### Returns:
+            - list: The segments, of size units each except the last one.
+        """
+        if self.unit == "words":
+            units, separator = text.split(), " "
+        elif self.unit == "line":
+            units, separator = text.splitlines(), "\n"
+        else:
+            units = [sentence.strip() for sentence in re.split(r"(?<=[.!?])\s+", text) if sentence.strip()]
+            separator = " "
+        return [separator.join(units[start:start + self.size]) for start in range(0, len(units), self.size)]
+
+    def align(self, texts: List[str]) -> List[List[str]]:
+        """Returns the segments of texts grouped by position.
+
+        ### Args:
+            - texts (list): The texts.
+
+        ### Returns:
+            - list: The texts of each segment, the first list containing segment 0 of each text. The texts with fewer
+            segments have empty segments at the end.
+        """
+        split = [self.split(text) for text in texts]
+        count = max((len(segments) for segments in split), default=0)
+        return [[segments[position] if position < len(segments) else "" for segments in split]
+                for position in range(count)]
+
+    @staticmethod
+    def weights(segments: List[List[str]], weighting: str = "sum") -> np.ndarray:
+        """Returns the weights of the distance matrices of the segments in the distance matrix of the texts.
+
+        ### Args:
+            - segments (list): The texts of each segment.
+            - weighting (str, Optional): sum gives the same weight 1 to all the segments, length weights each segment by
+            its share of the characters of all the texts: {sum, length}. Defaults to sum.
+
+        ### Returns:
+            - numpy.ndarray: The weight of each segment.
+
+        ### Raises:
+            - ValueError: If weighting is not supported.
+        """
+        if weighting not in Segmenter.WEIGHTINGS:
+            raise ValueError(f"Unknown weighting {weighting}. Supported weightings are: {list(Segmenter.WEIGHTINGS)}.")
+        if weighting == "sum":
+            return np.ones(len(segments))
+        lengths = np.array([sum(len(text) for text in texts) for texts in segments], dtype=np.float64)
+        return lengths / lengths.sum() if lengths.sum() else np.ones(len(segments))
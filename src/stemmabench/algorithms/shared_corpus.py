@@ -0,0 +1,104 @@
+from multiprocessing.shared_memory import SharedMemory
+from typing import List, Union
+import numpy as np
+
+
+class SharedCorpus:
+    """Texts stored once in a block of shared memory, so that worker processes attach to them instead of receiving a
+    pickled copy each. The block contains the number of texts n, the n + 1 offsets of the texts and their concatenated
+    UTF-8 encodings. The process creating the corpus owns the block and frees it when the corpus is closed.
+
+    ### Attributes:
+        - name (str): The name of the block of shared memory, used by other processes to attach to the corpus.
+    """
+
+    def __init__(self, texts: List[str]) -> None:
+        """Constructor for the SharedCorpus class. Copies the texts into a new block of shared memory.
+
+        ### Args:
+            - texts (list): The texts of the corpus.
+        """
+        encoded = [text.encode("utf-8") for text in texts]
+        offsets = np.zeros(len(encoded) + 1, dtype=np.int64)
+        np.cumsum([len(text) for text in encoded], out=offsets[1:])
+        header = 8 * (len(encoded) + 2)
+        self._memory: SharedMemory = SharedMemory(create=True, size=max(1, header + int(offsets[-1])))
+        self._owner: bool = True
+        self._memory.buf[:8] = np.int64(len(encoded)).tobytes()
+        self._memory.buf[8:header] = offsets.tobytes()
+        self._memory.buf[header:header + int(offsets[-1])] = b"".join(encoded)
+        self._load()
+
+    @classmethod
+    def attach(cls, name: str) -> "SharedCorpus":
+        """Attaches to a corpus created by another process.
+
+        ### Args:
+            - name (str): The name of the block of shared memory of the corpus.
+
+        ### Returns:
+            - SharedCorpus: The corpus, reading the texts from the shared block.
+        """
+        corpus = cls.__new__(cls)
+        corpus._memory = SharedMemory(name=name)
+        corpus._owner = False
+        corpus._load()
+        return corpus
+
+    def _load(self) -> None:
+        """Reads the offsets of the texts from the header of the block."""
+        size = int(np.frombuffer(self._memory.buf[:8], dtype=np.int64)[0])
+        # Copied so that no array keeps a reference to the buffer, which would prevent the block from being closed.
+        self._offsets: np.ndarray = np.frombuffer(self._memory.buf[8:8 * (size + 2)], dtype=np.int64).copy()
+        self._offsets += 8 * (size + 2)
+
+    @property
+    def name(self):
+        return self._memory.name
+
+    def __len__(self) -> int:
+        """Returns the number of texts of the corpus."""
+        return len(self._offsets) - 1
+
+    def view(self, index: int) -> memoryview:
+        """Returns the UTF-8 encoding of a text without copying it.
+
+        ### Args:
+            - index (int): The index of the text.
+
+        ### Returns:
+            - memoryview: The bytes of the text in the shared block.
+        """
+        return self._memory.buf[self._offsets[index]:self._offsets[index + 1]]
+
+    def __getitem__(self, index: Union[int, slice]) -> Union[str, List[str]]:
+        """Returns a text, or the list of the texts of a slice.
+
+        ### Args:
+            - index (int, slice): The index of the text or a slice of indices.
+
+        ### Returns:
+            - str, list: The text or the texts.
+        """
+        if isinstance(index, slice):
+            return [self[i] for i in range(*index.indices(len(self)))]
+        if index < 0:
+            index += len(self)
+        if not 0 <= index < len(self):
+            raise IndexError("SharedCorpus index out of range.")
+        view = self.view(index)
+        text = str(view, "utf-8")
+        view.release()
+        return text
+
+    def close(self) -> None:
+        """Detaches from the block of shared memory, and frees it if the corpus was created by this process."""
+        self._memory.close()
+        if self._owner:
+            self._memory.unlink()
+
+    def __enter__(self) -> "SharedCorpus":
+        return self
+
+    def __exit__(self, *args) -> None:
+        self.close()
@@ -86,16 +86,26 @@ class Stemma:
             raise ValueError(f"{folder_path} is not an existing folder path.")
         self._folder_path = folder_path
 
-    def get_edge_values(self) -> Dict[str, Union[float, int]]:
+    def get_edge_values(self, values: str = "length") -> Dict[str, Union[float, int]]:
         """Return dictionary with edges as keys an edge distances as values.
 
+        ### Args:
+            - values (str, Optional): The values of the edges: {length, support}. support returns the frequencies of the
+            bipartitions of the edges in the bootstrap trees, for stemmas computed with bootstrap. Defaults to length.
+
         ### Returns:
-            - dict: Dictionary with edges as keys and edge distances as values.
+            - dict: Dictionary with edges as keys and edge distances or supports as values.
+
+        ### Raises:
+            - ValueError: If values is not supported.
         """
+        if values not in ("length", "support"):
+            raise ValueError(f"Unknown edge values {values}. Supported values are: ['length', 'support'].")
         out = {}
         for key in self.text_lookup:
-            for i in range(len(self.text_lookup[key].edges)):
-                out.update({f"{self.text_lookup[key].label},{self.text_lookup[key].children[i].label}": self.text_lookup[key].edges[i]})
+            edges = self.text_lookup[key].edges if values == "length" else self.text_lookup[key].supports
+            for i in range(len(edges)):
+                out.update({f"{self.text_lookup[key].label},{self.text_lookup[key].children[i].label}": edges[i]})
         return out
 
     def to_edge_list(self) -> list[list[str]]:
@@ -110,6 +120,20 @@ class Stemma:
                 out.append([self.text_lookup[key].label, child.label])
         return out
 
+    def reroot(self, label: str) -> None:
+        """Reroots the stemma tree in place to the manuscript with the given label.
+
+        ### Args:
+            - label (str): The label of the manuscript that will become the root of the stemma.
+
+        ### Raises:
+            - RuntimeError: If the stemma has not been fited yet.
+            - ValueError: If label is not present in the stemma.
+        """
+        if not self.fitted:
+            raise RuntimeError("Stemma not fitted yet.")
+        self._root = self.root.reroot(label)
+
     def dict(self, include_edges: bool = False) -> Dict[str, Any]:
         """Return a dict representation of the tree.
         Dict is empty until tree is fitted (fitting can be done using .fit() method)
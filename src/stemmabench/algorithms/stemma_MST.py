@@ -0,0 +1,195 @@
+import os
+from pathlib import Path
+from typing import Callable, Dict, List, Tuple, Union
+import numpy as np
+from stemmabench.algorithms.stemma_algorithm import StemmaAlgo
+from stemmabench.algorithms.manuscript_in_tree import ManuscriptInTree
+from stemmabench.algorithms.manuscript_in_tree_base import ManuscriptInTreeBase
+from stemmabench.algorithms.utils import Utils
+from stemmabench.algorithms.distance_engine import DistanceEngine
+from stemmabench.algorithms.distance_cache import DistanceCache
+from stemmabench.algorithms.mst_core import MinimumSpanningTree
+from stemmabench.algorithms.distance import Distance
+from stemmabench.algorithms.condensed_matrix import CondensedMatrix
+from stemmabench.algorithms.stemma_NJ import StemmaNJ
+
+
+class StemmaMST(StemmaAlgo):
+    """Class that constructs a stemma from the minimum spanning tree of the manuscripts.
+    Every manuscript is a node of the stemma, so that the surviving manuscripts copied by other surviving manuscripts
+    are internal nodes, as in the traditions of the stemmabench generator, instead of leaves joined by hypothetical
+    ancestors. The tree is built by Prim's algorithm on the condensed distance matrix and rooted at a manuscript chosen by
+    a heuristic or given by its label.
+
+    ### Attributes:
+        - folder_path (str): The path to the folder containing all the texts.
+        - manuscripts (dict): The dictionay of all the texts with text labels as keys and texts as values.
+        - distance (Callable): The function to be used as a distance metric.
+        - _dist_matrix (CondensedMatrix): The distance matrix, stored as its condensed upper triangle.
+        - root (str): The rooting heuristic: {eccentricity, medoid}, or the label of the root.
+        - n_jobs (int): The number of worker processes used to compute the distance matrix.
+        - tile_size (int): The number of rows and columns of each tile of the distance matrix computed at once.
+        - progress (Callable): Function called during the computation of the distance matrix with the number of pairs
+        computed and the total number of pairs.
+        - cache (DistanceCache): The persistent cache of the distances between texts.
+        - dtype (numpy.dtype): The type of the distance matrix, float64 or float32.
+        - matrix_folder (str): The folder in which the distance matrix is memory-mapped, None to keep it in memory.
+        - duplicate_policy (str): The policy used to add the manuscripts with duplicated texts to the stemma.
+    """
+
+    def __init__(self,
+                 distance: Union[Distance, Callable, str],
+                 root: str = "eccentricity",
+                 n_jobs: int = 1,
+                 tile_size: int = 64,
+                 progress: Union[Callable[[int, int], None], None] = None,
+                 cache: Union[DistanceCache, str, None] = None,
+                 dtype: Union[type, np.dtype] = np.float64,
+                 matrix_folder: Union[str, None] = None,
+                 duplicate_policy: str = "child") -> None:
+        """Constructor for the StemmaMST class.
+
+        ### Args:
+            - distance (Distance, Callable, str): A function that takes 2 strings as parameters and returns a numeric
+            value which is the distance between the 2 strings, a Distance computing blocks of the distance matrix at
+            once, or the name of one of the built-in distances: {levenshtein, word_levenshtein, minhash, kmer, ncd}
+            - root (str, Optional): The rooting heuristic, or the label of the manuscript at the root of the stemma.
+            eccentricity roots the stemma at the manuscript minimizing the largest path length to the other
+            manuscripts in the tree, medoid at the manuscript minimizing the sum of its distances to the other
+            manuscripts. Defaults to eccentricity.
+            - n_jobs (int, Optional): The number of worker processes used to compute the distance matrix. -1 uses one
+            process per CPU. Defaults to 1, which computes the matrix in the calling process.
+            - tile_size (int, Optional): The number of rows and columns of each tile of the distance matrix computed at once.
+            - progress (Callable, Optional): Function called during the computation of the distance matrix with the number
+            of pairs computed and the total number of pairs.
+            - cache (DistanceCache, str, Optional): A DistanceCache or the path of its folder. The distances between
+            texts are stored in the cache and only the pairs of texts missing from it are computed.
+            - dtype (numpy.dtype, Optional): The type of the distance matrix, float64 or float32. Defaults to float64.
+            - matrix_folder (str, Optional): The folder in which the distance matrix is memory-mapped, for traditions
+            whose matrix does not fit in memory. The distance matrix is kept in distances.npy and reused by the next
+            computations on the same texts.
+            - duplicate_policy (str, Optional): The policy used to add the manuscripts with identical texts, collapsed
+            before computing the distances, back to the stemma: {sibling, child, none}. Defaults to child, which keeps
+            every node of the stemma a manuscript.
+
+        ### Raises:
+            - ValueError: If the distance parameter is not the name of a built-in distance.
+            - ValueError: If the distance parameter does not respect d(x,x) = 0 or d(x,y) = d(y,x).
+            - ValueError: If duplicate_policy is not a supported policy.
+            - RuntimeError: If was unable to create matrix_folder.
+        """
+        super().__init__()
+        if duplicate_policy not in self.DUPLICATE_POLICIES:
+            raise ValueError(f"Unknown duplicate policy {duplicate_policy}. "
+                             f"Supported policies are: {list(self.DUPLICATE_POLICIES)}.")
+        if isinstance(distance, str):
+            distance = Distance.resolve(distance)
+        if not StemmaNJ.is_similarity(distance):
+            raise ValueError(
+                "The distance parameter function is not an acceptable similarity metric. It must respect d(x,x) = 0 and d(x,y) = d(y,x).")
+        if matrix_folder is not None and not os.path.isdir(matrix_folder):
+            try:
+                Path(matrix_folder).mkdir(parents=True, exist_ok=True)
+            except OSError:
+                raise RuntimeError(f"Was unable to create the directory {matrix_folder}.")
+        self._dist_matrix: Union[CondensedMatrix, None] = None
+        self._distance: Union[Distance, Callable] = distance
+        self._root: str = root
+        self._dtype: np.dtype = np.dtype(dtype)
+        self._matrix_folder: Union[str, None] = matrix_folder
+        self._duplicate_policy: str = duplicate_policy
+        self._engine: DistanceEngine = DistanceEngine(distance, n_jobs=n_jobs, tile_size=tile_size, progress=progress,
+                                                      cache=cache)
+
+    @property
+    def dist_matrix(self):
+        return self._dist_matrix
+
+    @property
+    def distance(self):
+        return self._distance
+
+    @property
+    def root(self):
+        return self._root
+
+    @property
+    def n_jobs(self):
+        return self._engine.n_jobs
+
+    @property
+    def tile_size(self):
+        return self._engine.tile_size
+
+    @property
+    def progress(self):
+        return self._engine.progress
+
+    @property
+    def cache(self):
+        return self._engine.cache
+
+    @property
+    def dtype(self):
+        return self._dtype
+
+    @property
+    def matrix_folder(self):
+        return self._matrix_folder
+
+    @property
+    def duplicate_policy(self):
+        return self._duplicate_policy
+
+    def compute(self, folder_path: str) -> ManuscriptInTreeBase:
+        """Builds the stemma tree.
+
+        ### Args:
+            - folder_path (str): The path to the folder containing the texts. The path specified here will surplant the previous path defined in constructor.
+            !!! All .txt files in this folder must be files containing Manuscript texts unless the file name contains the substring "edge" !!!
+
+        Returns:
+            - Manuscript: The root of the stemma with the rest of its tree as its children.
+
+        Raises:
+            - ValueError: If root is neither a rooting heuristic nor the label of a manuscript.
+        """
+        super().compute(folder_path)
+        if self.root not in MinimumSpanningTree.ROOTINGS and self.root not in self.manuscripts:
+            raise ValueError(f"Unknown root {self.root}. The root must be one of the manuscripts or one of the "
+                             f"heuristics: {list(MinimumSpanningTree.ROOTINGS)}.")
+        self._duplicates = self.collapse_duplicates() if self.duplicate_policy != "none" else {}
+        self.dist()
+        edges_dict, edges_list = self.expand_duplicates(*self._build_edges(), policy=self.duplicate_policy)
+        if not edges_list:
+            return ManuscriptInTree(parent=None, label=next(iter(self.manuscripts)), children=[], edges=[])
+        out = ManuscriptInTree(parent=None, recursive=Utils.dict_from_edge(edge_list=edges_list),
+                               text_list=list(self.manuscripts.keys()))
+        out.set_edges(edges_dict)
+        if self.root in self.manuscripts and out.label != self.root:
+            # The root is a duplicate, or the sibling policy placed a new node above it.
+            out = out.reroot(self.root)
+        return out
+
+    def dist(self) -> None:
+        """Builds the condensed distance matrix of the unique manuscripts, in the order of their labels, and sets the
+        attribute _dist_matrix.
+        """
+        manuscripts = self.unique_manuscripts
+        texts = [manuscripts[key] for key in sorted(manuscripts.keys())]
+        path = os.path.join(self.matrix_folder, "distances.npy") if self.matrix_folder else None
+        self._dist_matrix = self._engine.compute_condensed(texts, dtype=self.dtype, path=path)
+
+    def _build_edges(self) -> Tuple[Dict[str, float], List[List[str]]]:
+        """Builds list of edges as well as the associated dictionary containing the edge distances.
+
+        ### Returns:
+            - dict: The dictionary with edges as keys and distances as values.
+            - list: List of edges.
+        """
+        labels = sorted(self.unique_manuscripts.keys())
+        root = self.root
+        if root not in MinimumSpanningTree.ROOTINGS and root not in labels:
+            # The root is a duplicate, the tree is rooted at the manuscript it was collapsed into.
+            root = next(label for label, duplicates in self.duplicates.items() if root in duplicates)
+        return MinimumSpanningTree(self._dist_matrix, labels, root=root).build()
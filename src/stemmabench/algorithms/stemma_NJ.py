@@ -1,12 +1,46 @@
-from concurrent.futures import ThreadPoolExecutor
-from concurrent.futures._base import Future
+import os
+from concurrent.futures import ProcessPoolExecutor
 from numbers import Number
+from pathlib import Path
 from typing import Callable, Dict, Union, Tuple, List
 import numpy as np
 from stemmabench.algorithms.stemma_algorithm import StemmaAlgo
 from stemmabench.algorithms.manuscript_in_tree_base import ManuscriptInTreeBase
 from stemmabench.algorithms.manuscript_in_tree_empty import ManuscriptInTreeEmpty
 from stemmabench.algorithms.utils import Utils
+from stemmabench.algorithms.distance_engine import DistanceEngine
+from stemmabench.algorithms.distance_cache import DistanceCache
+from stemmabench.algorithms.nj_core import NeighborJoining
+from stemmabench.algorithms.distance import Distance
+from stemmabench.algorithms.condensed_matrix import CondensedMatrix
+from stemmabench.algorithms.segmenter import Segmenter
+from stemmabench.algorithms.consensus import Consensus
+
+
+# Set in each worker process by _init_bootstrap_worker, the arguments of StemmaNJ.bootstrap_tree shared by all the trees.
+_BOOTSTRAP_ARGS: tuple = ()
+
+
+def _init_bootstrap_worker(*args) -> None:
+    """Initializer of the worker processes of the bootstrap, receiving the matrices of the segments once.
+
+    ### Args:
+        - *args: The matrices, weights, labels, dtype and search passed to StemmaNJ.bootstrap_tree.
+    """
+    global _BOOTSTRAP_ARGS
+    _BOOTSTRAP_ARGS = args
+
+
+def _bootstrap_worker(counts: np.ndarray) -> List[List[str]]:
+    """Builds a bootstrap tree in a worker process.
+
+    ### Args:
+        - counts (numpy.ndarray): The number of times each segment is drawn.
+
+    ### Returns:
+        - list: The edges of the tree.
+    """
+    return StemmaNJ.bootstrap_tree(*_BOOTSTRAP_ARGS, counts)
 
 
 class StemmaNJ(StemmaAlgo):
@@ -16,32 +50,132 @@ class StemmaNJ(StemmaAlgo):
         - folder_path (str): The path to the folder containing all the texts.
         - manuscripts (dict): The dictionay of all the texts with text labels as keys and texts as values.
         - distance (Callable): The function to be used as a distance metric.
-        - _dist_matrix (numpy.ndarray): The distance matrix
+        - _dist_matrix (CondensedMatrix): The distance matrix, stored as its condensed upper triangle.
         - _rooting_method (str): The rooting method used on the tree resulting from Neighbor-Joining algorithm.
+        - n_jobs (int): The number of worker processes used to compute the distance matrix.
+        - tile_size (int): The number of rows and columns of each tile of the distance matrix computed at once.
+        - progress (Callable): Function called during the computation of the distance matrix with the number of pairs
+        computed and the total number of pairs.
+        - cache (DistanceCache): The persistent cache of the distances between texts.
+        - dtype (numpy.dtype): The type of the matrix used by the Neighbor-Joining algorithm, float64 or float32.
+        - search (str): The strategy used to search the pair of nodes to be joined: {exact, rapid}
+        - matrix_folder (str): The folder in which the matrices are memory-mapped, None to keep them in memory.
+        - duplicate_policy (str): The policy used to add the manuscripts with duplicated texts to the stemma.
+        - segmentation (Segmenter): The segmentation of the texts whose distances are computed segment by segment, None
+        to compare the whole texts.
+        - segment_weighting (str): The weighting of the segments in the distance matrix: {sum, length}
+        - segment_matrices (list): The condensed distance matrix of each segment, None without segmentation.
+        - segment_weights (numpy.ndarray): The weight of each segment in the distance matrix, None without segmentation.
+        - bootstrap (int): The number of bootstrap trees built on resampled segments, 0 for no support values.
+        - seed (int): The seed of the resampling of the segments.
+        - supports (dict): The frequency of the bipartition of each edge of the stemma in the bootstrap trees.
     """
 
     def __init__(self, 
-                 distance: Callable,
-                 rooting_method: str = "midpoint-dist") -> None:
+                 distance: Union[Distance, Callable, str],
+                 rooting_method: str = "midpoint-dist",
+                 n_jobs: int = 1,
+                 tile_size: int = 64,
+                 progress: Union[Callable[[int, int], None], None] = None,
+                 cache: Union[DistanceCache, str, None] = None,
+                 dtype: Union[type, np.dtype] = np.float64,
+                 search: str = "exact",
+                 matrix_folder: Union[str, None] = None,
+                 duplicate_policy: str = "none",
+                 segmentation: Union[Segmenter, str, int, None] = None,
+                 segment_weighting: str = "sum",
+                 bootstrap: int = 0,
+                 seed: Union[int, None] = None) -> None:
         """
         Constructor for the StemmaNJ class.
 
         ### Args:
-            - distance (Callable): A function that takes 2 strings as parameters and returns a numeric value which is
-            the distance between the 2 strings.
+            - distance (Distance, Callable, str): A function that takes 2 strings as parameters and returns a numeric value which is
+            the distance between the 2 strings, a Distance computing blocks of the distance matrix at once, or the name
+            of one of the built-in distances: {levenshtein, word_levenshtein, minhash, kmer, ncd}
             - rooting_method (str, Optional): Indicates the method used for rooting the tree. If set to none will return an unrroted tree. 
             Supported methods are: {midpoint-dist, midpoint-edge, none}
+            - n_jobs (int, Optional): The number of worker processes used to compute the distance matrix. -1 uses one
+            process per CPU. Defaults to 1, which computes the matrix in the calling process. The distance function must
+            be picklable if different than 1.
+            - tile_size (int, Optional): The number of rows and columns of each tile of the distance matrix computed at once.
+            - progress (Callable, Optional): Function called during the computation of the distance matrix with the number
+            of pairs computed and the total number of pairs.
+            - cache (DistanceCache, str, Optional): A DistanceCache or the path of its folder. The distances between
+            texts are stored in the cache and only the pairs of texts missing from it are computed.
+            - dtype (numpy.dtype, Optional): The type of the distance matrix and of the matrix used by the
+            Neighbor-Joining algorithm, float64 or float32. Defaults to float64.
+            - search (str, Optional): The strategy used to search the pair of nodes to be joined at each step:
+            {exact, rapid}. rapid keeps the distances of each row sorted and skips most pairs, as in RapidNJ. Both
+            strategies return the same tree. Defaults to exact.
+            - matrix_folder (str, Optional): The folder in which the distance matrix and the matrix of the
+            Neighbor-Joining algorithm are memory-mapped, for traditions whose matrices do not fit in memory. The
+            distance matrix is kept in distances.npy and reused by the next computations on the same texts.
+            - duplicate_policy (str, Optional): With sibling or child the manuscripts with identical texts are collapsed
+            before computing the distances, and the Neighbor-Joining algorithm only runs on the unique texts. This
+            parameter is the policy used to add the duplicates back to the stemma: {sibling, child, none}. sibling joins
+            a manuscript and its duplicates to a new node with edges of length 0, child adds the duplicates as children
+            of the manuscript and none does not collapse the duplicates. Defaults to none.
+            - segmentation (Segmenter, str, int, Optional): Splits the texts into segments aligned by position, whose
+            distances are computed independently by the worker processes: a Segmenter, line or sentence for segments of
+            one line or sentence, or a number of words per segment as in RHM. The distance matrix is the weighted sum of
+            the matrices of the segments, which are kept in segment_matrices. Defaults to the whole texts.
+            - segment_weighting (str, Optional): The weight of each segment in the distance matrix: {sum, length}. sum
+            adds the distances of all the segments and length weights each segment by its share of the characters of
+            the texts. Defaults to sum.
+            - bootstrap (int, Optional): The number of bootstrap trees. The segments are drawn with replacement and each
+            tree is built on the weighted sum of the matrices of the drawn segments, without computing distances again,
+            by the worker processes. Each edge of the stemma is annotated with the frequency of its bipartition of the
+            manuscripts in the bootstrap trees, available through Stemma.get_edge_values("support"). Requires a
+            segmentation. Defaults to 0, no bootstrap.
+            - seed (int, Optional): The seed of the resampling of the segments. Defaults to a random seed.
 
         Raises:
+            - ValueError: If the distance parameter is not the name of a built-in distance.
             - ValueError: If the distance parameter does not respect d(x,x) = 0 or d(x,y) = d(y,x).
+            - ValueError: If search is not a supported strategy.
+            - ValueError: If duplicate_policy is not a supported policy.
+            - ValueError: If segmentation or segment_weighting is not supported.
+            - ValueError: If bootstrap is negative, or positive without segmentation.
+            - RuntimeError: If was unable to create matrix_folder.
         """
         super().__init__()
+        if search not in NeighborJoining.SEARCHES:
+            raise ValueError(f"Unknown search {search}. Supported searches are: {list(NeighborJoining.SEARCHES)}.")
+        if duplicate_policy not in self.DUPLICATE_POLICIES:
+            raise ValueError(f"Unknown duplicate policy {duplicate_policy}. "
+                             f"Supported policies are: {list(self.DUPLICATE_POLICIES)}.")
+        if segment_weighting not in Segmenter.WEIGHTINGS:
+            raise ValueError(f"Unknown segment weighting {segment_weighting}. "
+                             f"Supported weightings are: {list(Segmenter.WEIGHTINGS)}.")
+        if bootstrap < 0 or (bootstrap and segmentation is None):
+            raise ValueError("Parameter bootstrap must be a positive integer, and requires a segmentation.")
+        if isinstance(distance, str):
+            distance = Distance.resolve(distance)
         if not self.is_similarity(distance):
             raise ValueError(
                 "The distance parameter function is not an acceptable similarity metric. It must respect d(x,x) = 0 and d(x,y) = d(y,x).")
-        self._dist_matrix: Union[np.ndarray, None] = None
-        self._distance: Callable = distance
+        self._dist_matrix: Union[CondensedMatrix, np.ndarray, None] = None
+        self._distance: Union[Distance, Callable] = distance
         self._rooting_method: str = rooting_method
+        self._dtype: np.dtype = np.dtype(dtype)
+        self._search: str = search
+        if matrix_folder is not None and not os.path.isdir(matrix_folder):
+            try:
+                Path(matrix_folder).mkdir(parents=True, exist_ok=True)
+            except OSError:
+                raise RuntimeError(f"Was unable to create the directory {matrix_folder}.")
+        self._matrix_folder: Union[str, None] = matrix_folder
+        self._duplicate_policy: str = duplicate_policy
+        self._segmentation: Union[Segmenter, None] = None if segmentation is None else Segmenter.resolve(segmentation)
+        self._segment_weighting: str = segment_weighting
+        self._segment_matrices: Union[List[CondensedMatrix], None] = None
+        self._segment_weights: Union[np.ndarray, None] = None
+        self._bootstrap: int = bootstrap
+        self._seed: Union[int, None] = seed
+        self._supports: Dict[str, float] = {}
+        self._engine: DistanceEngine = DistanceEngine(distance, n_jobs=n_jobs, tile_size=tile_size, progress=progress,
+                                                      cache=cache)
 
     @property
     def dist_matrix(self):
@@ -51,6 +185,66 @@ class StemmaNJ(StemmaAlgo):
     def distance(self):
         return self._distance
 
+    @property
+    def n_jobs(self):
+        return self._engine.n_jobs
+
+    @property
+    def tile_size(self):
+        return self._engine.tile_size
+
+    @property
+    def progress(self):
+        return self._engine.progress
+
+    @property
+    def cache(self):
+        return self._engine.cache
+
+    @property
+    def dtype(self):
+        return self._dtype
+
+    @property
+    def search(self):
+        return self._search
+
+    @property
+    def matrix_folder(self):
+        return self._matrix_folder
+
+    @property
+    def duplicate_policy(self):
+        return self._duplicate_policy
+
+    @property
+    def segmentation(self):
+        return self._segmentation
+
+    @property
+    def segment_weighting(self):
+        return self._segment_weighting
+
+    @property
+    def segment_matrices(self):
+        return self._segment_matrices
+
+    @property
+    def segment_weights(self):
+        return self._segment_weights
+
+    @property
+    def bootstrap(self):
+        return self._bootstrap
+
+    @property
+    def seed(self):
+        return self._seed
+
+    @property
+    def supports(self):
+        return self._supports
+
     def compute(self, folder_path: str) -> ManuscriptInTreeBase:
         """Builds the stemma tree. If the distance is specified in function call it will surplant the existing distance if it exists.
 
@@ -62,8 +256,9 @@ class StemmaNJ(StemmaAlgo):
             - Manuscript: The root of the stemma with the rest of its tree as its children.
         """
         super().compute(folder_path)
-        self.dist(distance=self.distance)
-        edges_dict, edges_list = self._build_edges()
+        self._duplicates = self.collapse_duplicates() if self.duplicate_policy != "none" else {}
+        self.dist()
+        edges_dict, edges_list = self.expand_duplicates(*self._build_edges(), policy=self.duplicate_policy)
         if self._rooting_method == "midpoint-dist":
             edges_list = Utils.set_new_root(
                 edge_list=edges_list, new_root=Utils.find_midpoint_root(edges_list, edges_dict))
@@ -73,15 +268,18 @@ class StemmaNJ(StemmaAlgo):
         out = ManuscriptInTreeEmpty(parent=None, recursive=Utils.dict_from_edge(
             edge_list=edges_list), text_list=list(self.manuscripts.keys()))
         out.set_edges(edges_dict)
+        if self.bootstrap:
+            self._supports = self.bootstrap_supports(edges_list)
+            out.set_supports(self._supports)
         return out
 
     @staticmethod
-    def is_similarity(distance: Callable) -> bool:
+    def is_similarity(distance: Union[Distance, Callable]) -> bool:
         """Checks to see if the function passed does in fact return a distance.
-        Checks that d(x,x) = 0 and d(x,y) = d(y,x)
+        Checks that d(x,x) = 0 and d(x,y) = d(y,x). A Distance is checked with a single call to its pairwise method.
 
         ### Args:
-            - distance (Callable): The distance function to be tested.
+            - distance (Distance, Callable): The distance function to be tested.
 
         ### Returns:
             - bool: True if the function does return a distance. Else false.
@@ -90,6 +288,8 @@ class StemmaNJ(StemmaAlgo):
             - ValueError: If distance is not a parameter.
             - ValueError: If distance method does not return a number.
         """
+        if isinstance(distance, Distance):
+            return distance.is_similarity()
         if not callable(distance):
             raise ValueError("The distance parameter is not callable.")
         if not isinstance(distance("test", "test1"), Number):
@@ -100,92 +300,127 @@ class StemmaNJ(StemmaAlgo):
             return False
         return True
 
-    def dist(self, distance: Callable) -> None:
+    def dist(self, distance: Union[Distance, Callable, None] = None) -> None:
         """Builds the distance matix based on the provided distance function and sets the attribute _dist_matrix.
+        The matrix is stored as its condensed upper triangle, with values of the type of the Neighbor-Joining matrix.
+        Only the unique manuscripts are in the matrix, in the order of their labels. With a segmentation, the matrices
+        of the segments are computed by the same pool of worker processes and kept in memory, and the distance matrix is
+        their weighted sum.
 
         ### Args:
-            - distance (Callable): A function that takes as parameters 2 strings and that returns the distance between them.
+            - distance (Distance, Callable, Optional): A function that takes as parameters 2 strings and that returns the
+            distance between them, or a Distance. If it is not the distance of the stemma, it replaces it and the
+            distance engine is rebuilt with the same settings. Defaults to the distance of the stemma.
         """
-        self._dist_matrix = np.zeros((len(self._manuscripts), len(self._manuscripts)), dtype=float)
-        keys = list(self._manuscripts.keys())
-        keys.sort()
-        labels = {}
-        man_range = range(len(self._manuscripts))
-        with ThreadPoolExecutor(max_workers=len(self._manuscripts)*len(self._manuscripts)) as executor:
-            for row in man_range:
-                for col in man_range:
-                    if col >= row:
-                        labels.update({f"{keys[row]},{keys[col]}" : executor.submit(distance, self._manuscripts[keys[row]], self._manuscripts[keys[col]])})
-        for row in enumerate(keys, start=0):
-            for col in enumerate(keys, start=0):
-                if col[0] >= row[0]:
-                    self._dist_matrix[row[0]][col[0]] = labels[f"{row[1]},{col[1]}"].result()
-        self._dist_matrix = self._dist_matrix + self._dist_matrix.transpose()
+        if distance is not None and distance is not self._distance:
+            self._distance = distance
+            self._engine = DistanceEngine(distance, n_jobs=self.n_jobs, tile_size=self.tile_size,
+                                          progress=self.progress, cache=self.cache)
+        engine = self._engine
+        manuscripts = self.unique_manuscripts
+        keys = sorted(manuscripts.keys())
+        texts = [manuscripts[key] for key in keys]
+        if self.segmentation is not None:
+            segments = self.segmentation.align(texts)
+            self._segment_matrices = engine.compute_segments(segments, dtype=self.dtype)
+            self._segment_weights = Segmenter.weights(segments, self.segment_weighting)
+            self._dist_matrix = self.combine_segments(self._segment_weights)
+            return
+        path = os.path.join(self.matrix_folder, "distances.npy") if self.matrix_folder else None
+        self._dist_matrix = engine.compute_condensed(texts, dtype=self.dtype, path=path)
 
-    def _build_edges(self) -> Tuple[Dict[str, float], List[List[str]]]:
-        """Builds list of edges as well as the associated dictionayr containing the edge distances.
+    def combine_segments(self, weights: np.ndarray) -> CondensedMatrix:
+        """Returns the weighted sum of the distance matrices of the segments.
+
+        ### Args:
+            - weights (numpy.ndarray): The weight of each segment.
 
         ### Returns:
-            - dict: The dictionary with edges as keys and distences as values.
-            - list: List of edges.
+            - CondensedMatrix: The distance matrix of the manuscripts.
+
+        ### Raises:
+            - RuntimeError: If the matrices of the segments were not computed.
         """
-        temp_dist_matrix = self._dist_matrix.copy()
-        labels = sorted(list(self.manuscripts.keys()))
-        edges_labels = []
-        edges_distance = []
-        while temp_dist_matrix.shape[0] > 2:
-            temp_dist_matrix, labels, df, f_lab, dg, g_lab = self._agglo(
-                temp_dist_matrix, labels)
-            edges_labels.append([labels[len(labels)-1], f_lab])
-            edges_distance.append(df)
-            edges_labels.append([labels[len(labels)-1], g_lab])
-            edges_distance.append(dg)
-        edges_distance.append(temp_dist_matrix[0, 1])
-        edges_labels.append([labels[0], labels[1]])
-        edges_dict_labels = [l[0] + "," + l[1] for l in edges_labels]
-        return {edges_dict_labels[i]: edges_distance[i] for i in range(len(edges_dict_labels))}, edges_labels
-
-    def _agglo(self, dist_mat: np.ndarray, labels: List[str]) -> Tuple[np.ndarray, List[str], float, str, float, str]:
-        """Performs one step in the distance matrix agglomeration process and returns all information needed for Neighbour Joining.
-           Does not work for matrix 2*2. 
+        if self._segment_matrices is None:
+            raise RuntimeError("The distances of the segments were not computed, a segmentation is required.")
+        size = len(self.unique_manuscripts)
+        out = np.zeros(size * (size - 1) // 2, dtype=np.float64)
+        for weight, matrix in zip(weights, self._segment_matrices):
+            if weight:
+                out += weight * matrix.data
+        return CondensedMatrix(size, dtype=self.dtype, data=out.astype(self.dtype))
+
+    def bootstrap_supports(self, edges_list: List[List[str]]) -> Dict[str, float]:
+        """Builds the bootstrap trees and returns the frequency of the bipartition of each edge of the stemma in them.
+        The edges whose bipartition separates at most one unique manuscript from the others are in every tree and have
+        a support of 1.
+
+        ### Args:
+            - edges_list (list): The edges of the stemma.
+
+        ### Returns:
+            - dict: The support of each edge, with the edges as keys in the format "node_label1,node_label2".
+        """
+        labels = sorted(self.unique_manuscripts.keys())
+        segments = len(self.segment_matrices)
+        draws = np.random.default_rng(self.seed).multinomial(segments, np.full(segments, 1 / segments),
+                                                             size=self.bootstrap)
+        args = ([matrix.data for matrix in self.segment_matrices], self.segment_weights, labels, self.dtype,
+                self.search)
+        if self.n_jobs == 1 or self.bootstrap < 2:
+            trees = [self.bootstrap_tree(*args, counts) for counts in draws]
+        else:
+            with ProcessPoolExecutor(max_workers=min(self.n_jobs, self.bootstrap), initializer=_init_bootstrap_worker,
+                                     initargs=args) as executor:
+                trees = list(executor.map(_bootstrap_worker, draws))
+        consensus = Consensus(labels)
+        for tree in trees:
+            consensus.add(tree)
+        return consensus.supports(edges_list)
+
+    @staticmethod
+    def bootstrap_tree(matrices: List[np.ndarray],
+                       weights: np.ndarray,
+                       labels: List[str],
+                       dtype: np.dtype,
+                       search: str,
+                       counts: np.ndarray) -> List[List[str]]:
+        """Builds the Neighbor-Joining tree of a resampling of the segments.
 
         ### Args:
-            - dist_mat (np.ndarray): A !!!insert name here!!! distance matrix to be agglomerated by one step.
-            - labels (list): The list of labels that corespond to the distance matrix labels. Can be found in manuscrips.keys().
+            - matrices (list): The condensed upper triangles of the distance matrices of the segments.
+            - weights (numpy.ndarray): The weight of each segment.
+            - labels (list): The labels of the manuscripts, in the order of the rows of the matrices.
+            - dtype (numpy.dtype): The type of the matrix used by the Neighbor-Joining algorithm.
+            - search (str): The strategy used to search the pair of nodes to be joined.
+            - counts (numpy.ndarray): The number of times each segment is drawn.
 
         ### Returns:
-            - np.ndarray: The distance matrix agglomerated by one step.
-            - list: The list of labels for the new agglomerated matrix.
-            - float: Distance between the the agglomerrated manuscript f and the new node u.
-            - str: The label of the manuscript f.
-            - float: Distance between the the agglomerrated manuscript g and the new node u.
-            - str: The label of the manuscript g.
+            - list: The edges of the tree.
+        """
+        if len(labels) < 2:
+            return []
+        data = np.zeros(len(labels) * (len(labels) - 1) // 2, dtype=np.float64)
+        for count, weight, matrix in zip(counts, weights, matrices):
+            if count:
+                data += count * weight * matrix
+        matrix = CondensedMatrix(len(labels), dtype=dtype, data=data.astype(dtype))
+        return NeighborJoining(matrix, labels, dtype=dtype, search=search).build()[1]
+
+    def _build_edges(self) -> Tuple[Dict[str, float], List[List[str]]]:
+        """Builds list of edges as well as the associated dictionayr containing the edge distances.
+
+        ### Returns:
+            - dict: The dictionary with edges as keys and distences as values.
+            - list: List of edges.
         """
-        # Calculate divergence matrix
-        Q = (dist_mat.shape[0] - 2) * dist_mat - (dist_mat.sum(
-            axis=0).reshape((dist_mat.shape[0], 1)) + dist_mat.sum(axis=1))
-        Q = Q.round(7)
-        np.fill_diagonal(Q, 0)
-        # Find min of divergence matrix
-        coord = np.argwhere(Q == Q.min())[0]
-        # The distances d(f,u) and d(g,u)
-        df = round(0.5*dist_mat[coord[0], coord[1]] + (dist_mat[coord[0],
-                                                                ].sum() - dist_mat[coord[1],].sum())/(2*(dist_mat.shape[0] - 2)), 7)
-        dg = round(dist_mat[coord[0], coord[1]] - df, 7)
-        # Removed agglomerated rows and columns
-        out = np.delete(np.delete(dist_mat, obj=coord, axis=0),
-                        obj=coord, axis=1).round(7)
-        # Vector to be appended to side of reduced matrix
-        vect = 0.5*(np.delete(dist_mat[coord[0],], [coord[0], coord[1]]) + np.delete(
-            dist_mat[coord[1],], [coord[0], coord[1]]) - dist_mat[coord[0], coord[1]])
-        vect = vect.round(7)
-        # Stick new U distance vectors on the right and bottom of the original distance matrix
-        out = np.row_stack((np.column_stack((out, vect)),
-                           np.append(vect, 0))).round(7)
-        # Extracting labels and creating new node label
-        f_label = labels[coord[0]]
-        g_label = labels[coord[1]]
-        new_label = "N_" + str(self.dist_matrix.shape[0] - len(labels) + 1)
-        labels = list(np.delete(labels, coord))
-        labels.append(new_label)
-        return out, labels, df, f_label, dg, g_label
+        labels = sorted(self.unique_manuscripts.keys())
+        if len(labels) < 2:
+            return {}, []
+        if not self.matrix_folder:
+            return NeighborJoining(self._dist_matrix, labels, dtype=self.dtype, search=self.search).build()
+        path = os.path.join(self.matrix_folder, "neighbor_joining.npy")
+        edges = NeighborJoining(self._dist_matrix, labels, dtype=self.dtype, search=self.search, path=path).build()
+        # The working matrix is modified by the algorithm and cannot be reused.
+        os.remove(path)
+        return edges
@@ -0,0 +1,271 @@
+from difflib import SequenceMatcher
+from typing import Callable, Dict, List, Tuple, Union
+import numpy as np
+from stemmabench.algorithms.stemma_algorithm import StemmaAlgo
+from stemmabench.algorithms.manuscript_in_tree_base import ManuscriptInTreeBase
+from stemmabench.algorithms.manuscript_in_tree_empty import ManuscriptInTreeEmpty
+from stemmabench.algorithms.utils import Utils
+from stemmabench.algorithms.distance_engine import DistanceEngine
+from stemmabench.algorithms.distance_cache import DistanceCache
+from stemmabench.algorithms.nj_core import NeighborJoining
+from stemmabench.algorithms.mst_core import MinimumSpanningTree
+from stemmabench.algorithms.parsimony_core import FitchParsimony
+from stemmabench.algorithms.distance import Distance
+from stemmabench.algorithms.condensed_matrix import CondensedMatrix
+from stemmabench.algorithms.stemma_NJ import StemmaNJ
+
+
+class StemmaParsimony(StemmaAlgo):
+    """Class that constructs a stemma by maximum parsimony on the variant locations of the tradition.
+    The texts are collated word by word against the manuscript closest to all the others, each position of this base
+    text being a variant location whose readings are the words of the manuscripts aligned to it. A starting tree is
+    built by Neighbor-Joining or as the minimum spanning tree of the distance matrix, then improved by a local search
+    of the tree of minimal Fitch length, the number of changes of reading along its edges, with FitchParsimony. The
+    edges of the stemma are the numbers of changes of the informative variant locations.
+
+    ### Attributes:
+        - folder_path (str): The path to the folder containing all the texts.
+        - manuscripts (dict): The dictionay of all the texts with text labels as keys and texts as values.
+        - distance (Callable): The function to be used as a distance metric for the starting tree.
+        - _dist_matrix (CondensedMatrix): The distance matrix, stored as its condensed upper triangle.
+        - _rooting_method (str): The rooting method used on the tree resulting from the search.
+        - start (str): The algorithm building the starting tree: {nj, mst}
+        - search (str): The moves of the local search: {spr, nni, none}
+        - max_rounds (int): The maximal number of rounds of the local search, None for no limit.
+        - n_jobs (int): The number of worker processes used to compute the distance matrix.
+        - tile_size (int): The number of rows and columns of each tile of the distance matrix computed at once.
+        - progress (Callable): Function called during the computation of the distance matrix with the number of pairs
+        computed and the total number of pairs.
+        - cache (DistanceCache): The persistent cache of the distances between texts.
+        - dtype (numpy.dtype): The type of the distance matrix, float64 or float32.
+        - duplicate_policy (str): The policy used to add the manuscripts with duplicated texts to the stemma.
+        - characters (numpy.ndarray): The readings of the unique manuscripts at each variant location.
+        - length (int): The Fitch length of the stemma.
+        - evaluated (int): The number of candidate trees whose length was computed by the local search.
+    """
+
+    STARTS: Tuple[str, ...] = ("nj", "mst")
+
+    def __init__(self,
+                 distance: Union[Distance, Callable, str] = "levenshtein",
+                 start: str = "nj",
+                 search: str = "spr",
+                 max_rounds: Union[int, None] = None,
+                 rooting_method: str = "midpoint-dist",
+                 n_jobs: int = 1,
+                 tile_size: int = 64,
+                 progress: Union[Callable[[int, int], None], None] = None,
+                 cache: Union[DistanceCache, str, None] = None,
+                 dtype: Union[type, np.dtype] = np.float64,
+                 duplicate_policy: str = "none") -> None:
+        """Constructor for the StemmaParsimony class.
+
+        ### Args:
+            - distance (Distance, Callable, str, Optional): The distance used to build the starting tree and to choose
+            the base text of the collation, as for StemmaNJ. Defaults to levenshtein.
+            - start (str, Optional): The starting tree: {nj, mst}. nj uses the Neighbor-Joining tree, mst the minimum
+            spanning tree, whose internal manuscripts are joined to their node. Defaults to nj.
+            - search (str, Optional): The moves of the local search: {spr, nni, none}. spr regrafts each subtree on any
+            edge, nni on the edges adjacent to its own, and none keeps the starting tree. Defaults to spr.
+            - max_rounds (int, Optional): The maximal number of rounds of the local search, each round trying to move
+            every subtree once. Defaults to no limit.
+            - rooting_method (str, Optional): Indicates the method used for rooting the tree. If set to none will return
+            an unrooted tree. Supported methods are: {midpoint-dist, midpoint-edge, none}
+            - n_jobs (int, Optional): The number of worker processes used to compute the distance matrix. -1 uses one
+            process per CPU. Defaults to 1, which computes the matrix in the calling process.
+            - tile_size (int, Optional): The number of rows and columns of each tile of the distance matrix computed at once.
+            - progress (Callable, Optional): Function called during the computation of the distance matrix with the number
+            of pairs computed and the total number of pairs.
+            - cache (DistanceCache, str, Optional): A DistanceCache or the path of its folder. The distances between
+            texts are stored in the cache and only the pairs of texts missing from it are computed.
+            - dtype (numpy.dtype, Optional): The type of the distance matrix, float64 or float32. Defaults to float64.
+            - duplicate_policy (str, Optional): The policy used to add the manuscripts with identical texts, collapsed
+            before the collation, back to the stemma: {sibling, child, none}. Defaults to none.
+
+        ### Raises:
+            - ValueError: If the distance parameter is not the name of a built-in distance.
+            - ValueError: If the distance parameter does not respect d(x,x) = 0 or d(x,y) = d(y,x).
+            - ValueError: If start, search or duplicate_policy is not supported.
+            - ValueError: If max_rounds is not positive.
+        """
+        super().__init__()
+        if start not in self.STARTS:
+            raise ValueError(f"Unknown start {start}. Supported starting trees are: {list(self.STARTS)}.")
+        if search not in FitchParsimony.SEARCHES + ("none",):
+            raise ValueError(f"Unknown search {search}. "
+                             f"Supported searches are: {list(FitchParsimony.SEARCHES + ('none',))}.")
+        if max_rounds is not None and max_rounds < 1:
+            raise ValueError("Parameter max_rounds must be a positive integer.")
+        if duplicate_policy not in self.DUPLICATE_POLICIES:
+            raise ValueError(f"Unknown duplicate policy {duplicate_policy}. "
+                             f"Supported policies are: {list(self.DUPLICATE_POLICIES)}.")
+        if isinstance(distance, str):
+            distance = Distance.resolve(distance)
+        if not StemmaNJ.is_similarity(distance):
+            raise ValueError(
+                "The distance parameter function is not an acceptable similarity metric. It must respect d(x,x) = 0 and d(x,y) = d(y,x).")
+        self._dist_matrix: Union[CondensedMatrix, None] = None
+        self._distance: Union[Distance, Callable] = distance
+        self._start: str = start
+        self._search: str = search
+        self._max_rounds: Union[int, None] = max_rounds
+        self._rooting_method: str = rooting_method
+        self._dtype: np.dtype = np.dtype(dtype)
+        self._duplicate_policy: str = duplicate_policy
+        self._characters: Union[np.ndarray, None] = None
+        self._length: Union[int, None] = None
+        self._evaluated: int = 0
+        self._engine: DistanceEngine = DistanceEngine(distance, n_jobs=n_jobs, tile_size=tile_size, progress=progress,
+                                                      cache=cache)
+
+    @property
+    def dist_matrix(self):
+        return self._dist_matrix
+
+    @property
+    def distance(self):
+        return self._distance
+
+    @property
+    def start(self):
+        return self._start
+
+    @property
+    def search(self):
+        return self._search
+
+    @property
+    def max_rounds(self):
+        return self._max_rounds
+
+    @property
+    def n_jobs(self):
+        return self._engine.n_jobs
+
+    @property
+    def tile_size(self):
+        return self._engine.tile_size
+
+    @property
+    def progress(self):
+        return self._engine.progress
+
+    @property
+    def cache(self):
+        return self._engine.cache
+
+    @property
+    def dtype(self):
+        return self._dtype
+
+    @property
+    def duplicate_policy(self):
+        return self._duplicate_policy
+
+    @property
+    def characters(self):
+        return self._characters
+
+    @property
+    def length(self):
+        return self._length
+
+    @property
+    def evaluated(self):
+        return self._evaluated
+
+    def compute(self, folder_path: str) -> ManuscriptInTreeBase:
+        """Builds the stemma tree.
+
+        ### Args:
+            - folder_path (str): The path to the folder containing the texts. The path specified here will surplant the previous path defined in constructor.
+            !!! All .txt files in this folder must be files containing Manuscript texts unless the file name contains the substring "edge" !!!
+
+        Returns:
+            - Manuscript: The root of the stemma with the rest of its tree as its children.
+        """
+        super().compute(folder_path)
+        self._duplicates = self.collapse_duplicates() if self.duplicate_policy != "none" else {}
+        self.dist()
+        edges_dict, edges_list = self.expand_duplicates(*self._build_edges(), policy=self.duplicate_policy)
+        if self._rooting_method == "midpoint-dist":
+            edges_list = Utils.set_new_root(
+                edge_list=edges_list, new_root=Utils.find_midpoint_root(edges_list, edges_dict))
+        if self._rooting_method == "midpoint-edge":
+            edges_list = Utils.set_new_root(
+                edge_list=edges_list, new_root=Utils.find_midpoint_root(edges_list))
+        out = ManuscriptInTreeEmpty(parent=None, recursive=Utils.dict_from_edge(
+            edge_list=edges_list), text_list=list(self.manuscripts.keys()))
+        out.set_edges(edges_dict)
+        return out
+
+    def dist(self) -> None:
+        """Builds the condensed distance matrix of the unique manuscripts, in the order of their labels, and sets the
+        attribute _dist_matrix.
+        """
+        manuscripts = self.unique_manuscripts
+        texts = [manuscripts[key] for key in sorted(manuscripts.keys())]
+        self._dist_matrix = self._engine.compute_condensed(texts, dtype=self.dtype)
+
+    @staticmethod
+    def collate(texts: List[str], base: int = 0) -> np.ndarray:
+        """Collates the words of the texts against a base text. Each word of the base text is a variant location, and the
+        reading of a text at a location is the words aligned to it by difflib.SequenceMatcher: the same word, the words
+        replacing it, shared evenly between the replaced words, or an empty reading for an omission. The words added
+        by a text are appended to the reading of the previous location, the first location gathering the words added
+        before the first word of the base text.
+
+        ### Args:
+            - texts (list): The texts.
+            - base (int, Optional): The index of the base text. Defaults to the first text.
+
+        ### Returns:
+            - numpy.ndarray: The readings as integers, with one row per text and one column per variant location, the
+            readings of a location being numbered in order of first appearance.
+        """
+        base_words = texts[base].split() if texts else []
+        readings = []
+        for text in texts:
+            words = text.split()
+            locations = [""] * (len(base_words) + 1)
+            matcher = SequenceMatcher(None, base_words, words, autojunk=False)
+            for tag, i1, i2, j1, j2 in matcher.get_opcodes():
+                if tag == "equal":
+                    locations[i1 + 1:i2 + 1] = words[j1:j2]
+                elif tag == "replace":
+                    for i in range(i1, i2):
+                        locations[i + 1] = " ".join(words[j1 + (i - i1) * (j2 - j1) // (i2 - i1):
+                                                          j1 + (i + 1 - i1) * (j2 - j1) // (i2 - i1)])
+                elif tag == "insert":
+                    locations[i1] = " ".join([locations[i1]] + words[j1:j2]).strip()
+            readings.append(locations)
+        characters = np.zeros((len(texts), len(base_words) + 1), dtype=np.int64)
+        for location in range(len(base_words) + 1):
+            codes: Dict[str, int] = {}
+            characters[:, location] = [codes.setdefault(locations[location], len(codes)) for locations in readings]
+        return characters
+
+    def _build_edges(self) -> Tuple[Dict[str, float], List[List[str]]]:
+        """Collates the unique manuscripts, builds the starting tree and improves it by the local search.
+
+        ### Returns:
+            - dict: The dictionary with edges as keys and numbers of changes as values.
+            - list: List of edges.
+        """
+        manuscripts = self.unique_manuscripts
+        labels = sorted(manuscripts.keys())
+        if len(labels) < 2:
+            self._characters, self._length, self._evaluated = None, 0, 0
+            return {}, []
+        base = int(MinimumSpanningTree(self._dist_matrix, labels, root="medoid").row_sums().argmin())
+        self._characters = self.collate([manuscripts[label] for label in labels], base=base)
+        if self.start == "nj":
+            _, start = NeighborJoining(self._dist_matrix, labels, dtype=self.dtype).build()
+        else:
+            _, start = MinimumSpanningTree(self._dist_matrix, labels).build()
+        parsimony = FitchParsimony(self._characters, labels)
+        self._length = parsimony.set_tree(start)
+        if self.search != "none":
+            self._length = parsimony.search(self.search, max_rounds=self.max_rounds)
+        self._evaluated = parsimony.evaluated
+        return parsimony.edges()
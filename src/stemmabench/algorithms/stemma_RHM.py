@@ -1,11 +1,12 @@
 import os
 from sys import platform
-from typing import Union
+from typing import List, Union
 from ctypes import CDLL, c_char_p, c_int
 from stemmabench.algorithms.stemma_algorithm import StemmaAlgo
 from stemmabench.algorithms.manuscript_in_tree_empty import ManuscriptInTreeEmpty
 from stemmabench.algorithms.manuscript_in_tree_base import ManuscriptInTreeBase
 from stemmabench.algorithms.utils import Utils
+from stemmabench.algorithms.consensus import Consensus
 
 
 class StemmaRHM(StemmaAlgo):
@@ -20,13 +21,16 @@ class StemmaRHM(StemmaAlgo):
         - _segment_size (int): The number of words per segment.
         - _keep_dot (bool): Indicates if the dot files that the c code outputs should be kept.
         - _dll (ctypes.CDLL): The dll file called by the python code.
+        - consensus (str): The consensus method used to summarise the trees of the straps, None to keep the last tree.
+        - trees (list): The edge list of the tree of each strap.
     """
 
     def __init__(self, 
                 nb_opti: int,
                 strap: int = 1,
                 segment_size: int = 1,
-                keep_dot: Union[bool, int] = False) -> None:
+                keep_dot: Union[bool, int] = False,
+                consensus: Union[str, None] = None) -> None:
         """
         Constructor for the StemmaRHM class.
 
@@ -36,8 +40,18 @@ class StemmaRHM(StemmaAlgo):
             Used to evaluate the stochastic nature of the algorithm.
             - _segment_size (int): The number of words per segment.
             - _keep_dot (bool, int): Indicates if the dot files that the c code outputs should be kept.
+            - consensus (str, Optional): The consensus method used to summarise the trees of the straps:
+            {majority, strict}. The edges of the consensus tree are annotated with the frequency of their bipartition
+            of the manuscripts in the trees. Defaults to None, which returns the tree of the last strap.
+
+        ### Raises:
+            - ValueError: If consensus is not a supported method.
         """
         super().__init__()
+        if consensus is not None and consensus not in Consensus.METHODS:
+            raise ValueError(f"Unknown consensus {consensus}. Supported methods are: {list(Consensus.METHODS)}.")
+        self._consensus: Union[str, None] = consensus
+        self._trees: List[List[List[str]]] = []
         self._nb_opti = nb_opti
         self._strap = strap
         self._segment_size = segment_size
@@ -54,6 +68,14 @@ class StemmaRHM(StemmaAlgo):
         self._dll.compute.argtypes = [c_char_p, c_int, c_int, c_int, c_int]
         self._dll.compute.restype = c_int
 
+    @property
+    def consensus(self):
+        return self._consensus
+
+    @property
+    def trees(self):
+        return self._trees
+
     def compute(self, folder_path: Union[str, None] = None
                 ) -> ManuscriptInTreeBase:
         """Builds the stemma tree. If the distance is specified in function call it will surplant the existing distance if it exists.
@@ -72,10 +94,21 @@ class StemmaRHM(StemmaAlgo):
             self._keep_dot = 0
         self._dll.compute(folder_path.encode("utf-8"), self._segment_size, self._strap, self._nb_opti, 1)
         dot_list = Utils.get_dot_list(folder_path)
+        self._trees = []
         for file in dot_list:
             full_path = f"{folder_path}/{file}.dot"
             edges = Utils.dot_to_edge(full_path)
+            self._trees.append(edges)
             Utils.save_edge(edges, full_path.replace(".dot", ".txt"))
             if not self._keep_dot:
                 os.remove(full_path)
-        return ManuscriptInTreeEmpty(parent= None, recursive=Utils.dict_from_edge(edge_list=edges), text_list=list(self.manuscripts.keys()))
\ No newline at end of file
+        if self.consensus is None:
+            return ManuscriptInTreeEmpty(parent= None, recursive=Utils.dict_from_edge(edge_list=edges), text_list=list(self.manuscripts.keys()))
+        consensus = Consensus(sorted(self.manuscripts.keys()))
+        for tree in self._trees:
+            consensus.add(tree)
+        supports, edges = consensus.build(self.consensus)
+        out = ManuscriptInTreeEmpty(parent=None, recursive=Utils.dict_from_edge(edge_list=edges),
+                                    text_list=list(self.manuscripts.keys()))
+        out.set_supports(supports)
+        return out
\ No newline at end of file
@@ -0,0 +1,163 @@
+from typing import Callable, Dict, List, Tuple, Union
+import numpy as np
+from stemmabench.algorithms.stemma_algorithm import StemmaAlgo
+from stemmabench.algorithms.manuscript_in_tree_base import ManuscriptInTreeBase
+from stemmabench.algorithms.manuscript_in_tree_empty import ManuscriptInTreeEmpty
+from stemmabench.algorithms.utils import Utils
+from stemmabench.algorithms.distance_engine import DistanceEngine
+from stemmabench.algorithms.distance_cache import DistanceCache
+from stemmabench.algorithms.upgma_core import AverageLinkage
+from stemmabench.algorithms.distance import Distance
+from stemmabench.algorithms.condensed_matrix import CondensedMatrix
+from stemmabench.algorithms.stemma_NJ import StemmaNJ
+
+
+class StemmaUPGMA(StemmaAlgo):
+    """Class that constructs a rooted stemma using the UPGMA algorithm.
+    The closest groups of manuscripts are merged first, and the distance between two groups is the mean distance
+    between their manuscripts. The stemma is rooted at the last merge and every manuscript is at the same distance from
+    the root, which assumes that the texts changed at the same rate in all the branches of the tradition. It is a quick
+    baseline for large traditions: the distances are computed by the same engine and cache as StemmaNJ, and the tree is
+    built with a priority queue of the candidate merges instead of the O(n³) search of Neighbor-Joining.
+
+    ### Attributes:
+        - folder_path (str): The path to the folder containing all the texts.
+        - manuscripts (dict): The dictionay of all the texts with text labels as keys and texts as values.
+        - distance (Callable): The function to be used as a distance metric.
+        - _dist_matrix (CondensedMatrix): The distance matrix, stored as its condensed upper triangle.
+        - n_jobs (int): The number of worker processes used to compute the distance matrix.
+        - tile_size (int): The number of rows and columns of each tile of the distance matrix computed at once.
+        - progress (Callable): Function called during the computation of the distance matrix with the number of pairs
+        computed and the total number of pairs.
+        - cache (DistanceCache): The persistent cache of the distances between texts.
+        - dtype (numpy.dtype): The type of the distance matrix and of the matrix of the clustering, float64 or float32.
+        - duplicate_policy (str): The policy used to add the manuscripts with duplicated texts to the stemma.
+    """
+
+    # The update of the distances after a merge, see AverageLinkage.
+    METHOD: str = "upgma"
+
+    def __init__(self,
+                 distance: Union[Distance, Callable, str],
+                 n_jobs: int = 1,
+                 tile_size: int = 64,
+                 progress: Union[Callable[[int, int], None], None] = None,
+                 cache: Union[DistanceCache, str, None] = None,
+                 dtype: Union[type, np.dtype] = np.float64,
+                 duplicate_policy: str = "none") -> None:
+        """Constructor for the StemmaUPGMA class.
+
+        ### Args:
+            - distance (Distance, Callable, str): A function that takes 2 strings as parameters and returns a numeric
+            value which is the distance between the 2 strings, a Distance computing blocks of the distance matrix at
+            once, or the name of one of the built-in distances: {levenshtein, word_levenshtein, minhash, kmer, ncd}
+            - n_jobs (int, Optional): The number of worker processes used to compute the distance matrix. -1 uses one
+            process per CPU. Defaults to 1, which computes the matrix in the calling process.
+            - tile_size (int, Optional): The number of rows and columns of each tile of the distance matrix computed at once.
+            - progress (Callable, Optional): Function called during the computation of the distance matrix with the number
+            of pairs computed and the total number of pairs.
+            - cache (DistanceCache, str, Optional): A DistanceCache or the path of its folder. The distances between
+            texts are stored in the cache and only the pairs of texts missing from it are computed.
+            - dtype (numpy.dtype, Optional): The type of the distance matrix and of the matrix of the clustering, float64
+            or float32. Defaults to float64.
+            - duplicate_policy (str, Optional): The policy used to add the manuscripts with identical texts, collapsed
+            before computing the distances, back to the stemma: {sibling, child, none}. Defaults to none.
+
+        ### Raises:
+            - ValueError: If the distance parameter is not the name of a built-in distance.
+            - ValueError: If the distance parameter does not respect d(x,x) = 0 or d(x,y) = d(y,x).
+            - ValueError: If duplicate_policy is not a supported policy.
+        """
+        super().__init__()
+        if duplicate_policy not in self.DUPLICATE_POLICIES:
+            raise ValueError(f"Unknown duplicate policy {duplicate_policy}. "
+                             f"Supported policies are: {list(self.DUPLICATE_POLICIES)}.")
+        if isinstance(distance, str):
+            distance = Distance.resolve(distance)
+        if not StemmaNJ.is_similarity(distance):
+            raise ValueError(
+                "The distance parameter function is not an acceptable similarity metric. It must respect d(x,x) = 0 and d(x,y) = d(y,x).")
+        self._dist_matrix: Union[CondensedMatrix, None] = None
+        self._distance: Union[Distance, Callable] = distance
+        self._dtype: np.dtype = np.dtype(dtype)
+        self._duplicate_policy: str = duplicate_policy
+        self._engine: DistanceEngine = DistanceEngine(distance, n_jobs=n_jobs, tile_size=tile_size, progress=progress,
+                                                      cache=cache)
+
+    @property
+    def dist_matrix(self):
+        return self._dist_matrix
+
+    @property
+    def distance(self):
+        return self._distance
+
+    @property
+    def n_jobs(self):
+        return self._engine.n_jobs
+
+    @property
+    def tile_size(self):
+        return self._engine.tile_size
+
+    @property
+    def progress(self):
+        return self._engine.progress
+
+    @property
+    def cache(self):
+        return self._engine.cache
+
+    @property
+    def dtype(self):
+        return self._dtype
+
+    @property
+    def duplicate_policy(self):
+        return self._duplicate_policy
+
+    def compute(self, folder_path: str) -> ManuscriptInTreeBase:
+        """Builds the stemma tree, rooted at the last merge.
+
+        ### Args:
+            - folder_path (str): The path to the folder containing the texts. The path specified here will surplant the previous path defined in constructor.
+            !!! All .txt files in this folder must be files containing Manuscript texts unless the file name contains the substring "edge" !!!
+
+        Returns:
+            - Manuscript: The root of the stemma with the rest of its tree as its children.
+        """
+        super().compute(folder_path)
+        self._duplicates = self.collapse_duplicates() if self.duplicate_policy != "none" else {}
+        self.dist()
+        edges_dict, edges_list = self.expand_duplicates(*self._build_edges(), policy=self.duplicate_policy)
+        out = ManuscriptInTreeEmpty(parent=None, recursive=Utils.dict_from_edge(
+            edge_list=edges_list), text_list=list(self.manuscripts.keys()))
+        out.set_edges(edges_dict)
+        return out
+
+    def dist(self) -> None:
+        """Builds the condensed distance matrix of the unique manuscripts, in the order of their labels, and sets the
+        attribute _dist_matrix.
+        """
+        manuscripts = self.unique_manuscripts
+        texts = [manuscripts[key] for key in sorted(manuscripts.keys())]
+        self._dist_matrix = self._engine.compute_condensed(texts, dtype=self.dtype)
+
+    def _build_edges(self) -> Tuple[Dict[str, float], List[List[str]]]:
+        """Builds list of edges as well as the associated dictionary containing the branch lengths.
+
+        ### Returns:
+            - dict: The dictionary with edges as keys and branch lengths as values.
+            - list: List of edges.
+        """
+        labels = sorted(self.unique_manuscripts.keys())
+        return AverageLinkage(self._dist_matrix, labels, method=self.METHOD, dtype=self.dtype).build()
+
+
+class StemmaWPGMA(StemmaUPGMA):
+    """Class that constructs a rooted stemma using the WPGMA algorithm.
+    Same as StemmaUPGMA, except that the distance between a merged group and another group is the mean of the distances
+    of the two merged groups, whatever their number of manuscripts.
+    """
+
+    METHOD: str = "wpgma"
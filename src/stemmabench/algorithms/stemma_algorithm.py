@@ -1,5 +1,5 @@
 import os
-from typing import Dict, List
+from typing import Dict, List, Tuple
 from stemmabench.algorithms.manuscript_in_tree import ManuscriptInTree
 
 
@@ -9,17 +9,103 @@ class StemmaAlgo:
     ### Attributes:
         - manuscripts (dict): The dictionay of all the texts with text labels as keys and texts as values.
         This is what is ued to build the stemmas.
+        - duplicates (dict): The labels of the manuscripts whose text is identical to the text of an other manuscript,
+        with the label of this other manuscript as keys. Set by collapse_duplicates.
+        - unique_manuscripts (dict): The manuscripts without the duplicates.
     """
 
+    # Policies used to add the duplicated manuscripts to the stemma built on the unique texts:
+    # - sibling: The manuscript and its duplicates are joined by edges of length 0 to a new node, which takes the place
+    #   of the manuscript in the stemma.
+    # - child: The duplicates are children of the manuscript, with edges of length 0.
+    # - none: The duplicates are not collapsed and the stemma is built on all the manuscripts.
+    DUPLICATE_POLICIES: Tuple[str, ...] = ("sibling", "child", "none")
+
     def __init__(self) -> None:
         """StemmaAlgo constructor.
         """
         self._manuscripts: Dict[str, str] = {}
+        self._duplicates: Dict[str, List[str]] = {}
 
     @property
     def manuscripts(self):
         return self._manuscripts
 
+    @property
+    def duplicates(self):
+        return self._duplicates
+
+    @property
+    def unique_manuscripts(self) -> Dict[str, str]:
+        duplicated = {label for labels in self._duplicates.values() for label in labels}
+        return {label: text for label, text in self._manuscripts.items() if label not in duplicated}
+
+    def collapse_duplicates(self) -> Dict[str, List[str]]:
+        """Groups the manuscripts with identical texts by hashing the texts, and sets the duplicates attribute.
+        The first label of each group in sorted order is kept in unique_manuscripts, the other labels are its duplicates.
+
+        ### Returns:
+            - dict: The labels of the duplicated manuscripts, with the label of the manuscript kept as keys.
+        """
+        groups: Dict[str, List[str]] = {}
+        for label in sorted(self._manuscripts):
+            groups.setdefault(self._manuscripts[label], []).append(label)
+        self._duplicates = {labels[0]: labels[1:] for labels in groups.values() if len(labels) > 1}
+        return self._duplicates
+
+    def expand_duplicates(self,
+                          edges_dict: Dict[str, float],
+                          edges_list: List[List[str]],
+                          policy: str = "sibling") -> Tuple[Dict[str, float], List[List[str]]]:
+        """Adds the duplicated manuscripts to the edges of a stemma built on the unique manuscripts.
+
+        ### Args:
+            - edges_dict (dict): The dictionary with edges as keys in format "parent,child" and distances as values.
+            - edges_list (list): List of edges.
+            - policy (str, Optional): The policy used to add the duplicates: {sibling, child, none}. Defaults to sibling.
+
+        ### Returns:
+            - dict: The dictionary of the edges, with the edges of the duplicates.
+            - list: List of edges, with the edges of the duplicates.
+
+        ### Raises:
+            - ValueError: If policy is not supported.
+        """
+        if policy not in self.DUPLICATE_POLICIES:
+            raise ValueError(f"Unknown duplicate policy {policy}. Supported policies are: {list(self.DUPLICATE_POLICIES)}.")
+        if policy == "none" or not self._duplicates:
+            return edges_dict, edges_list
+        edges_dict, edges_list = dict(edges_dict), [list(edge) for edge in edges_list]
+        used = set(self._manuscripts) | {label for edge in edges_list for label in edge}
+        # The positions of the edges of each node, built once so that replacing a manuscript only visits its edges.
+        positions: Dict[str, List[int]] = {}
+        if policy == "sibling":
+            for position, edge in enumerate(edges_list):
+                for node in edge:
+                    positions.setdefault(node, []).append(position)
+        count = 0
+        for label, duplicates in self._duplicates.items():
+            parent = label
+            if policy == "sibling":
+                count += 1
+                while f"N_{count}" in used:
+                    count += 1
+                parent = f"N_{count}"
+                used.add(parent)
+                # The new node takes the place of the manuscript in its edges.
+                for position in positions.get(label, []):
+                    edge = edges_list[position]
+                    old_key = ",".join(edge)
+                    edge[edge.index(label)] = parent
+                    if old_key in edges_dict:
+                        edges_dict[",".join(edge)] = edges_dict.pop(old_key)
+                edges_list.append([parent, label])
+                edges_dict[f"{parent},{label}"] = 0.0
+            for duplicate in duplicates:
+                edges_list.append([parent, duplicate])
+                edges_dict[f"{parent},{duplicate}"] = 0.0
+        return edges_dict, edges_list
+
     def compute(self, folder_path: str, *arg, **kwarg) -> ManuscriptInTree:
         """Builds the stemma tree. The implementation at this level only checks the inputs and sets the attributes.
         At this level this method checks that attributs are properly set to be able to call the compute method.
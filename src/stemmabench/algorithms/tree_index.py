@@ -0,0 +1,236 @@
+from typing import Dict, List, Tuple, Union
+import numpy as np
+from stemmabench.algorithms.compact_tree import CompactTree
+
+
+class TreeIndex:
+    """Index answering lowest common ancestor and path queries on a stemma tree.
+    Built once per tree in O(n·log(n)) from an Euler tour of the tree and a sparse table for range minimum queries
+    over the depths of the tour. Each lowest common ancestor query then takes O(1).
+
+    ### Attributes:
+        - tree (CompactTree): The indexed tree.
+        - euler (numpy.ndarray): The node ids in Euler tour order (2n-1 entries).
+        - first (numpy.ndarray): The position of the first occurrence of each node in the Euler tour.
+        - last (numpy.ndarray): The position of the last occurrence of each node in the Euler tour.
+        - sparse_table (numpy.ndarray): Row k contains the node of minimal depth of each window of 2**k tour positions.
+    """
+
+    def __init__(self, tree: CompactTree) -> None:
+        """Constructor for the TreeIndex class.
+
+        ### Args:
+            - tree (CompactTree): The tree to be indexed.
+        """
+        self._tree: CompactTree = tree
+        self._euler, self._first, self._last = self._euler_tour()
+        self._sparse_table: np.ndarray = self._build_sparse_table()
+
+    @property
+    def tree(self):
+        return self._tree
+
+    @property
+    def euler(self):
+        return self._euler
+
+    @property
+    def first(self):
+        return self._first
+
+    @property
+    def last(self):
+        return self._last
+
+    @property
+    def sparse_table(self):
+        return self._sparse_table
+
+    @classmethod
+    def from_edges(cls,
+                   edge_list: Union[List[List[str]], np.ndarray],
+                   dist_dict: Union[Dict[str, Union[float, int]], None] = None) -> "TreeIndex":
+        """Builds the index of the tree represented by an edge list. The orientation of the edges is ignored.
+
+        ### Args:
+            - edge_list (list, numpy.ndarray): A list of edges.
+            - dist_dict (dict, Optional): Dictionary with the edges as keys in format "parent,child" and the length of the
+            edges as value. If not specified the length of each edge will be assumed to be 1.
+
+        ### Returns:
+            - TreeIndex: The index of the tree.
+        """
+        return cls(CompactTree.from_edges(edge_list, dist_dict, root=str(np.asarray(edge_list)[0, 0])))
+
+    def _euler_tour(self) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+        """Computes the Euler tour of the tree with an explicit stack.
+
+        ### Returns:
+            - numpy.ndarray: The node ids in Euler tour order.
+            - numpy.ndarray: The position of the first occurrence of each node.
+            - numpy.ndarray: The position of the last occurrence of each node.
+        """
+        offsets = self._tree.child_offsets.tolist()
+        children = self._tree.child_ids.tolist()
+        next_child = offsets[:-1]
+        first = [0] * len(self._tree)
+        last = [0] * len(self._tree)
+        euler = [self._tree.root]
+        stack = [self._tree.root]
+        while stack:
+            node = stack[-1]
+            if next_child[node] < offsets[node + 1]:
+                child = children[next_child[node]]
+                next_child[node] += 1
+                first[child] = len(euler)
+                euler.append(child)
+                stack.append(child)
+            else:
+                stack.pop()
+                last[node] = len(euler) - 1
+                if stack:
+                    euler.append(stack[-1])
+        return (np.array(euler, dtype=np.int32), np.array(first, dtype=np.int64),
+                np.array(last, dtype=np.int64))
+
+    def _build_sparse_table(self) -> np.ndarray:
+        """Builds the sparse table of the minimal depth nodes over windows of the Euler tour.
+
+        ### Returns:
+            - numpy.ndarray: Array of shape (log2(2n-1)+1, 2n-1). Entries past the end of the tour are left at 0.
+        """
+        size = self._euler.shape[0]
+        depth = self._tree.depth
+        table = np.zeros((size.bit_length(), size), dtype=np.int32)
+        table[0] = self._euler
+        for k in range(1, table.shape[0]):
+            half = 1 << (k - 1)
+            left = table[k - 1, :size - 2 * half + 1]
+            right = table[k - 1, half:size - half + 1]
+            table[k, :left.shape[0]] = np.where(depth[left] <= depth[right], left, right)
+        return table
+
+    def _ids(self, labels: Union[str, List[str], np.ndarray]) -> np.ndarray:
+        """Converts labels to node ids.
+
+        ### Args:
+            - labels (str, list, numpy.ndarray): The labels to be converted.
+
+        ### Returns:
+            - numpy.ndarray: The node ids.
+
+        ### Raises:
+            - ValueError: If a label is not in the tree.
+        """
+        labels = np.atleast_1d(np.asarray(labels)).ravel().tolist()
+        missing = [label for label in labels if label not in self._tree.index]
+        if missing:
+            raise ValueError(f"Labels {missing} are not present in the tree.")
+        return np.array([self._tree.index[label] for label in labels], dtype=np.int64)
+
+    def lca_ids(self, nodes1: np.ndarray, nodes2: np.ndarray) -> np.ndarray:
+        """Vectorized lowest common ancestor query on node ids.
+
+        ### Args:
+            - nodes1 (numpy.ndarray): Node ids.
+            - nodes2 (numpy.ndarray): Node ids, broadcastable against nodes1.
+
+        ### Returns:
+            - numpy.ndarray: The id of the lowest common ancestor of each pair of nodes.
+        """
+        position1, position2 = self._first[nodes1], self._first[nodes2]
+        low = np.minimum(position1, position2)
+        high = np.maximum(position1, position2) + 1
+        level = np.log2(high - low).astype(np.int64)
+        left = self._sparse_table[level, low]
+        right = self._sparse_table[level, high - (1 << level)]
+        return np.where(self._tree.depth[left] <= self._tree.depth[right], left, right)
+
+    def lca(self, node1: str, node2: str) -> str:
+        """Returns the label of the lowest common ancestor of two nodes.
+
+        ### Args:
+            - node1 (str): The label of the first node.
+            - node2 (str): The label of the second node.
+
+        ### Returns:
+            - str: The label of the lowest common ancestor.
+        """
+        return self._tree.labels[int(self.lca_ids(*self._ids([node1, node2])))]
+
+    def path_length(self, start: str, target: str, weighted: bool = True) -> float:
+        """Returns the length of the path between two nodes in O(1).
+
+        ### Args:
+            - start (str): The label of the node the path starts from.
+            - target (str): The label of the node the path ends at.
+            - weighted (bool, Optional): If false each edge is counted as having a length of 1.
+
+        ### Returns:
+            - float: The sum of the branch lengths between both nodes.
+        """
+        return float(self.pairwise_path_lengths([start], [target], weighted)[0, 0])
+
+    def pairwise_path_lengths(self,
+                              labels: Union[List[str], np.ndarray, None] = None,
+                              targets: Union[List[str], np.ndarray, None] = None,
+                              weighted: bool = True) -> np.ndarray:
+        """Returns the matrix of the path lengths (patristic distances) between two lists of nodes in O(n²).
+
+        ### Args:
+            - labels (list, numpy.ndarray, Optional): The labels of the rows of the matrix. Defaults to all the nodes of the tree.
+            - targets (list, numpy.ndarray, Optional): The labels of the columns of the matrix. Defaults to labels.
+            - weighted (bool, Optional): If false each edge is counted as having a length of 1.
+
+        ### Returns:
+            - numpy.ndarray: Matrix with the length of the path between labels[i] and targets[j] at position [i, j].
+        """
+        rows = np.arange(len(self._tree)) if labels is None else self._ids(labels)
+        columns = rows if targets is None else self._ids(targets)
+        distance = self._tree.root_distance if weighted else self._tree.depth.astype(np.float64)
+        ancestors = self.lca_ids(rows[:, None], columns[None, :])
+        return distance[rows][:, None] + distance[columns][None, :] - 2 * distance[ancestors]
+
+    def is_ancestor(self, ancestor: str, node: str) -> bool:
+        """Returns True if ancestor is node or one of the ancestors of node.
+
+        ### Args:
+            - ancestor (str): The label of the potential ancestor.
+            - node (str): The label of the node.
+
+        ### Returns:
+            - bool: Value indicating if ancestor is an ancestor of node.
+        """
+        ancestor_id, node_id = self._ids([ancestor, node]).tolist()
+        return bool(self._first[ancestor_id] <= self._first[node_id] <= self._last[ancestor_id])
+
+    def on_path(self, node: str, start: str, target: str) -> bool:
+        """Returns True if node is on the path between start and target in O(1).
+
+        ### Args:
+            - node (str): The label of the node to be tested.
+            - start (str): The label of the node the path starts from.
+            - target (str): The label of the node the path ends at.
+
+        ### Returns:
+            - bool: Value indicating if node is on the path.
+        """
+        top = self.lca(start, target)
+        return self.is_ancestor(top, node) and (self.is_ancestor(node, start) or self.is_ancestor(node, target))
+
+    def path(self, start: str, target: str) -> List[str]:
+        """Returns the list of the nodes on the path between two nodes in O(path length).
+
+        ### Args:
+            - start (str): The label of the node the path starts from.
+            - target (str): The label of the node the path ends at.
+
+        ### Returns:
+            - list: The labels of the nodes between start and target, both included.
+        """
+        top = self._tree.index[self.lca(start, target)]
+        up, down = [self._tree.index[start]], [self._tree.index[target]]
+        for branch in (up, down):
+            while branch[-1] != top:
+                branch.append(int(self._tree.parent[branch[-1]]))
+        return [self._tree.labels[i] for i in up + down[-2::-1]]
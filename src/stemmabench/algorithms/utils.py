@@ -1,6 +1,7 @@
 from pathlib import Path
 import numpy as np
 from typing import Dict, Union, List, Any, Tuple
+from stemmabench.algorithms.compact_tree import CompactTree
 
 
 class Utils:
@@ -113,21 +114,14 @@ class Utils:
             ['A']
         """
         if isinstance(tree, (list, np.ndarray)):
-            out = []
-            if not isinstance(tree, np.ndarray):
-                tree = np.array(tree)
-            for node in tree[:, 0]:
-                if node not in tree[:, 1] and node not in out:
-                    out.append(node)
-            return out
+            labels, _, ids = CompactTree.intern(tree)
+            has_parent = np.bincount(ids[:, 1], minlength=len(labels)) > 0
+            candidates = ids[:, 0][~has_parent[ids[:, 0]]]
+            _, first = np.unique(candidates, return_index=True)
+            return [labels[i] for i in candidates[np.sort(first)].tolist()]
         else:
-            not_root = []
-            for i in tree:
-                for j in tree:
-                    if str(i) in list(tree[j].keys()):
-                        not_root.append(i)
-            root = list(set(tree.keys()) - set(not_root))
-            return root
+            children = {child for node in tree for child in tree[node]}
+            return [node for node in tree if str(node) not in children]
 
     @staticmethod
     def recursive_fit(input_dict: Dict[str, Any],
@@ -197,15 +191,13 @@ class Utils:
         root = Utils.find_root(tree_data)
         if edge_path and not Utils.validate_edge(tree_data):
             raise ValueError("The edge file given is not valid. Look at validate_edge function for more details.")
-        while len(tree_data) > 1:
-            # If root is the last one take next as root should be fitted last
-            if root[0] == list(tree_data.keys())[len(tree_data.keys())-1]:
-                lab = list(tree_data.keys())[len(tree_data.keys())-2]
-            else:
-                lab = list(tree_data.keys())[len(tree_data.keys())-1]
-            moving = tree_data.pop(lab)
-            tree_data = Utils.recursive_fit(tree_data, lab, moving)
-        return tree_data
+        # Every node dictionary is created once and referenced by its parent, which nests the whole tree in O(n).
+        nested: Dict[str, dict] = {}
+        for parent, children in tree_data.items():
+            parent_dict = nested.setdefault(parent, {})
+            for child in children:
+                parent_dict[child] = nested.setdefault(child, {})
+        return {root[0]: nested[root[0]]}
 
     @staticmethod
     def validate_edge(tree: Union[Dict[str, Any], List[List[str]], np.ndarray]) -> bool:
@@ -253,6 +245,8 @@ class Utils:
     def set_new_root(edge_list: Union[List[List[str]], np.ndarray],
                      new_root: str) -> List[List[str]]:
         """Reroots the given tree to the given root.
+        Runs a single breadth first search over an adjacency index of the edges. The edges of each level of the
+        rerooted tree are listed in the order in which they appear in edge_list.
 
         ### Args:
             - edge_list (list, numpy.ndarray): A list of edges that represents a tree.
@@ -264,27 +258,25 @@ class Utils:
         ### Raises:
             - ValueError: If new_root is not present in edge_list.
         """
-        if new_root not in np.array(edge_list).flatten():
+        labels, index, ids = CompactTree.intern(edge_list)
+        if new_root not in index:
             raise ValueError(f"Parameter new_root: {new_root} is not present in edge_list.")
+        offsets, incident = CompactTree.csr(ids.ravel(), np.repeat(np.arange(ids.shape[0]), 2), len(labels))
+        offsets, incident, edges = offsets.tolist(), incident.tolist(), ids.tolist()
+        visited = [False] * len(labels)
+        visited[index[new_root]] = True
+        curent_level = [index[new_root]]
         out = []
-        leaves = Utils.find_leaf_nodes(edge_list)
-        curent_level = [new_root]
-        next_level = []
-        already_done = []
-        while curent_level != []:
-            for edge in edge_list:
-                if edge[0] in curent_level and edge[0] not in already_done and edge[1] not in already_done:
-                    out.append([edge[0], edge[1]])
-                    if edge[1] not in next_level and edge[1] not in leaves:
-                        next_level.append(edge[1])
-                elif edge[1] in curent_level:
-                    if edge[1] not in next_level and edge[1] not in already_done and edge[0] not in already_done:
-                        out.append([edge[1], edge[0]])
-                        if edge[1] not in leaves:
-                            next_level.append(edge[0])
-            already_done.extend(curent_level)
-            curent_level = next_level.copy()
-            next_level = []
+        while curent_level:
+            next_edges = sorted(edge for node in curent_level
+                                for edge in incident[offsets[node]:offsets[node + 1]]
+                                if not visited[edges[edge][0]] or not visited[edges[edge][1]])
+            curent_level = []
+            for edge in next_edges:
+                parent, child = edges[edge] if visited[edges[edge][0]] else edges[edge][::-1]
+                visited[child] = True
+                out.append([labels[parent], labels[child]])
+                curent_level.append(child)
         return out
 
     @staticmethod
@@ -297,41 +289,93 @@ class Utils:
         ### Returns:
             - list: The list of all leaf nodes in the tree.
         """
+        labels, _, ids = CompactTree.intern(edge_list)
+        is_leaf = np.bincount(ids.ravel(), minlength=len(labels)) == 1
         out = []
-        if not isinstance(edge_list, np.ndarray):
-            edges = np.array(edge_list)
-        unique_elements, counts = np.unique(edges[:, 0], return_counts=True)
-        out.extend(np.setdiff1d(unique_elements[counts == 1], edges[:, 1]).tolist())
-        unique_elements, counts = np.unique(edges[:, 1], return_counts=True)
-        out.extend(np.setdiff1d(unique_elements[counts == 1], edges[:, 0]).tolist())
+        for column in (ids[:, 0], ids[:, 1]):
+            out.extend(sorted(labels[i] for i in np.unique(column[is_leaf[column]]).tolist()))
         return out
 
     @staticmethod
     def find_midpoint_root(edge_list: List[List[str]],
-                           dist_dict: Union[Dict[str, Union[float, int]], None] = None) -> str:
+                           dist_dict: Union[Dict[str, Union[float, int]], None] = None,
+                           clamp_negative: bool = False) -> str:
         """For a given edge list will return the node label that is the midpoint between the 2 leaf nodes that are the furthest apart.
+        The farthest leaf from every leaf is found in O(n) by dynamic programming over a search tree, which holds for
+        negative lengths too, so the longest path is the one of a search over all the pairs of leaves.
 
         ### Args:
             - edge_list (list): A list of edges that represents a stemma tree.
             - dist_dict (dict, Optional): A dictionary with all the edges of the tree as key in format "parent,child".
             If it is not specified thie distance beween each node will be assumed to be 1.
             And the distance between the nodes as value.
+            - clamp_negative (bool, Optional): If true the negative lengths, which Neighbor-Joining can produce, are counted
+            as 0. Defaults to False.
 
         Returns:
             - str: The label of the node that is the midpoint between the 2 leaf nodes that are the furthest apart.
+
+        ### Raises:
+            - RuntimeError: If dist_dict is specified and an edge of edge_list is not a key of dist_dict.
         """
         leaves = Utils.find_leaf_nodes(edge_list)
-        dict_connect = Utils.dict_of_connections(edge_list)
-        longest = 0.0
-        # Find longest path
-        while len(leaves) > 1:
-            current_node = leaves.pop(0)
-            for leaf in leaves:
-                length, path = Utils.find_path_length(
-                    dict_connect, current_node, leaf, dist_dict, get_path=True)
-                if length > longest:
-                    longest = length
-                    longest_path = path
+        labels, index, ids = CompactTree.intern(edge_list)
+        if dist_dict:
+            lengths = np.array([CompactTree.edge_length(dist_dict, labels[p], labels[c])
+                                for p, c in ids.tolist()], dtype=np.float64)
+            if np.isnan(lengths).any():
+                raise RuntimeError("All the edges of edge_list must be keys of dist_dict.")
+            if clamp_negative:
+                lengths = np.maximum(lengths, 0.0)
+        else:
+            lengths = np.ones(ids.shape[0], dtype=np.float64)
+        leaf_ids = np.array([index[leaf] for leaf in leaves])
+        offsets, adjacent, adjacent_lengths = CompactTree.adjacency(ids, len(labels), lengths)
+        def distances(source: int) -> Tuple[np.ndarray, np.ndarray]:
+            """Returns the search tree parents and the distances from source to every node."""
+            parent, _, distance, _ = CompactTree.bfs(offsets, adjacent, adjacent_lengths, source)
+            return parent, distance
+        # The tree is rooted at the first leaf. below[node] is the longest path from node down to a leaf of its subtree,
+        # above[node] the longest path from node to a leaf outside of its subtree, and the farthest leaf from a leaf
+        # other than the root is its above value.
+        source = int(leaf_ids[0])
+        parent, branch, _, order = CompactTree.bfs(offsets, adjacent, adjacent_lengths, source)
+        parent, branch, order = parent.tolist(), branch.tolist(), order.tolist()
+        is_leaf = np.zeros(len(labels), dtype=bool)
+        is_leaf[leaf_ids] = True
+        below = [0.0 if leaf else -np.inf for leaf in is_leaf.tolist()]
+        below[source] = -np.inf
+        # The two longest paths down through different children, to get the longest path avoiding a given child.
+        best, best_child, second = [-np.inf] * len(labels), [-1] * len(labels), [-np.inf] * len(labels)
+        for node in reversed(order):
+            value = below[node] + branch[node]
+            up = parent[node]
+            if value > best[up]:
+                best[up], best_child[up], second[up] = value, node, best[up]
+            elif value > second[up]:
+                second[up] = value
+            below[up] = max(below[up], value)
+        above = [-np.inf] * len(labels)
+        for node in order:
+            up = parent[node]
+            sibling = second[up] if best_child[up] == node else best[up]
+            above[node] = branch[node] + max(above[up], sibling, 0.0 if up == source else -np.inf)
+        eccentricity = np.array(above)[leaf_ids]
+        eccentricity[0] = below[source]
+        diameter = eccentricity.max()
+        # Ties are broken as in a search over the ordered pairs of leaves: the first leaf ending a longest path,
+        # then its first partner in leaf order.
+        tolerance = 1e-9 * max(1.0, abs(diameter))
+        first = int(np.argmax(eccentricity >= diameter - tolerance))
+        parent, from_first = distances(leaf_ids[first])
+        second_leaf = leaf_ids[first + 1 + int(np.argmax(from_first[leaf_ids[first + 1:]] >= diameter - tolerance))]
+        longest = from_first[second_leaf]
+        longest_path = []
+        node = second_leaf
+        while node != -1:
+            longest_path.append(labels[node])
+            node = parent[node]
+        longest_path.reverse()
         # Finding the middle of the path
         if dist_dict:
             distance = 0.0
@@ -341,9 +385,10 @@ class Utils:
                     dist_dict_key = f"{longest_path[idx]},{longest_path[idx+1]}"
                 else:
                     dist_dict_key = f"{longest_path[idx+1]},{longest_path[idx]}"
-                distance += dist_dict[dist_dict_key]
+                length = max(dist_dict[dist_dict_key], 0) if clamp_negative else dist_dict[dist_dict_key]
+                distance += length
                 if distance > middistance:
-                    if abs(distance - middistance) < abs(distance - dist_dict[dist_dict_key] - middistance):
+                    if abs(distance - middistance) < abs(distance - length - middistance):
                         return longest_path[idx+1]
                     else:
                         return longest_path[idx]
@@ -374,8 +419,6 @@ class Utils:
         ### Raises:
             - RuntimeError: If path between 2 successive nodes is not referenced in dist_dict.
         """
-        if isinstance(connections, (list, np.ndarray)):
-            connections = Utils.dict_of_connections(connections)
         path = Utils.find_path(connections, start, target)
         if not dist_dict:
             out = len(path) - 1
@@ -409,7 +452,11 @@ class Utils:
             - list: The list of all the nodes between the 2 points. Will return an empty list if ether the start or target are not in dict_of_connections.
         """
         if isinstance(tree, (list, np.ndarray)):
-            tree = Utils.dict_of_connections(tree)
+            try:
+                return CompactTree.from_edges(tree, root=start).path(start, target)
+            except ValueError:
+                # Start absent from the edges or edges not forming a tree: fall back on the depth first search.
+                tree = Utils.dict_of_connections(tree)
         path: List[str] = []
         if not tree.get(start) or not tree.get(target):
             return path
@@ -455,16 +502,12 @@ class Utils:
                 tree = np.array(tree)
             if len(tree.shape) != 2 or tree.shape[1] != 2:
                 raise ValueError(f"The list specified as tree parameter has shape {tree.shape}. It must be of shape (n,2).")
-            out: Dict[str, List[str]] = {}
-            for edge in tree:
-                if not out.get(edge[0]):
-                    out.update({edge[0]: [edge[1]]})
-                else:
-                    out[edge[0]].append(edge[1])
-                if not out.get(edge[1]):
-                    out.update({edge[1]: [edge[0]]})
-                else:
-                    out[edge[1]].append(edge[0])
+            labels, _, ids = CompactTree.intern(tree)
+            # Interleaving both directions keeps the connections of each node in edge list order.
+            offsets, connected = CompactTree.csr(ids.ravel(), ids[:, ::-1].ravel(), len(labels))
+            connected_labels = np.array(labels, dtype=object)[connected].tolist()
+            out: Dict[str, List[str]] = {label: connected_labels[offsets[i]:offsets[i + 1]]
+                                         for i, label in enumerate(labels)}
         else:
             raise ValueError(
                 "tree parameter must be of type list or numpy.ndarray.")
@@ -0,0 +1,136 @@
+from typing import Dict, List, Union
+import numpy as np
+from stemmabench.algorithms.distance import Distance
+from stemmabench.algorithms.distance_cache import DistanceCache
+from stemmabench.algorithms.levenshtein import Levenshtein
+
+
+@Distance.register("word_levenshtein")
+class WordLevenshtein(Distance):
+    """Levenshtein (edit) distance between the sequences of words of two texts.
+    The distance is the minimal number of word insertions, deletions and substitutions needed to transform one text
+    into the other, so that a misspelled word costs 1 like a replaced, omitted or duplicated word. Each text is split
+    once into an int32 array of the ids of its words in a vocabulary shared by all the texts. The common prefix and
+    suffix of two arrays are removed with NumPy, and the remaining tokens are compared with the bit-parallel algorithm
+    of Levenshtein, whose sequences are about as many times shorter as the mean length of a word.
+
+    ### Attributes:
+        - max_distance (int): The distance after which the computation stops, None to always compute the exact distance.
+        - vocabulary (dict): The id of each word of the tokenized texts.
+    """
+
+    def __init__(self, max_distance: Union[int, None] = None) -> None:
+        """Constructor for the WordLevenshtein class.
+
+        ### Args:
+            - max_distance (int, Optional): If specified, the distances greater than max_distance are returned as
+            max_distance + 1.
+        """
+        self._max_distance: Union[int, None] = max_distance
+        self._vocabulary: Dict[str, int] = {}
+        self._tokens: Dict[int, np.ndarray] = {}
+
+    @property
+    def max_distance(self):
+        return self._max_distance
+
+    @property
+    def vocabulary(self):
+        return self._vocabulary
+
+    def tokenize(self, text: str) -> np.ndarray:
+        """Returns the ids of the words of a text, adding the new words to the vocabulary.
+
+        ### Args:
+            - text (str): The text.
+
+        ### Returns:
+            - numpy.ndarray: The int32 ids of the words of the text.
+        """
+        return np.array([self._vocabulary.setdefault(word, len(self._vocabulary)) for word in text.split()],
+                        dtype=np.int32)
+
+    def tokens(self, texts: List[str]) -> List[np.ndarray]:
+        """Returns the ids of the words of texts, tokenizing only the texts that are not cached.
+
+        ### Args:
+            - texts (list): The texts.
+
+        ### Returns:
+            - list: The int32 ids of the words of each text.
+        """
+        keys = DistanceCache.fingerprint(texts)
+        for i, key in enumerate(keys):
+            if int(key) not in self._tokens:
+                self._tokens[int(key)] = self.tokenize(texts[i])
+        return [self._tokens[int(key)] for key in keys]
+
+    def prepare(self, texts: List[str]) -> None:
+        """Tokenizes the texts in the main process, so that the worker processes receive their ids.
+
+        ### Args:
+            - texts (list): The texts.
+        """
+        self.tokens(texts)
+
+    @staticmethod
+    def distance(tokens1: np.ndarray, tokens2: np.ndarray, max_distance: Union[int, None] = None) -> int:
+        """Returns the Levenshtein distance between two arrays of word ids. The common prefix and suffix of the arrays
+        are found with a single comparison of their aligned elements each.
+
+        ### Args:
+            - tokens1 (numpy.ndarray): The ids of the words of the first text.
+            - tokens2 (numpy.ndarray): The ids of the words of the second text.
+            - max_distance (int, Optional): If specified, the computation stops as soon as the distance is known to be
+            greater than max_distance.
+
+        ### Returns:
+            - int: The distance between both texts, or max_distance + 1 if it is greater than max_distance.
+        """
+        length = min(len(tokens1), len(tokens2))
+        different = np.flatnonzero(tokens1[:length] != tokens2[:length])
+        prefix = int(different[0]) if len(different) else length
+        tokens1, tokens2 = tokens1[prefix:], tokens2[prefix:]
+        length = min(len(tokens1), len(tokens2))
+        different = np.flatnonzero(tokens1[len(tokens1) - length:] != tokens2[len(tokens2) - length:])
+        suffix = length - int(different[-1]) - 1 if len(different) else length
+        tokens1, tokens2 = tokens1[:len(tokens1) - suffix], tokens2[:len(tokens2) - suffix]
+        if len(tokens1) < len(tokens2):
+            tokens1, tokens2 = tokens2, tokens1
+        if max_distance is not None and len(tokens1) - len(tokens2) > max_distance:
+            return max_distance + 1
+        return Levenshtein.bit_parallel(tokens1.tolist(), tokens2.tolist(), max_distance)
+
+    def __call__(self, text1: str, text2: str) -> int:
+        """Returns the word Levenshtein distance between two texts.
+
+        ### Args:
+            - text1 (str): The first text.
+            - text2 (str): The second text.
+
+        ### Returns:
+            - int: The distance between both texts, or max_distance + 1 if it is greater than max_distance.
+        """
+        return self.distance(*self.tokens([text1, text2]), self.max_distance)
+
+    def pairwise(self, texts1: List[str], texts2: Union[List[str], None] = None) -> np.ndarray:
+        """Returns the matrix of the word Levenshtein distances between two lists of texts.
+
+        ### Args:
+            - texts1 (list): The texts of the rows of the matrix.
+            - texts2 (list, Optional): The texts of the columns of the matrix. If not specified the distances between
+            the texts of texts1 are computed.
+
+        ### Returns:
+            - numpy.ndarray: Matrix with the distance between texts1[i] and texts2[j] at position [i, j].
+        """
+        symmetric = texts2 is None
+        tokens1 = self.tokens(texts1)
+        tokens2 = tokens1 if symmetric else self.tokens(texts2)
+        out = np.zeros((len(tokens1), len(tokens2)), dtype=np.float64)
+        for row in range(len(tokens1)):
+            for col in range(row + 1 if symmetric else 0, len(tokens2)):
+                out[row, col] = self.distance(tokens1[row], tokens2[col], self.max_distance)
+        if symmetric:
+            out += out.T
+        return out
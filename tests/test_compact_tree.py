@@ -0,0 +1,85 @@
+"""
+Unit tests for the CompactTree class.
+"""
+import unittest
+import numpy as np
+from stemmabench.algorithms.compact_tree import CompactTree
+from stemmabench.algorithms.manuscript_in_tree import ManuscriptInTree
+from stemmabench.algorithms.manuscript_in_tree_empty import ManuscriptInTreeEmpty
+from stemmabench.algorithms.utils import Utils
+
+
+class TestCompactTree(unittest.TestCase):
+    """Unit tests for the CompactTree class.
+    """
+
+    def setUp(self) -> None:
+        """Setup the unit test.
+        """
+        self.test_edge_list = [["A", "1"], ["1", "2"], ["1", "3"],
+                               ["2", "4"], ["2", "5"], ["3", "6"],
+                               ["3", "7"]]
+        self.test_dist_dict = {"A,1": 0.5, "1,2": 0.5, "1,3": 0.5,
+                               "2,4": 0.5, "2,5": 0.5, "3,6": 0.5, "3,7": 10.5}
+        self.tree = CompactTree.from_edges(self.test_edge_list, self.test_dist_dict)
+
+    def test_from_edges(self):
+        """Tests the from_edges method."""
+        self.assertEqual(self.tree.labels, ["A", "1", "2", "3", "4", "5", "6", "7"],
+                         msg="Labels are not interned in order of first appearance.")
+        self.assertTrue((self.tree.parent == [-1, 0, 1, 1, 2, 2, 3, 3]).all(),
+                        msg="The parent array is not correct.")
+        self.assertEqual(self.tree.parent.dtype, np.int32)
+        self.assertTrue((self.tree.child_offsets == [0, 1, 3, 5, 7, 7, 7, 7, 7]).all(),
+                        msg="The child offsets are not correct.")
+        self.assertTrue((self.tree.branch_lengths == [0, 0.5, 0.5, 0.5, 0.5, 0.5, 0.5, 10.5]).all(),
+                        msg="The branch lengths are not correct.")
+        self.assertEqual(self.tree.find_root(), "A")
+        with self.assertRaises(ValueError, msg="Does not raise a ValueError if the edge list has 2 roots."):
+            CompactTree.from_edges([["1", "2"], ["3", "4"]])
+        with self.assertRaises(ValueError, msg="Does not raise a ValueError if a node has 2 parents."):
+            CompactTree.from_edges([["1", "3"], ["2", "3"], ["4", "1"]])
+
+    def test_from_edges_root(self):
+        """Tests the orientation of undirected edges by the from_edges method."""
+        tree = CompactTree.from_edges(self.test_edge_list, self.test_dist_dict, root="3")
+        self.assertEqual(tree.find_root(), "3")
+        self.assertCountEqual(tree.to_edge_list(), Utils.set_new_root(self.test_edge_list, "3"),
+                              msg="Does not orient the edges from the given root.")
+        self.assertEqual(tree.branch_lengths[tree.index["1"]], 0.5)
+        self.assertEqual(tree.branch_lengths[tree.index["A"]], 0.5)
+        with self.assertRaises(ValueError, msg="Does not raise a ValueError if the root is not in the edge list."):
+            CompactTree.from_edges(self.test_edge_list, root="B")
+
+    def test_manuscript_conversion(self):
+        """Tests the conversion from and to manuscripts."""
+        root = self.tree.to_manuscript(text_list=["4", "5", "6", "7"])
+        self.assertIsInstance(root, ManuscriptInTreeEmpty)
+        self.assertIsInstance(root.children[0].children[0].children[0], ManuscriptInTree)
+        self.assertDictEqual(root.dict(), Utils.dict_from_edge(edge_list=self.test_edge_list))
+        self.assertEqual(root.children[0].edges, [0.5, 0.5])
+        tree = CompactTree.from_manuscript(root)
+        self.assertCountEqual(tree.to_edge_list(), self.test_edge_list)
+        self.assertDictEqual(tree.edge_dict(), self.test_dist_dict)
+
+    def test_queries(self):
+        """Tests the vectorized queries."""
+        self.assertCountEqual(self.tree.leaves(), ["4", "5", "6", "7"])
+        self.assertTrue((self.tree.degree() == [1, 3, 3, 3, 1, 1, 1, 1]).all())
+        self.assertTrue((self.tree.depth == [0, 1, 2, 2, 3, 3, 3, 3]).all())
+        self.assertEqual(self.tree.path("4", "7"), ["4", "2", "1", "3", "7"])
+        self.assertEqual(self.tree.path("A", "B"), [])
+        self.assertEqual(self.tree.path_length("4", "7"), 12.0)
+        self.assertEqual(self.tree.path_length("4", "7", weighted=False), 4)
+        with self.assertRaises(ValueError):
+            self.tree.path_length("4", "B")
+
+    def test_reroot(self):
+        """Tests the reroot method."""
+        tree = self.tree.reroot("3")
+        self.assertEqual(tree.find_root(), "3")
+        self.assertCountEqual(tree.to_edge_list(), Utils.set_new_root(self.test_edge_list, "3"))
+        self.assertEqual(tree.path_length("4", "7"), 12.0)
+        self.assertEqual(tree.branch_lengths[tree.index["1"]], 0.5)
+        with self.assertRaises(ValueError):
+            self.tree.reroot("B")
@@ -0,0 +1,62 @@
+"""
+Unit tests for the CondensedMatrix class.
+"""
+import unittest
+import numpy as np
+from stemmabench.algorithms.condensed_matrix import CondensedMatrix
+
+
+class TestCondensedMatrix(unittest.TestCase):
+    """Unit tests for the CondensedMatrix class.
+    """
+
+    def setUp(self) -> None:
+        """Setup the unit test.
+        """
+        rng = np.random.default_rng(0)
+        upper = np.triu(rng.random((9, 9)), k=1)
+        self.matrix = upper + upper.T
+        self.condensed = CondensedMatrix.from_dense(self.matrix)
+
+    def test_layout(self):
+        """Tests that the pairs are stored row after row."""
+        self.assertEqual(len(self.condensed.data), 36)
+        self.assertTrue((self.condensed.data == self.matrix[np.triu_indices(9, k=1)]).all(),
+                        msg="The upper triangle is not stored row after row.")
+        rows, cols = CondensedMatrix.row_col(9, np.arange(36))
+        self.assertTrue((CondensedMatrix.index(9, rows, cols) == np.arange(36)).all(),
+                        msg="row_col is not the inverse of index.")
+        self.assertTrue((CondensedMatrix.index(9, cols, rows) == np.arange(36)).all(),
+                        msg="index is not symmetric.")
+
+    def test_views(self):
+        """Tests the rows, blocks and full matrix read from the condensed matrix."""
+        self.assertTrue((self.condensed.to_dense() == self.matrix).all(), msg="The full matrix is not correct.")
+        self.assertTrue((np.asarray(self.condensed) == self.matrix).all())
+        for row in range(9):
+            self.assertTrue((self.condensed[row] == self.matrix[row]).all(), msg=f"Row {row} is not correct.")
+        self.assertEqual(self.condensed[3, 5], self.matrix[3, 5])
+        self.assertEqual(self.condensed[4, 4], 0)
+        rows, cols = np.array([8, 0, 3]), np.array([3, 3, 1, 7])
+        self.assertTrue((self.condensed.block(rows, cols) == self.matrix[np.ix_(rows, cols)]).all(),
+                        msg="The block is not correct.")
+        self.assertEqual(CondensedMatrix(1).to_dense().shape, (1, 1))
+
+    def test_set_block(self):
+        """Tests that writing the blocks of the full matrix fills the condensed matrix."""
+        condensed = CondensedMatrix(9, dtype=np.float32)
+        order = np.array([4, 0, 8, 2, 6, 1, 3, 5, 7])
+        condensed.set_block(order[:5], order, self.matrix[np.ix_(order[:5], order)])
+        condensed.set_block(order[5:], order[5:], self.matrix[np.ix_(order[5:], order[5:])])
+        self.assertEqual(condensed.dtype, np.float32)
+        self.assertTrue((condensed.to_dense() == self.matrix.astype(np.float32)).all(),
+                        msg="The blocks are not written at the right positions.")
+
+    def test_parameters(self):
+        """Tests the error raising in the constructor."""
+        with self.assertRaises(ValueError, msg="Does not raise a ValueError if the data does not match the size."):
+            CondensedMatrix(4, data=np.zeros(5))
+        with self.assertRaises(ValueError, msg="Does not raise a ValueError if size is negative."):
+            CondensedMatrix(-1)
+        with self.assertRaises(ValueError, msg="Does not raise a ValueError if the matrix is not square."):
+            CondensedMatrix.from_dense(np.zeros((2, 3)))
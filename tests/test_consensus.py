@@ -0,0 +1,87 @@
+"""
+Unit tests for the Consensus class.
+"""
+import unittest
+from stemmabench.algorithms.consensus import Consensus
+
+
+class TestConsensus(unittest.TestCase):
+    """Unit tests for the Consensus class.
+    """
+
+    def setUp(self) -> None:
+        """Setup the unit test.
+        """
+        self.leaves = ["A", "B", "C", "D", "E"]
+        # ((A, B), C, (D, E)) rooted at different nodes.
+        self.tree1 = [["X", "A"], ["X", "B"], ["X", "Y"], ["Y", "C"], ["Y", "Z"], ["Z", "D"], ["Z", "E"]]
+        self.tree2 = [["Z", "D"], ["Z", "E"], ["Z", "Y"], ["Y", "C"], ["Y", "X"], ["X", "A"], ["X", "B"]]
+        # ((A, C), B, (D, E)).
+        self.tree3 = [["X", "A"], ["X", "C"], ["X", "Y"], ["Y", "B"], ["Y", "Z"], ["Z", "D"], ["Z", "E"]]
+
+    def test_init(self):
+        """Tests the constructor."""
+        consensus = Consensus(self.leaves)
+        self.assertEqual(consensus.leaves, self.leaves)
+        self.assertEqual(consensus.trees, 0)
+        self.assertEqual(consensus.counts, {})
+        with self.assertRaises(ValueError, msg="Does not raise a ValueError for duplicated leaves."):
+            Consensus(["A", "A"])
+
+    def test_bitsets(self):
+        """Tests that the bitsets do not depend on the root of the tree."""
+        consensus = Consensus(self.leaves)
+        bitsets1, bitsets2 = consensus.bitsets(self.tree1), consensus.bitsets(self.tree2)
+        self.assertEqual(bitsets1["X,Y"], 0b11100, msg="The bitset contains leaf 0.")
+        self.assertEqual(bitsets1["Y,Z"], bitsets2["Z,Y"], msg="The bitset depends on the root.")
+        self.assertEqual(bitsets1["X,Y"], bitsets2["Y,X"], msg="The bitset depends on the root.")
+        self.assertEqual(bitsets1["Z,D"], 0b01000)
+        self.assertEqual(bitsets1["X,A"], 0b11110)
+        with self.assertRaises(ValueError, msg="Does not raise a ValueError for a missing leaf."):
+            consensus.bitsets(self.tree1[:-1])
+
+    def test_add(self):
+        """Tests that only the non trivial bipartitions are counted."""
+        consensus = Consensus(self.leaves)
+        consensus.add(self.tree1)
+        consensus.add(self.tree2)
+        consensus.add(self.tree3)
+        self.assertEqual(consensus.trees, 3)
+        self.assertEqual(consensus.counts, {0b11100: 2, 0b11000: 3, 0b11010: 1})
+        self.assertEqual(consensus.members(0b11010), [1, 3, 4])
+
+    def test_supports(self):
+        """Tests the supports of the edges of a tree."""
+        consensus = Consensus(self.leaves)
+        self.assertEqual(consensus.supports(self.tree1)["X,Y"], 0.0)
+        for tree in [self.tree1, self.tree2, self.tree3, self.tree3]:
+            consensus.add(tree)
+        supports = consensus.supports(self.tree3)
+        self.assertEqual(supports["X,Y"], 0.5)
+        self.assertEqual(supports["Y,Z"], 1.0)
+        self.assertEqual(supports["X,A"], 1.0, msg="A trivial bipartition is not supported by all the trees.")
+
+    def test_build(self):
+        """Tests the majority-rule and strict consensus trees."""
+        consensus = Consensus(self.leaves)
+        with self.assertRaises(ValueError, msg="Does not raise a ValueError without trees."):
+            consensus.build()
+        for tree in [self.tree1, self.tree2, self.tree3]:
+            consensus.add(tree)
+        supports, edges = consensus.build("majority")
+        self.assertEqual(sorted(map(tuple, edges)), [("N_0", "A"), ("N_0", "B"), ("N_0", "N_1"), ("N_1", "C"),
+                                                    ("N_1", "N_2"), ("N_2", "D"), ("N_2", "E")],
+                         msg="The majority-rule consensus is wrong.")
+        self.assertEqual(Consensus(self.leaves).bitsets(edges)["N_0,N_1"], 0b11100)
+        self.assertEqual(supports["N_0,N_1"], 2 / 3)
+        self.assertEqual(len(supports), len(edges))
+        supports, edges = consensus.build("strict")
+        self.assertEqual(sorted(map(tuple, edges)), [("N_0", "A"), ("N_0", "B"), ("N_0", "C"), ("N_0", "N_1"),
+                                                    ("N_1", "D"), ("N_1", "E")], msg="The strict consensus is wrong.")
+        self.assertEqual(supports["N_0,N_1"], 1.0)
+        with self.assertRaises(ValueError, msg="Does not raise a ValueError for an unknown method."):
+            consensus.build("unknown")
+
+
+if __name__ == '__main__':
+    unittest.main()
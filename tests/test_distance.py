@@ -0,0 +1,89 @@
+"""
+Unit tests for the Distance and ScalarDistance classes.
+"""
+import functools
+import tempfile
+import unittest
+import numpy as np
+import textdistance
+from textdistance import levenshtein
+from stemmabench.algorithms.distance import Distance, ScalarDistance
+from stemmabench.algorithms.levenshtein import Levenshtein
+from stemmabench.algorithms.distance_engine import DistanceEngine
+
+
+class LengthDistance(Distance):
+    """Vectorized distance used for testing, the absolute difference of the lengths of the texts."""
+
+    def pairwise(self, texts1, texts2=None):
+        lengths1 = np.array([len(text) for text in texts1], dtype=float)
+        lengths2 = lengths1 if texts2 is None else np.array([len(text) for text in texts2], dtype=float)
+        return np.abs(lengths1[:, None] - lengths2[None, :])
+
+
+class TestDistance(unittest.TestCase):
+    """Unit tests for the Distance and ScalarDistance classes.
+    """
+
+    def setUp(self) -> None:
+        """Setup the unit test.
+        """
+        self.texts = ["kitten", "sitting", "", "flaw", "lawn"]
+        self.reference = np.array([[levenshtein(text1, text2) for text2 in self.texts] for text1 in self.texts],
+                                  dtype=float)
+
+    def test_scalar_distance(self):
+        """Tests the wrapping of a scalar function."""
+        distance = Distance.resolve(levenshtein)
+        self.assertIsInstance(distance, ScalarDistance, msg="Does not wrap a function in a ScalarDistance.")
+        self.assertEqual(distance.function, levenshtein)
+        self.assertEqual(distance("kitten", "sitting"), 3)
+        self.assertTrue((distance.pairwise(self.texts) == self.reference).all(),
+                        msg="The symmetric pairwise matrix is not correct.")
+        self.assertTrue((distance.pairwise(self.texts[:2], self.texts[2:]) == self.reference[:2, 2:]).all(),
+                        msg="The rectangular pairwise matrix is not correct.")
+
+    def test_vectorized_distance(self):
+        """Tests a distance only implementing the pairwise method."""
+        distance = LengthDistance()
+        self.assertEqual(distance("kitten", "flaw"), 2.0, msg="Calling the distance does not use pairwise.")
+        self.assertTrue(distance.is_similarity())
+        self.assertEqual(distance.pairwise(self.texts).shape, (5, 5))
+
+    def test_resolve(self):
+        """Tests the resolve method."""
+        self.assertIn("levenshtein", Distance.names())
+        self.assertIsInstance(Distance.resolve("levenshtein"), Levenshtein)
+        distance = LengthDistance()
+        self.assertIs(Distance.resolve(distance), distance, msg="Does not return a Distance unchanged.")
+        with self.assertRaises(ValueError, msg="Does not raise a ValueError for an unknown name."):
+            Distance.resolve("unknown")
+        with self.assertRaises(ValueError, msg="Does not raise a ValueError if the distance is not callable."):
+            Distance.resolve(3)
+
+    def test_identity(self):
+        """Tests that different distances have different identities, and that the distances of lambdas are not cached."""
+        identities = [ScalarDistance(function).identity for function in [textdistance.hamming.distance,
+                                                                          textdistance.levenshtein.distance,
+                                                                          textdistance.Levenshtein(qval=2).distance]]
+        self.assertEqual(len(set(identities)), 3, msg="Bound methods of different objects have the same identity.")
+        self.assertEqual(ScalarDistance(textdistance.levenshtein.distance).identity, identities[1])
+        for function in [lambda text1, text2: textdistance.hamming(text1, text2),
+                         lambda text1, text2: textdistance.levenshtein(text1, text2),
+                         functools.partial(textdistance.levenshtein)]:
+            self.assertIsNone(ScalarDistance(function).identity, msg="A function without stable name has an identity.")
+        first, second = [ScalarDistance(lambda text1, text2: levenshtein(text1, text2), identity=name)
+                         for name in ["first", "second"]]
+        self.assertNotEqual(first.identity, second.identity)
+        with tempfile.TemporaryDirectory() as folder:
+            with self.assertRaises(ValueError, msg="Does not raise a ValueError when caching a lambda."):
+                DistanceEngine(lambda text1, text2: levenshtein(text1, text2), cache=folder)
+            self.assertTrue((DistanceEngine(first, cache=folder).compute(self.texts) == self.reference).all())
+
+    def test_is_similarity(self):
+        """Tests the is_similarity method."""
+        self.assertTrue(Levenshtein().is_similarity())
+        self.assertFalse(ScalarDistance(lambda text1, text2: len(text1) + len(text2)).is_similarity(),
+                         msg="Does not return false if d(x,x) != 0.")
+        self.assertFalse(ScalarDistance(lambda text1, text2: len(text1) - len(text2)).is_similarity(),
+                         msg="Does not return false if d(x,y) != d(y,x).")
@@ -0,0 +1,96 @@
+"""
+Unit tests for the DistanceCache class.
+"""
+import os
+import tempfile
+import unittest
+import numpy as np
+from textdistance import levenshtein
+from stemmabench.algorithms.distance import Distance
+from stemmabench.algorithms.distance_cache import DistanceCache
+from stemmabench.algorithms.distance_engine import DistanceEngine
+
+
+class CountingDistance(Distance):
+    """Levenshtein distance counting its calls, used for testing."""
+
+    def __init__(self) -> None:
+        # Stored in a list so that the counter is not part of the identity of the distance.
+        self.calls = [0]
+
+    def __call__(self, text1, text2):
+        self.calls[0] += 1
+        return levenshtein(text1, text2)
+
+
+class TestDistanceCache(unittest.TestCase):
+    """Unit tests for the DistanceCache class.
+    """
+
+    def setUp(self) -> None:
+        """Setup the unit test.
+        """
+        self.folder = tempfile.TemporaryDirectory()
+        self.texts = [f"{i} " + "text " * (i % 7) for i in range(30)]
+        self.reference = np.array([[levenshtein(text1, text2) for text2 in self.texts] for text1 in self.texts],
+                                  dtype=float)
+
+    def tearDown(self) -> None:
+        """Removes the cache folder."""
+        self.folder.cleanup()
+
+    def test_lookup_add(self):
+        """Tests the lookup and add methods."""
+        cache = DistanceCache(self.folder.name)
+        keys = cache.fingerprint(["a", "b", "c"])
+        self.assertEqual(keys.dtype, np.uint64)
+        self.assertTrue(np.isnan(cache.lookup("test", keys[:2], keys[1:])).all(),
+                        msg="An empty cache returns distances.")
+        cache.add("test", keys[:2], keys[1:], np.array([1.0, 2.0]))
+        self.assertTrue((cache.lookup("test", keys[1:], keys[:2]) == [1.0, 2.0]).all(),
+                        msg="The cache is not symmetric.")
+        self.assertTrue(np.isnan(cache.lookup("other", keys[:2], keys[1:])).all(),
+                        msg="The distances of an other identity are returned.")
+        self.assertTrue(np.isnan(cache.lookup("test", keys[[0]], keys[[2]])).all())
+        reloaded = DistanceCache(self.folder.name)
+        self.assertTrue((reloaded.lookup("test", keys[:2], keys[1:]) == [1.0, 2.0]).all(),
+                        msg="The distances are not persisted.")
+        self.assertEqual(len(reloaded), 2)
+
+    def test_interrupted_write(self):
+        """Tests that an incomplete record is ignored and overwritten."""
+        cache = DistanceCache(self.folder.name)
+        keys = cache.fingerprint(["a", "b", "c"])
+        cache.add("test", keys[:1], keys[1:2], np.array([1.0]))
+        with open(cache.path("test"), "ab") as file:
+            file.write(b"\x00" * 5)
+        reloaded = DistanceCache(self.folder.name)
+        self.assertEqual(reloaded.lookup("test", keys[:1], keys[1:2])[0], 1.0)
+        reloaded.add("test", keys[1:2], keys[2:], np.array([2.0]))
+        self.assertTrue((DistanceCache(self.folder.name).lookup("test", keys[:2], keys[1:]) == [1.0, 2.0]).all(),
+                        msg="The records are not aligned after an interrupted write.")
+
+    def test_engine(self):
+        """Tests that the engine only computes the pairs missing from the cache."""
+        distance = CountingDistance()
+        engine = DistanceEngine(distance, tile_size=7, cache=self.folder.name)
+        self.assertTrue((engine.compute(self.texts[:25]) == self.reference[:25, :25]).all(),
+                        msg="The distance matrix is not correct with an empty cache.")
+        self.assertEqual(distance.calls[0], 25 * 24 // 2)
+        distance.calls[0] = 0
+        self.assertTrue((engine.compute(self.texts[::-1]) == self.reference[::-1, ::-1]).all(),
+                        msg="The distance matrix is not correct with a partially filled cache.")
+        self.assertEqual(distance.calls[0], 5 * 25 + 5 * 4 // 2,
+                         msg="Pairs already in the cache are computed again.")
+        distance.calls[0] = 0
+        engine.compute(self.texts)
+        self.assertEqual(distance.calls[0], 0, msg="Pairs already in the cache are computed again.")
+        self.assertEqual(len(engine.cache), 30 * 29 // 2)
+
+    def test_missing_cover(self):
+        """Tests the missing_cover method."""
+        missing = np.zeros((6, 6), dtype=bool)
+        missing[[1, 4], :] = True
+        missing[:, [1, 4]] = True
+        self.assertCountEqual(DistanceEngine.missing_cover(missing).tolist(), [1, 4])
+        self.assertEqual(DistanceEngine.missing_cover(np.zeros((3, 3), dtype=bool)).tolist(), [])
@@ -0,0 +1,160 @@
+"""
+Unit tests for the DistanceEngine class.
+"""
+import os
+import random
+import tempfile
+import unittest
+import numpy as np
+from textdistance import levenshtein
+from stemmabench.algorithms.condensed_matrix import CondensedMatrix
+from stemmabench.algorithms.distance import Distance
+from stemmabench.algorithms.distance_engine import DistanceEngine
+
+
+class CountingLevenshtein(Distance):
+    """Levenshtein distance counting its calls, used for testing."""
+
+    def __init__(self) -> None:
+        # Stored in a list so that the counter is not part of the identity of the distance.
+        self.calls = [0]
+
+    def __call__(self, text1, text2):
+        self.calls[0] += 1
+        return levenshtein(text1, text2)
+
+
+class TestDistanceEngine(unittest.TestCase):
+    """Unit tests for the DistanceEngine class.
+    """
+
+    def setUp(self) -> None:
+        """Setup the unit test.
+        """
+        generator = random.Random(0)
+        self.texts = ["".join(generator.choice("abc ") for _ in range(generator.randint(0, 30)))
+                      for _ in range(23)]
+        self.reference = np.array([[levenshtein(text1, text2) for text2 in self.texts] for text1 in self.texts],
+                                  dtype=float)
+
+    def test_tiles(self):
+        """Tests that the tiles cover the upper triangle exactly once."""
+        engine = DistanceEngine(levenshtein, tile_size=4)
+        covered = np.zeros((10, 10), dtype=int)
+        for tile in engine.tiles(10):
+            covered[tile[0]:tile[1], tile[2]:tile[3]] += 1
+        self.assertTrue((np.triu(covered, k=1) == np.triu(np.ones((10, 10), dtype=int), k=1)).all(),
+                        msg="The tiles do not cover the upper triangle exactly once.")
+        self.assertEqual(sum(engine.tile_pairs(tile) for tile in engine.tiles(10)), 45,
+                         msg="The number of pairs of the tiles is not correct.")
+        pairs = [engine.tile_pairs(tile) for tile in engine.tiles(10)]
+        self.assertEqual(pairs, sorted(pairs, reverse=True), msg="The tiles are not sorted by number of pairs.")
+
+    def test_compute(self):
+        """Tests the serial computation of the distance matrix."""
+        for tile_size in [1, 5, 64]:
+            out = DistanceEngine(levenshtein, tile_size=tile_size).compute(self.texts)
+            self.assertTrue((out == self.reference).all(),
+                            msg=f"The distance matrix is not correct for tiles of size {tile_size}.")
+        self.assertEqual(DistanceEngine(levenshtein).compute([]).shape, (0, 0))
+
+    def test_compute_condensed(self):
+        """Tests the computation of the condensed distance matrix."""
+        out = DistanceEngine(levenshtein, tile_size=5).compute_condensed(self.texts, dtype=np.float32)
+        self.assertEqual(out.dtype, np.float32)
+        self.assertTrue((out.to_dense() == self.reference).all(),
+                        msg="The condensed distance matrix is not correct.")
+
+    def test_compute_pool(self):
+        """Tests that the process pool returns the same matrix as the serial computation."""
+        out = DistanceEngine(levenshtein, n_jobs=2, tile_size=5).compute(self.texts)
+        self.assertTrue((out == self.reference).all(),
+                        msg="The distance matrix computed by the process pool is not correct.")
+
+    def test_progress(self):
+        """Tests the progress callback."""
+        calls = []
+        DistanceEngine(levenshtein, tile_size=5, progress=lambda done, total: calls.append((done, total))).compute(self.texts)
+        self.assertEqual(len(calls), len(DistanceEngine(levenshtein, tile_size=5).tiles(len(self.texts))))
+        self.assertEqual(calls[-1], (253, 253), msg="The progress callback does not reach the total number of pairs.")
+        self.assertEqual([done for done, _ in calls], sorted(done for done, _ in calls))
+
+    def test_parameters(self):
+        """Tests the error raising in the constructor."""
+        with self.assertRaises(ValueError, msg="Does not raise a ValueError if n_jobs is 0."):
+            DistanceEngine(levenshtein, n_jobs=0)
+        with self.assertRaises(ValueError, msg="Does not raise a ValueError if n_jobs is lower than -1."):
+            DistanceEngine(levenshtein, n_jobs=-2)
+        with self.assertRaises(ValueError, msg="Does not raise a ValueError if tile_size is lower than 1."):
+            DistanceEngine(levenshtein, tile_size=0)
+        self.assertGreaterEqual(DistanceEngine(levenshtein, n_jobs=-1).n_jobs, 1)
+
+    def test_distance_name(self):
+        """Tests the computation with a registered distance."""
+        out = DistanceEngine("levenshtein", n_jobs=2, tile_size=5).compute(self.texts)
+        self.assertTrue((out == self.reference).all(),
+                        msg="The distance matrix computed with the levenshtein distance is not correct.")
+
+    def test_memmap(self):
+        """Tests the computation of a memory-mapped matrix by the process pool and its reuse across runs."""
+        with tempfile.TemporaryDirectory() as folder:
+            path = os.path.join(folder, "distances.npy")
+            distance = CountingLevenshtein()
+            out = DistanceEngine(distance, n_jobs=2, tile_size=5).compute_condensed(self.texts, path=path)
+            self.assertEqual(out.path, os.path.abspath(path))
+            self.assertTrue((out.to_dense() == self.reference).all(),
+                            msg="The memory-mapped matrix written by the worker processes is not correct.")
+            self.assertTrue((CondensedMatrix.open(path, mode="r").to_dense() == self.reference).all(),
+                            msg="The matrix reopened from its file is not correct.")
+            del out
+            DistanceEngine(distance).compute_condensed(self.texts, path=path)
+            self.assertEqual(distance.calls[0], 0, msg="The distances of the file are computed again.")
+            # Simulates an interrupted run in which the last row was not computed.
+            matrix = CondensedMatrix.open(path)
+            matrix.data[CondensedMatrix.index(len(self.texts), np.arange(len(self.texts) - 1), len(self.texts) - 1)] = np.nan
+            matrix.flush()
+            del matrix
+            out = DistanceEngine(distance).compute_condensed(self.texts, path=path)
+            self.assertEqual(distance.calls[0], len(self.texts) - 1, msg="Computes more than the missing distances.")
+            self.assertTrue((out.to_dense() == self.reference).all(), msg="The resumed matrix is not correct.")
+            del out
+            out = DistanceEngine(distance).compute_condensed(self.texts[:10], path=path)
+            self.assertEqual(out.size, 10, msg="The file of other texts is reused.")
+            self.assertTrue((out.to_dense() == self.reference[:10, :10]).all())
+
+    def test_compute_segments(self):
+        """Tests the distance matrices of the segments, computed by the process pool and looked up in the cache."""
+        segments = [self.texts[:10], self.texts[10:20], ["a"] * 5 + ["b"] * 5]
+        references = [np.array([[levenshtein(text1, text2) for text2 in texts] for text1 in texts], dtype=float)
+                      for texts in segments]
+        for n_jobs in [1, 2]:
+            out = DistanceEngine("levenshtein", n_jobs=n_jobs, tile_size=3).compute_segments(segments)
+            self.assertEqual(len(out), 3)
+            for matrix, reference in zip(out, references):
+                self.assertTrue((matrix.to_dense() == reference).all(),
+                                msg="The distance matrix of a segment is not correct.")
+        with self.assertRaises(ValueError, msg="Does not raise a ValueError for segments of different sizes."):
+            DistanceEngine("levenshtein").compute_segments([self.texts[:3], self.texts[:4]])
+        with tempfile.TemporaryDirectory() as folder:
+            distance = CountingLevenshtein()
+            DistanceEngine(distance, cache=folder).compute_segments(segments)
+            distance.calls[0] = 0
+            out = DistanceEngine(distance, cache=folder).compute_segments(segments)
+            self.assertEqual(distance.calls[0], 0, msg="The distances of the cached segments are computed again.")
+            self.assertTrue(all((matrix.to_dense() == reference).all() for matrix, reference in zip(out, references)))
+            out = DistanceEngine(distance, cache=folder).compute_segments(segments + [self.texts[20:] + self.texts[:7]])
+            # The pairs of the last segment between the first 7 texts are in the cache.
+            self.assertEqual(distance.calls[0], 3 + 3 * 7, msg="Only the pairs missing from the cache must be computed.")
+        with tempfile.TemporaryDirectory() as folder:
+            distance = CountingLevenshtein()
+            # Two manuscripts are added to a cached tradition, whose texts are all different.
+            grown = [self.texts[:10], [text + "d" for text in self.texts[:10]]]
+            DistanceEngine(distance, cache=folder).compute_segments([texts[:8] for texts in grown])
+            distance.calls[0] = 0
+            out = DistanceEngine(distance, cache=folder, tile_size=3).compute_segments(grown)
+            self.assertEqual(distance.calls[0], 2 * (1 + 2 * 8),
+                             msg="The pairs of the partially cached segments found in the cache are computed again.")
+            self.assertTrue((out[0].to_dense() == references[0]).all() and
+                            (out[1].to_dense() == [[levenshtein(text1, text2) for text2 in grown[1]]
+                                                   for text1 in grown[1]]).all(),
+                            msg="The distance matrix of a partially cached segment is not correct.")
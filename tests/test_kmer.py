@@ -0,0 +1,84 @@
+"""
+Unit tests for the KmerProfile class.
+"""
+import unittest
+from collections import Counter
+import numpy as np
+from stemmabench.algorithms.distance import Distance
+from stemmabench.algorithms.distance_engine import DistanceEngine
+from stemmabench.algorithms.kmer import KmerProfile
+
+
+class TestKmerProfile(unittest.TestCase):
+    """Unit tests for the KmerProfile class.
+    """
+
+    def setUp(self) -> None:
+        """Setup the unit test.
+        """
+        generator = np.random.default_rng(0)
+        self.texts = ["".join(generator.choice(list("abcd "), generator.integers(0, 40))) for _ in range(20)]
+        self.texts += ["", "a", "abab abab"]
+
+    @staticmethod
+    def expected(text1: str, text2: str, k: int, metric: str) -> float:
+        """Returns the distance between the exact k-mer counts of two texts."""
+        counts = [Counter(text[i:i + min(k, len(text))] for i in range(max(0, len(text) - k) + bool(text)))
+                  for text in [text1, text2]]
+        keys = sorted(set(counts[0]) | set(counts[1]))
+        u, v = (np.array([count[key] for key in keys], dtype=float) for count in counts)
+        if metric == "cosine":
+            if not u.any() or not v.any():
+                return float(u.any() != v.any())
+            return 1 - u @ v / (np.linalg.norm(u) * np.linalg.norm(v))
+        return 0.0 if not (u + v).any() else 1 - 2 * np.minimum(u, v).sum() / (u + v).sum()
+
+    def test_profile(self):
+        """Tests the sparse profiles of the texts."""
+        buckets, counts = KmerProfile(k=2).profile("abab")
+        self.assertEqual(sorted(counts.tolist()), [1, 2], msg="The k-mers are not counted.")
+        self.assertEqual(len(KmerProfile().profile("")[0]), 0)
+        buckets, counts = KmerProfile(k=1, unit="word").profile("a b a")
+        self.assertEqual(sorted(counts.tolist()), [1, 2], msg="The word k-mers are not counted.")
+        self.assertTrue((KmerProfile(width=4).profile("abcdefgh")[0] < 4).all(), msg="The buckets exceed the width.")
+
+    def test_pairwise(self):
+        """Tests the distances against the exact k-mer counts."""
+        for metric in KmerProfile.METRICS:
+            distance = KmerProfile(metric=metric, block_size=7)
+            out = distance.pairwise(self.texts)
+            self.assertTrue((np.diag(out) == 0).all() and (out == out.T).all(),
+                            msg="The distance matrix is not symmetric.")
+            expected = np.array([[self.expected(text1, text2, 3, metric) for text2 in self.texts]
+                                 for text1 in self.texts])
+            self.assertTrue(np.allclose(out, expected, atol=1e-9),
+                            msg=f"The {metric} distances do not match the exact k-mer counts.")
+            self.assertTrue(np.allclose(distance.pairwise(self.texts[:5], self.texts), expected[:5], atol=1e-9),
+                            msg="The distances between two lists of texts are not correct.")
+            self.assertEqual(distance("", ""), 0)
+            self.assertEqual(distance("", "text"), 1)
+            self.assertTrue(distance.is_similarity())
+
+    def test_braycurtis_long_texts(self):
+        """Tests the Bray-Curtis distance on texts whose k-mers occur hundreds of thousands of times."""
+        texts = ["a" * 300000, "a" * 100000 + "b" * 200000, "ab" * 150000]
+        out = KmerProfile(metric="braycurtis").pairwise(texts)
+        expected = np.array([[self.expected(text1, text2, 3, "braycurtis") for text2 in texts] for text1 in texts])
+        self.assertTrue(np.allclose(out, expected, atol=1e-9),
+                        msg="The distances of long texts do not match the exact k-mer counts.")
+
+    def test_engine(self):
+        """Tests the k-mer distance as a named distance of the engine."""
+        self.assertIsInstance(Distance.resolve("kmer"), KmerProfile)
+        expected = KmerProfile().pairwise(self.texts)
+        self.assertTrue(np.allclose(DistanceEngine("kmer", tile_size=4).compute(self.texts), expected),
+                        msg="The engine does not compute the k-mer distances.")
+        self.assertEqual(KmerProfile(block_size=2).identity, KmerProfile().identity,
+                         msg="The block size is part of the identity.")
+        self.assertNotEqual(KmerProfile(metric="braycurtis").identity, KmerProfile().identity)
+
+    def test_errors(self):
+        """Tests the errors of the parameters."""
+        for parameters in [{"k": 0}, {"width": 0}, {"block_size": 0}, {"unit": "line"}, {"metric": "euclidean"}]:
+            with self.assertRaises(ValueError, msg=f"Does not raise a ValueError for {parameters}."):
+                KmerProfile(**parameters)
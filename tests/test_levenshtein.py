@@ -0,0 +1,56 @@
+"""
+Unit tests for the Levenshtein class.
+"""
+import random
+import unittest
+from textdistance import levenshtein
+from stemmabench.algorithms.levenshtein import Levenshtein
+
+
+class TestLevenshtein(unittest.TestCase):
+    """Unit tests for the Levenshtein class.
+    """
+
+    def setUp(self) -> None:
+        """Setup the unit test.
+        """
+        generator = random.Random(0)
+        self.pairs = [("", ""), ("", "abc"), ("abc", ""), ("kitten", "sitting"), ("flaw", "lawn"),
+                      ("été", "ete"), ("a" * 100, "a" * 99 + "b")]
+        for _ in range(300):
+            text1 = "".join(generator.choice("abcé ") for _ in range(generator.randint(0, 150)))
+            text2 = "".join(generator.choice("abcé ") for _ in range(generator.randint(0, 150)))
+            if generator.random() < 0.5:
+                # Similar texts, as between manuscripts of a same tradition.
+                text2 = text1[:generator.randint(0, len(text1))] + text2[:3] + text1[generator.randint(0, len(text1)):]
+            self.pairs.append((text1, text2))
+
+    def test_distance(self):
+        """Tests that the distance is the same as textdistance.levenshtein on random inputs."""
+        for text1, text2 in self.pairs:
+            expected = levenshtein(text1, text2)
+            self.assertEqual(Levenshtein.distance(text1, text2), expected,
+                             msg=f"Distance between {text1!r} and {text2!r} is not correct.")
+            self.assertEqual(Levenshtein.bit_parallel(text1, text2), expected,
+                             msg=f"Bit-parallel distance between {text1!r} and {text2!r} is not correct.")
+
+    def test_max_distance(self):
+        """Tests the early exit of the distance and the banded methods."""
+        for text1, text2 in self.pairs[:100]:
+            expected = levenshtein(text1, text2)
+            for max_distance in [0, 1, expected - 1, expected, expected + 5]:
+                if max_distance < 0:
+                    continue
+                capped = min(expected, max_distance + 1)
+                self.assertEqual(Levenshtein.distance(text1, text2, max_distance), capped,
+                                 msg=f"Early exit of the distance with max_distance={max_distance} is not correct.")
+                self.assertEqual(Levenshtein.banded(text1, text2, max_distance), capped,
+                                 msg=f"Banded distance with max_distance={max_distance} is not correct.")
+        with self.assertRaises(ValueError, msg="Does not raise a ValueError if max_distance is negative."):
+            Levenshtein.banded("a", "b", -1)
+
+    def test_common_prefix_length(self):
+        """Tests the common_prefix_length method."""
+        self.assertEqual(Levenshtein.common_prefix_length("abcdef", "abcxef"), 3)
+        self.assertEqual(Levenshtein.common_prefix_length("abc", "abc"), 3)
+        self.assertEqual(Levenshtein.common_prefix_length("", "abc"), 0)
@@ -50,3 +50,13 @@ class TestManuscriptInTree(unittest.TestCase):
         self.assertTrue(self.manuscript1.__eq__(self.manuscript2))
         self.assertFalse(self.manuscript1.__eq__(self.manuscript3))
         self.assertFalse(self.manuscript1.__eq__(self.manuscript4))
+
+    def test_recursive_init_deep(self):
+        """Tests the construction of a chain-like tree deeper than the recursion limit."""
+        edges = [[str(i), str(i + 1)] for i in range(5000)]
+        root = ManuscriptInTree(parent=None, recursive=Utils.dict_from_edge(edge_list=edges), text_list=["0", "4999"])
+        lookup = root.build_text_lookup()
+        self.assertEqual(len(lookup), 5001)
+        self.assertIsInstance(lookup["4999"], ManuscriptInTree)
+        self.assertIs(lookup["4999"].parent, lookup["4998"])
+        self.assertEqual(lookup["5000"].children, [])
@@ -67,3 +67,39 @@ class TestManuscriptInTreeBase(unittest.TestCase):
         """Tests the build_text_lookup method."""
         self.assertDictEqual(
             self.manuscriptBase.build_text_lookup(), self.lookup_dict)
+
+    def test_deep_tree(self):
+        """Tests that the traversals do not hit the recursion limit on a chain-like tree."""
+        root = ManuscriptInTreeBase(label="0", parent=None, children=[], edges=[])
+        node = root
+        for i in range(1, 5000):
+            child = ManuscriptInTreeBase(label=str(i), parent=node, children=[], edges=[])
+            node._children.append(child)
+            node = child
+        self.assertEqual(len(root.build_text_lookup()), 5000)
+        root.set_edges({f"{i-1},{i}": 0.5 for i in range(1, 5000)})
+        self.assertEqual(root.build_text_lookup()["4998"].edges, [0.5])
+        self.assertEqual(node.edges, [])
+        depth = 0
+        nested = root.dict()["0"]
+        while nested:
+            nested = nested[str(depth + 1)]
+            depth += 1
+        self.assertEqual(depth, 4999)
+
+    def test_reroot(self):
+        """Tests the reroot method."""
+        new_root = self.manuscriptBase.reroot("child2")
+        self.assertIs(new_root, self.test_child2)
+        self.assertIsNone(new_root.parent)
+        self.assertIs(self.manuscriptBase.parent, new_root)
+        self.assertDictEqual(new_root.dict(), {'child2': {'label': {'child1': {}, 'child3': {}}}})
+        self.assertEqual(new_root.edges, [2])
+        self.assertEqual(self.manuscriptBase.edges, [1, 3])
+        new_root.set_supports({"child2,label": 0.2, "label,child1": 0.1, "label,child3": 0.3})
+        self.assertEqual(self.manuscriptBase.supports, [0.1, 0.3])
+        self.manuscriptBase.reroot("child1")
+        self.assertEqual(self.test_child1.supports, [0.1], msg="The supports do not follow their edges.")
+        self.assertEqual(self.manuscriptBase.supports, [0.3])
+        with self.assertRaises(ValueError, msg="Does not raise a ValueError if the label is not in the tree."):
+            new_root.reroot("missing")
@@ -0,0 +1,104 @@
+"""
+Unit tests for the MinHash class.
+"""
+import os
+import tempfile
+import unittest
+import numpy as np
+from stemmabench.algorithms.distance import Distance
+from stemmabench.algorithms.distance_engine import DistanceEngine
+from stemmabench.algorithms.minhash import MinHash
+
+
+class TestMinHash(unittest.TestCase):
+    """Unit tests for the MinHash class.
+    """
+
+    def setUp(self) -> None:
+        """Setup the unit test.
+        """
+        generator = np.random.default_rng(0)
+        vocabulary = [f"word{i}" for i in range(400)]
+        self.texts = [" ".join(generator.choice(vocabulary, 150)) for _ in range(6)]
+        # Near duplicates of the first text, with 5 and 30 words replaced.
+        for replaced in [5, 30]:
+            words = self.texts[0].split()
+            words[:replaced] = generator.choice(vocabulary, replaced)
+            self.texts.append(" ".join(words))
+
+    @staticmethod
+    def exact_jaccard(shingles1: np.ndarray, shingles2: np.ndarray) -> float:
+        """Returns the exact Jaccard similarity of two sets of shingles."""
+        return len(np.intersect1d(shingles1, shingles2)) / len(np.union1d(shingles1, shingles2))
+
+    def test_shingles(self):
+        """Tests the shingles of the texts."""
+        distance = MinHash(shingle_size=3)
+        self.assertEqual(len(distance.shingles("abcabc")), 3, msg="The shingles of a text are not distinct.")
+        self.assertEqual(len(distance.shingles("ab")), 1, msg="A short text is not a single shingle.")
+        self.assertEqual(len(distance.shingles("")), 0)
+        words = MinHash(unit="word", shingle_size=2)
+        self.assertEqual(len(words.shingles("a b a b c")), 3, msg="The word shingles are not correct.")
+        self.assertEqual(MinHash(unit="word").shingle_size, 2)
+
+    def test_estimate(self):
+        """Tests that the distances estimate the Jaccard distances of the shingles."""
+        distance = MinHash(num_perm=256)
+        out = distance.pairwise(self.texts)
+        self.assertTrue((np.diag(out) == 0).all() and (out == out.T).all(), msg="The distance matrix is not symmetric.")
+        shingles = [distance.shingles(text) for text in self.texts]
+        for i in range(len(self.texts)):
+            for j in range(len(self.texts)):
+                self.assertAlmostEqual(out[i, j], 1 - self.exact_jaccard(shingles[i], shingles[j]), delta=0.15,
+                                       msg=f"The distance between texts {i} and {j} is not a good estimate.")
+        self.assertTrue((distance.pairwise(self.texts[:2], self.texts[2:]) == out[:2, 2:]).all())
+        self.assertEqual(distance("", ""), 0)
+        self.assertEqual(distance("", "text"), 1)
+
+    def test_empty_texts(self):
+        """Tests that the empty texts are at distance 0 from each other and 1 from the other texts."""
+        distance = MinHash()
+        self.assertTrue((distance.pairwise(["", "", "a text"]) == [[0, 0, 1], [0, 0, 1], [1, 1, 0]]).all(),
+                        msg="The distances of the empty texts are not correct.")
+        self.assertEqual(distance.candidates(["", "", "a text"], bands=32).tolist(), [[0, 1]],
+                         msg="An empty text is a candidate with a non empty text.")
+
+    def test_candidates(self):
+        """Tests that the locality sensitive hashing finds the near duplicates."""
+        candidates = MinHash().candidates(self.texts, bands=32)
+        self.assertIn([0, 6], candidates.tolist(), msg="Does not find the near duplicate.")
+        self.assertTrue((candidates[:, 0] < candidates[:, 1]).all())
+        self.assertNotIn([1, 2], candidates.tolist(), msg="Finds texts without common shingles.")
+        with self.assertRaises(ValueError, msg="Does not raise a ValueError if bands does not divide num_perm."):
+            MinHash().candidates(self.texts, bands=3)
+
+    def test_store(self):
+        """Tests that the signatures are stored and sketched once across runs."""
+        with tempfile.TemporaryDirectory() as folder:
+            distance = MinHash(store=folder)
+            self.assertEqual(distance.identity, MinHash().identity, msg="The store is part of the identity.")
+            distance.prepare(self.texts[:5])
+            path = os.path.join(folder, os.listdir(folder)[0])
+            record = 8 * (distance.num_perm + 1)
+            self.assertEqual(os.path.getsize(path), 5 * record)
+            reloaded = MinHash(store=folder)
+            reloaded.prepare(self.texts)
+            self.assertEqual(os.path.getsize(path), len(self.texts) * record,
+                             msg="The stored signatures are sketched again.")
+            self.assertTrue((reloaded.signatures(self.texts) == distance.signatures(self.texts)).all())
+
+    def test_engine(self):
+        """Tests the selection of the distance by name in the distance engine."""
+        self.assertIsInstance(Distance.resolve("minhash"), MinHash)
+        out = DistanceEngine("minhash", n_jobs=2, tile_size=3).compute(self.texts)
+        self.assertTrue((out == MinHash().pairwise(self.texts)).all(),
+                        msg="The distance matrix computed by the engine is not correct.")
+
+    def test_parameters(self):
+        """Tests the error raising in the constructor."""
+        with self.assertRaises(ValueError, msg="Does not raise a ValueError if num_perm is lower than 1."):
+            MinHash(num_perm=0)
+        with self.assertRaises(ValueError, msg="Does not raise a ValueError if shingle_size is lower than 1."):
+            MinHash(shingle_size=0)
+        with self.assertRaises(ValueError, msg="Does not raise a ValueError for an unknown unit."):
+            MinHash(unit="sentence")
@@ -0,0 +1,78 @@
+"""
+Unit tests for the MinimumSpanningTree class.
+"""
+import unittest
+import numpy as np
+from stemmabench.algorithms.condensed_matrix import CondensedMatrix
+from stemmabench.algorithms.mst_core import MinimumSpanningTree
+
+
+class TestMinimumSpanningTree(unittest.TestCase):
+    """Unit tests for the MinimumSpanningTree class.
+    """
+
+    def setUp(self) -> None:
+        """Setup the unit test.
+        """
+        # Points on a line at 0, 1, 3, 6 and 10: the tree is the path a - b - c - d - e.
+        positions = np.array([0, 1, 3, 6, 10], dtype=float)
+        self.labels = ["a", "b", "c", "d", "e"]
+        self.dist_matrix = np.abs(positions[:, None] - positions[None])
+        rng = np.random.default_rng(0)
+        points = rng.random((50, 2))
+        self.random_matrix = np.sqrt(((points[:, None] - points[None]) ** 2).sum(axis=-1))
+        self.random_labels = [f"m{i:02d}" for i in range(50)]
+
+    @staticmethod
+    def weight(matrix: np.ndarray) -> float:
+        """Returns the weight of the minimum spanning tree found by scanning the whole matrix at each step."""
+        in_tree = np.zeros(len(matrix), dtype=bool)
+        in_tree[0] = True
+        total = 0.0
+        while not in_tree.all():
+            outside = np.where(in_tree[:, None] & ~in_tree[None], matrix, np.inf)
+            row, col = np.unravel_index(outside.argmin(), outside.shape)
+            total += matrix[row, col]
+            in_tree[col] = True
+        return total
+
+    def test_build(self):
+        """Tests the edges, their lengths and the rooting heuristics."""
+        distance_dict, edge_list = MinimumSpanningTree(self.dist_matrix, self.labels).build()
+        self.assertEqual(edge_list, [["d", "c"], ["d", "e"], ["c", "b"], ["b", "a"]],
+                         msg="The tree is not rooted at the manuscript of minimal eccentricity.")
+        self.assertDictEqual(distance_dict, {"d,c": 3, "d,e": 4, "c,b": 2, "b,a": 1})
+        _, edge_list = MinimumSpanningTree(self.dist_matrix, self.labels, root="medoid").build()
+        self.assertEqual(edge_list[0][0], "c", msg="The tree is not rooted at the medoid.")
+        _, edge_list = MinimumSpanningTree(self.dist_matrix, self.labels, root="e").build()
+        self.assertEqual(edge_list, [["e", "d"], ["d", "c"], ["c", "b"], ["b", "a"]],
+                         msg="The tree is not rooted at the given label.")
+
+    def test_reference(self):
+        """Tests that the tree is a minimum spanning tree and that the medoid minimizes the sum of the distances."""
+        builder = MinimumSpanningTree(self.random_matrix, self.random_labels, root="medoid")
+        distance_dict, edge_list = builder.build()
+        self.assertEqual(len(edge_list), 49)
+        self.assertEqual(len({label for edge in edge_list for label in edge}), 50)
+        self.assertAlmostEqual(sum(distance_dict.values()), self.weight(self.random_matrix),
+                               msg="The tree is not a minimum spanning tree.")
+        self.assertTrue(np.allclose(builder.row_sums(), self.random_matrix.sum(axis=1)))
+        self.assertEqual(edge_list[0][0], self.random_labels[int(self.random_matrix.sum(axis=1).argmin())])
+
+    def test_condensed(self):
+        """Tests that a CondensedMatrix gives the same tree as a full matrix."""
+        reference = MinimumSpanningTree(self.random_matrix, self.random_labels).build()
+        condensed = CondensedMatrix.from_dense(self.random_matrix)
+        self.assertEqual(MinimumSpanningTree(condensed, self.random_labels).build(), reference)
+
+    def test_parameters(self):
+        """Tests the errors of the constructor and the trees of less than 2 manuscripts."""
+        with self.assertRaises(ValueError, msg="Does not raise a ValueError for a matrix not matching the labels."):
+            MinimumSpanningTree(self.dist_matrix, self.labels[:4])
+        with self.assertRaises(ValueError, msg="Does not raise a ValueError for an unknown root."):
+            MinimumSpanningTree(self.dist_matrix, self.labels, root="unknown")
+        self.assertEqual(MinimumSpanningTree(np.zeros((1, 1)), ["a"]).build(), ({}, []))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,82 @@
+"""
+Unit tests for the CompressionDistance class.
+"""
+import unittest
+import numpy as np
+from stemmabench.algorithms.distance import Distance
+from stemmabench.algorithms.distance_engine import DistanceEngine
+from stemmabench.algorithms.ncd import CompressionDistance
+
+
+class TestCompressionDistance(unittest.TestCase):
+    """Unit tests for the CompressionDistance class.
+    """
+
+    def setUp(self) -> None:
+        """Setup the unit test.
+        """
+        generator = np.random.default_rng(0)
+        vocabulary = [f"word{i}" for i in range(200)]
+        self.texts = [" ".join(generator.choice(vocabulary, generator.integers(0, 120))) for _ in range(8)]
+        words = self.texts[0].split()
+        words[:3] = ["copy", "of", "text"]
+        self.texts += [" ".join(words), ""]
+
+    @staticmethod
+    def expected(distance: CompressionDistance, text1: str, text2: str) -> float:
+        """Returns the normalized compression distance computed by compressing whole concatenations."""
+        segments1, segments2 = distance.segments(text1), distance.segments(text2)
+        total = 0
+        for position in range(max(len(segments1), len(segments2))):
+            segment1 = segments1[position] if position < len(segments1) else b""
+            segment2 = segments2[position] if position < len(segments2) else b""
+            if segment1 != segment2:
+                size1, size2 = distance.compressed_size(segment1), distance.compressed_size(segment2)
+                first, second = sorted([segment1, segment2], key=lambda segment: (-len(segment), segment))
+                size = distance.compressed_size(first + second)
+                total += (size - min(size1, size2)) / max(size1, size2)
+        return total / max(1, len(segments1), len(segments2))
+
+    def test_pairwise(self):
+        """Tests the distances against the compression of the whole concatenations."""
+        for compressor in CompressionDistance.COMPRESSORS:
+            for segment_size in [None, 20]:
+                distance = CompressionDistance(compressor, segment_size=segment_size)
+                out = distance.pairwise(self.texts)
+                self.assertTrue((np.diag(out) == 0).all() and (out == out.T).all(),
+                                msg="The distance matrix is not symmetric.")
+                expected = np.array([[self.expected(distance, text1, text2) for text2 in self.texts]
+                                     for text1 in self.texts])
+                self.assertTrue(np.allclose(out, expected),
+                                msg=f"The {compressor} distances with segments of {segment_size} words are not correct.")
+                self.assertTrue(np.allclose(distance.pairwise(self.texts[:3], self.texts), expected[:3]))
+                self.assertTrue(distance.is_similarity())
+
+    def test_copy(self):
+        """Tests that the copied state of the compressor gives the size of the compressed concatenation."""
+        distance = CompressionDistance()
+        first, seconds = self.texts[0].encode("utf-8"), [text.encode("utf-8") for text in self.texts]
+        self.assertEqual(distance.concatenated_sizes(first, seconds),
+                         [distance.compressed_size(first + second) for second in seconds])
+
+    def test_distance(self):
+        """Tests that the near copy is the closest text."""
+        out = CompressionDistance().pairwise(self.texts)
+        self.assertEqual(np.argsort(out[0])[1], 8, msg="The near copy is not the closest text.")
+        self.assertEqual(out[9, 9], 0)
+
+    def test_engine(self):
+        """Tests the compression distance as a named distance of the engine."""
+        self.assertIsInstance(Distance.resolve("ncd"), CompressionDistance)
+        distance = CompressionDistance(segment_size=10)
+        self.assertTrue(np.allclose(DistanceEngine(distance, n_jobs=2, tile_size=3).compute(self.texts),
+                                    distance.pairwise(self.texts)),
+                        msg="The engine does not compute the compression distances.")
+        self.assertNotEqual(distance.identity, CompressionDistance().identity)
+
+    def test_errors(self):
+        """Tests the errors of the parameters."""
+        with self.assertRaises(ValueError, msg="Does not raise a ValueError for an unknown compressor."):
+            CompressionDistance("gzip")
+        with self.assertRaises(ValueError, msg="Does not raise a ValueError for an empty segment."):
+            CompressionDistance(segment_size=0)
@@ -0,0 +1,116 @@
+"""
+Unit tests for the NeighborJoining class.
+"""
+import os
+import tempfile
+import unittest
+import numpy as np
+from stemmabench.algorithms.condensed_matrix import CondensedMatrix
+from stemmabench.algorithms.nj_core import NeighborJoining
+
+
+class TestNeighborJoining(unittest.TestCase):
+    """Unit tests for the NeighborJoining class.
+    """
+
+    def setUp(self) -> None:
+        """Setup the unit test.
+        """
+        self.labels = ["a", "b", "c", "d", "e"]
+        self.dist_matrix = np.array([[0, 17, 21, 31, 23],
+                                     [17, 0, 30, 34, 21],
+                                     [21, 30, 0, 28, 39],
+                                     [31, 34, 28, 0, 43],
+                                     [23, 21, 39, 43, 0]])
+        self.edge_dictionary_reference = {'N_1,c': 11.0,
+                                          'N_1,d': 17.0,
+                                          'N_2,a': 4.75,
+                                          'N_2,N_1': 7.25,
+                                          'N_3,b': 6.75,
+                                          'N_3,e': 14.25,
+                                          'N_2,N_3': 4.75}
+        rng = np.random.default_rng(0)
+        points = rng.random((60, 3))
+        self.random_matrix = np.sqrt(((points[:, None] - points[None]) ** 2).sum(axis=-1))
+        self.random_labels = [f"m{i:02d}" for i in range(60)]
+
+    def test_build(self):
+        """Tests the edges and branch lengths."""
+        distance_dict, edge_list = NeighborJoining(self.dist_matrix, self.labels).build()
+        self.assertDictEqual(distance_dict, self.edge_dictionary_reference,
+                             msg="Does not return the correct distance dictionary.")
+        self.assertEqual(edge_list, [edge.split(",") for edge in self.edge_dictionary_reference],
+                         msg="Does not return the edges in order of creation.")
+
+    def test_additive(self):
+        """Tests that the tree of an additive matrix is recovered exactly."""
+        # Tree ((a:1,b:2):3,(c:4,d:5):6,e:7) and its path lengths.
+        matrix = np.array([[0, 3, 14, 15, 11],
+                           [3, 0, 15, 16, 12],
+                           [14, 15, 0, 9, 17],
+                           [15, 16, 9, 0, 18],
+                           [11, 12, 17, 18, 0]], dtype=float)
+        distance_dict, _ = NeighborJoining(matrix, self.labels).build()
+        self.assertEqual(sorted(distance_dict.values()), [1, 2, 3, 4, 5, 6, 7],
+                         msg="Does not recover the branch lengths of an additive matrix.")
+
+    def test_chunk_size(self):
+        """Tests that the chunk size does not change the result."""
+        reference = NeighborJoining(self.random_matrix, self.random_labels).build()
+        for chunk_size in [1, 7, 1000]:
+            self.assertEqual(NeighborJoining(self.random_matrix, self.random_labels, chunk_size=chunk_size).build(),
+                             reference, msg=f"The result changes with chunks of {chunk_size} rows.")
+
+    def test_ties(self):
+        """Tests that ties are broken by taking the first pair of the matrix."""
+        matrix = np.ones((4, 4)) - np.eye(4)
+        _, edge_list = NeighborJoining(matrix, ["a", "b", "c", "d"]).build()
+        self.assertEqual(edge_list, [["N_1", "a"], ["N_1", "b"], ["N_2", "c"], ["N_2", "d"], ["N_1", "N_2"]])
+
+    def test_float32(self):
+        """Tests the float32 working matrix."""
+        distance_dict, edge_list = NeighborJoining(self.dist_matrix, self.labels, dtype=np.float32).build()
+        self.assertDictEqual(distance_dict, self.edge_dictionary_reference)
+        self.assertEqual(NeighborJoining(self.dist_matrix, self.labels, dtype="float32").dtype, np.float32)
+
+    def test_condensed(self):
+        """Tests that a condensed distance matrix returns the same tree as the full matrix."""
+        self.assertEqual(NeighborJoining(CondensedMatrix.from_dense(self.random_matrix), self.random_labels).build(),
+                         NeighborJoining(self.random_matrix, self.random_labels).build(),
+                         msg="The condensed distance matrix does not return the same tree.")
+
+    def test_memmap(self):
+        """Tests that a memory-mapped working matrix returns the same tree."""
+        reference = NeighborJoining(self.random_matrix, self.random_labels).build()
+        with tempfile.TemporaryDirectory() as folder:
+            for matrix in [self.random_matrix, CondensedMatrix.from_dense(self.random_matrix)]:
+                path = os.path.join(folder, "neighbor_joining.npy")
+                self.assertEqual(NeighborJoining(matrix, self.random_labels, chunk_size=7, path=path).build(),
+                                 reference, msg="The memory-mapped working matrix does not return the same tree.")
+
+    def test_rapid(self):
+        """Tests that the rapid search returns the same tree as the exact search."""
+        rng = np.random.default_rng(1)
+        integer_matrix = np.triu(rng.integers(0, 6, (40, 40)), k=1).astype(float)
+        matrices = [self.random_matrix, integer_matrix + integer_matrix.T, np.ones((6, 6)) - np.eye(6),
+                    self.dist_matrix]
+        for matrix in matrices:
+            labels = [f"m{i:02d}" for i in range(len(matrix))]
+            self.assertEqual(NeighborJoining(matrix, labels, search="rapid").build(),
+                             NeighborJoining(matrix, labels).build(),
+                             msg=f"The rapid search does not return the same tree for a matrix of size {len(matrix)}.")
+        self.assertEqual(NeighborJoining(self.random_matrix, self.random_labels, dtype=np.float32,
+                                         search="rapid").build(),
+                         NeighborJoining(self.random_matrix, self.random_labels, dtype=np.float32).build(),
+                         msg="The rapid search does not return the same tree with a float32 matrix.")
+
+    def test_parameters(self):
+        """Tests the error raising in the constructor."""
+        with self.assertRaises(ValueError, msg="Does not raise a ValueError if the matrix does not match the labels."):
+            NeighborJoining(self.dist_matrix, self.labels[:4])
+        with self.assertRaises(ValueError, msg="Does not raise a ValueError for an unsupported dtype."):
+            NeighborJoining(self.dist_matrix, self.labels, dtype=np.int64)
+        with self.assertRaises(ValueError, msg="Does not raise a ValueError if chunk_size is lower than 1."):
+            NeighborJoining(self.dist_matrix, self.labels, chunk_size=0)
+        with self.assertRaises(ValueError, msg="Does not raise a ValueError for an unknown search."):
+            NeighborJoining(self.dist_matrix, self.labels, search="unknown")
@@ -0,0 +1,138 @@
+"""
+Unit tests for the FitchParsimony class.
+"""
+import unittest
+from typing import List, Set
+import numpy as np
+from stemmabench.algorithms.parsimony_core import FitchParsimony
+
+
+class TestFitchParsimony(unittest.TestCase):
+    """Unit tests for the FitchParsimony class.
+    """
+
+    def setUp(self) -> None:
+        """Setup the unit test.
+        """
+        self.rng = np.random.default_rng(0)
+        # The groups (a, b), (a, b, c) and (d, e) of the tree ((a, b), c), (d, e) are each shared by one character.
+        self.labels = ["a", "b", "c", "d", "e"]
+        self.characters = np.array([[1, 1, 0, 0, 0],
+                                    [1, 1, 1, 0, 0],
+                                    [0, 0, 0, 1, 1]]).T
+        self.tree = [["r", "x"], ["r", "y"], ["x", "z"], ["x", "c"], ["z", "a"], ["z", "b"], ["y", "d"], ["y", "e"]]
+        self.wrong_tree = [["r", "x"], ["r", "y"], ["x", "z"], ["x", "b"], ["z", "a"], ["z", "d"], ["y", "c"],
+                           ["y", "e"]]
+
+    def random_tree(self, labels: List[str]) -> List[List[str]]:
+        """Returns the edges of a random binary tree on the labels."""
+        nodes, edges = list(labels), []
+        while len(nodes) > 1:
+            first, second = sorted(self.rng.choice(len(nodes), 2, replace=False))
+            parent = f"X{len(edges)}"
+            edges += [[parent, nodes[first]], [parent, nodes[second]]]
+            nodes = nodes[:first] + nodes[first + 1:second] + nodes[second + 1:] + [parent]
+        return edges
+
+    @staticmethod
+    def fitch(edges: List[List[str]], characters: np.ndarray, labels: List[str]) -> int:
+        """Returns the Fitch length of a tree computed with sets of states, one character at a time."""
+        children = {}
+        for parent, child in edges:
+            children.setdefault(parent, []).append(child)
+        root = next(iter(set(children) - {child for _, child in edges}))
+        total = 0
+        for column in characters.T:
+            def states(node: str) -> Set[int]:
+                nonlocal total
+                if node in labels:
+                    state = column[labels.index(node)]
+                    return set(range(column.max() + 1)) if state < 0 else {state}
+                first, second = [states(child) for child in children[node]]
+                if first & second:
+                    return first & second
+                total += 1
+                return first | second
+            states(root)
+        return total
+
+    def test_compress(self):
+        """Tests the removal of the uninformative characters and the merging of the identical ones."""
+        characters = np.array([[0, 0, 0, 1, 0],
+                               [0, 1, 2, 3, 4],
+                               [2, 2, 0, 0, 1],
+                               [5, 5, 1, 1, 7],
+                               [0, 0, -1, 1, 1]]).T
+        patterns, weights, constant = FitchParsimony.compress(characters)
+        self.assertEqual(constant, 1 + 4, msg="The length of the uninformative characters is not kept.")
+        self.assertEqual(patterns.tolist(), [[0, 0, -1, 1, 1], [0, 0, 1, 1, 2]],
+                         msg="The identical characters are not merged.")
+        self.assertEqual(weights.tolist(), [1, 2])
+
+    def test_pack(self):
+        """Tests the narrowest lanes and the characters spread over several lanes."""
+        sets, lane_character, starts = FitchParsimony.pack(np.array([[0, 1, 2], [0, 0, -1]]))
+        self.assertEqual(sets.dtype, np.uint8)
+        self.assertEqual(sets.tolist(), [[1, 1], [2, 1], [4, 255]])
+        self.assertEqual(FitchParsimony.pack(np.array([[0, 20]]))[0].dtype, np.uint32)
+        sets, lane_character, starts = FitchParsimony.pack(np.array([[0, 130, -1], [0, 1, 1]]))
+        self.assertEqual(sets.dtype, np.uint64)
+        self.assertEqual(lane_character.tolist(), [0, 0, 0, 1])
+        self.assertEqual(starts.tolist(), [0, 3])
+        self.assertEqual(sets[1].tolist(), [0, 0, 4, 2])
+        self.assertTrue((sets[2, :3] == np.iinfo(np.uint64).max).all(), msg="A missing state is not all the states.")
+
+    def test_set_tree(self):
+        """Tests the length of a tree, with internal manuscripts, polytomies and hypothetical leaves."""
+        parsimony = FitchParsimony(self.characters, self.labels)
+        self.assertEqual(parsimony.set_tree(self.tree), 3)
+        self.assertEqual(parsimony.set_tree(self.wrong_tree), 6)
+        self.assertEqual(parsimony.set_tree([["c", "a"], ["c", "b"], ["c", "H"], ["H", "d"], ["H", "e"], ["e", "G"]]),
+                         3, msg="The manuscripts at internal nodes are not handled.")
+        with self.assertRaises(ValueError, msg="Does not raise a ValueError for a missing manuscript."):
+            parsimony.set_tree([["x", "a"], ["x", "b"]])
+        for _ in range(20):
+            size = int(self.rng.integers(3, 15))
+            labels = [f"m{i}" for i in range(size)]
+            characters = self.rng.integers(0, [3, 12, 40, 100][_ % 4], (size, 30))
+            characters[self.rng.random(characters.shape) < 0.1] = -1
+            tree = self.random_tree(labels)
+            self.assertEqual(FitchParsimony(characters, labels).set_tree(tree), self.fitch(tree, characters, labels),
+                             msg="The length differs from the Fitch algorithm.")
+
+    def test_search(self):
+        """Tests that the search finds the shortest tree and that the edges give its length."""
+        for search in FitchParsimony.SEARCHES:
+            parsimony = FitchParsimony(self.characters, self.labels)
+            parsimony.set_tree(self.wrong_tree)
+            self.assertEqual(parsimony.search(search), 3, msg=f"The {search} search does not find the shortest tree.")
+            self.assertGreater(parsimony.evaluated, 0)
+        for _ in range(10):
+            size = int(self.rng.integers(4, 20))
+            labels = [f"m{i}" for i in range(size)]
+            characters = self.rng.integers(0, 4, (size, 40))
+            parsimony = FitchParsimony(characters, labels)
+            start = parsimony.set_tree(self.random_tree(labels))
+            length = parsimony.search("spr")
+            distance_dict, edge_list = parsimony.edges()
+            self.assertLessEqual(length, start)
+            self.assertEqual(len(edge_list), 2 * size - 2)
+            self.assertEqual(self.fitch(edge_list, characters, labels), length,
+                             msg="The length of the search differs from the length of its tree.")
+            self.assertEqual(sum(distance_dict.values()) + parsimony.constant, length,
+                             msg="The changes on the edges do not add up to the length.")
+
+    def test_parameters(self):
+        """Tests the error raising."""
+        with self.assertRaises(ValueError, msg="Does not raise a ValueError for a matrix not matching the labels."):
+            FitchParsimony(self.characters, self.labels[:3])
+        parsimony = FitchParsimony(self.characters, self.labels)
+        with self.assertRaises(RuntimeError, msg="Does not raise a RuntimeError without a tree."):
+            parsimony.search()
+        parsimony.set_tree(self.tree)
+        with self.assertRaises(ValueError, msg="Does not raise a ValueError for an unknown search."):
+            parsimony.search("tbr")
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,51 @@
+"""
+Unit tests for the Segmenter class.
+"""
+import unittest
+import numpy as np
+from stemmabench.algorithms.segmenter import Segmenter
+
+
+class TestSegmenter(unittest.TestCase):
+    """Unit tests for the Segmenter class.
+    """
+
+    def setUp(self) -> None:
+        """Setup the unit test.
+        """
+        self.texts = ["the cat sat on the mat. it slept.\nthe end", "the cat sat. it slept", ""]
+
+    def test_split(self):
+        """Tests the segments of a text for each unit."""
+        self.assertEqual(Segmenter("words", 3).split(self.texts[1]), ["the cat sat.", "it slept"])
+        self.assertEqual(Segmenter("line").split(self.texts[0]), ["the cat sat on the mat. it slept.", "the end"])
+        self.assertEqual(Segmenter("sentence").split(self.texts[0]),
+                         ["the cat sat on the mat.", "it slept.", "the end"], msg="The sentences are not split.")
+        self.assertEqual(Segmenter("sentence", 2).split(self.texts[1]), ["the cat sat. it slept"])
+        self.assertEqual(Segmenter().split(""), [])
+
+    def test_align(self):
+        """Tests that the segments are grouped by position."""
+        segments = Segmenter("sentence").align(self.texts)
+        self.assertEqual(segments, [["the cat sat on the mat.", "the cat sat.", ""], ["it slept.", "it slept", ""],
+                                    ["the end", "", ""]], msg="The missing segments are not empty.")
+        self.assertEqual(Segmenter().align([]), [])
+
+    def test_weights(self):
+        """Tests the weights of the segments."""
+        segments = [["ab", "cd"], ["efgh", ""]]
+        self.assertTrue((Segmenter.weights(segments) == [1, 1]).all())
+        self.assertTrue(np.allclose(Segmenter.weights(segments, "length"), [0.5, 0.5]))
+        self.assertTrue(np.allclose(Segmenter.weights([["a", "b"], ["cd", "ef"]], "length"), [1 / 3, 2 / 3]))
+        with self.assertRaises(ValueError, msg="Does not raise a ValueError for an unknown weighting."):
+            Segmenter.weights(segments, "mean")
+
+    def test_resolve(self):
+        """Tests the conversion of the segmentation parameter."""
+        self.assertEqual(Segmenter.resolve(10).size, 10)
+        self.assertEqual(Segmenter.resolve("line").unit, "line")
+        segmenter = Segmenter("sentence", 2)
+        self.assertIs(Segmenter.resolve(segmenter), segmenter)
+        for parameters in [("paragraph", 1), ("words", 0)]:
+            with self.assertRaises(ValueError, msg=f"Does not raise a ValueError for {parameters}."):
+                Segmenter(*parameters)
@@ -0,0 +1,43 @@
+"""
+Unit tests for the SharedCorpus class.
+"""
+import unittest
+from concurrent.futures import ProcessPoolExecutor
+from stemmabench.algorithms.shared_corpus import SharedCorpus
+
+
+def read_corpus(name: str, index: int) -> str:
+    """Reads a text of a shared corpus in a worker process."""
+    corpus = SharedCorpus.attach(name)
+    text = corpus[index]
+    corpus.close()
+    return text
+
+
+class TestSharedCorpus(unittest.TestCase):
+    """Unit tests for the SharedCorpus class.
+    """
+
+    def setUp(self) -> None:
+        """Setup the unit test.
+        """
+        self.texts = ["first text", "", "ἐν ἀρχῇ ἦν ὁ λόγος", "last text"]
+
+    def test_texts(self):
+        """Tests that the texts are read back from the shared block."""
+        with SharedCorpus(self.texts) as corpus:
+            self.assertEqual(len(corpus), 4)
+            self.assertEqual([corpus[i] for i in range(4)], self.texts, msg="The texts are not read back correctly.")
+            self.assertEqual(corpus[1:3], self.texts[1:3], msg="The slices of the corpus are not correct.")
+            self.assertEqual(corpus[-1], self.texts[-1])
+            self.assertEqual(bytes(corpus.view(2)), self.texts[2].encode("utf-8"))
+            with self.assertRaises(IndexError, msg="Does not raise an IndexError for an index out of range."):
+                corpus[4]
+        with SharedCorpus([]) as corpus:
+            self.assertEqual(len(corpus), 0)
+
+    def test_attach(self):
+        """Tests that worker processes read the texts of the corpus."""
+        with SharedCorpus(self.texts) as corpus, ProcessPoolExecutor(max_workers=2) as executor:
+            texts = list(executor.map(read_corpus, [corpus.name] * 4, range(4)))
+        self.assertEqual(texts, self.texts, msg="The worker processes do not read the texts of the corpus.")
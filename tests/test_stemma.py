@@ -116,6 +116,18 @@ class TestStemma(unittest.TestCase):
                                                                 '2,6': 6,
                                                                 '2,7': 7})
 
+    def test_get_edge_supports(self):
+        """Tests the get_edge_values method with the bootstrap supports."""
+        testing_stemma = Stemma(folder_path=self.stemma_folder)
+        testing_stemma.compute(edge_file=self.stemma_edge_file)
+        self.assertDictEqual(testing_stemma.get_edge_values("support"), {},
+                             msg="A stemma that was not bootstrapped has supports.")
+        supports = {f"{parent},{child}": 0.5 for parent, child in testing_stemma.to_edge_list()}
+        testing_stemma.root.set_supports(supports)
+        self.assertDictEqual(testing_stemma.get_edge_values("support"), supports)
+        with self.assertRaises(ValueError, msg="Does not raise a ValueError for unknown edge values."):
+            testing_stemma.get_edge_values("weight")
+
     def test_set_folder_path(self):
         """Tests the _set_folder_path method."""
         with self.assertRaises(ValueError, msg="The _set_folder_path method does not raise a ValueError when the given folder_path is not an existing directory."):
@@ -126,4 +138,18 @@ class TestStemma(unittest.TestCase):
         testing_stemma = Stemma(folder_path=self.stemma_folder)
         testing_stemma.compute(edge_file=self.stemma_edge_file)
         self.assertCountEqual(
-            testing_stemma.to_edge_list(), self.test_edge_list)
\ No newline at end of file
+            testing_stemma.to_edge_list(), self.test_edge_list)
+
+    def test_reroot(self):
+        """Tests the reroot method."""
+        testing_stemma = Stemma(folder_path=self.stemma_folder)
+        with self.assertRaises(RuntimeError, msg="Does not raise RuntimeError if reroot method called on stemma that has not been fited."):
+            testing_stemma.reroot("4")
+        testing_stemma.compute(edge_file=self.stemma_edge_file)
+        testing_stemma.reroot("4")
+        self.assertEqual(testing_stemma.root.label, "4")
+        self.assertIsNone(testing_stemma.root.parent)
+        self.assertDictEqual(testing_stemma.dict(), {'4': {'11': {}, '12': {}, '13': {},
+                                                           '1': {'3': {'9': {}, '10': {}, '8': {}},
+                                                                 '2': {'5': {}, '6': {}, '7': {}}}}})
+        self.assertIs(testing_stemma.text_lookup["1"].parent, testing_stemma.root)
@@ -0,0 +1,83 @@
+"""
+Unit tests for the StemmaMST class.
+"""
+import tempfile
+import unittest
+import numpy as np
+from textdistance import levenshtein
+from stemmabench.algorithms.stemma_MST import StemmaMST
+from stemmabench.algorithms.manuscript_in_tree import ManuscriptInTree
+from stemmabench.algorithms.levenshtein import Levenshtein
+
+
+class TestStemmaMST(unittest.TestCase):
+    """Unit tests for the StemmaMST class.
+    """
+
+    def setUp(self) -> None:
+        """Setup the unit test.
+        """
+        self.stemma_folder_path = "tests/test_data/test_stemma"
+
+    def test_getters(self):
+        """Testing getters for class properties."""
+        testing_stemma = StemmaMST(distance="levenshtein", root="medoid", n_jobs=2, tile_size=8, dtype=np.float32)
+        self.assertIsInstance(testing_stemma.distance, Levenshtein)
+        self.assertEqual(testing_stemma.root, "medoid")
+        self.assertEqual(testing_stemma.n_jobs, 2)
+        self.assertEqual(testing_stemma.tile_size, 8)
+        self.assertEqual(testing_stemma.dtype, np.float32)
+        self.assertEqual(testing_stemma.duplicate_policy, "child")
+        self.assertIsNone(testing_stemma.matrix_folder)
+        self.assertIsNone(testing_stemma.dist_matrix)
+
+    def test_parameters(self):
+        """Tests the error raising in the constructor and in compute."""
+        with self.assertRaises(ValueError, msg="Does not raise a ValueError for an invalid distance function."):
+            StemmaMST(distance=lambda text1, text2: len(text1) + len(text2))
+        with self.assertRaises(ValueError, msg="Does not raise a ValueError for an unknown duplicate policy."):
+            StemmaMST(distance=levenshtein, duplicate_policy="unknown")
+        with self.assertRaises(ValueError, msg="Does not raise a ValueError for an unknown root."):
+            StemmaMST(distance=levenshtein, root="unknown").compute(folder_path=self.stemma_folder_path)
+
+    def test_compute(self):
+        """Tests that every node of the stemma is a manuscript."""
+        for policy in ["child", "none"]:
+            testing_stemma = StemmaMST(distance="levenshtein", duplicate_policy=policy)
+            tree = testing_stemma.compute(folder_path=self.stemma_folder_path)
+            self.assertIsInstance(tree, ManuscriptInTree)
+            lookup = tree.build_text_lookup()
+            self.assertCountEqual(lookup.keys(), map(str, range(1, 14)),
+                                  msg="The nodes of the stemma are not the manuscripts.")
+            self.assertTrue(any(node.children for node in lookup.values() if node is not tree),
+                            msg="No manuscript is an internal node.")
+            for label, node in lookup.items():
+                self.assertEqual(len(node.edges), len(node.children))
+                for child, length in zip(node.children, node.edges):
+                    self.assertEqual(length, levenshtein(self.text(label), self.text(child.label)),
+                                     msg="The length of an edge is not the distance between its manuscripts.")
+
+    def test_root(self):
+        """Tests the rooting at a given manuscript, including a duplicate."""
+        for root in ["13", "12"]:
+            tree = StemmaMST(distance="levenshtein", root=root).compute(folder_path=self.stemma_folder_path)
+            self.assertEqual(tree.label, root, msg=f"The stemma is not rooted at {root}.")
+            self.assertEqual(len(tree.build_text_lookup()), 13)
+
+    def test_matrix_folder(self):
+        """Tests that the distance matrix can be memory-mapped."""
+        reference = StemmaMST(distance="levenshtein").compute(folder_path=self.stemma_folder_path)
+        with tempfile.TemporaryDirectory() as folder:
+            testing_stemma = StemmaMST(distance="levenshtein", matrix_folder=folder)
+            tree = testing_stemma.compute(folder_path=self.stemma_folder_path)
+            self.assertIsNotNone(testing_stemma.dist_matrix.path)
+            self.assertEqual(tree.dict(), reference.dict())
+
+    def text(self, label: str) -> str:
+        """Returns the text of a manuscript of the test folder."""
+        with open(f"{self.stemma_folder_path}/{label}.txt") as file:
+            return file.read()
+
+
+if __name__ == '__main__':
+    unittest.main()
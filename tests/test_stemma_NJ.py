@@ -1,10 +1,13 @@
 """
 Unit tests for the StemmaNJ class.
 """
+import os
+import tempfile
 import numpy as np
 import unittest
 from textdistance import levenshtein
 from stemmabench.algorithms.stemma_NJ import StemmaNJ
+from stemmabench.algorithms.levenshtein import Levenshtein
 
 
 class TestStemmaNJ(unittest.TestCase):
@@ -100,9 +103,120 @@ class TestStemmaNJ(unittest.TestCase):
         testing_stemma = StemmaNJ(distance=levenshtein)
         testing_stemma._manuscripts = {
             "m1": "text1", "m2": "text2", "m3": "text3"}
+        engine = testing_stemma._engine
         testing_stemma.dist(distance=levenshtein)
-        self.assertTrue((testing_stemma.dist_matrix.round(0) == [
+        self.assertTrue((testing_stemma.dist_matrix.to_dense().round(0) == [
                         [0., 1., 1.], [1., 0., 1.], [1., 1., 0.]]).all())
+        self.assertIs(testing_stemma._engine, engine, msg="The distance engine of the stemma is not reused.")
+        pool_stemma = StemmaNJ(distance=levenshtein, n_jobs=2, tile_size=4)
+        pool_stemma.compute(folder_path=self.stemma_folder_path)
+        self.assertTrue((pool_stemma.dist_matrix.to_dense() == self.test_distance_matrix).all(),
+                        msg="The distance matrix computed with a process pool is not correct.")
+
+    def test_distance_name(self):
+        """Tests the selection of a built-in distance by name."""
+        testing_stemma = StemmaNJ(distance="levenshtein")
+        self.assertIsInstance(testing_stemma.distance, Levenshtein,
+                              msg="Does not select the built-in levenshtein distance.")
+        testing_stemma.compute(folder_path=self.stemma_folder_path)
+        self.assertTrue((testing_stemma.dist_matrix.to_dense() == self.test_distance_matrix).all(),
+                        msg="The distance matrix computed with the built-in levenshtein distance is not correct.")
+        with self.assertRaises(ValueError, msg="Does not raise a ValueError for an unknown distance name."):
+            StemmaNJ(distance="unknown")
+
+    def test_search(self):
+        """Tests that the rapid search builds the same stemma as the exact search."""
+        exact_stemma = StemmaNJ(distance=levenshtein)
+        exact_stemma.compute(folder_path=self.stemma_folder_path)
+        rapid_stemma = StemmaNJ(distance=levenshtein, search="rapid")
+        rapid_stemma.compute(folder_path=self.stemma_folder_path)
+        self.assertEqual(rapid_stemma.search, "rapid")
+        self.assertEqual(rapid_stemma._build_edges(), exact_stemma._build_edges(),
+                         msg="The rapid search does not build the same stemma as the exact search.")
+        with self.assertRaises(ValueError, msg="Does not raise a ValueError for an unknown search."):
+            StemmaNJ(distance=levenshtein, search="unknown")
+
+    def test_matrix_folder(self):
+        """Tests that memory-mapped matrices build the same stemma."""
+        exact_stemma = StemmaNJ(distance=levenshtein)
+        exact_stemma.compute(folder_path=self.stemma_folder_path)
+        with tempfile.TemporaryDirectory() as folder:
+            memmap_stemma = StemmaNJ(distance=levenshtein, matrix_folder=os.path.join(folder, "matrices"))
+            memmap_stemma.compute(folder_path=self.stemma_folder_path)
+            self.assertEqual(memmap_stemma._build_edges(), exact_stemma._build_edges(),
+                             msg="The memory-mapped matrices do not build the same stemma.")
+            self.assertTrue((memmap_stemma.dist_matrix.to_dense() == self.test_distance_matrix).all())
+            self.assertTrue(os.path.isfile(os.path.join(folder, "matrices", "distances.npy")),
+                            msg="The distance matrix is not kept in the folder.")
+            del memmap_stemma
+
+    def test_segmentation(self):
+        """Tests that the distance matrix is the weighted sum of the matrices of the segments."""
+        whole_stemma = StemmaNJ(distance=levenshtein)
+        whole_stemma.compute(folder_path=self.stemma_folder_path)
+        self.assertIsNone(whole_stemma.segment_matrices)
+        testing_stemma = StemmaNJ(distance="levenshtein", segmentation=4, n_jobs=2, tile_size=3)
+        testing_stemma.compute(folder_path=self.stemma_folder_path)
+        texts = [testing_stemma.unique_manuscripts[label] for label in sorted(testing_stemma.unique_manuscripts)]
+        segments = testing_stemma.segmentation.align(texts)
+        self.assertEqual(len(testing_stemma.segment_matrices), len(segments))
+        expected = sum(np.array([[levenshtein(text1, text2) for text2 in texts] for text1 in texts], dtype=float)
+                       for texts in segments)
+        self.assertTrue((testing_stemma.dist_matrix.to_dense() == expected).all(),
+                        msg="The distance matrix is not the sum of the matrices of the segments.")
+        weights = np.arange(len(segments), dtype=float)
+        self.assertTrue(np.allclose(testing_stemma.combine_segments(weights).to_dense(),
+                                    sum(weight * matrix.to_dense() for weight, matrix
+                                        in zip(weights, testing_stemma.segment_matrices))))
+        length_stemma = StemmaNJ(distance="levenshtein", segmentation="line", segment_weighting="length")
+        length_stemma.compute(folder_path=self.stemma_folder_path)
+        self.assertAlmostEqual(length_stemma.segment_weights.sum(), 1)
+        with self.assertRaises(ValueError, msg="Does not raise a ValueError for an unknown weighting."):
+            StemmaNJ(distance="levenshtein", segmentation=4, segment_weighting="mean")
+        with self.assertRaises(RuntimeError, msg="Does not raise a RuntimeError without segmentation."):
+            whole_stemma.combine_segments(np.ones(1))
+
+    def test_bootstrap(self):
+        """Tests the supports of the edges computed by the bootstrap."""
+        serial_stemma = StemmaNJ(distance="levenshtein", segmentation=4, bootstrap=10, seed=0)
+        tree = serial_stemma.compute(folder_path=self.stemma_folder_path)
+        supports = serial_stemma.supports
+        self.assertEqual(set(supports), set(f"{node.label},{child.label}" for node in tree.build_text_lookup().values()
+                                            for child in node.children), msg="Not all the edges have a support.")
+        self.assertTrue(all(0 <= support <= 1 for support in supports.values()))
+        self.assertEqual(supports[f"{tree.label},{tree.children[0].label}"], tree.supports[0])
+        pool_stemma = StemmaNJ(distance="levenshtein", segmentation=4, bootstrap=10, seed=0, n_jobs=2)
+        pool_stemma.compute(folder_path=self.stemma_folder_path)
+        self.assertDictEqual(pool_stemma.supports, supports, msg="The process pool does not give the same supports.")
+        self.assertEqual(StemmaNJ.bootstrap_tree([matrix.data for matrix in serial_stemma.segment_matrices],
+                                                 serial_stemma.segment_weights,
+                                                 sorted(serial_stemma.unique_manuscripts), serial_stemma.dtype,
+                                                 "exact", np.ones(len(serial_stemma.segment_matrices))),
+                         serial_stemma._build_edges()[1],
+                         msg="Drawing each segment once does not give the tree of the distance matrix.")
+        for parameters in [{"bootstrap": -1, "segmentation": 4}, {"bootstrap": 10}]:
+            with self.assertRaises(ValueError, msg=f"Does not raise a ValueError for {parameters}."):
+                StemmaNJ(distance="levenshtein", **parameters)
+
+    def test_duplicates(self):
+        """Tests that the Neighbor-Joining algorithm only runs on the unique texts."""
+        for policy in ["sibling", "child"]:
+            testing_stemma = StemmaNJ(distance=levenshtein, duplicate_policy=policy)
+            tree = testing_stemma.compute(folder_path=self.stemma_folder_path)
+            self.assertEqual(testing_stemma.dist_matrix.shape, (8, 8),
+                             msg="The distance matrix is not computed on the unique texts.")
+            lookup = tree.build_text_lookup()
+            for label in map(str, range(1, 14)):
+                self.assertIn(label, lookup, msg=f"The manuscript {label} is missing from the stemma.")
+            for label, duplicates in testing_stemma.duplicates.items():
+                for duplicate in duplicates:
+                    parent = lookup[duplicate].parent
+                    self.assertEqual(parent.edges[[child.label for child in parent.children].index(duplicate)], 0,
+                                     msg="The edge of a duplicate is not of length 0.")
+                    expected = lookup[label] if policy == "child" else lookup[label].parent
+                    self.assertIs(parent, expected, msg=f"The duplicate is not placed by the {policy} policy.")
+        with self.assertRaises(ValueError, msg="Does not raise a ValueError for an unknown duplicate policy."):
+            StemmaNJ(distance=levenshtein, duplicate_policy="unknown")
 
     def test_is_similarity(self):
         """Tests the is_similarity method."""
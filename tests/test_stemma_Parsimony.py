@@ -0,0 +1,81 @@
+"""
+Unit tests for the StemmaParsimony class.
+"""
+import unittest
+import numpy as np
+from textdistance import levenshtein
+from stemmabench.algorithms.stemma_Parsimony import StemmaParsimony
+from stemmabench.algorithms.manuscript_in_tree_empty import ManuscriptInTreeEmpty
+from stemmabench.algorithms.levenshtein import Levenshtein
+
+
+class TestStemmaParsimony(unittest.TestCase):
+    """Unit tests for the StemmaParsimony class.
+    """
+
+    def setUp(self) -> None:
+        """Setup the unit test.
+        """
+        self.stemma_folder_path = "tests/test_data/test_stemma"
+
+    def test_getters(self):
+        """Testing getters for class properties."""
+        testing_stemma = StemmaParsimony(start="mst", search="nni", max_rounds=2, n_jobs=2, tile_size=8,
+                                         dtype=np.float32)
+        self.assertIsInstance(testing_stemma.distance, Levenshtein)
+        self.assertEqual(testing_stemma.start, "mst")
+        self.assertEqual(testing_stemma.search, "nni")
+        self.assertEqual(testing_stemma.max_rounds, 2)
+        self.assertEqual(testing_stemma.n_jobs, 2)
+        self.assertEqual(testing_stemma.tile_size, 8)
+        self.assertEqual(testing_stemma.dtype, np.float32)
+        self.assertEqual(testing_stemma.duplicate_policy, "none")
+        self.assertIsNone(testing_stemma.dist_matrix)
+        self.assertIsNone(testing_stemma.characters)
+        self.assertIsNone(testing_stemma.length)
+        self.assertEqual(testing_stemma.evaluated, 0)
+
+    def test_parameters(self):
+        """Tests the error raising in the constructor."""
+        with self.assertRaises(ValueError, msg="Does not raise a ValueError for an invalid distance function."):
+            StemmaParsimony(distance=lambda text1, text2: len(text1) + len(text2))
+        with self.assertRaises(ValueError, msg="Does not raise a ValueError for an unknown starting tree."):
+            StemmaParsimony(start="upgma")
+        with self.assertRaises(ValueError, msg="Does not raise a ValueError for an unknown search."):
+            StemmaParsimony(search="tbr")
+        with self.assertRaises(ValueError, msg="Does not raise a ValueError for a max_rounds of 0."):
+            StemmaParsimony(max_rounds=0)
+        with self.assertRaises(ValueError, msg="Does not raise a ValueError for an unknown duplicate policy."):
+            StemmaParsimony(duplicate_policy="unknown")
+
+    def test_collate(self):
+        """Tests the readings of the variant locations."""
+        characters = StemmaParsimony.collate(["a b c d", "a x c d e", "b c d", "z a b y y d"])
+        self.assertEqual(characters.tolist(), [[0, 0, 0, 0, 0],
+                                               [0, 0, 1, 0, 1],
+                                               [0, 1, 0, 0, 0],
+                                               [1, 0, 0, 1, 0]])
+        self.assertEqual(StemmaParsimony.collate(["a b", "a c"], base=1)[:, 2].tolist(), [0, 1])
+
+    def test_compute(self):
+        """Tests that the search does not lengthen the starting tree and that the stemma contains all the manuscripts."""
+        starting = StemmaParsimony(distance=levenshtein, search="none")
+        starting.compute(folder_path=self.stemma_folder_path)
+        self.assertEqual(starting.evaluated, 0)
+        for start in StemmaParsimony.STARTS:
+            for search in ["spr", "nni"]:
+                testing_stemma = StemmaParsimony(distance=levenshtein, start=start, search=search)
+                tree = testing_stemma.compute(folder_path=self.stemma_folder_path)
+                self.assertIsInstance(tree, ManuscriptInTreeEmpty)
+                self.assertEqual(testing_stemma.characters.shape[0], 13 - len(
+                    [label for labels in testing_stemma.duplicates.values() for label in labels]))
+                self.assertGreater(testing_stemma.evaluated, 0)
+                if start == "nj":
+                    self.assertLessEqual(testing_stemma.length, starting.length,
+                                         msg="The search lengthens the starting tree.")
+                self.assertTrue(set(map(str, range(1, 14))) <= set(tree.build_text_lookup().keys()),
+                                msg="The stemma does not contain all the manuscripts.")
+
+
+if __name__ == '__main__':
+    unittest.main()
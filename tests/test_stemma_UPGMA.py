@@ -0,0 +1,75 @@
+"""
+Unit tests for the StemmaUPGMA and StemmaWPGMA classes.
+"""
+import unittest
+import numpy as np
+from textdistance import levenshtein
+from stemmabench.algorithms.stemma_UPGMA import StemmaUPGMA, StemmaWPGMA
+from stemmabench.algorithms.levenshtein import Levenshtein
+
+
+class TestStemmaUPGMA(unittest.TestCase):
+    """Unit tests for the StemmaUPGMA and StemmaWPGMA classes.
+    """
+
+    def setUp(self) -> None:
+        """Setup the unit test.
+        """
+        self.stemma_folder_path = "tests/test_data/test_stemma"
+        self.dist_mat_edge_test = np.array([[0, 17, 21, 31, 23],
+                                            [17, 0, 30, 34, 21],
+                                            [21, 30, 0, 28, 39],
+                                            [31, 34, 28, 0, 43],
+                                            [23, 21, 39, 43, 0]])
+
+    def test_getters(self):
+        """Testing getters for class properties."""
+        testing_stemma = StemmaUPGMA(distance="levenshtein", n_jobs=2, tile_size=8, dtype=np.float32,
+                                     duplicate_policy="child")
+        self.assertIsInstance(testing_stemma.distance, Levenshtein)
+        self.assertEqual(testing_stemma.n_jobs, 2)
+        self.assertEqual(testing_stemma.tile_size, 8)
+        self.assertEqual(testing_stemma.dtype, np.float32)
+        self.assertEqual(testing_stemma.duplicate_policy, "child")
+        self.assertIsNone(testing_stemma.dist_matrix)
+        self.assertIsNone(testing_stemma.cache)
+
+    def test_parameters(self):
+        """Tests the error raising in the constructor."""
+        with self.assertRaises(ValueError, msg="Does not raise a ValueError for an invalid distance function."):
+            StemmaUPGMA(distance=lambda text1, text2: len(text1) + len(text2))
+        with self.assertRaises(ValueError, msg="Does not raise a ValueError for an unknown duplicate policy."):
+            StemmaWPGMA(distance=levenshtein, duplicate_policy="unknown")
+
+    def test_build_edges(self):
+        """Tests the _build_edges method of both algorithms."""
+        for algo, lengths in [(StemmaUPGMA, {"N_4,N_2": 5.5, "N_4,N_3": 2.5}),
+                              (StemmaWPGMA, {"N_4,N_2": 6.5, "N_4,N_3": 3.5})]:
+            temp_stem = algo(distance=levenshtein)
+            temp_stem._dist_matrix = self.dist_mat_edge_test
+            temp_stem._manuscripts = {"a": "", "b": "", "c": "", "d": "", "e": ""}
+            distance_dict, edge_list = temp_stem._build_edges()
+            self.assertEqual(len(edge_list), 8)
+            for edge, length in lengths.items():
+                self.assertEqual(distance_dict[edge], length, msg=f"The branch lengths of {algo.METHOD} are wrong.")
+
+    def test_compute(self):
+        """Tests that the stemma is rooted and contains all the manuscripts."""
+        for policy in ["sibling", "none"]:
+            testing_stemma = StemmaUPGMA(distance="levenshtein", duplicate_policy=policy)
+            tree = testing_stemma.compute(folder_path=self.stemma_folder_path)
+            self.assertEqual(testing_stemma.dist_matrix.shape, (8, 8) if policy == "sibling" else (13, 13))
+            lookup = tree.build_text_lookup()
+            for label in map(str, range(1, 14)):
+                self.assertIn(label, lookup, msg=f"The manuscript {label} is missing from the stemma.")
+            self.assertEqual(tree.label, "N_12" if policy == "none" else "N_7",
+                             msg="The stemma is not rooted at the last merge.")
+            self.assertEqual(len(tree.children), 2)
+        pool_stemma = StemmaWPGMA(distance=levenshtein, n_jobs=2, tile_size=4)
+        lookup = pool_stemma.compute(folder_path=self.stemma_folder_path).build_text_lookup()
+        self.assertEqual(len([label for label in lookup if not label.startswith("N_")]), 13,
+                         msg="The stemma of WPGMA does not contain all the manuscripts.")
+
+
+if __name__ == '__main__':
+    unittest.main()
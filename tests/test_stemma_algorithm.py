@@ -62,3 +62,33 @@ class TestStemmaAlgo(unittest.TestCase):
         testing_stemma_algo = StemmaAlgo()
         with self.assertRaises(RuntimeError):
             testing_stemma_algo.compute(folder_path="Not/a/valid/folder/path")
+
+    def test_collapse_duplicates(self):
+        """Tests the grouping of the manuscripts with identical texts."""
+        testing_stemma_algo = StemmaAlgo()
+        testing_stemma_algo._manuscripts = dict(self.test_manuscript)
+        self.assertDictEqual(testing_stemma_algo.collapse_duplicates(),
+                             {'10': ['5', '7'], '11': ['12'], '2': ['3'], '8': ['9']},
+                             msg="Does not group the manuscripts with identical texts.")
+        self.assertEqual(sorted(testing_stemma_algo.unique_manuscripts), ['1', '10', '11', '13', '2', '4', '6', '8'],
+                         msg="The unique manuscripts are not correct.")
+
+    def test_expand_duplicates(self):
+        """Tests the addition of the duplicates to the edges."""
+        testing_stemma_algo = StemmaAlgo()
+        testing_stemma_algo._manuscripts = {"a": "text", "b": "text", "c": "other", "d": "third"}
+        testing_stemma_algo.collapse_duplicates()
+        edges_dict, edges_list = {"N_1,a": 1.0, "N_1,c": 2.0, "N_1,d": 3.0}, [["N_1", "a"], ["N_1", "c"], ["N_1", "d"]]
+        self.assertEqual(testing_stemma_algo.expand_duplicates(edges_dict, edges_list, policy="sibling"),
+                         ({"N_1,N_2": 1.0, "N_1,c": 2.0, "N_1,d": 3.0, "N_2,a": 0.0, "N_2,b": 0.0},
+                          [["N_1", "N_2"], ["N_1", "c"], ["N_1", "d"], ["N_2", "a"], ["N_2", "b"]]),
+                         msg="The sibling policy does not join the duplicates to a new node.")
+        self.assertEqual(testing_stemma_algo.expand_duplicates(edges_dict, edges_list, policy="child"),
+                         ({"N_1,a": 1.0, "N_1,c": 2.0, "N_1,d": 3.0, "a,b": 0.0},
+                          [["N_1", "a"], ["N_1", "c"], ["N_1", "d"], ["a", "b"]]),
+                         msg="The child policy does not add the duplicates as children.")
+        self.assertEqual(testing_stemma_algo.expand_duplicates(edges_dict, edges_list, policy="none"),
+                         (edges_dict, edges_list))
+        self.assertEqual(edges_list, [["N_1", "a"], ["N_1", "c"], ["N_1", "d"]], msg="Modifies the input edges.")
+        with self.assertRaises(ValueError, msg="Does not raise a ValueError for an unknown policy."):
+            testing_stemma_algo.expand_duplicates(edges_dict, edges_list, policy="unknown")
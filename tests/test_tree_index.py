@@ -0,0 +1,66 @@
+"""
+Unit tests for the TreeIndex class.
+"""
+import unittest
+import numpy as np
+from stemmabench.algorithms.tree_index import TreeIndex
+from stemmabench.algorithms.utils import Utils
+
+
+class TestTreeIndex(unittest.TestCase):
+    """Unit tests for the TreeIndex class.
+    """
+
+    def setUp(self) -> None:
+        """Setup the unit test.
+        """
+        self.test_edge_list = [["A", "1"], ["1", "2"], ["1", "3"],
+                               ["2", "4"], ["2", "5"], ["3", "6"],
+                               ["3", "7"]]
+        self.test_dist_dict = {"A,1": 0.5, "1,2": 0.5, "1,3": 0.5,
+                               "2,4": 0.5, "2,5": 0.5, "3,6": 0.5, "3,7": 10.5}
+        self.index = TreeIndex.from_edges(self.test_edge_list, self.test_dist_dict)
+
+    def test_euler_tour(self):
+        """Tests the Euler tour."""
+        self.assertEqual(self.index.euler.shape[0], 2 * len(self.index.tree) - 1)
+        labels = [self.index.tree.labels[i] for i in self.index.euler]
+        self.assertEqual(labels, ["A", "1", "2", "4", "2", "5", "2", "1", "3", "6", "3", "7", "3", "1", "A"])
+
+    def test_lca(self):
+        """Tests the lca method."""
+        self.assertEqual(self.index.lca("4", "5"), "2")
+        self.assertEqual(self.index.lca("4", "7"), "1")
+        self.assertEqual(self.index.lca("3", "7"), "3")
+        self.assertEqual(self.index.lca("6", "6"), "6")
+        with self.assertRaises(ValueError, msg="Does not raise a ValueError if a label is not in the tree."):
+            self.index.lca("4", "B")
+
+    def test_path_queries(self):
+        """Tests the path_length, path and on_path methods against the Utils search."""
+        for start in self.index.tree.labels:
+            for target in self.index.tree.labels:
+                self.assertEqual(self.index.path(start, target), Utils.find_path(self.test_edge_list, start, target))
+                self.assertAlmostEqual(self.index.path_length(start, target),
+                                       Utils.find_path_length(self.test_edge_list, start, target, self.test_dist_dict))
+                self.assertEqual(self.index.path_length(start, target, weighted=False),
+                                 Utils.find_path_length(self.test_edge_list, start, target))
+        self.assertTrue(self.index.on_path("1", "4", "7"))
+        self.assertTrue(self.index.on_path("4", "4", "7"))
+        self.assertFalse(self.index.on_path("5", "4", "7"))
+        self.assertFalse(self.index.on_path("A", "4", "7"))
+
+    def test_pairwise_path_lengths(self):
+        """Tests the pairwise_path_lengths method."""
+        leaves = ["4", "5", "6", "7"]
+        matrix = self.index.pairwise_path_lengths(leaves)
+        self.assertTrue(np.allclose(matrix, [[0, 1, 2, 12], [1, 0, 2, 12], [2, 2, 0, 11], [12, 12, 11, 0]]))
+        self.assertEqual(self.index.pairwise_path_lengths(["A"], leaves, weighted=False).tolist(), [[3, 3, 3, 3]])
+        self.assertEqual(self.index.pairwise_path_lengths().shape, (8, 8))
+
+    def test_deep_tree(self):
+        """Tests the index on a chain-like tree deeper than the recursion limit."""
+        chain = [[str(i), str(i + 1)] for i in range(5000)]
+        index = TreeIndex.from_edges(chain)
+        self.assertEqual(index.lca("4000", "2500"), "2500")
+        self.assertEqual(index.path_length("10", "4010"), 4000)
@@ -0,0 +1,125 @@
+"""
+Unit tests for the AverageLinkage class.
+"""
+import unittest
+import numpy as np
+from stemmabench.algorithms.condensed_matrix import CondensedMatrix
+from stemmabench.algorithms.upgma_core import AverageLinkage
+
+
+class TestAverageLinkage(unittest.TestCase):
+    """Unit tests for the AverageLinkage class.
+    """
+
+    def setUp(self) -> None:
+        """Setup the unit test.
+        """
+        self.labels = ["a", "b", "c", "d", "e"]
+        # Example of the Wikipedia article on UPGMA, whose tree is (((a:8.5,b:8.5):2.5,e:11):5.5,(c:14,d:14):2.5).
+        self.dist_matrix = np.array([[0, 17, 21, 31, 23],
+                                     [17, 0, 30, 34, 21],
+                                     [21, 30, 0, 28, 39],
+                                     [31, 34, 28, 0, 43],
+                                     [23, 21, 39, 43, 0]])
+        rng = np.random.default_rng(0)
+        points = rng.random((40, 3))
+        self.random_matrix = np.sqrt(((points[:, None] - points[None]) ** 2).sum(axis=-1))
+        self.random_labels = [f"m{i:02d}" for i in range(40)]
+
+    @staticmethod
+    def naive(matrix: np.ndarray, method: str) -> list:
+        """Reference clustering scanning the whole matrix at each merge, returning the height and leaves of each merge.
+        """
+        matrix = matrix.astype(np.float64)
+        np.fill_diagonal(matrix, np.inf)
+        clusters = {i: frozenset([i]) for i in range(len(matrix))}
+        active = list(range(len(matrix)))
+        merges = []
+        while len(active) > 1:
+            sub = matrix[np.ix_(active, active)]
+            first, second = (active[i] for i in np.unravel_index(sub.argmin(), sub.shape))
+            merges.append((round(matrix[first, second] / 2, 9), clusters[first] | clusters[second]))
+            for other in active:
+                if other not in (first, second):
+                    if method == "upgma":
+                        value = (len(clusters[first]) * matrix[first, other] +
+                                 len(clusters[second]) * matrix[second, other]) / \
+                            (len(clusters[first]) + len(clusters[second]))
+                    else:
+                        value = (matrix[first, other] + matrix[second, other]) / 2
+                    matrix[first, other] = matrix[other, first] = value
+            clusters[first] |= clusters[second]
+            active.remove(second)
+        return sorted(merges, key=lambda merge: (merge[0], sorted(merge[1])))
+
+    @staticmethod
+    def merges(distance_dict: dict, edge_list: list, labels: list) -> list:
+        """Returns the height and leaves of each internal node of a tree."""
+        children = {}
+        for parent, child in edge_list:
+            children.setdefault(parent, []).append(child)
+
+        def leaves(node):
+            if node not in children:
+                return frozenset([labels.index(node)])
+            return frozenset().union(*[leaves(child) for child in children[node]])
+
+        def height(node):
+            if node not in children:
+                return 0
+            child = children[node][0]
+            return distance_dict[f"{node},{child}"] + height(child)
+        return sorted(((round(height(node), 9), leaves(node)) for node in children),
+                      key=lambda merge: (merge[0], sorted(merge[1])))
+
+    def test_build(self):
+        """Tests the edges and branch lengths."""
+        distance_dict, edge_list = AverageLinkage(self.dist_matrix, self.labels).build()
+        self.assertEqual(edge_list, [["N_1", "a"], ["N_1", "b"], ["N_2", "N_1"], ["N_2", "e"], ["N_3", "c"],
+                                     ["N_3", "d"], ["N_4", "N_2"], ["N_4", "N_3"]],
+                         msg="Does not return the edges in order of merge.")
+        self.assertDictEqual(distance_dict, {"N_1,a": 8.5, "N_1,b": 8.5, "N_2,N_1": 2.5, "N_2,e": 11.0,
+                                             "N_3,c": 14.0, "N_3,d": 14.0, "N_4,N_2": 5.5, "N_4,N_3": 2.5},
+                             msg="Does not return the correct branch lengths.")
+
+    def test_reference(self):
+        """Tests both methods against a clustering scanning the whole matrix."""
+        for method in AverageLinkage.METHODS:
+            result = AverageLinkage(self.random_matrix, self.random_labels, method=method).build()
+            self.assertEqual(self.merges(*result, self.random_labels), self.naive(self.random_matrix, method),
+                             msg=f"The {method} tree is not correct.")
+
+    def test_ultrametric(self):
+        """Tests that all the leaves are at the same distance from the root."""
+        distance_dict, edge_list = AverageLinkage(self.random_matrix, self.random_labels, method="wpgma").build()
+        parent = {child: node for node, child in edge_list}
+        depths = []
+        for label in self.random_labels:
+            depth, node = 0, label
+            while node in parent:
+                depth += distance_dict[f"{parent[node]},{node}"]
+                node = parent[node]
+            depths.append(depth)
+        self.assertTrue(np.allclose(depths, depths[0]), msg="The tree is not ultrametric.")
+
+    def test_condensed(self):
+        """Tests that a CondensedMatrix and a float32 matrix give the same tree."""
+        reference = AverageLinkage(self.random_matrix, self.random_labels).build()
+        condensed = CondensedMatrix.from_dense(self.random_matrix)
+        self.assertEqual(AverageLinkage(condensed, self.random_labels).build(), reference)
+        self.assertEqual(AverageLinkage(self.random_matrix, self.random_labels, dtype=np.float32).build()[1],
+                         reference[1])
+
+    def test_parameters(self):
+        """Tests the errors of the constructor and the trees of less than 2 leaves."""
+        with self.assertRaises(ValueError, msg="Does not raise a ValueError for a matrix not matching the labels."):
+            AverageLinkage(self.dist_matrix, self.labels[:4])
+        with self.assertRaises(ValueError, msg="Does not raise a ValueError for an unknown method."):
+            AverageLinkage(self.dist_matrix, self.labels, method="unknown")
+        with self.assertRaises(ValueError, msg="Does not raise a ValueError for an unsupported dtype."):
+            AverageLinkage(self.dist_matrix, self.labels, dtype=np.int64)
+        self.assertEqual(AverageLinkage(np.zeros((1, 1)), ["a"]).build(), ({}, []))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -189,6 +189,27 @@ class TestUtils(unittest.TestCase):
         self.assertEqual(Utils.find_midpoint_root(self.test_edge_list2, {"A,1": 0.5, "1,2": 20.5, "1,3": 0.5, "2,4": 0.5, "2,5": 0.5, "3,6": 0.5, "3,7": 10.5}),
                          "1",
                          msg="Does not find the right midpoint with dist_dict.")
+        self.assertEqual(Utils.find_midpoint_root(self.test_edge_list2, {"A,1": 0.5, "1,2": 0.5, "1,3": -0.5, "2,4": 0.5, "2,5": 0.5, "3,6": 0.5, "3,7": 10.5}),
+                         "3", msg="Does not find the right midpoint with negative edge lengths.")
+        with self.assertRaises(RuntimeError, msg="Does not raise a RuntimeError if an edge is missing from dist_dict."):
+            Utils.find_midpoint_root(self.test_edge_list2, {"A,1": 0.5})
+
+    def test_find_midpoint_root_large(self):
+        """Tests the find_midpoint_root method on a caterpillar tree too large for a search over all pairs of leaves."""
+        spine = [[str(i), str(i + 1)] for i in range(3000)]
+        edge_list = spine + [[str(i), f"leaf_{i}"] for i in range(1, 3000)]
+        self.assertEqual(Utils.find_midpoint_root(edge_list), "1500",
+                         msg="Does not find the right midpoint with no dist_dict.")
+        dist_dict = {f"{edge[0]},{edge[1]}": 1.0 for edge in edge_list}
+        dist_dict["0,1"] = 1000.0
+        self.assertEqual(Utils.find_midpoint_root(edge_list, dist_dict), "1000",
+                         msg="Does not find the right midpoint with dist_dict.")
+        # The negative lengths shorten the paths through them, unless they are counted as 0.
+        dist_dict["1,2"] = -1000.0
+        self.assertEqual(Utils.find_midpoint_root(edge_list, dist_dict), "1501",
+                         msg="Does not find the right midpoint with negative edge lengths.")
+        self.assertEqual(Utils.find_midpoint_root(edge_list, dist_dict, clamp_negative=True), "1001",
+                         msg="Does not count the negative edge lengths as 0 with clamp_negative.")
 
     def test_find_leaf_nodes(self):
         """Tests the find_leaf_nodes method."""
@@ -210,6 +231,12 @@ class TestUtils(unittest.TestCase):
                               msg="Does not return the right edge list.")
         with self.assertRaises(ValueError,  msg="Does no raise a ValueError when the specified new root is not in the tree."):
             Utils.set_new_root(self.test_edge_list, "B")
+        self.assertEqual(Utils.set_new_root([['1', '2'], ['3', '2'], ['2', '4']], "2"),
+                         [['2', '1'], ['2', '3'], ['2', '4']],
+                         msg="Does not keep the edge list order or does not orient the edges from the new root.")
+        chain = [[str(i), str(i + 1)] for i in range(20000)]
+        self.assertEqual(Utils.set_new_root(chain, "20000")[-1], ["1", "0"],
+                         msg="Does not reroot a long chain.")
 
     def test_get_dot_list(self):
         """Tests the get_dot_list method."""
@@ -0,0 +1,57 @@
+"""
+Unit tests for the WordLevenshtein class.
+"""
+import unittest
+import numpy as np
+from textdistance import levenshtein
+from stemmabench.algorithms.distance import Distance
+from stemmabench.algorithms.distance_engine import DistanceEngine
+from stemmabench.algorithms.word_levenshtein import WordLevenshtein
+
+
+class TestWordLevenshtein(unittest.TestCase):
+    """Unit tests for the WordLevenshtein class.
+    """
+
+    def setUp(self) -> None:
+        """Setup the unit test.
+        """
+        generator = np.random.default_rng(0)
+        vocabulary = [f"word{i}" for i in range(20)]
+        self.texts = [" ".join(generator.choice(vocabulary, generator.integers(0, 25))) for _ in range(15)]
+        self.texts += ["", "the cat sat", "the cat the sat", "the dog sat"]
+        self.reference = np.array([[levenshtein(text1.split(), text2.split()) for text2 in self.texts]
+                                   for text1 in self.texts], dtype=float)
+
+    def test_tokens(self):
+        """Tests the ids of the words."""
+        distance = WordLevenshtein()
+        tokens = distance.tokens(["a b a", "b c"])
+        self.assertEqual(tokens[0].dtype, np.int32)
+        self.assertEqual(tokens[0].tolist(), [0, 1, 0], msg="The words are not interned.")
+        self.assertEqual(tokens[1].tolist(), [1, 2], msg="The vocabulary is not shared by the texts.")
+        self.assertEqual(distance.vocabulary, {"a": 0, "b": 1, "c": 2})
+        self.assertEqual(len(distance.tokenize("")), 0)
+
+    def test_pairwise(self):
+        """Tests the distances against textdistance on the words of the texts."""
+        distance = WordLevenshtein()
+        out = distance.pairwise(self.texts)
+        self.assertTrue((out == self.reference).all(), msg="The word distances are not correct.")
+        self.assertTrue((distance.pairwise(self.texts[:4], self.texts) == self.reference[:4]).all())
+        self.assertEqual(distance("the cat sat", "the cat the sat"), 1, msg="A duplicated word does not cost 1.")
+        self.assertEqual(distance("the cat sat", "the cta sat"), 1, msg="A misspelled word does not cost 1.")
+        self.assertTrue(distance.is_similarity())
+
+    def test_max_distance(self):
+        """Tests that the distances greater than max_distance are returned as max_distance + 1."""
+        for max_distance in [0, 3, 10]:
+            out = WordLevenshtein(max_distance).pairwise(self.texts)
+            self.assertTrue((out == np.minimum(self.reference, max_distance + 1)).all(),
+                            msg=f"The distances are not bounded by {max_distance}.")
+
+    def test_engine(self):
+        """Tests the word distance as a named distance of the engine."""
+        self.assertIsInstance(Distance.resolve("word_levenshtein"), WordLevenshtein)
+        self.assertTrue((DistanceEngine("word_levenshtein", n_jobs=2, tile_size=4).compute(self.texts)
+                         == self.reference).all(), msg="The engine does not compute the word distances.")